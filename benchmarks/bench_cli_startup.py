@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# ══════════════════════════════════════════════════════════════════════════════
+#  benchmarks/bench_cli_startup.py
+#
+#  Mide el arranque del CLI por subcomando: tiempo de pared de
+#  `emoparse <subcomando> --help` en un proceso nuevo, tiempo de importación
+#  según `python -X importtime` y qué dependencias pesadas quedaron cargadas.
+#
+#  Uso:
+#      python benchmarks/bench_cli_startup.py --commands status,metrics,run \
+#          --repeat 5 --out benchmarks/resultado_arranque.md
+#
+#  Con `--max-status S` sale con código 1 si la mediana de `status` supera
+#  S segundos: sirve de guarda contra imports pesados que vuelvan al camino
+#  de los subcomandos livianos.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+#: Dependencias cuya carga se reporta (las que el arranque liviano evita).
+_PESADAS = ("pandas", "numpy", "pandera", "networkx", "httpx", "llama_cpp", "streamlit")
+
+#: Subcomando vacío = `emoparse --help`.
+_AYUDA = ""
+
+
+def main() -> int:
+    args = _parse_args()
+    comandos = [c.strip() for c in args.commands.split(",")]
+
+    filas: list[dict] = []
+    for comando in comandos:
+        paredes, imports, pesadas = [], [], set()
+        for _ in range(args.repeat):
+            pared, importacion, cargadas = _medir(comando)
+            paredes.append(pared)
+            imports.append(importacion)
+            pesadas |= cargadas
+        filas.append(
+            {
+                "comando": comando or "--help",
+                "pared_s": statistics.median(paredes),
+                "imports_s": statistics.median(imports),
+                "pesadas": sorted(pesadas),
+            }
+        )
+        print(f"→ {filas[-1]['comando']}: {filas[-1]['pared_s']:.3f}s")
+
+    md = _to_markdown(filas)
+    print(md)
+    if args.out:
+        Path(args.out).write_text(md, encoding="utf-8")
+
+    status = next((f for f in filas if f["comando"] == "status"), None)
+    if args.max_status is not None and status is not None:
+        if status["pared_s"] > args.max_status:
+            print(
+                f"status arrancó en {status['pared_s']:.3f}s (> {args.max_status}s)",
+                file=sys.stderr,
+            )
+            return 1
+    return 0
+
+
+def _medir(comando: str) -> tuple[float, float, set[str]]:
+    """(pared, importación, pesadas cargadas) de una invocación en un proceso nuevo."""
+    argv = [sys.executable, "-X", "importtime", "-m", "emoparse.cli"]
+    argv += [comando, "--help"] if comando else ["--help"]
+    t0 = time.perf_counter()
+    proc = subprocess.run(argv, capture_output=True, text=True, check=True)
+    pared = time.perf_counter() - t0
+
+    importacion_us = 0
+    cargadas: set[str] = set()
+    for linea in proc.stderr.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea.split("|", 2)
+        if not acumulado.strip().isdigit():
+            continue  # encabezado
+        if not nombre.startswith("  "):
+            # Import de primer nivel: su acumulado incluye a todos sus hijos.
+            importacion_us += int(acumulado)
+        raiz = nombre.strip().split(".", 1)[0]
+        if raiz in _PESADAS:
+            cargadas.add(raiz)
+    return pared, importacion_us / 1e6, cargadas
+
+
+def _to_markdown(filas: list[dict]) -> str:
+    lineas = [
+        "| comando | pared_s | imports_s | dependencias pesadas |",
+        "|---|---|---|---|",
+    ]
+    for f in filas:
+        pesadas = ", ".join(f["pesadas"]) or "—"
+        lineas.append(f"| {f['comando']} | {f['pared_s']:.3f} | {f['imports_s']:.3f} | {pesadas} |")
+    return "\n".join(lineas) + "\n"
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument(
+        "--commands",
+        default=",".join((_AYUDA, "status", "metrics", "stats", "inspect", "network", "run")),
+        help="Subcomandos separados por coma (vacío = `emoparse --help`).",
+    )
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--max-status", type=float, default=None)
+    p.add_argument("--out", default=None)
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
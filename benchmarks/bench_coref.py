@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# ══════════════════════════════════════════════════════════════════════════════
+#  benchmarks/bench_coref.py
+#
+#  Mide el clustering de correferencia intra-discurso sobre listas sintéticas
+#  de menciones (1k–50k) y lo compara con la versión par a par.
+#
+#  Uso:
+#      python benchmarks/bench_coref.py --sizes 1000,5000,20000,50000 \
+#          --pairwise-max 5000 --out benchmarks/resultado_coref.md
+#
+#  Las menciones se generan con seed fija sobre un vocabulario con sesgo
+#  Zipf (unos pocos tokens muy frecuentes, como "gobierno" o "presidente" en
+#  un corpus real). La versión par a par es cuadrática: solo se corre hasta
+#  --pairwise-max y, cuando corre, se verifica que los clusters coincidan.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from emoparse.pipeline.coref import _cluster_mentions_pairwise, cluster_mentions_within_discurso
+
+_STOPWORDS = ("de", "la", "el", "del", "los")
+
+
+def main() -> int:
+    args = _parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    filas: list[dict] = []
+    for n in sizes:
+        actores = _menciones(n, vocab=args.vocab, seed=args.seed)
+        bloqueado, t_bloq = _medir(cluster_mentions_within_discurso, actores)
+        fila: dict = {"n": n, "clusters": len(bloqueado), "bloqueado_s": t_bloq}
+        if n <= args.pairwise_max:
+            pares, t_pares = _medir(_cluster_mentions_pairwise, actores)
+            if pares != bloqueado:
+                print(f"✗ n={n}: los clusters no coinciden con la versión par a par.")
+                return 1
+            fila["pares_s"] = t_pares
+        filas.append(fila)
+        print(f"→ n={n}: {t_bloq:.3f}s ({len(bloqueado)} clusters)")
+
+    md = _to_markdown(filas)
+    print(md)
+    if args.out:
+        Path(args.out).write_text(md, encoding="utf-8")
+    return 0
+
+
+def _menciones(n: int, *, vocab: int, seed: int) -> list[tuple[int, list[dict]]]:
+    """`n` menciones repartidas en frases de hasta 8 actores."""
+    rng = random.Random(seed)
+    tokens = [f"tok{i}" for i in range(vocab)]
+    pesos = [1 / (i + 1) for i in range(vocab)]
+    out: list[tuple[int, list[dict]]] = []
+    restantes = n
+    unit_idx = 0
+    while restantes > 0:
+        k = min(restantes, rng.randint(1, 8))
+        actores = []
+        for _ in range(k):
+            palabras = rng.choices(tokens, weights=pesos, k=rng.randint(1, 5))
+            if rng.random() < 0.5:
+                palabras.insert(rng.randint(0, len(palabras)), rng.choice(_STOPWORDS))
+            actores.append({"actor": " ".join(palabras)})
+        out.append((unit_idx, actores))
+        restantes -= k
+        unit_idx += 1
+    return out
+
+
+def _medir(
+    fn: Callable[[list[tuple[int, list[dict]]]], list],
+    actores: list[tuple[int, list[dict]]],
+) -> tuple[list, float]:
+    t0 = time.perf_counter()
+    clusters = fn(actores)
+    return clusters, time.perf_counter() - t0
+
+
+def _to_markdown(filas: list[dict]) -> str:
+    lineas = [
+        "| n | clusters | bloqueado_s | pares_s | speedup |",
+        "|---|---|---|---|---|",
+    ]
+    for f in filas:
+        pares = f.get("pares_s")
+        speedup = f"{pares / f['bloqueado_s']:.1f}x" if pares and f["bloqueado_s"] else "—"
+        pares_txt = f"{pares:.3f}" if pares is not None else "—"
+        lineas.append(
+            f"| {f['n']} | {f['clusters']} | {f['bloqueado_s']:.3f} | {pares_txt} | {speedup} |"
+        )
+    return "\n".join(lineas) + "\n"
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--sizes", default="1000,5000,20000,50000")
+    p.add_argument(
+        "--pairwise-max",
+        type=int,
+        default=5000,
+        help="Tamaño máximo en el que también se corre la versión par a par.",
+    )
+    p.add_argument("--vocab", type=int, default=2000, help="Tokens distintos del vocabulario.")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out", default=None)
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,11 @@
 #  segundo run no se beneficia del primero. Repetir con --runs N para
 #  promediar (el sampling es determinista con seed fija, pero la latencia
 #  del sistema no).
+#
+#  Además de la tabla por stage se tabula la ocupación del modelo por
+#  corrida: segundos dentro de llamadas al LLM sobre el tiempo de pared. Es
+#  el proxy de uso de GPU que mueve `pipeline.prefetch` (comparar un config
+#  con `prefetch: 0` contra otro con `prefetch: 1`).
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
@@ -75,7 +80,7 @@ def main() -> int:
                     {"variante": label, "corrida": corrida, "wall_s": wall, **stage_row}
                 )
 
-    md = _to_markdown(resultados)
+    md = _to_markdown(resultados) + "\n" + _ocupacion_markdown(resultados)
     print(md)
     if args.out:
         Path(args.out).write_text(md, encoding="utf-8")
@@ -117,6 +122,29 @@ def _to_markdown(rows: list[dict]) -> str:
     return "\n".join(lineas) + "\n"
 
 
+def _ocupacion_markdown(rows: list[dict]) -> str:
+    """Ocupación del modelo por variante y corrida: Σ latencia LLM / pared."""
+    if not rows:
+        return ""
+    corridas: dict[tuple[str, int], dict[str, float]] = {}
+    for r in rows:
+        c = corridas.setdefault(
+            (r["variante"], r["corrida"]), {"wall_s": r["wall_s"], "llm_s": 0.0}
+        )
+        c["llm_s"] += (r["total_latency_ms"] or 0) / 1000.0
+    lineas = [
+        "| variante | corrida | pared_s | llm_s | ocupación |",
+        "|---|---|---|---|---|",
+    ]
+    for (variante, corrida), c in sorted(corridas.items()):
+        ocupacion = c["llm_s"] / c["wall_s"] if c["wall_s"] > 0 else 0.0
+        lineas.append(
+            f"| {variante} | {corrida + 1} | {c['wall_s']:.1f} | {c['llm_s']:.1f} "
+            f"| {ocupacion:.0%} |"
+        )
+    return "\n".join(lineas) + "\n"
+
+
 def _parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description=__doc__)
     p.add_argument("--input", required=True)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# ══════════════════════════════════════════════════════════════════════════════
+#  benchmarks/bench_run_comparison.py
+#
+#  Mide `compare_runs` sobre runs sintéticos del mismo corpus (p. ej. 30 runs
+#  × 200k emociones, el barrido típico de modelos y cuantizaciones).
+#
+#  Uso:
+#      python benchmarks/bench_run_comparison.py --runs 30 --emotions 200000 \
+#          [--workers 8] --out benchmarks/resultado_comparacion.md
+#
+#  Cada run es una SQLite mínima (frases + emociones) generada con seed fija:
+#  el mismo corpus, con un porcentaje de emociones que cambian de tipo,
+#  experienciador o fuente respecto de la base. Reporta tiempo total y pico
+#  de memoria residente del proceso.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from emoparse.evaluation.run_comparison import compare_runs
+
+_TIPOS = ("ira", "miedo", "alegría", "tristeza", "esperanza", "indignación", "orgullo")
+_MODOS = ("realizada", "virtualizada", "actualizada", "potencializada")
+_FORIAS = ("eufórica", "disfórica", "aforia")
+_ROLES = ("el enunciador", "el destinatario")
+
+
+def main() -> int:
+    args = _parse_args()
+    with tempfile.TemporaryDirectory(prefix="bench_comparacion_") as tmp:
+        t0 = time.perf_counter()
+        paths = [
+            _run_db(Path(tmp) / f"run_{i:02d}.sqlite", args.emotions, seed=args.seed, run=i)
+            for i in range(args.runs)
+        ]
+        generacion = time.perf_counter() - t0
+        print(f"→ {args.runs} runs × {args.emotions} emociones generados en {generacion:.1f}s")
+
+        t0 = time.perf_counter()
+        comparison = compare_runs(paths, workers=args.workers)
+        total = time.perf_counter() - t0
+
+    pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    md = _to_markdown(args, comparison.common_units, total, pico_mb, comparison.agreement)
+    print(md)
+    if args.out:
+        Path(args.out).write_text(md, encoding="utf-8")
+    return 0
+
+
+def _run_db(path: Path, emotions: int, *, seed: int, run: int) -> Path:
+    """Run sintético: 4 emociones por unidad; `run` > 0 perturba un 10 %."""
+    base = random.Random(seed)
+    rng = random.Random(seed * 1000 + run)
+    actores = [f"Actor {i}" for i in range(2000)]
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        """
+        CREATE TABLE frases (
+            codigo TEXT NOT NULL, unit_idx INTEGER NOT NULL, frase TEXT NOT NULL,
+            PRIMARY KEY (codigo, unit_idx)
+        );
+        CREATE TABLE emociones (
+            codigo TEXT NOT NULL, frase_idx INTEGER NOT NULL, emocion_idx INTEGER NOT NULL,
+            tipo_emocion TEXT, experienciador TEXT, experienciador_canonico TEXT,
+            fuente_inferencia TEXT, fuente_canonico TEXT, modo_existencia TEXT,
+            caracterizacion_payload TEXT,
+            PRIMARY KEY (codigo, frase_idx, emocion_idx)
+        );
+        """
+    )
+    unidades = emotions // 4
+    connection.executemany(
+        "INSERT INTO frases VALUES (?, ?, ?)",
+        ((f"d{u // 20}", u % 20, f"frase {u}") for u in range(unidades)),
+    )
+    filas = []
+    for i in range(emotions):
+        u = i // 4
+        experienciador = base.choice(actores)
+        fuente = base.choice(actores)
+        tipo = base.choice(_TIPOS)
+        if run and rng.random() < 0.1:
+            experienciador = rng.choice((*actores[:50], *_ROLES))
+            fuente = rng.choice(actores)
+            tipo = rng.choice(_TIPOS)
+        filas.append(
+            (
+                f"d{u // 20}",
+                u % 20,
+                i % 4,
+                tipo,
+                experienciador,
+                experienciador.lower().replace(" ", "_"),
+                fuente,
+                fuente.lower().replace(" ", "_"),
+                base.choice(_MODOS),
+                json.dumps({"foria": base.choice(_FORIAS)}),
+            )
+        )
+    connection.executemany(
+        "INSERT INTO emociones VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        filas,
+    )
+    connection.commit()
+    connection.close()
+    return path
+
+
+def _to_markdown(
+    args: argparse.Namespace,
+    common_units: int,
+    total: float,
+    pico_mb: float,
+    agreement: tuple[dict, ...],
+) -> str:
+    lineas = [
+        "| runs | emociones/run | unidades comunes | total_s | pico_rss_mb |",
+        "|---|---|---|---|---|",
+        f"| {args.runs} | {args.emotions} | {common_units} | {total:.1f} | {pico_mb:.0f} |",
+        "",
+        "| dimensión | alpha |",
+        "|---|---|",
+    ]
+    for row in agreement:
+        alpha = row["alpha"]
+        lineas.append(f"| {row['dimension']} | {'—' if alpha is None else f'{alpha:.3f}'} |")
+    return "\n".join(lineas) + "\n"
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--runs", type=int, default=30)
+    p.add_argument("--emotions", type=int, default=200_000, help="Emociones por run.")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument(
+        "--workers", type=int, default=None, help="Procesos lectores (default: automático)."
+    )
+    p.add_argument("--out", default=None)
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,50 @@
-"""Mide el tamaño de los system prompts renderizados más sensibles."""
+"""Mide tamaño y latencia de render de los system prompts más sensibles.
+
+Además del presupuesto de caracteres, reporta por prompt el primer render
+del proceso (carga del template, desde el bytecode en disco si ya existe)
+y la mediana de los renders siguientes. `--repeat 0` omite la medición de
+latencia.
+"""
 
 from __future__ import annotations
 
+import argparse
 import math
+import statistics
+import time
+from collections.abc import Callable
 from pathlib import Path
 
 import yaml
 
-from emoparse.core.prompts import characterizer, emotions
+from emoparse.core.prompts import _loader, characterizer, emotions
 from emoparse.knowledge.loader import KnowledgeLoader
 
 
 def build_footprint(root: Path) -> dict[str, int]:
+    return {name: len(render()) for name, render in _renderers(root).items()}
+
+
+def build_latency(root: Path, repeat: int) -> dict[str, dict[str, float]]:
+    """Latencias en ms por prompt: primer render del proceso y render en caliente."""
+    latency: dict[str, dict[str, float]] = {}
+    for name, render in _renderers(root).items():
+        _loader._env.cache_clear()
+        first = _time_ms(render)
+        latency[name] = {
+            "primer_ms": first,
+            "render_ms": statistics.median(_time_ms(render) for _ in range(repeat)),
+        }
+    return latency
+
+
+def _time_ms(render: Callable[[], str]) -> float:
+    start = time.perf_counter()
+    render()
+    return (time.perf_counter() - start) * 1000
+
+
+def _renderers(root: Path) -> dict[str, Callable[[], str]]:
     knowledge = KnowledgeLoader(root / "knowledge")
     configurations = knowledge.load_emotion_configurations("configuraciones_emocion.json")
     modes = knowledge.load_ontology("emociones.json")
@@ -21,28 +54,35 @@ def build_footprint(root: Path) -> dict[str, int]:
             knowledge.load_heuristics("heuristicas/emotions_tuit.md"),
         ]
     )
-    emotion_prompt = emotions.render_system(
-        configuraciones=configurations,
-        titulo="",
-        tipo_discurso="tuit",
-        enunciador="@autor.bsky.social",
-        heuristicas=emotion_heuristics,
-        modos_existencia=modes,
-        template="emotions_system_tuit",
-    )
-    characterizer_prompt = characterizer.render_system(
-        titulo="",
-        tipo_discurso="tuit",
-        enunciador="@autor.bsky.social",
-        heuristicas=knowledge.load_heuristics("heuristicas/characterizer.md"),
-    )
+    characterizer_heuristics = knowledge.load_heuristics("heuristicas/characterizer.md")
     return {
-        "emotions_tuit_system_chars": len(emotion_prompt),
-        "characterizer_system_chars": len(characterizer_prompt),
+        "emotions_tuit_system_chars": lambda: emotions.render_system(
+            configuraciones=configurations,
+            titulo="",
+            tipo_discurso="tuit",
+            enunciador="@autor.bsky.social",
+            heuristicas=emotion_heuristics,
+            modos_existencia=modes,
+            template="emotions_system_tuit",
+        ),
+        "characterizer_system_chars": lambda: characterizer.render_system(
+            titulo="",
+            tipo_discurso="tuit",
+            enunciador="@autor.bsky.social",
+            heuristicas=characterizer_heuristics,
+        ),
     }
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=200,
+        help="Renders por medición de latencia (0 = solo presupuesto).",
+    )
+    args = parser.parse_args()
     root = Path(__file__).resolve().parents[1]
     budget = yaml.safe_load(
         (root / "evals/prompt_regression/prompt_budget.yaml").read_text(encoding="utf-8")
@@ -86,6 +126,14 @@ def main() -> None:
                 f"~{remaining} tokens. Esta cifra no reemplaza la prueba real."
             )
 
+    if args.repeat > 0:
+        print(f"Latencia de render (mediana de {args.repeat}):")
+        for name, ms in build_latency(root, args.repeat).items():
+            print(
+                f"  {name}: primer render {ms['primer_ms']:.2f} ms, "
+                f"en caliente {ms['render_ms'] * 1000:.0f} µs"
+            )
+
     if failed:
         raise SystemExit(1)
 
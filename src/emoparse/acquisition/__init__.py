@@ -13,6 +13,7 @@
 
 from emoparse.acquisition.base import DiscursoRecord, SourceAdapter
 from emoparse.acquisition.base_posts import PostSourceAdapter
+from emoparse.acquisition.fetch_engine import FetchEngine, FetchResult, HttpCache
 from emoparse.acquisition.jsonl_appender import JsonlAppender
 from emoparse.acquisition.persist import CsvAppender
 from emoparse.acquisition.post_record import PostRecord
@@ -23,6 +24,9 @@ __all__ = [
     "DiscursoRecord",
     "SourceAdapter",
     "CsvAppender",
+    "FetchEngine",
+    "FetchResult",
+    "HttpCache",
     "SOURCES",
     "get_source",
     "PostRecord",
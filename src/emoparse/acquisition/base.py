@@ -7,7 +7,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from datetime import date
 from typing import Any
@@ -60,6 +60,10 @@ class DiscursoRecord:
         return d
 
 
+#: Parser del HTML de un discurso: `(url, html) → DiscursoRecord | None`.
+HtmlParser = Callable[[str, str], DiscursoRecord | None]
+
+
 class SourceAdapter(ABC):
     """Interfaz abstracta de un adapter de fuente."""
 
@@ -80,6 +84,16 @@ class SourceAdapter(ABC):
     def fetch_discurso(self, url: str) -> DiscursoRecord | None:
         """Extrae el contenido de un discurso individual."""
 
+    def html_parser(self) -> HtmlParser | None:
+        """Parser puro del HTML de un discurso, si la fuente separa descarga y parseo.
+
+        Debe ser una función a nivel de módulo (o un `functools.partial` de
+        una), para que `FetchEngine` pueda descargar en paralelo y parsear en
+        otros procesos. None (default): la fuente solo se scrapea en serie
+        con `fetch_discurso`.
+        """
+        return None
+
     def close(self) -> None:
         """Libera recursos (sesiones HTTP, drivers, etc.). Default no-op."""
 
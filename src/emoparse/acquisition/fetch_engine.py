@@ -0,0 +1,300 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.acquisition.fetch_engine
+#
+#  Motor de descarga concurrente de discursos para los adapters que separan
+#  descarga y parseo (`SourceAdapter.html_parser`).
+#
+#  - Descarga: un pool acotado de hilos, cada uno con su `HttpClient`
+#    (retries y backoff incluidos). Las URLs se toman del listado de a poco,
+#    con a lo sumo `2·workers` en vuelo, así que cortar el consumo (--max,
+#    Ctrl-C) no descarga de más.
+#  - Cortesía por dominio: a lo sumo `per_domain` solicitudes simultáneas y
+#    un intervalo mínimo entre inicios de solicitud al mismo dominio.
+#  - Caché HTTP local (`HttpCache`): guarda cuerpo, ETag y Last-Modified por
+#    URL y revalida con solicitudes condicionales; ante un 304 se reutiliza
+#    el cuerpo guardado sin volver a bajarlo.
+#  - Parseo: el parser (una función a nivel de módulo, para poder enviarla a
+#    otro proceso) corre en un pool de procesos si hay más de un CPU, y si no
+#    en el mismo hilo que descargó.
+#
+#  Los resultados salen en orden de finalización, no de listado: la reanudación
+#  sigue siendo por URL (`CsvAppender`), que no depende del orden.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from emoparse.acquisition.base import DiscursoRecord, HtmlParser
+from emoparse.acquisition.http_client import HttpClient
+
+#: Defaults del motor: descargas simultáneas en total y por dominio, y
+#: segundos entre inicios de solicitud a un mismo dominio.
+DEFAULT_WORKERS = 8
+DEFAULT_PER_DOMAIN = 4
+DEFAULT_INTERVAL = 0.25
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """Una respuesta guardada en la caché HTTP, con sus validadores."""
+
+    url: str
+    body: str
+    etag: str | None
+    last_modified: str | None
+
+
+class HttpCache:
+    """Caché HTTP en disco: un JSON por URL (nombre = sha256 de la URL).
+
+    Las escrituras son atómicas (archivo temporal + rename), así que varios
+    hilos o corridas pueden compartir el directorio.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, url: str) -> CachedResponse | None:
+        """La respuesta guardada de `url`, o None si no hay (o está corrupta)."""
+        path = self._path(url)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("url") != url:
+            return None
+        return CachedResponse(
+            url=url,
+            body=str(data.get("body", "")),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+        )
+
+    def put(self, response: CachedResponse) -> None:
+        """Guarda (o reemplaza) la respuesta de `response.url`."""
+        path = self._path(response.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "url": response.url,
+                    "etag": response.etag,
+                    "last_modified": response.last_modified,
+                    "body": response.body,
+                },
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+
+@dataclass(frozen=True, slots=True)
+class FetchResult:
+    """Resultado de descargar y parsear una URL.
+
+    `record` es None si el parser descartó la página (sin contenido) o si
+    falló: en ese caso `error` trae el motivo.
+    """
+
+    url: str
+    record: DiscursoRecord | None
+    error: str | None = None
+    from_cache: bool = False
+
+
+class _Cortesia:
+    """Límite de concurrencia e intervalo mínimo entre solicitudes, por dominio."""
+
+    def __init__(self, per_domain: int, interval: float) -> None:
+        self._per_domain = per_domain
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._semaforos: dict[str, threading.BoundedSemaphore] = {}
+        self._proximo: dict[str, float] = {}
+
+    @contextmanager
+    def turno(self, url: str) -> Iterator[None]:
+        """Espera el turno de `url` en su dominio y lo retiene durante la solicitud."""
+        dominio = urlparse(url).netloc.lower()
+        with self._lock:
+            semaforo = self._semaforos.setdefault(
+                dominio, threading.BoundedSemaphore(self._per_domain)
+            )
+        with semaforo:
+            with self._lock:
+                ahora = time.monotonic()
+                inicio = max(ahora, self._proximo.get(dominio, ahora))
+                self._proximo[dominio] = inicio + self._interval
+            if inicio > ahora:
+                time.sleep(inicio - ahora)
+            yield
+
+
+class FetchEngine:
+    """Descarga y parsea URLs de discursos con concurrencia acotada."""
+
+    def __init__(
+        self,
+        parser: HtmlParser,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        per_domain: int = DEFAULT_PER_DOMAIN,
+        interval: float = DEFAULT_INTERVAL,
+        cache: HttpCache | None = None,
+        parse_workers: int | None = None,
+        timeout: float = 20.0,
+        max_retries: int = 3,
+    ) -> None:
+        """
+        Args:
+            parser: `(url, html) → DiscursoRecord | None`, a nivel de módulo.
+            workers: Descargas simultáneas en total.
+            per_domain: Descargas simultáneas por dominio.
+            interval: Segundos mínimos entre inicios de solicitud a un dominio.
+            cache: Caché HTTP para solicitudes condicionales. None = sin caché.
+            parse_workers: Procesos de parseo. None = uno por CPU (hasta
+                `workers`); ≤ 1 parsea en el hilo de descarga.
+            timeout: Timeout por solicitud en segundos.
+            max_retries: Reintentos en errores transitorios.
+        """
+        if workers < 1 or per_domain < 1:
+            raise ValueError("workers y per_domain deben ser ≥ 1")
+        if interval < 0:
+            raise ValueError("interval no puede ser negativo")
+        self._parser = parser
+        self._workers = workers
+        self._cortesia = _Cortesia(per_domain, interval)
+        self._cache = cache
+        if parse_workers is None:
+            parse_workers = min(os.cpu_count() or 1, workers)
+        self._parse_workers = parse_workers
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._local = threading.local()
+        self._clientes: list[HttpClient] = []
+        self._clientes_lock = threading.Lock()
+
+    def run(self, urls: Iterable[str]) -> Generator[FetchResult, None, None]:
+        """Descarga y parsea `urls`; los resultados salen a medida que terminan."""
+        descargas = ThreadPoolExecutor(self._workers, thread_name_prefix="fetch")
+        parseo: Executor | None = None
+        if self._parse_workers > 1:
+            parseo = ProcessPoolExecutor(
+                max_workers=self._parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        pendientes: set[Future[FetchResult]] = set()
+        fuente = iter(urls)
+        agotada = False
+        try:
+            while True:
+                while not agotada and len(pendientes) < 2 * self._workers:
+                    url = next(fuente, None)
+                    if url is None:
+                        agotada = True
+                        break
+                    pendientes.add(descargas.submit(self._procesar, url, parseo))
+                if not pendientes:
+                    return
+                hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    yield futuro.result()
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
+            descargas.shutdown(wait=True, cancel_futures=True)
+            if parseo is not None:
+                parseo.shutdown(wait=True, cancel_futures=True)
+            self._cerrar_clientes()
+
+    def _procesar(self, url: str, parseo: Executor | None) -> FetchResult:
+        try:
+            html, from_cache = self._descargar(url)
+            if parseo is not None:
+                record = parseo.submit(self._parser, url, html).result()
+            else:
+                record = self._parser(url, html)
+        except Exception as e:
+            return FetchResult(url=url, record=None, error=f"{type(e).__name__}: {e}")
+        return FetchResult(url=url, record=record, from_cache=from_cache)
+
+    def _descargar(self, url: str) -> tuple[str, bool]:
+        """(html, vino de la caché) de `url`, revalidando lo guardado."""
+        guardada = self._cache.get(url) if self._cache is not None else None
+        headers: dict[str, str] = {}
+        if guardada is not None:
+            if guardada.etag:
+                headers["If-None-Match"] = guardada.etag
+            if guardada.last_modified:
+                headers["If-Modified-Since"] = guardada.last_modified
+
+        with self._cortesia.turno(url):
+            response = self._cliente().get(url, headers=headers)
+
+        if response.status_code == 304 and guardada is not None:
+            logger.debug(f"[FetchEngine] 304, desde caché: {url}")
+            return guardada.body, True
+        if response.status_code >= 400:
+            response.raise_for_status()
+        html = response.text
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self._cache is not None and (etag or last_modified):
+            self._cache.put(CachedResponse(url, html, etag, last_modified))
+        return html, False
+
+    def _cliente(self) -> HttpClient:
+        """El `HttpClient` del hilo actual (las sesiones no se comparten entre hilos)."""
+        cliente: HttpClient | None = getattr(self._local, "cliente", None)
+        if cliente is None:
+            cliente = HttpClient(timeout=self._timeout, max_retries=self._max_retries)
+            self._local.cliente = cliente
+            with self._clientes_lock:
+                self._clientes.append(cliente)
+        return cliente
+
+    def _cerrar_clientes(self) -> None:
+        with self._clientes_lock:
+            for cliente in self._clientes:
+                cliente.close()
+            self._clientes.clear()
+        self._local = threading.local()
+
+
+__all__ = [
+    "CachedResponse",
+    "DEFAULT_INTERVAL",
+    "DEFAULT_PER_DOMAIN",
+    "DEFAULT_WORKERS",
+    "FetchEngine",
+    "FetchResult",
+    "HttpCache",
+]
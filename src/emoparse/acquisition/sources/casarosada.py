@@ -6,14 +6,16 @@
 
 from __future__ import annotations
 
+import re
 from collections.abc import Iterator
 from datetime import date
+from functools import partial
 from typing import TYPE_CHECKING, Any, Literal
 
 import requests
 from loguru import logger
 
-from emoparse.acquisition.base import DiscursoRecord, SourceAdapter
+from emoparse.acquisition.base import DiscursoRecord, HtmlParser, SourceAdapter
 from emoparse.acquisition.http_client import HttpClient
 from emoparse.acquisition.normalize import (
     clean_whitespace,
@@ -157,75 +159,17 @@ class CasaRosadaAdapter(SourceAdapter):
         html = self._fetch_html(url)
         if not html:
             return None
+        return parse_discurso_html(url, html, scrape_mode=self._current_mode_label())
 
-        soup = _parse_html(html)
+    def html_parser(self) -> HtmlParser | None:
+        """Parser para descargar en paralelo; solo en modo http.
 
-        titulo = self._select_first_text(soup, _TITULO_SELECTORS) or "Sin título"
-        fecha = self._extract_fecha(soup)
-        contenido = self._extract_contenido(soup)
-
-        if not contenido or contenido == "[Contenido no encontrado]":
-            logger.warning(f"[CasaRosada] Sin contenido en {url}")
+        En auto/selenium la descarga puede escalar a Selenium, que no se
+        comparte entre hilos: esos modos se scrapean en serie.
+        """
+        if self._mode != "http":
             return None
-
-        codigo = self._codigo_from_url(url)
-
-        return DiscursoRecord(
-            codigo=codigo,
-            url=url,
-            titulo=titulo,
-            fecha=fecha,
-            contenido=contenido,
-            fuente=self.source_id,
-            extras=(("scrape_mode", self._current_mode_label()),),
-        )
-
-    def _extract_fecha(self, soup: BeautifulSoup) -> str:
-        """Extrae fecha del discurso, normalizada si posible."""
-        for sel in _FECHA_SELECTORS:
-            el = soup.select_one(sel)
-            if el is None:
-                continue
-            raw = el.get("datetime") or el.get_text(strip=True)
-            if not raw:
-                continue
-            normalized = normalize_date(raw)
-            if normalized:
-                return normalized
-            return raw
-        return ""
-
-    def _extract_contenido(self, soup: BeautifulSoup) -> str:
-        """Concatena párrafos, limpia whitespace y boilerplate."""
-        parrafos = soup.select(_CONTENIDO_SELECTOR)
-        textos = [p.get_text(separator=" ", strip=True) for p in parrafos]
-        textos = [t for t in textos if t]
-        if not textos:
-            return ""
-        joined = "\n\n".join(textos)
-        joined = clean_whitespace(joined)
-        joined = strip_boilerplate(joined)
-        return joined
-
-    @staticmethod
-    def _select_first_text(soup: BeautifulSoup, selectors: tuple[str, ...]) -> str:
-        for sel in selectors:
-            el = soup.select_one(sel)
-            if el is not None:
-                txt = el.get_text(strip=True)
-                if txt:
-                    return txt
-        return ""
-
-    @staticmethod
-    def _codigo_from_url(url: str) -> str:
-        """Genera código estable a partir del slug de la URL."""
-        slug = url.rstrip("/").rsplit("/", 1)[-1]
-        # Sanitizar caracteres raros en el slug: solo [\w-].
-        import re
-
-        slug = re.sub(r"[^\w\-]", "_", slug)
-        return f"casarosada_{slug}" if slug else f"casarosada_{abs(hash(url))}"
+        return partial(parse_discurso_html, scrape_mode="http")
 
     # ── HTTP/Selenium dispatcher ─────────────────────────────────────────
 
@@ -295,3 +239,78 @@ class CasaRosadaAdapter(SourceAdapter):
         if self._selenium is not None:
             self._selenium.close()
             self._selenium = None
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Parseo de un discurso (a nivel de módulo: corre también en otros procesos)
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def parse_discurso_html(url: str, html: str, *, scrape_mode: str) -> DiscursoRecord | None:
+    """Parsea el HTML de un discurso. None si no tiene contenido."""
+    soup = _parse_html(html)
+
+    titulo = _select_first_text(soup, _TITULO_SELECTORS) or "Sin título"
+    fecha = _extract_fecha(soup)
+    contenido = _extract_contenido(soup)
+
+    if not contenido or contenido == "[Contenido no encontrado]":
+        logger.warning(f"[CasaRosada] Sin contenido en {url}")
+        return None
+
+    return DiscursoRecord(
+        codigo=_codigo_from_url(url),
+        url=url,
+        titulo=titulo,
+        fecha=fecha,
+        contenido=contenido,
+        fuente=CasaRosadaAdapter.source_id,
+        extras=(("scrape_mode", scrape_mode),),
+    )
+
+
+def _extract_fecha(soup: BeautifulSoup) -> str:
+    """Extrae fecha del discurso, normalizada si posible."""
+    for sel in _FECHA_SELECTORS:
+        el = soup.select_one(sel)
+        if el is None:
+            continue
+        raw = el.get("datetime") or el.get_text(strip=True)
+        if not raw:
+            continue
+        normalized = normalize_date(raw)
+        if normalized:
+            return normalized
+        return raw
+    return ""
+
+
+def _extract_contenido(soup: BeautifulSoup) -> str:
+    """Concatena párrafos, limpia whitespace y boilerplate."""
+    parrafos = soup.select(_CONTENIDO_SELECTOR)
+    textos = [p.get_text(separator=" ", strip=True) for p in parrafos]
+    textos = [t for t in textos if t]
+    if not textos:
+        return ""
+    joined = "\n\n".join(textos)
+    joined = clean_whitespace(joined)
+    joined = strip_boilerplate(joined)
+    return joined
+
+
+def _select_first_text(soup: BeautifulSoup, selectors: tuple[str, ...]) -> str:
+    for sel in selectors:
+        el = soup.select_one(sel)
+        if el is not None:
+            txt = el.get_text(strip=True)
+            if txt:
+                return txt
+    return ""
+
+
+def _codigo_from_url(url: str) -> str:
+    """Genera código estable a partir del slug de la URL."""
+    slug = url.rstrip("/").rsplit("/", 1)[-1]
+    # Sanitizar caracteres raros en el slug: solo [\w-].
+    slug = re.sub(r"[^\w\-]", "_", slug)
+    return f"casarosada_{slug}" if slug else f"casarosada_{abs(hash(url))}"
@@ -20,7 +20,7 @@ from xml.etree import ElementTree
 import requests
 from loguru import logger
 
-from emoparse.acquisition.base import DiscursoRecord, SourceAdapter
+from emoparse.acquisition.base import DiscursoRecord, HtmlParser, SourceAdapter
 from emoparse.acquisition.http_client import HttpClient, TransientHttpError
 from emoparse.acquisition.normalize import clean_whitespace, normalize_date, strip_boilerplate
 
@@ -215,70 +215,11 @@ class Pagina12Adapter(SourceAdapter):
 
     def fetch_discurso(self, url: str) -> DiscursoRecord | None:
         """Descarga una nota y conserva texto y metadata periodística."""
-        html = self._fetch_text(url)
-        soup = _parse_html(html)
-        article = _extract_news_article(soup)
-        fusion_content = _extract_fusion_global_content(soup)
-
-        canonical_url = _canonical_url(soup) or url
-        titulo = _first_nonempty(
-            _as_text(article.get("headline")),
-            _meta_content(soup, "property", "og:title"),
-            _first_text(soup, ("article h1", "main h1", "h1")),
-        )
-        contenido = _extract_body(soup, article, fusion_content)
-
-        if not titulo or len(contenido) < 200:
-            logger.warning(f"[Pagina12] Nota incompleta o demasiado breve, se omite: {url}")
-            return None
-
-        url_date = _date_from_url(canonical_url)
-        fecha = _first_nonempty(
-            normalize_date(_as_text(article.get("datePublished"))),
-            normalize_date(_meta_content(soup, "property", "article:published_time")),
-            _extract_time(soup),
-            url_date.isoformat() if url_date is not None else "",
-        )
-        seccion = _first_nonempty(
-            _as_text(article.get("articleSection")),
-            _meta_content(soup, "property", "article:section"),
-            _first_text(soup, _SECTION_SELECTORS),
-        )
-        volanta = _first_text(soup, _VOLANTA_SELECTORS)
-        subtitulo = _first_nonempty(
-            _as_text(article.get("description")),
-            _meta_content(soup, "name", "description"),
-            _meta_content(soup, "property", "og:description"),
-            _first_text(soup, _SUBTITLE_SELECTORS),
-        )
-        autoria = _extract_authors(soup, article)
-        epigrafe = _first_nonempty(
-            _extract_image_caption(article),
-            _first_text(soup, _CAPTION_SELECTORS),
-        )
-        agencia = _extract_agency(article, autoria, epigrafe)
-
-        extras = (
-            ("medio", "Página/12"),
-            ("idioma", "es-AR"),
-            ("seccion", seccion),
-            ("volanta", volanta),
-            ("subtitulo", subtitulo),
-            ("autoria", json.dumps(autoria, ensure_ascii=False)),
-            ("agencia", agencia),
-            ("epigrafe", epigrafe),
-            ("scrape_mode", "http"),
-        )
+        return parse_article(url, self._fetch_text(url))
 
-        return DiscursoRecord(
-            codigo=_codigo_from_url(canonical_url),
-            url=canonical_url,
-            titulo=titulo,
-            fecha=fecha,
-            contenido=contenido,
-            fuente=self.source_id,
-            extras=extras,
-        )
+    def html_parser(self) -> HtmlParser:
+        """`parse_article`: las notas se pueden descargar en paralelo."""
+        return parse_article
 
     def _fetch_text(self, url: str) -> str:
         """Descarga texto con un intervalo mínimo entre solicitudes."""
@@ -298,6 +239,73 @@ class Pagina12Adapter(SourceAdapter):
         self._http.close()
 
 
+def parse_article(url: str, html: str) -> DiscursoRecord | None:
+    """Parsea una nota ya descargada y conserva texto y metadata periodística."""
+    soup = _parse_html(html)
+    article = _extract_news_article(soup)
+    fusion_content = _extract_fusion_global_content(soup)
+
+    canonical_url = _canonical_url(soup) or url
+    titulo = _first_nonempty(
+        _as_text(article.get("headline")),
+        _meta_content(soup, "property", "og:title"),
+        _first_text(soup, ("article h1", "main h1", "h1")),
+    )
+    contenido = _extract_body(soup, article, fusion_content)
+
+    if not titulo or len(contenido) < 200:
+        logger.warning(f"[Pagina12] Nota incompleta o demasiado breve, se omite: {url}")
+        return None
+
+    url_date = _date_from_url(canonical_url)
+    fecha = _first_nonempty(
+        normalize_date(_as_text(article.get("datePublished"))),
+        normalize_date(_meta_content(soup, "property", "article:published_time")),
+        _extract_time(soup),
+        url_date.isoformat() if url_date is not None else "",
+    )
+    seccion = _first_nonempty(
+        _as_text(article.get("articleSection")),
+        _meta_content(soup, "property", "article:section"),
+        _first_text(soup, _SECTION_SELECTORS),
+    )
+    volanta = _first_text(soup, _VOLANTA_SELECTORS)
+    subtitulo = _first_nonempty(
+        _as_text(article.get("description")),
+        _meta_content(soup, "name", "description"),
+        _meta_content(soup, "property", "og:description"),
+        _first_text(soup, _SUBTITLE_SELECTORS),
+    )
+    autoria = _extract_authors(soup, article)
+    epigrafe = _first_nonempty(
+        _extract_image_caption(article),
+        _first_text(soup, _CAPTION_SELECTORS),
+    )
+    agencia = _extract_agency(article, autoria, epigrafe)
+
+    extras = (
+        ("medio", "Página/12"),
+        ("idioma", "es-AR"),
+        ("seccion", seccion),
+        ("volanta", volanta),
+        ("subtitulo", subtitulo),
+        ("autoria", json.dumps(autoria, ensure_ascii=False)),
+        ("agencia", agencia),
+        ("epigrafe", epigrafe),
+        ("scrape_mode", "http"),
+    )
+
+    return DiscursoRecord(
+        codigo=_codigo_from_url(canonical_url),
+        url=canonical_url,
+        titulo=titulo,
+        fecha=fecha,
+        contenido=contenido,
+        fuente=Pagina12Adapter.source_id,
+        extras=extras,
+    )
+
+
 def parse_sitemap(xml: str) -> list[tuple[str, date | None]]:
     """Parsea un sitemap XML y devuelve URL y fecha de publicación conocida."""
     try:
@@ -690,4 +698,4 @@ def _codigo_from_url(url: str) -> str:
     return f"pagina12_{date_part}_{slug}"
 
 
-__all__ = ["Pagina12Adapter", "parse_rss", "parse_sitemap"]
+__all__ = ["Pagina12Adapter", "parse_article", "parse_rss", "parse_sitemap"]
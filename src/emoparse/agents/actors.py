@@ -46,6 +46,7 @@ class ActorsAgent(BaseBatchAgent[ListaActoresBatchSchema]):
         heuristicas: str | None = None,
         retry_config: Any | None = None,
         genre: Genre | None = None,
+        empaquetado: bool = False,
     ) -> None:
         """Inicializa el agente.
 
@@ -59,12 +60,16 @@ class ActorsAgent(BaseBatchAgent[ListaActoresBatchSchema]):
             retry_config: Configuración de reintentos.
             genre: Permite sobrescribir `BATCH_SIZE` si define
                 `batch_size["actors"]`.
+            empaquetado: True si los batches mezclan unidades de varios
+                discursos. El contexto de cada discurso llega por fila
+                (`CONTEXT_COLUMN`) y va en el bloque de su unidad.
         """
         self._titulo = titulo
         self._tipo_discurso = tipo_discurso
         self._enunciador = enunciador
         self._heuristicas = heuristicas
         self._genre = genre
+        self._empaquetado = empaquetado
 
         # Permite override de batch size desde el género.
         if genre is not None and "actors" in genre.batch_size:
@@ -80,6 +85,7 @@ class ActorsAgent(BaseBatchAgent[ListaActoresBatchSchema]):
             tipo_discurso=self._tipo_discurso,
             enunciador=self._enunciador,
             heuristicas=self._heuristicas,
+            empaquetado=self._empaquetado,
         )
 
     def _build_user(self, batch: pd.DataFrame) -> str:
@@ -89,7 +95,11 @@ class ActorsAgent(BaseBatchAgent[ListaActoresBatchSchema]):
         for i, (_, row) in enumerate(batch.iterrows()):
             codigo = str(row.get("codigo", ""))
             frase = str(row.get("frase", row.get("contenido", "")))
-            bloques.append(f"UNIDAD [{i}] (codigo={codigo}):\n{frase}")
+            contexto = self._contexto_unidad(row)
+            cabecera = f"UNIDAD [{i}] (codigo={codigo}):"
+            if contexto:
+                cabecera = f"{cabecera}\n{contexto}\nFRASE:"
+            bloques.append(f"{cabecera}\n{frase}")
         unidades_block = "\n\n".join(bloques)
         return prompts.render_user(unidades_block=unidades_block)
 
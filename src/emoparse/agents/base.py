@@ -20,6 +20,8 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from concurrent.futures import Future
+from contextlib import closing
 from typing import Any, ClassVar, Generic, TypeVar
 
 import pandas as pd
@@ -32,6 +34,7 @@ from emoparse.core.backend.exceptions import (
     ContextLengthExceededError,
 )
 from emoparse.core.backend.retry import RetryConfig, retry_with_backoff
+from emoparse.core.prefetch import DEFAULT_ANTICIPACION, anticipar
 
 #: Schema Pydantic esperado como salida del agente.
 ResultT = TypeVar("ResultT", bound=BaseModel)
@@ -237,6 +240,13 @@ class BaseBatchAgent(ABC, Generic[ResultT]):
     #: True cuando el log muestra que el modelo la produce bien.
     ANCHOR_STRICT: ClassVar[bool] = False
 
+    #: Columnas que la stage agrega a cada fila cuando empaqueta unidades de
+    #: varios discursos en un mismo batch: el contexto del discurso ya
+    #: formateado, que va en el bloque de la unidad en lugar del system
+    #: prompt, y su enunciador, para el posprocesado que lo necesita.
+    CONTEXT_COLUMN: ClassVar[str] = "contexto_discurso"
+    ENUNCIADOR_COLUMN: ClassVar[str] = "enunciador_discurso"
+
     def __init__(
         self,
         backend: LLMBackend,
@@ -246,6 +256,11 @@ class BaseBatchAgent(ABC, Generic[ResultT]):
         self._retry_config = retry_config
         #: Callback opcional de avance; lo engancha la stage (ver BaseAgent).
         self.on_progress: Callable[[int], None] | None = None
+        #: Batches cuyo prompt se arma por delante del que está en el modelo:
+        #: el user prompt del batch N+1 (y la gramática del backend) se
+        #: preparan en un hilo auxiliar mientras se decodifica el N. 0 = en
+        #: serie. La stage lo ajusta según `pipeline.prefetch`.
+        self.prefetch = DEFAULT_ANTICIPACION
         self._system = self._build_system()
 
     # ── Métodos que las subclases deben implementar ──────────────────────────
@@ -291,6 +306,20 @@ class BaseBatchAgent(ABC, Generic[ResultT]):
         es la fila original asociada a su `unit_idx`.
         """
 
+    # ── Contexto por unidad (batches empaquetados) ───────────────────────────
+
+    def _contexto_unidad(self, row: pd.Series) -> str:
+        """Bloque de contexto del discurso de la fila, o '' si no viene.
+
+        Solo lo traen las filas de un batch empaquetado; en el modo de un
+        agente por discurso ese contexto ya está en el system prompt.
+        """
+        return _celda_str(row.get(self.CONTEXT_COLUMN))
+
+    def _enunciador_de(self, row: pd.Series, default: str) -> str:
+        """Enunciador del discurso de la fila, con `default` si no viene."""
+        return _celda_str(row.get(self.ENUNCIADOR_COLUMN)) or default
+
     # ── API pública ──────────────────────────────────────────────────────────
 
     def run(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -308,32 +337,42 @@ class BaseBatchAgent(ABC, Generic[ResultT]):
 
         results: list[dict[str, Any]] = []
         total = len(df_reset)
-        n_batches = (total + self.BATCH_SIZE - 1) // self.BATCH_SIZE
-
-        for batch_i in range(n_batches):
-            start = batch_i * self.BATCH_SIZE
-            end = min(start + self.BATCH_SIZE, total)
-            batch = df_reset.iloc[start:end].reset_index(drop=True)
-
-            if self.on_progress is None and n_batches > 1:
-                logger.info(
-                    f"[{self.NAME}] batch {batch_i + 1}/{n_batches} "
-                    f"(filas {start + 1}-{end} de {total})"
-                )
-            results.extend(self._process_batch(batch, split_on_overflow=True))
-            if self.on_progress is not None:
-                self.on_progress(end - start)
+        tramos = [(s, min(s + self.BATCH_SIZE, total)) for s in range(0, total, self.BATCH_SIZE)]
+        n_batches = len(tramos)
+        batches = [df_reset.iloc[s:e].reset_index(drop=True) for s, e in tramos]
+
+        anticipados = anticipar(batches, self._preparar_batch, anticipacion=self.prefetch)
+        with closing(anticipados):
+            for batch_i, ((start, end), (batch, user)) in enumerate(zip(tramos, anticipados)):
+                if self.on_progress is None and n_batches > 1:
+                    logger.info(
+                        f"[{self.NAME}] batch {batch_i + 1}/{n_batches} "
+                        f"(filas {start + 1}-{end} de {total})"
+                    )
+                results.extend(self._process_batch(batch, split_on_overflow=True, user=user))
+                if self.on_progress is not None:
+                    self.on_progress(end - start)
 
         # Restaurar orden original del input.
         out_df = pd.DataFrame(results).sort_values("__orig_index")
         out_df = out_df.drop(columns=["__orig_index"]).reset_index(drop=True)
         return out_df
 
+    def _preparar_batch(self, batch: pd.DataFrame) -> str:
+        """User prompt del batch, con el backend avisado de la llamada que viene.
+
+        Corre en el hilo de `anticipar`: solo lee el batch y el estado fijo
+        del agente, igual que `_build_user`.
+        """
+        self._backend.prepare(self.SCHEMA, len(batch))
+        return self._build_user(batch)
+
     def _process_batch(
         self,
         batch: pd.DataFrame,
         *,
         split_on_overflow: bool,
+        user: Future[str] | None = None,
     ) -> list[dict[str, Any]]:
         """Procesa un batch y devuelve una fila de salida por unidad, en orden.
 
@@ -343,6 +382,10 @@ class BaseBatchAgent(ABC, Generic[ResultT]):
         a partir. Recupera las unidades que hoy se pierden en bloque cuando el
         batch no cierra el JSON. Con un batch de una sola unidad no hay dónde
         partir: la unidad se marca fallida, como antes.
+
+        `user` es el prompt ya armado por `run` en el hilo de prefetch; sin él
+        (las mitades de un split) se arma acá. Un error al armarlo se
+        relanza al pedir el resultado y se trata igual que antes.
         """
         batch = batch.reset_index(drop=True)
         batch_size = len(batch)
@@ -356,12 +399,12 @@ class BaseBatchAgent(ABC, Generic[ResultT]):
             row_outputs[i] = row_dict
 
         try:
-            user = self._build_user(batch)
+            prompt = user.result() if user is not None else self._build_user(batch)
 
             def _call_backend() -> Any:
                 response = self._backend.generate(
                     system=self._system,
-                    user=user,
+                    user=prompt,
                     schema=self.SCHEMA,
                     max_items=batch_size,
                 )
@@ -524,3 +567,10 @@ def _normalizar_ancla(valor: Any) -> str:
     if valor is None:
         return ""
     return str(valor).strip().lstrip("@").casefold()
+
+
+def _celda_str(value: Any) -> str:
+    """String de una celda opcional: None/NaN → ''."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value).strip()
@@ -54,6 +54,7 @@ class CharacterizerAgent(BaseBatchAgent[ListaCaracterizacionBatchSchema]):
         retry_config: Any | None = None,
         genre: Genre | None = None,
         enunciador: str = "",
+        empaquetado: bool = False,
     ) -> None:
         """
         Args:
@@ -69,6 +70,9 @@ class CharacterizerAgent(BaseBatchAgent[ListaCaracterizacionBatchSchema]):
                 del backend.
             genre: Configuración opcional de género discursivo. Puede
                 sobrescribir parámetros como `BATCH_SIZE`.
+            empaquetado: True si los batches mezclan emociones de varios
+                discursos; el contexto y el enunciador de cada una llegan
+                por fila (ver `BaseBatchAgent.CONTEXT_COLUMN`).
         """
 
         self._titulo = titulo
@@ -76,6 +80,7 @@ class CharacterizerAgent(BaseBatchAgent[ListaCaracterizacionBatchSchema]):
         self._enunciador = enunciador
         self._heuristicas = heuristicas
         self._genre = genre
+        self._empaquetado = empaquetado
 
         if genre is not None and "characterizer" in genre.batch_size:
             self.BATCH_SIZE = genre.batch_size["characterizer"]  # type: ignore[misc]
@@ -90,6 +95,7 @@ class CharacterizerAgent(BaseBatchAgent[ListaCaracterizacionBatchSchema]):
             tipo_discurso=self._tipo_discurso,
             enunciador=self._enunciador,
             heuristicas=self._heuristicas,
+            empaquetado=self._empaquetado,
         )
 
     def _build_user(self, batch: pd.DataFrame) -> str:
@@ -105,9 +111,11 @@ class CharacterizerAgent(BaseBatchAgent[ListaCaracterizacionBatchSchema]):
             fuente_marca = str(row.get("fuente_marca", ""))
             fuente_inferencia = str(row.get("fuente_inferencia", ""))
 
+            contexto = self._contexto_unidad(row)
             bloques.append(
                 f"EMOCIÓN [{i}] (codigo={codigo}):\n"
-                f"  Experienciador:  {experienciador}\n"
+                + (f"{contexto}\n" if contexto else "")
+                + f"  Experienciador:  {experienciador}\n"
                 f"  Marca experienciador: {experienciador_marca}\n"
                 f"  Tipo emoción:    {tipo_emocion}\n"
                 f"  Modo existencia: {modo}\n"
@@ -131,10 +139,9 @@ class CharacterizerAgent(BaseBatchAgent[ListaCaracterizacionBatchSchema]):
         marca = str(row.get("experienciador_marca", "")).strip()
         frase = str(row.get("frase", "")).strip()
         configuracion = str(row.get("tipo_configuracion", "")).strip()
+        enunciador = self._enunciador_de(row, self._enunciador)
         same_as_enunciator = bool(
-            self._enunciador.strip()
-            and experienciador
-            and _same_referent(experienciador, self._enunciador)
+            enunciador.strip() and experienciador and _same_referent(experienciador, enunciador)
         )
         marca_literal = _literal_mark_in_text(marca, frase)
         explicit_config = configuracion in _EXPLICIT_ATTRIBUTION_CONFIGS
@@ -157,7 +164,7 @@ class CharacterizerAgent(BaseBatchAgent[ListaCaracterizacionBatchSchema]):
                     "La emoción se infiere de la construcción, sin un término "
                     "emocional atribuido explícitamente al enunciador."
                 )
-        elif self._enunciador.strip() and experienciador:
+        elif enunciador.strip() and experienciador:
             if frase and marca_literal and explicit_config:
                 tipo_atribucion = "hetero_atribucion"
                 justificacion_atribucion = (
@@ -170,7 +177,7 @@ class CharacterizerAgent(BaseBatchAgent[ListaCaracterizacionBatchSchema]):
                 tipo_atribucion = "hetero_atribucion"
                 justificacion_atribucion = (
                     f"La emoción se atribuye a {experienciador}, distinto del "
-                    f"enunciador {self._enunciador}."
+                    f"enunciador {enunciador}."
                 )
             elif tipo_atribucion in {"auto_atribucion", "hetero_atribucion"}:
                 tipo_atribucion = "sin_atribucion"
@@ -421,17 +421,23 @@ def alcance_text(
     emotion_scope: tuple[str, ...] | None,
     enunciador: str,
     enunciatarios: str,
+    *,
+    empaquetado: bool = False,
 ) -> str:
     """Frase legible del alcance de detección, o cadena vacía si no hay límite.
 
     Compartida por los dos pases para que el mismo `emotion_scope` produzca
-    la misma restricción en ambos prompts.
+    la misma restricción en ambos prompts. Con `empaquetado` el enunciador
+    no es uno solo: se remite al contexto de cada unidad.
     """
     if not emotion_scope:
         return ""
     partes: list[str] = []
     if "enunciador" in emotion_scope:
-        partes.append(f"el enunciador ({enunciador or 'no identificado'})")
+        if empaquetado:
+            partes.append("el enunciador indicado en el contexto de cada unidad")
+        else:
+            partes.append(f"el enunciador ({enunciador or 'no identificado'})")
     if "enunciatarios" in emotion_scope:
         detalle = f" ({enunciatarios})" if enunciatarios else ""
         partes.append(f"los enunciatarios del discurso{detalle}")
@@ -480,6 +486,7 @@ class EmotionsAgent(BaseBatchAgent[ListaEmocionesBatchSchema]):
         emotion_scope: tuple[str, ...] | None = None,
         retry_config: Any | None = None,
         genre: Genre | None = None,
+        empaquetado: bool = False,
     ) -> None:
         """
         Args:
@@ -502,6 +509,10 @@ class EmotionsAgent(BaseBatchAgent[ListaEmocionesBatchSchema]):
             genre: Configuración opcional de género discursivo. Puede
                 ajustar parámetros como BATCH_SIZE y sustituir el template
                 del system prompt vía `prompt_overrides`.
+            empaquetado: True si los batches mezclan unidades de varios
+                discursos. El contexto y el enunciador de cada discurso
+                llegan por fila (ver `BaseBatchAgent.CONTEXT_COLUMN`) y el
+                system prompt queda sin contexto de discurso.
         """
         self._heuristicas = heuristicas
         self._configuraciones = configuraciones
@@ -515,6 +526,7 @@ class EmotionsAgent(BaseBatchAgent[ListaEmocionesBatchSchema]):
         self._modos_existencia = modos_existencia
         self._emotion_scope = tuple(emotion_scope) if emotion_scope else ()
         self._genre = genre
+        self._empaquetado = empaquetado
 
         if genre is not None:
             restricted = emociones_batch_schema(genre)
@@ -545,6 +557,7 @@ class EmotionsAgent(BaseBatchAgent[ListaEmocionesBatchSchema]):
             modos_existencia=self._modos_existencia,
             alcance=self._alcance_text(),
             template=template,
+            empaquetado=self._empaquetado,
         )
 
     def _build_user(self, batch: pd.DataFrame) -> str:
@@ -558,6 +571,9 @@ class EmotionsAgent(BaseBatchAgent[ListaEmocionesBatchSchema]):
             media_desc = _opt_str(row.get("media_desc"))
 
             partes = [f"UNIDAD [{i}] (codigo={codigo}):"]
+            contexto = self._contexto_unidad(row)
+            if contexto:
+                partes.append(contexto)
             if contexto_hilo:
                 partes.append(
                     "CONTEXTO DEL HILO (posts a los que responde; solo para "
@@ -586,7 +602,7 @@ class EmotionsAgent(BaseBatchAgent[ListaEmocionesBatchSchema]):
     ) -> dict[str, Any]:
         saneadas: list[dict[str, Any]] = []
         text = str(row.get("frase", row.get("contenido", "")))
-        enunciador = getattr(self, "_enunciador", "")
+        enunciador = self._enunciador_de(row, getattr(self, "_enunciador", ""))
         for emocion in item.emociones:
             limpia = sanitize_emocion(emocion.model_dump())
             normalizada = normalize_emotion_for_unit(
@@ -607,7 +623,12 @@ class EmotionsAgent(BaseBatchAgent[ListaEmocionesBatchSchema]):
 
     def _alcance_text(self) -> str:
         """Frase legible del alcance, o cadena vacía si no hay restricción."""
-        return alcance_text(self._emotion_scope, self._enunciador, self._enunciatarios)
+        return alcance_text(
+            self._emotion_scope,
+            self._enunciador,
+            self._enunciatarios,
+            empaquetado=self._empaquetado,
+        )
 
     @staticmethod
     def _format_actores(actores_raw: Any) -> str:
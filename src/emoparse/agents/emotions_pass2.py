@@ -89,6 +89,7 @@ class EmotionsAgentPass2(BaseBatchAgent[ListaEmocionesBatchSchema]):
         context_mode: Literal["rolling", "full"] = "rolling",
         retry_config: RetryConfig | None = None,
         genre: Genre | None = None,
+        empaquetado: bool = False,
     ) -> None:
         """
         Args:
@@ -114,6 +115,10 @@ class EmotionsAgentPass2(BaseBatchAgent[ListaEmocionesBatchSchema]):
             retry_config: Política de reintentos ante errores transitorios.
             genre: Configuración opcional de género discursivo. Puede
                 ajustar parámetros como `BATCH_SIZE`.
+            empaquetado: True si los batches mezclan unidades de varios
+                discursos. El contexto y el enunciador de cada discurso
+                llegan por fila (ver `BaseBatchAgent.CONTEXT_COLUMN`) y el
+                system prompt queda sin contexto de discurso.
         """
         self._heuristicas = heuristicas
         self._configuraciones = configuraciones
@@ -127,6 +132,7 @@ class EmotionsAgentPass2(BaseBatchAgent[ListaEmocionesBatchSchema]):
         self._emotion_scope = tuple(emotion_scope) if emotion_scope else ()
         self._context_mode = context_mode
         self._genre = genre
+        self._empaquetado = empaquetado
 
         if genre is not None:
             restricted = emociones_batch_schema(genre)
@@ -159,8 +165,14 @@ class EmotionsAgentPass2(BaseBatchAgent[ListaEmocionesBatchSchema]):
             auditorio=self._auditorio,
             resumen=self._resumen,
             modos_existencia=self._modos_existencia,
-            alcance=alcance_text(self._emotion_scope, self._enunciador, self._enunciatarios),
+            alcance=alcance_text(
+                self._emotion_scope,
+                self._enunciador,
+                self._enunciatarios,
+                empaquetado=self._empaquetado,
+            ),
             template=template,
+            empaquetado=self._empaquetado,
         )
 
     def _build_user(self, batch: pd.DataFrame) -> str:
@@ -185,6 +197,9 @@ class EmotionsAgentPass2(BaseBatchAgent[ListaEmocionesBatchSchema]):
                 rolling = "(sin emociones previas)"
 
             partes = [f"UNIDAD [{i}] (codigo={codigo}):"]
+            contexto = self._contexto_unidad(row)
+            if contexto:
+                partes.append(contexto)
             if contexto_hilo:
                 partes.append(
                     "CONTEXTO DEL HILO (posts a los que responde; solo para "
@@ -213,7 +228,7 @@ class EmotionsAgentPass2(BaseBatchAgent[ListaEmocionesBatchSchema]):
     ) -> dict[str, Any]:
         saneadas: list[dict[str, Any]] = []
         text = str(row.get("frase", row.get("contenido", "")))
-        enunciador = getattr(self, "_enunciador", "")
+        enunciador = self._enunciador_de(row, getattr(self, "_enunciador", ""))
         for emocion in item.emociones:
             limpia = sanitize_emocion(emocion.model_dump())
             normalizada = normalize_emotion_for_unit(
@@ -0,0 +1,332 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.app._cache
+#
+#  Caché de lectura del dashboard y pool de conexiones read-only por run.
+#
+#  Cada rerun de Streamlit vuelve a ejecutar las tabs de arriba abajo; sin
+#  caché, cada una re-consulta la SQLite y re-parsea los payloads JSON. Este
+#  módulo memoiza los loaders de `app.data` con una clave
+#  (db, firma del archivo, generación, función, argumentos):
+#
+#  - la firma (`storage.db.db_signature`) combina mtime/tamaño de la base y
+#    del `-wal`, más la cabecera del WAL (salts), de modo que cualquier commit externo (un run en curso,
+#    un `emoparse retry`) invalida solo las entradas de esa base;
+#  - la generación es un contador por base que `app.actions` incrementa al
+#    escribir, por si la resolución del mtime no alcanza a distinguir dos
+#    escrituras consecutivas;
+#  - la memoria total está acotada (LRU por bytes estimados), configurable
+#    con `EMOPARSE_APP_CACHE_MB`.
+#
+#  Los valores se devuelven como copia: las tabs mutan los DataFrames que
+#  reciben y no deben contaminar la entrada cacheada.
+#
+#  Las conexiones read-only se reutilizan desde un pool por base, acotado en
+#  cantidad de bases y de conexiones ociosas por base.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import copy
+import functools
+import inspect
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+import pandas as pd
+from loguru import logger
+
+from emoparse.storage.db import db_signature
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+#: Presupuesto de memoria del caché, en MB.
+_BUDGET_ENV = "EMOPARSE_APP_CACHE_MB"
+_DEFAULT_BUDGET_MB = 512
+
+#: Conexiones ociosas que se conservan por base.
+_MAX_IDLE_PER_DB = 4
+#: Bases con pool abierto; la menos usada cierra sus conexiones al excederlo.
+_MAX_POOLED_DBS = 8
+
+
+def _budget_bytes() -> int:
+    raw = os.environ.get(_BUDGET_ENV, "")
+    try:
+        mb = float(raw) if raw.strip() else _DEFAULT_BUDGET_MB
+    except ValueError:
+        logger.warning(f"[app.cache] {_BUDGET_ENV}={raw!r} inválido; se usa {_DEFAULT_BUDGET_MB}.")
+        mb = _DEFAULT_BUDGET_MB
+    return max(0, int(mb * 1024 * 1024))
+
+
+def _db_key(db_path: Path | str) -> str:
+    return str(Path(db_path).resolve())
+
+
+def _stat_sig(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Pool de conexiones read-only
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+@dataclass(slots=True)
+class _Pool:
+    inode: int | None
+    idle: list[sqlite3.Connection]
+
+
+_pools: OrderedDict[str, _Pool] = OrderedDict()
+_pools_lock = threading.Lock()
+
+
+def _open_ro(db_path: Path | str) -> sqlite3.Connection:
+    uri = f"file:{db_path}?mode=ro"
+    conn = sqlite3.connect(
+        uri,
+        uri=True,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False,  # cada conexión la usa un solo hilo a la vez
+    )
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _close_quietly(conns: list[sqlite3.Connection]) -> None:
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+@contextmanager
+def pooled_connect(db_path: Path | str) -> Iterator[sqlite3.Connection]:
+    """Presta una conexión read-only del pool de la base y la devuelve al salir.
+
+    Si el archivo fue reemplazado (otro inodo, p. ej. un run recreado) el pool
+    se descarta. Una conexión que terminó con error de SQLite se cierra en vez
+    de volver al pool.
+    """
+    key = _db_key(db_path)
+    sig = _stat_sig(Path(db_path))
+    inode = sig[0] if sig else None
+    stale: list[sqlite3.Connection] = []
+    conn: sqlite3.Connection | None = None
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is not None and pool.inode != inode:
+            stale.extend(pool.idle)
+            pool = None
+        if pool is None:
+            pool = _Pool(inode=inode, idle=[])
+            _pools[key] = pool
+        _pools.move_to_end(key)
+        while len(_pools) > _MAX_POOLED_DBS:
+            _, evicted = _pools.popitem(last=False)
+            stale.extend(evicted.idle)
+        if pool.idle:
+            conn = pool.idle.pop()
+    _close_quietly(stale)
+
+    if conn is None:
+        conn = _open_ro(db_path)
+    else:
+        conn.row_factory = sqlite3.Row
+    healthy = True
+    try:
+        yield conn
+    except sqlite3.Error:
+        healthy = False
+        raise
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        returned = False
+        if healthy:
+            with _pools_lock:
+                pool = _pools.get(key)
+                if pool is not None and pool.inode == inode and len(pool.idle) < _MAX_IDLE_PER_DB:
+                    pool.idle.append(conn)
+                    returned = True
+        if not returned:
+            _close_quietly([conn])
+
+
+def close_pools() -> None:
+    """Cierra todas las conexiones ociosas del pool."""
+    with _pools_lock:
+        stale = [c for pool in _pools.values() for c in pool.idle]
+        _pools.clear()
+    _close_quietly(stale)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Caché de resultados
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    nbytes: int
+
+
+_entries: OrderedDict[tuple[Any, ...], _Entry] = OrderedDict()
+_generations: dict[str, int] = {}
+_last_disk: dict[str, tuple[Any, ...]] = {}
+_lock = threading.Lock()
+_used_bytes = 0
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _approx_nbytes(value: Any, _depth: int = 0) -> int:
+    """Estimación del tamaño en memoria; exacta para DataFrames, aproximada para el resto."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    size = sys.getsizeof(value)
+    if _depth > 6:
+        return size
+    if isinstance(value, dict):
+        return size + sum(
+            _approx_nbytes(k, _depth + 1) + _approx_nbytes(v, _depth + 1) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(_approx_nbytes(v, _depth + 1) for v in value)
+    return size
+
+
+def _freeze(value: Any) -> Any:
+    """Convierte argumentos a una forma hasheable y estable para la clave."""
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(v) for v in value))
+    return value
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, (dict, list, set)):
+        return copy.deepcopy(value)
+    return value
+
+
+def _evict_locked(budget: int) -> None:
+    global _used_bytes
+    while _entries and _used_bytes > budget:
+        _, entry = _entries.popitem(last=False)
+        _used_bytes -= entry.nbytes
+        _stats["evictions"] += 1
+
+
+def _drop_db_locked(db: str) -> None:
+    global _used_bytes
+    for key in [k for k in _entries if k[0] == db]:
+        _used_bytes -= _entries.pop(key).nbytes
+
+
+def invalidate(db_path: Path | str | None = None) -> None:
+    """Descarta las entradas de una base (o de todas si `db_path` es None).
+
+    La llaman las escrituras de `app.actions`; además incrementa la generación
+    de la base, así una lectura en vuelo no repuebla el caché con datos viejos.
+    """
+    global _used_bytes
+    with _lock:
+        if db_path is None:
+            for key in list(_generations):
+                _generations[key] += 1
+            _entries.clear()
+            _used_bytes = 0
+            return
+        db = _db_key(db_path)
+        _generations[db] = _generations.get(db, 0) + 1
+        _drop_db_locked(db)
+
+
+def cache_stats() -> dict[str, int]:
+    """Contadores del caché (hits, misses, evictions, entries, bytes)."""
+    with _lock:
+        return {**_stats, "entries": len(_entries), "bytes": _used_bytes}
+
+
+def cached_loader(fn: F) -> F:
+    """Memoiza un loader `fn(db_path, ...)` de `app.data`.
+
+    La clave normaliza los argumentos contra la firma de `fn` (posicionales,
+    nombrados y defaults dan la misma entrada) e incluye la firma en disco de
+    la base y su generación. Si la base no existe, se delega sin cachear para
+    conservar el error original.
+    """
+    sig = inspect.signature(fn)
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        global _used_bytes
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = list(bound.arguments.items())
+        db_path = params[0][1]
+        disk = db_signature(db_path)
+        if disk[0] is None:
+            return fn(*args, **kwargs)
+        db = _db_key(db_path)
+        try:
+            frozen = tuple((k, _freeze(v)) for k, v in params[1:])
+            hash(frozen)
+        except TypeError:
+            return fn(*args, **kwargs)
+
+        with _lock:
+            # Cambió la base en disco: lo cacheado de la firma anterior ya no
+            # puede volver a pedirse, se libera en el acto.
+            if _last_disk.get(db, disk) != disk:
+                _drop_db_locked(db)
+            _last_disk[db] = disk
+            generation = _generations.get(db, 0)
+            key = (db, disk, generation, name, frozen)
+            entry = _entries.get(key)
+            if entry is not None:
+                _entries.move_to_end(key)
+                _stats["hits"] += 1
+                value = entry.value
+            else:
+                _stats["misses"] += 1
+        if entry is not None:
+            return _copy_value(value)
+
+        result = fn(*args, **kwargs)
+        nbytes = _approx_nbytes(result)
+        budget = _budget_bytes()
+        stored = _copy_value(result) if nbytes <= budget else None
+        with _lock:
+            if stored is not None and _generations.get(db, 0) == generation and key not in _entries:
+                _entries[key] = _Entry(value=stored, nbytes=nbytes)
+                _used_bytes += nbytes
+            _evict_locked(budget)
+        return result
+
+    return wrapper  # type: ignore[return-value]
@@ -6,15 +6,21 @@
 #  Expone funciones puras para la revisión: commit del overlay de
 #  experienciadores a la base, gestión de vínculos marca↔referente y promoción
 #  de referentes aceptados a la KB.
+#
+#  Toda función que escribe en la base del run invalida la caché de lectura
+#  del dashboard (`app._cache`) para esa base al terminar, haya fallado o no.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 from loguru import logger
 
+from emoparse.app._cache import invalidate
 from emoparse.app.revision_overlay import (
     OverlayCorruptError,
     RevisionOverlay,
@@ -22,6 +28,7 @@ from emoparse.app.revision_overlay import (
 )
 from emoparse.storage.db import Database
 from emoparse.storage.discursos import DiscursosRepository
+from emoparse.storage.emocion_canonico import EmocionCanonicoRepository
 from emoparse.storage.emociones import EmocionesRepository
 from emoparse.storage.judgments import JudgmentsRepository
 from emoparse.storage.menciones import MencionesRepository
@@ -30,8 +37,35 @@ from emoparse.storage.referencia import (
     marca_canonicos_index,
     resolver_canonicos,
 )
+from emoparse.storage.referent_index import spacy_vectorizer, sync_referent_index
 from emoparse.storage.runs import RunsRepository
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _escribe_db(fn: F) -> F:
+    """Invalida la caché de lectura de `db_path` después de la escritura.
+
+    También re-materializa la resolución de referentes de los discursos que
+    la escritura dejó sin vigencia y alinea el índice de referentes del run:
+    una vez acá, y no en cada lectura de las tabs (que abren la DB en solo
+    lectura).
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        db_path = kwargs["db_path"] if "db_path" in kwargs else args[0]
+        try:
+            resultado = fn(*args, **kwargs)
+            db = Database(Path(db_path))
+            EmocionCanonicoRepository(db).refresh()
+            sync_referent_index(db)
+            return resultado
+        finally:
+            invalidate(db_path)
+
+    return wrapper  # type: ignore[return-value]
+
 
 def _canon_values(value: object) -> list[str]:
     """Normaliza el valor del overlay (str o lista) a una lista de canónicos.
@@ -43,6 +77,7 @@ def _canon_values(value: object) -> list[str]:
     return [p.strip() for p in s.split(";") if p.strip()]
 
 
+@_escribe_db
 def commit_experiencers_overlay(
     db_path: Path,
     *,
@@ -127,6 +162,7 @@ def _run_prompt_version(db: Database) -> str | None:
     return ctx.versions.prompt if ctx is not None else None
 
 
+@_escribe_db
 def emocion_set_experiencer_at(
     db_path: Path,
     codigo: str,
@@ -162,6 +198,7 @@ def emocion_set_experiencer_at(
     return changed
 
 
+@_escribe_db
 def emocion_set_fuente_at(
     db_path: Path,
     codigo: str,
@@ -188,6 +225,7 @@ def emocion_set_fuente_at(
     return emo.set_fuente_canonico_at(codigo, frase_idx, emocion_idx, value, version=version)
 
 
+@_escribe_db
 def emocion_split_experiencers(
     db_path: Path,
     codigo: str,
@@ -219,6 +257,7 @@ def emocion_split_experiencers(
     return res
 
 
+@_escribe_db
 def emocion_set_fuentes_at(
     db_path: Path,
     codigo: str,
@@ -258,6 +297,7 @@ def _cleanup_kb_if_orphan(db_path: Path, canonical_id: str) -> None:
         remove_referente_from_kb(canonical_id)
 
 
+@_escribe_db
 def mencion_accept(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     """Acepta un vínculo marca↔canónico."""
     MencionesRepository(Database(Path(db_path))).set_link_status(
@@ -265,6 +305,7 @@ def mencion_accept(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     )
 
 
+@_escribe_db
 def mencion_reject(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     """Rechaza un vínculo marca↔canónico y limpia la KB si el canónico queda huérfano."""
     MencionesRepository(Database(Path(db_path))).set_link_status(
@@ -273,17 +314,20 @@ def mencion_reject(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     _cleanup_kb_if_orphan(db_path, canonical_id)
 
 
+@_escribe_db
 def mencion_add_link(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     """Agrega un vínculo marca↔canónico creado por el analista (aceptado)."""
     MencionesRepository(Database(Path(db_path))).add_human_link(mencion_id, canonical_id)
 
 
+@_escribe_db
 def mencion_remove_link(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     """Elimina un vínculo marca↔canónico y limpia la KB si el canónico queda huérfano."""
     MencionesRepository(Database(Path(db_path))).remove_link(mencion_id, canonical_id)
     _cleanup_kb_if_orphan(db_path, canonical_id)
 
 
+@_escribe_db
 def bulk_set_link_status(db_path: Path, pairs: list[tuple[int, str]], status: str) -> int:
     """Acepta/rechaza en lote (status='accepted'|'rejected'). Limpia KB huérfana
     solo en rechazos masivos. Devuelve cuántos vínculos se afectaron."""
@@ -295,6 +339,7 @@ def bulk_set_link_status(db_path: Path, pairs: list[tuple[int, str]], status: st
     return n
 
 
+@_escribe_db
 def mencion_set_modalidad(
     db_path: Path,
     mencion_id: int,
@@ -499,6 +544,23 @@ def remove_referente_from_kb(canonical_id: str, kb_path: Path | None = None) ->
     return True
 
 
+def refresh_referent_index(
+    db_path: Path, *, use_embeddings: bool = False, nlp_model: str | None = None
+) -> int:
+    """Alinea el índice de referentes del run, con vectores spaCy si se piden.
+
+    Las ediciones ya mantienen el pase léxico (`_escribe_db`); esto suma los
+    vectores de los canónicos que no los tienen, antes de buscar fusiones
+    semánticas, para que la lectura no tenga que calcularlos.
+    """
+    try:
+        vectorizer = spacy_vectorizer(nlp_model) if use_embeddings else None
+        return sync_referent_index(Database(Path(db_path)), vectorizer, vector_tag=nlp_model or "")
+    finally:
+        invalidate(db_path)
+
+
+@_escribe_db
 def rename_canonical(
     db_path: Path,
     old_id: str,
@@ -623,6 +685,7 @@ def update_kb_entry(
     return changed
 
 
+@_escribe_db
 def delete_canonical(
     db_path: Path,
     canonical_id: str,
@@ -655,6 +718,7 @@ def delete_canonical(
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@_escribe_db
 def merge_canonicals(
     db_path: Path,
     src_id: str,
@@ -715,6 +779,7 @@ def merge_canonicals(
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@_escribe_db
 def referente_set_sema(
     db_path: Path, canonical_id: str, sema: str, status: str = "accepted"
 ) -> None:
@@ -722,6 +787,7 @@ def referente_set_sema(
     MencionesRepository(Database(Path(db_path))).set_sema(canonical_id, sema, status)
 
 
+@_escribe_db
 def referente_remove_sema(db_path: Path, canonical_id: str, sema: str) -> None:
     """Elimina un sema de un referente."""
     MencionesRepository(Database(Path(db_path))).remove_sema(canonical_id, sema)
@@ -732,6 +798,7 @@ def referente_remove_sema(db_path: Path, canonical_id: str, sema: str) -> None:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@_escribe_db
 def deixis_accept(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     """Acepta un referente deíctico para una marca.
 
@@ -743,6 +810,7 @@ def deixis_accept(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     MencionesRepository(Database(Path(db_path))).accept_deixis_link(mencion_id, canonical_id)
 
 
+@_escribe_db
 def deixis_reject(db_path: Path, mencion_id: int, canonical_id: str) -> int:
     """Rechaza un referente deíctico para una marca y lo saca de sus simulacros.
 
@@ -803,6 +871,7 @@ def _limpiar_atribuciones(db_path: Path, mencion_id: int, canonical_id: str) ->
     return limpiadas
 
 
+@_escribe_db
 def emocion_delete(db_path: Path, codigo: str, frase_idx: int, emocion_idx: int) -> bool:
     """Elimina un simulacro de la base. Devuelve True si existía.
 
@@ -817,6 +886,7 @@ def emocion_delete(db_path: Path, codigo: str, frase_idx: int, emocion_idx: int)
     return EmocionesRepository(db).delete_emocion(codigo, frase_idx, emocion_idx)
 
 
+@_escribe_db
 def deixis_restore(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     """Devuelve a pendiente un referente deíctico descartado."""
     MencionesRepository(Database(Path(db_path))).set_link_status(
@@ -824,6 +894,7 @@ def deixis_restore(db_path: Path, mencion_id: int, canonical_id: str) -> None:
     )
 
 
+@_escribe_db
 def deixis_add(db_path: Path, mencion_id: int, canonical_id: str, deixis_tipo: str) -> None:
     """Agrega a mano un referente deíctico (del discurso) a una marca.
 
@@ -874,6 +945,7 @@ def canonicos_actuales_de_emocion(
     )
 
 
+@_escribe_db
 def deixis_aplicar_a_emocion(
     db_path: Path,
     codigo: str,
@@ -945,6 +1017,7 @@ def _modo_de_emocion(db_path: Path, codigo: str, frase_idx: int, emocion_idx: in
     return str((emo or {}).get("modo_existencia") or "")
 
 
+@_escribe_db
 def emocion_set_modo_at(
     db_path: Path, codigo: str, frase_idx: int, emocion_idx: int, modo: str
 ) -> bool:
@@ -978,6 +1051,7 @@ def _names_from_json(value: Any, key: str) -> list[str]:
     return out
 
 
+@_escribe_db
 def save_enunciation(db_path: Path, codigo: str, payload: dict) -> int:
     """Guarda la estructura enunciativa editada y propaga a la deixis.
 
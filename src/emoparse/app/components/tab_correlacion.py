@@ -48,7 +48,7 @@ def render(db_path: Path) -> None:
         )
     st.caption(_UNIDADES[unidad][1])
 
-    df = data_layer.get_emociones_enriched(db_path)
+    df = data_layer.get_emociones_analiticas(db_path)
     if df.empty:
         st.info("No hay emociones materializadas para este run.")
         return
@@ -31,7 +31,7 @@ def render(db_path: Path) -> None:
     """
     st.markdown("### Curva emocional frase a frase")
 
-    df_em = data_layer.get_emociones_enriched(db_path)
+    df_em = data_layer.get_emociones_analiticas(db_path)
     if df_em.empty:
         st.info("No hay emociones cargadas para este run. Corré la stage `emotions` primero.")
         return
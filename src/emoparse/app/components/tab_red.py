@@ -132,7 +132,7 @@ def _etiquetas_de_nodo(
             for r in data.get_posts(db_path).to_dict(orient="records")
         }
     if grafo == "simulacro":
-        df = data.get_emociones_enriched(db_path)
+        df = data.get_emociones_analiticas(db_path)
         if df.empty:
             return None
         return {
@@ -167,7 +167,7 @@ def _grupos_narrativos(db_path: Path, df_metricas: pd.DataFrame) -> None:
     """
     if df_metricas.empty or "comunidad" not in df_metricas.columns:
         return
-    df = data.get_emociones_enriched(db_path)
+    df = data.get_emociones_analiticas(db_path)
     if df.empty:
         return
     registros = df.to_dict(orient="records")
@@ -396,13 +396,13 @@ _MERGE_SUGG_KEY = "ref_merge_sugg"
 def _render_merge_suggestions(db_path: Path, codigo: str | None, all_cids: list[str]) -> None:
     """Panel de fusiones sugeridas de referentes casi-duplicados (escalable).
 
-    Usa `data.suggest_referent_merges` (blocking + similitud, sin LLM). Cada
+    Usa `data.suggest_referent_merges` (índice de referentes + similitud, sin LLM). Cada
     grupo se puede fusionar (todos sus miembros → el elegido) o descartar.
     """
     with st.expander("🔗 Fusiones sugeridas", expanded=False):
         st.caption(
             "Detecta referentes casi-duplicados por similitud léxica "
-            "(blocking + Jaccard/caracteres/contención). No fusiona solo: "
+            "(índice LSH + Jaccard/caracteres/contención). No fusiona solo: "
             "revisá cada grupo."
         )
         cc1, cc2 = st.columns([3, 1])
@@ -411,11 +411,13 @@ def _render_merge_suggestions(db_path: Path, codigo: str | None, all_cids: list[
         with cc2:
             st.markdown("<div style='height:1.6rem;'></div>", unsafe_allow_html=True)
             if st.button("🔎 Buscar", key="merge_scan", use_container_width=True):
+                use_embeddings = st.session_state.get("merge_emb", True)
+                actions_layer.refresh_referent_index(db_path, use_embeddings=use_embeddings)
                 st.session_state[_MERGE_SUGG_KEY] = data_layer.suggest_referent_merges(
                     db_path,
                     codigo,
                     threshold=thr,
-                    use_embeddings=st.session_state.get("merge_emb", True),
+                    use_embeddings=use_embeddings,
                     embed_threshold=st.session_state.get("merge_embthr", 0.80),
                 )
         e1, e2 = st.columns([1, 2])
@@ -708,7 +710,12 @@ def _render_kb_panel(
             "Mergear dentro de otro canónico (quedás en el destino)</span>",
             unsafe_allow_html=True,
         )
-        otros = [c for c in all_cids if c != canonical_id]
+        # Los parecidos (índice de referentes) primero; después el resto.
+        disponibles = set(all_cids)
+        parecidos = [
+            c for c, _ in data_layer.similar_referents(db_path, canonical_id) if c in disponibles
+        ]
+        otros = parecidos + [c for c in all_cids if c != canonical_id and c not in parecidos]
         if otros:
             mg_col, mg_btn = st.columns([5, 1])
             destino_merge = mg_col.selectbox(
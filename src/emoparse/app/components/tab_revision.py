@@ -1022,10 +1022,7 @@ def _on_confirm_emocion(ov: RevisionOverlay, codigo: str, unit_idx: int, eidx: i
 
 
 def _revert_emocion(ov: RevisionOverlay, codigo: str, unit_idx: int, eidx: int) -> None:
-    node = ov._emo(codigo, unit_idx, eidx)  # noqa: SLF001 - revertir todos los overrides
-    node["overrides"] = {}
-    node["sugerencias"] = {}
-    ov._save()  # noqa: SLF001
+    ov.revert_emocion(codigo, unit_idx, eidx)
 
 
 def _override_at(
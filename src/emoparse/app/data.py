@@ -7,8 +7,12 @@
 #  DataFrames listos para visualización.
 #
 #  Convenciones:
-#  - acceso exclusivamente read-only sobre SQLite
-#  - cada función abre y cierra su propia conexión
+#  - acceso exclusivamente read-only sobre SQLite, incluido el índice de
+#    referentes del run (`<run>.referentes.idx`): lo escriben el runner y
+#    `app.actions`; acá se lee una copia en memoria
+#  - cada función toma prestada su conexión del pool read-only del run
+#  - los loaders pesados se memoizan con `app._cache` (clave por firma de la
+#    base en disco); la caché la invalida también `app.actions` al escribir
 #  - siempre devuelve DataFrames (incluso vacíos)
 #  - los payloads JSON se expanden aquí para evitar que la UI
 #    trabaje con strings JSON crudos
@@ -22,7 +26,7 @@ from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import pandas as pd
 from loguru import logger
@@ -32,6 +36,7 @@ from loguru import logger
 #: `detect_types=PARSE_DECLTYPES` al leer timestamps persistidos por
 #: la capa de storage.
 import emoparse.storage.db  # noqa: F401  (side-effect import)
+from emoparse.app._cache import cached_loader, pooled_connect
 from emoparse.genres.presentation import (
     GenrePresentation,
     presentation_from_config,
@@ -42,17 +47,17 @@ from emoparse.genres.presentation import (
 #: de cada una; acá solo se reexpone para las tabs.
 from emoparse.pipeline import status as stage_status
 
+#: Resolución del referente canónico de una emoción: la misma que usan las
+#: stages y el export, para que ninguna tab muestre algo distinto.
+from emoparse.storage.emocion_canonico import ResolucionRoles, columnas_resolucion
+
 #: Importado desde el runner para mantener una única fuente de verdad
 #: sobre el orden y definición de stages.
 from emoparse.storage.posts import cita_embebida
+from emoparse.storage.referencia import canonicos_de_override
 
-#: Resolución del referente canónico de una emoción: la misma que usan las
-#: stages y el export, para que ninguna tab muestre algo distinto.
-from emoparse.storage.referencia import (
-    canonicos_de_override,
-    resolver_canonico,
-    resolver_canonicos,
-)
+if TYPE_CHECKING:
+    from emoparse.storage.referent_index import ReferentIndex
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  Tipos públicos
@@ -91,7 +96,6 @@ from emoparse.storage.simulacros import (
     _build_filter_sql,
     _canon_col,
     _canonico_semas_map,
-    _frase_mention_canonicos,
     _json_or_none,
     _menciones_exists,
     _parse_json,
@@ -117,18 +121,14 @@ StageStatus = stage_status.StageStatus
 
 @contextmanager
 def _ro_connect(db_path: Path) -> Iterator[sqlite3.Connection]:
-    """Abre una conexión SQLite en modo read-only.
+    """Presta una conexión SQLite read-only del pool del run.
 
     El modo URI con `mode=ro` impide operaciones de escritura y refuerza
-    el contrato de solo lectura de esta capa.
+    el contrato de solo lectura de esta capa; reutilizar la conexión evita
+    reabrir la base (y su WAL) en cada loader de cada rerun.
     """
-    uri = f"file:{db_path}?mode=ro"
-    conn = sqlite3.connect(uri, uri=True, detect_types=sqlite3.PARSE_DECLTYPES)
-    conn.row_factory = sqlite3.Row
-    try:
+    with pooled_connect(db_path) as conn:
         yield conn
-    finally:
-        conn.close()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -206,6 +206,7 @@ def _inspect_run(sqlite_path: Path) -> RunInfo:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@cached_loader
 def get_run_stats(db_path: Path) -> dict[str, Any]:
     """Devuelve el resumen de metadata general de un run.
 
@@ -251,6 +252,7 @@ def _genre_presentation_from_conn(
     return presentation_from_config(config)
 
 
+@cached_loader
 def get_genre_presentation(db_path: Path) -> GenrePresentation | None:
     """Devuelve el descriptor de presentación guardado en el run."""
     with _ro_connect(db_path) as conn:
@@ -270,6 +272,7 @@ def get_input_metadata_display(db_path: Path) -> dict[str, str]:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@cached_loader
 def get_discursos(db_path: Path) -> pd.DataFrame:
     """Devuelve una fila por discurso con input y payloads de stages a nivel discurso.
 
@@ -323,6 +326,7 @@ def get_discursos(db_path: Path) -> pd.DataFrame:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@cached_loader
 def get_frases(
     db_path: Path,
     codigos: list[str] | None = None,
@@ -382,6 +386,7 @@ def get_frases(
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@cached_loader
 def get_discurso_header(db_path: Path, codigo: str) -> dict[str, Any]:
     """Datos de cabecera de un discurso (una sola vez, no por frase).
 
@@ -420,6 +425,7 @@ def get_discurso_header(db_path: Path, codigo: str) -> dict[str, Any]:
     }
 
 
+@cached_loader
 def get_actores_por_frase(db_path: Path, codigo: str) -> dict[int, list[dict[str, Any]]]:
     """Actores por frase con su canónico, desde la base de marcas.
 
@@ -455,6 +461,7 @@ def get_actores_por_frase(db_path: Path, codigo: str) -> dict[int, list[dict[str
     return out
 
 
+@cached_loader
 def get_emociones_full(db_path: Path, codigo: str) -> list[dict[str, Any]]:
     """Emociones de un discurso con sus payloads crudos para revisión.
 
@@ -515,6 +522,7 @@ def get_emociones_full(db_path: Path, codigo: str) -> list[dict[str, Any]]:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@cached_loader
 def get_stage_statuses(db_path: Path) -> list[StageStatus]:
     """Estado de cada stage del run, en orden topológico.
 
@@ -556,6 +564,7 @@ def _stage_status_from(payload: str | None, error: str | None) -> str:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@cached_loader
 def get_menciones(db_path: Path, codigo: str | None = None) -> pd.DataFrame:
     """Marcas discursivas con sus funciones, vínculos canónicos y frase.
 
@@ -590,6 +599,7 @@ def get_menciones(db_path: Path, codigo: str | None = None) -> pd.DataFrame:
     return pd.DataFrame([dict(r) for r in rows])
 
 
+@cached_loader
 def get_referentes_resumen(db_path: Path, codigo: str | None = None) -> pd.DataFrame:
     """Resumen liviano de referentes para el navegador (no carga las marcas).
 
@@ -664,6 +674,7 @@ def get_menciones_de_canonico(
     return pd.DataFrame([dict(r) for r in rows])
 
 
+@cached_loader
 def get_referente_funciones(db_path: Path, codigo: str | None = None) -> dict[str, set]:
     """Funciones (actor/experienciador/fuente/…) presentes en cada referente.
 
@@ -691,6 +702,7 @@ def get_referente_funciones(db_path: Path, codigo: str | None = None) -> dict[st
     return out
 
 
+@cached_loader
 def get_referente_modalidades(db_path: Path, codigo: str | None = None) -> dict[str, set]:
     """canonical_id → conjunto de modalidades referenciales de sus vínculos.
 
@@ -840,6 +852,7 @@ def iter_all_frases(db_path: Path, codigos: list[str] | None = None) -> list[tup
     return [(r["codigo"], int(r["unit_idx"]), r["frase"] or "") for r in rows]
 
 
+@cached_loader
 def search_counts(db_path: Path, term: str) -> dict[str, int]:
     """Conteos de apariciones de un término (substring, insensible a caso/acentos).
 
@@ -861,22 +874,15 @@ def search_counts(db_path: Path, term: str) -> dict[str, int]:
         if conn.execute(
             "SELECT 1 FROM sqlite_master WHERE type='table' AND name='emociones'"
         ).fetchone():
-            exp_units = _frase_mention_canonicos(conn, "experienciador")
-            fte_units = _frase_mention_canonicos(conn, "fuente")
+            resolucion = ResolucionRoles(conn)
+            columnas, join = columnas_resolucion(conn)
             for r in conn.execute(
-                "SELECT codigo, frase_idx, experienciador, experienciador_marca, "
-                "fuente_marca, fuente_inferencia FROM emociones"
+                "SELECT emociones.codigo, emociones.frase_idx, emociones.experienciador, "
+                "emociones.experienciador_marca, emociones.fuente_marca, "
+                f"emociones.fuente_inferencia, {columnas} FROM emociones {join}"
             ):
-                exp_canon = resolver_canonico(
-                    exp_units.get((r["codigo"], int(r["frase_idx"]))),
-                    r["experienciador_marca"],
-                    inferencia=r["experienciador"],
-                )
-                fte_cids = resolver_canonicos(
-                    fte_units.get((r["codigo"], int(r["frase_idx"]))),
-                    r["fuente_marca"],
-                    inferencia=r["fuente_inferencia"],
-                )
+                exp_canon = resolucion.canonico(r, "experienciador", inferencia=r["experienciador"])
+                fte_cids = resolucion.canonicos(r, "fuente", inferencia=r["fuente_inferencia"])
                 exp_cids = [exp_canon] if exp_canon else []
                 # Texto buscable: inferencia + marca + canónico resuelto, para
                 # que coincida igual que lo que muestra la búsqueda.
@@ -919,6 +925,7 @@ def search_counts(db_path: Path, term: str) -> dict[str, int]:
     }
 
 
+@cached_loader
 def list_search_options(db_path: Path) -> dict[str, list[str]]:
     """Valores distintos para la búsqueda por selección.
 
@@ -989,6 +996,7 @@ def frases_for_selection(db_path: Path, kind: str, value: str) -> list[tuple[str
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@cached_loader
 def get_simulacros(db_path: Path) -> pd.DataFrame:
     """Una fila por emoción con sus actantes y los semas de experienciador/fuente.
 
@@ -1005,8 +1013,8 @@ def get_simulacros(db_path: Path) -> pd.DataFrame:
             is None
         ):
             return pd.DataFrame()
-        exp_units = _frase_mention_canonicos(conn, "experienciador")
-        fte_units = _frase_mention_canonicos(conn, "fuente")
+        resolucion = ResolucionRoles(conn)
+        columnas, join = columnas_resolucion(conn, "e")
         semas = _canonico_semas_map(conn)
         emo_cols = {r["name"] for r in conn.execute("PRAGMA table_info(emociones)")}
         sel_exp_c = (
@@ -1023,9 +1031,10 @@ def get_simulacros(db_path: Path) -> pd.DataFrame:
             "e.tipo_emocion, e.tipo_emocion_canonico, "
             "e.fuente_marca, e.fuente_inferencia, "
             f"{sel_exp_c}, {sel_fte_c}, "
-            "e.actantes_payload, f.frase "
+            f"e.actantes_payload, f.frase, {columnas} "
             "FROM emociones e "
             "LEFT JOIN frases f ON e.codigo = f.codigo AND e.frase_idx = f.unit_idx "
+            f"{join} "
             "ORDER BY e.codigo, e.frase_idx, e.emocion_idx"
         ).fetchall()
     records: list[dict[str, Any]] = []
@@ -1037,15 +1046,15 @@ def get_simulacros(db_path: Path) -> pd.DataFrame:
         om = act.get("operador_modificacion") or {}
         # Misma prelación que Revisión y Referentes: atribución por emoción
         # (columna canónica) > vínculo marca↔referente > canónico inferido.
-        exp_c = resolver_canonico(
-            exp_units.get((r["codigo"], r["frase_idx"])),
-            r["experienciador_marca"],
+        exp_c = resolucion.canonico(
+            r,
+            "experienciador",
             override=r["experienciador_canonico"],
             inferencia=r["experienciador"],
         )
-        fte_cids = resolver_canonicos(
-            fte_units.get((r["codigo"], r["frase_idx"])),
-            r["fuente_marca"],
+        fte_cids = resolucion.canonicos(
+            r,
+            "fuente",
             override=r["fuente_canonico"],
             inferencia=r["fuente_inferencia"],
         )
@@ -1084,6 +1093,26 @@ def get_simulacros(db_path: Path) -> pd.DataFrame:
 #: Actantes aplanados que se exponen a nivel emoción.
 
 
+@cached_loader
+def get_emociones_analiticas(db_path: Path) -> pd.DataFrame:
+    """`get_emociones_enriched` para las tabs agregadas (curva, correlación, comparación, red).
+
+    Si el run tiene una instantánea Parquet vigente (`emoparse snapshot`, sin
+    cambios en la base desde que se construyó), la lee en columnas sin volver a
+    parsear payloads ni resolver canónicos. Si no la hay, o falta pyarrow, se
+    calcula en vivo: el resultado es el mismo.
+    """
+    from emoparse.storage import snapshot
+    from emoparse.storage.analytics import AnalyticsUnavailableError
+
+    if snapshot.snapshot_is_fresh(db_path):
+        try:
+            return snapshot.load_snapshot_table(snapshot.snapshot_dir_for(db_path), "emociones")
+        except (AnalyticsUnavailableError, OSError) as e:
+            logger.warning(f"[app.data] Instantánea ilegible, se lee en vivo: {e}")
+    return get_emociones_enriched(db_path)
+
+
 def list_canonico_semas(db_path: Path, canonical_id: str) -> list[dict[str, Any]]:
     """Semas de un referente con estado/origen (para la edición en tab Referentes)."""
     with _ro_connect(db_path) as conn:
@@ -1323,17 +1352,18 @@ def get_items_by_frase(
             is None
         ):
             return {}
-        exp_units = _frase_mention_canonicos(conn, "experienciador")
-        fte_units = _frase_mention_canonicos(conn, "fuente")
+        resolucion = ResolucionRoles(conn, codigos or None)
+        columnas, join = columnas_resolucion(conn)
         sql = (
-            "SELECT codigo, frase_idx, tipo_emocion, tipo_emocion_canonico, "
-            "experienciador, experienciador_marca, "
-            "fuente_inferencia, fuente_marca FROM emociones"
+            "SELECT emociones.codigo, emociones.frase_idx, emociones.tipo_emocion, "
+            "emociones.tipo_emocion_canonico, emociones.experienciador, "
+            "emociones.experienciador_marca, emociones.fuente_inferencia, "
+            f"emociones.fuente_marca, {columnas} FROM emociones {join}"
         )
         params: tuple = ()
         if codigos:
             qm = ",".join("?" * len(codigos))
-            sql += f" WHERE codigo IN ({qm})"
+            sql += f" WHERE emociones.codigo IN ({qm})"
             params = tuple(codigos)
         for r in conn.execute(sql, params):
             key = (r["codigo"], int(r["frase_idx"]))
@@ -1345,20 +1375,12 @@ def get_items_by_frase(
                 d["emociones"].add(emo)
             # Experienciadores/fuentes: el canónico de cada emoción; si no hay
             # con qué resolverlo, la inferencia cruda del LLM.
-            exp_canon = resolver_canonico(
-                exp_units.get((r["codigo"], int(r["frase_idx"]))),
-                r["experienciador_marca"],
-                inferencia=r["experienciador"],
-            )
+            exp_canon = resolucion.canonico(r, "experienciador", inferencia=r["experienciador"])
             if exp_canon:
                 d["experienciadores"].add(exp_canon)
             elif (r["experienciador"] or "").strip():
                 d["experienciadores"].add(r["experienciador"].strip())
-            fte_cids = resolver_canonicos(
-                fte_units.get((r["codigo"], int(r["frase_idx"]))),
-                r["fuente_marca"],
-                inferencia=r["fuente_inferencia"],
-            )
+            fte_cids = resolucion.canonicos(r, "fuente", inferencia=r["fuente_inferencia"])
             if fte_cids:
                 d["fuentes"].update(fte_cids)
             elif (r["fuente_inferencia"] or "").strip():
@@ -1366,157 +1388,86 @@ def get_items_by_frase(
     return {k: {kk: sorted(vv) for kk, vv in v.items()} for k, v in out.items()}
 
 
-def _embedding_candidate_pairs(
-    cids: list[str], threshold: float, model: str | None
-) -> dict[tuple[str, str], float]:
-    """Pares (cid_a, cid_b) → coseno ≥ threshold vía vectores spaCy.
+def _referent_counts(conn: sqlite3.Connection, codigo: str | None = None) -> dict[str, int]:
+    """Ver `storage.referent_index.referent_counts`."""
+    from emoparse.storage.referent_index import referent_counts
 
-    Solo modelos CON vectores (es_core_news_md / lg; el sm no tiene). Si falta
-    spaCy/numpy/modelo o el modelo no trae vectores, devuelve {} (silencioso).
-    """
-    try:
-        import numpy as np  # type: ignore
-        import spacy  # type: ignore
-    except Exception:
-        return {}
-    candidates = [model] if model else []
-    candidates += ["es_core_news_md", "es_core_news_lg"]
-    nlp = None
-    for name in candidates:
-        if not name:
-            continue
-        try:
-            nlp = spacy.load(
-                name,
-                disable=[
-                    "parser",
-                    "ner",
-                    "tagger",
-                    "lemmatizer",
-                    "attribute_ruler",
-                    "morphologizer",
-                ],
-            )
-            break
-        except Exception:
-            continue
-    if nlp is None or not getattr(nlp.vocab, "vectors_length", 0):
-        return {}
+    return referent_counts(conn, codigo)
 
-    kept: list[str] = []
-    vecs: list[Any] = []
-    for cid, doc in zip(cids, nlp.pipe(c.replace("_", " ") for c in cids)):
-        v = getattr(doc, "vector", None)
-        if v is None:
-            continue
-        norm = float(np.linalg.norm(v))
-        if norm > 0.0:
-            kept.append(cid)
-            vecs.append(v / norm)
-    if len(kept) < 2:
-        return {}
 
-    mat = np.vstack(vecs)
-    cos = mat @ mat.T
-    out: dict[tuple[str, str], float] = {}
-    n = len(kept)
-    for i in range(n):
-        row = cos[i]
-        for j in range(i + 1, n):
-            c = float(row[j])
-            if c >= threshold:
-                out[(kept[i], kept[j])] = round(c, 3)
-    return out
+def _open_referent_index(
+    db_path: Path,
+    counts: dict[str, int],
+    use_embeddings: bool,
+    nlp_model: str | None,
+) -> ReferentIndex:
+    """Copia en memoria del índice de referentes del run, alineada con `counts`.
+
+    El archivo no se escribe. Si está desfasado de la base (o no existe) la
+    copia se completa en memoria, con el costo de firmar lo que falte en cada
+    lectura, y se avisa: el índice lo mantienen el runner y `app.actions`.
+    """
+    from emoparse.storage.referent_index import (
+        ReferentIndex,
+        referent_index_path_for,
+        spacy_vectorizer,
+    )
+
+    path = referent_index_path_for(db_path)
+    idx = ReferentIndex.in_memory_copy(path)
+    if use_embeddings:
+        cambios = idx.sync(counts, spacy_vectorizer(nlp_model), vector_tag=nlp_model or "")
+    else:
+        cambios = idx.sync(counts)
+    if cambios:
+        logger.warning(
+            f"[data] Índice de referentes desactualizado ({path.name}): {cambios} canónicos "
+            "completados en memoria. Se actualiza al terminar un run o al editar referentes."
+        )
+    return idx
 
 
+@cached_loader
 def suggest_referent_merges(
     db_path: Path,
     codigo: str | None = None,
     threshold: float = 0.62,
-    max_block: int = 60,
     use_embeddings: bool = True,
     embed_threshold: float = 0.80,
     nlp_model: str | None = None,
-    embed_max_n: int = 6000,
 ) -> list[dict]:
     """Sugiere grupos de referentes canónicos que podrían ser el mismo.
 
-    Escalable (no compara todos contra todos): **blocking** por token
-    significativo compartido (los canónicos ya vienen sin artículos), y solo
-    dentro de cada bloque calcula similitud léxica (Jaccard de tokens, ratio de
+    Escalable (no compara todos contra todos): los candidatos salen del
+    índice persistente de referentes del run (`storage.referent_index`:
+    bloques por token, contención de tokens y LSH sobre n-gramas de
+    caracteres), que se actualiza solo con los canónicos nuevos. Cada
+    candidato se puntúa por similitud léxica (Jaccard de tokens, ratio de
     caracteres y contención de conjuntos). Opcionalmente suma candidatos
-    **semánticos** por embeddings (vectores spaCy + coseno), que capta sinónimos
-    sin tokens compartidos. Agrupa con union-find. NO fusiona: solo propone.
+    **semánticos** por embeddings (vectores spaCy + coseno, con LSH sobre
+    los vectores), que capta sinónimos sin tokens compartidos. Agrupa con
+    union-find. NO fusiona: solo propone.
 
     - `threshold`: score léxico mínimo (0..1) para proponer un par.
-    - `max_block`: bloques por token con más canónicos que esto se saltean.
     - `use_embeddings`: si hay modelo spaCy con vectores (md/lg), agrega pares
-      semánticos con coseno ≥ `embed_threshold`. Requiere numpy.
-    - `embed_max_n`: si hay más canónicos que esto, se omite el pase semántico
-      (evita la matriz de coseno n×n en bases enormes).
+      semánticos con coseno ≥ `embed_threshold`.
     """
-    import difflib
     from collections import defaultdict
 
-    stop = {"de", "la", "el", "los", "las", "un", "una", "y", "o", "del", "al"}
-
-    def toks(cid: str) -> set:
-        return {t for t in cid.split("_") if len(t) >= 3 and t not in stop}
-
-    counts: dict[str, int] = {}
     with _ro_connect(db_path) as conn:
         if not _menciones_exists(conn):
             return []
-        sql = (
-            "SELECT mc.canonical_id AS cid, COUNT(*) AS n "
-            "FROM mencion_canonico mc JOIN menciones m ON m.id = mc.mencion_id "
-            "WHERE mc.status != 'rejected' AND mc.canonical_id IS NOT NULL "
-        )
-        params: tuple = ()
-        if codigo:
-            sql += "AND m.codigo = ? "
-            params = (codigo,)
-        sql += "GROUP BY mc.canonical_id"
-        for r in conn.execute(sql, params):
-            counts[str(r["cid"])] = int(r["n"])
-
-    cids = list(counts)
-    tok_map = {c: toks(c) for c in cids}
+        all_counts = _referent_counts(conn)
+        counts = _referent_counts(conn, codigo) if codigo else all_counts
 
-    # Blocking: token → cids que lo contienen.
-    buckets: dict[str, list[str]] = defaultdict(list)
-    for c, ts in tok_map.items():
-        for t in ts:
-            buckets[t].append(c)
-
-    scored: dict[tuple[str, str], float] = {}
-    for t, members in buckets.items():
-        if len(members) < 2 or len(members) > max_block:
-            continue
-        for i in range(len(members)):
-            for j in range(i + 1, len(members)):
-                a, b = members[i], members[j]
-                key = (a, b) if a < b else (b, a)
-                if key in scored:
-                    continue
-                ta, tb = tok_map[a], tok_map[b]
-                inter = ta & tb
-                union_t = ta | tb
-                jacc = len(inter) / len(union_t) if union_t else 0.0
-                char = difflib.SequenceMatcher(None, a, b).ratio()
-                # Contención de conjuntos de tokens (p. ej. "sociedad_humana" ⊆
-                # "sociedad_humana_humanidad") = señal fuerte de sinonimia.
-                contained = bool(inter) and (ta <= tb or tb <= ta)
-                score = max(jacc, char, 0.9 if contained else 0.0)
-                if score >= threshold:
-                    scored[key] = score
-
-    # ── Pase semántico opcional: candidatos por embeddings (spaCy + coseno) ───
-    if use_embeddings and 2 <= len(cids) <= embed_max_n:
-        emb_pairs = _embedding_candidate_pairs(cids, embed_threshold, nlp_model)
-        for (a, b), cos in emb_pairs.items():
-            key = (a, b) if a < b else (b, a)
-            scored[key] = max(scored.get(key, 0.0), cos)
+    if len(counts) < 2:
+        return []
+    with _open_referent_index(db_path, all_counts, use_embeddings, nlp_model) as idx:
+        scored = idx.scored_pairs(
+            threshold,
+            embed_threshold=embed_threshold if use_embeddings else None,
+            cids=list(counts) if codigo else None,
+        )
 
     if not scored:
         return []
@@ -1561,6 +1512,33 @@ def suggest_referent_merges(
     return out
 
 
+@cached_loader
+def similar_referents(
+    db_path: Path,
+    cid: str,
+    threshold: float = 0.62,
+    use_embeddings: bool = False,
+    embed_threshold: float = 0.80,
+    nlp_model: str | None = None,
+    limit: int = 20,
+) -> list[tuple[str, float]]:
+    """Referentes canónicos parecidos a `cid` (score descendente), vía el índice."""
+    with _ro_connect(db_path) as conn:
+        if not _menciones_exists(conn):
+            return []
+        counts = _referent_counts(conn)
+    if cid not in counts:
+        return []
+    with _open_referent_index(db_path, counts, use_embeddings, nlp_model) as idx:
+        return idx.similar(
+            cid,
+            threshold=threshold,
+            embed_threshold=embed_threshold if use_embeddings else None,
+            limit=limit,
+        )
+
+
+@cached_loader
 def get_frase_emociones_brief(
     db_path: Path,
 ) -> dict[tuple[str, int], list[dict[str, Any]]]:
@@ -1586,43 +1564,41 @@ def get_frase_emociones_brief(
             is None
         ):
             return out
-        exp_units = _frase_mention_canonicos(conn, "experienciador")
-        fte_units = _frase_mention_canonicos(conn, "fuente")
+        resolucion = ResolucionRoles(conn)
+        columnas, join = columnas_resolucion(conn)
         emo_cols = {r["name"] for r in conn.execute("PRAGMA table_info(emociones)")}
         sel_exp_c = (
-            "experienciador_canonico"
+            "emociones.experienciador_canonico"
             if "experienciador_canonico" in emo_cols
             else "NULL AS experienciador_canonico"
         )
         sel_fte_c = (
-            "fuente_canonico" if "fuente_canonico" in emo_cols else "NULL AS fuente_canonico"
+            "emociones.fuente_canonico"
+            if "fuente_canonico" in emo_cols
+            else "NULL AS fuente_canonico"
         )
         for r in conn.execute(
-            "SELECT codigo, frase_idx, emocion_idx, experienciador, "
-            f"experienciador_marca, {sel_exp_c}, modo_existencia, "
-            "tipo_emocion, tipo_emocion_canonico, "
-            f"fuente_inferencia, fuente_marca, {sel_fte_c} FROM emociones "
-            "ORDER BY codigo, frase_idx, emocion_idx"
+            "SELECT emociones.codigo, emociones.frase_idx, emociones.emocion_idx, "
+            "emociones.experienciador, emociones.experienciador_marca, "
+            f"{sel_exp_c}, emociones.modo_existencia, "
+            "emociones.tipo_emocion, emociones.tipo_emocion_canonico, "
+            "emociones.fuente_inferencia, emociones.fuente_marca, "
+            f"{sel_fte_c}, {columnas} FROM emociones {join} "
+            "ORDER BY emociones.codigo, emociones.frase_idx, emociones.emocion_idx"
         ):
             key = (r["codigo"], int(r["frase_idx"]))
             exp_override = (r["experienciador_canonico"] or "").strip()
             exp = (
-                resolver_canonico(
-                    exp_units.get(key),
-                    r["experienciador_marca"],
-                    override=exp_override,
-                    inferencia=r["experienciador"],
+                resolucion.canonico(
+                    r, "experienciador", override=exp_override, inferencia=r["experienciador"]
                 )
                 or "—"
             )
             fte_override = (r["fuente_canonico"] or "").strip()
             fte = (
                 "; ".join(
-                    resolver_canonicos(
-                        fte_units.get(key),
-                        r["fuente_marca"],
-                        override=fte_override,
-                        inferencia=r["fuente_inferencia"],
+                    resolucion.canonicos(
+                        r, "fuente", override=fte_override, inferencia=r["fuente_inferencia"]
                     )
                 )
                 or "—"
@@ -1645,6 +1621,7 @@ def get_frase_emociones_brief(
     return out
 
 
+@cached_loader
 def list_canonicos(db_path: Path) -> list[str]:
     """Canónicos existentes (los visibles en tab Referentes), para reasignar."""
     out: set[str] = set()
@@ -1664,6 +1641,7 @@ def list_canonicos(db_path: Path) -> list[str]:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+@cached_loader
 def list_discursos(db_path: Path) -> list[tuple[str, str]]:
     """(codigo, titulo) de cada discurso, para el selector de la tab."""
     out: list[tuple[str, str]] = []
@@ -1675,6 +1653,7 @@ def list_discursos(db_path: Path) -> list[tuple[str, str]]:
     return out
 
 
+@cached_loader
 def get_enunciation_full(db_path: Path, codigo: str) -> dict[str, Any] | None:
     """Estructura enunciativa editable + título y resumen global del discurso."""
     with _ro_connect(db_path) as conn:
@@ -1719,6 +1698,7 @@ def has_posts(db_path: Path) -> bool:
         return int(n) > 0
 
 
+@cached_loader
 def get_posts(db_path: Path) -> pd.DataFrame:
     """Posts del corpus con métricas desplegadas (metricas__likes, ...)."""
     with _ro_connect(db_path) as conn:
@@ -1733,6 +1713,7 @@ def get_posts(db_path: Path) -> pd.DataFrame:
     return pd.DataFrame(records)
 
 
+@cached_loader
 def get_hilos(db_path: Path, min_posts: int = 2) -> pd.DataFrame:
     """Hilos del corpus (conversaciones con al menos `min_posts` posts)."""
     with _ro_connect(db_path) as conn:
@@ -1783,6 +1764,7 @@ def _foria_dominante_map(conn: sqlite3.Connection) -> dict[str, str]:
     }
 
 
+@cached_loader
 def get_posts_citadores(db_path: Path) -> pd.DataFrame:
     """Posts que citan o repostean, con su reframing y el post citado.
 
@@ -1891,6 +1873,7 @@ def _post_record(row: sqlite3.Row, forias: dict[str, str]) -> dict[str, Any]:
     return rec
 
 
+@cached_loader
 def get_tecno_resumen(db_path: Path) -> pd.DataFrame:
     """Conteo de tecno-entidades por tipo y valor normalizado."""
     with _ro_connect(db_path) as conn:
@@ -1906,6 +1889,7 @@ def get_tecno_resumen(db_path: Path) -> pd.DataFrame:
     return pd.DataFrame([dict(r) for r in rows])
 
 
+@cached_loader
 def get_emojis_con_afecto(db_path: Path) -> pd.DataFrame:
     """Usos de emoji con su afecto resuelto (léxico o LLM).
 
@@ -1959,6 +1943,7 @@ def _afecto_record(extra: Any) -> dict[str, Any]:
     }
 
 
+@cached_loader
 def get_hashtags_analizados(db_path: Path) -> pd.DataFrame:
     """Hashtags con caracterización semiótica (y los pendientes, con n_usos).
 
@@ -2004,6 +1989,7 @@ def get_posts_con_hashtag(db_path: Path, valor_norm: str) -> pd.DataFrame:
     return pd.DataFrame([dict(r) for r in rows])
 
 
+@cached_loader
 def codigo_labels(db_path: Path) -> dict[str, str]:
     """Mapa codigo → etiqueta visible para los selectores y gráficos.
 
@@ -2026,6 +2012,7 @@ def codigo_labels(db_path: Path) -> dict[str, str]:
     return out
 
 
+@cached_loader
 def get_post_contexto(db_path: Path) -> pd.DataFrame:
     """Contexto conversacional por post: codigo, conversacion_id, fecha, autor.
 
@@ -2042,6 +2029,7 @@ def get_post_contexto(db_path: Path) -> pd.DataFrame:
     return pd.DataFrame([dict(r) for r in rows])
 
 
+@cached_loader
 def get_post_hashtags(db_path: Path) -> pd.DataFrame:
     """Pares (codigo, hashtag) por cada uso de hashtag en el corpus de posts."""
     with _ro_connect(db_path) as conn:
@@ -2093,6 +2081,7 @@ def get_usos_hashtag(db_path: Path, valor_norm: str) -> pd.DataFrame:
     return pd.DataFrame(records)
 
 
+@cached_loader
 def get_tecno_usos(db_path: Path) -> pd.DataFrame:
     """Menciones, tecnografismos y URLs con su uso pragmático resuelto.
 
@@ -2243,6 +2232,7 @@ def agrupar_por_conversacion(db_path: Path, df: pd.DataFrame, modo: str) -> pd.D
     return pd.concat(partes, ignore_index=True)
 
 
+@cached_loader
 def get_emociones_carac(db_path: Path) -> pd.DataFrame:
     """Emociones con la caracterización sin expandir.
 
@@ -2261,6 +2251,7 @@ def get_emociones_carac(db_path: Path) -> pd.DataFrame:
     return pd.DataFrame([dict(r) for r in rows])
 
 
+@cached_loader
 def get_red_metricas(db_path: Path, grafo: str) -> pd.DataFrame:
     """Métricas por nodo de un grafo persistido por `emoparse network`."""
     with _ro_connect(db_path) as conn:
@@ -2274,6 +2265,7 @@ def get_red_metricas(db_path: Path, grafo: str) -> pd.DataFrame:
     return pd.DataFrame([dict(r) for r in rows])
 
 
+@cached_loader
 def get_red_aristas(db_path: Path, grafo: str) -> pd.DataFrame:
     """Aristas de un grafo persistido."""
     with _ro_connect(db_path) as conn:
@@ -2288,6 +2280,7 @@ def get_red_aristas(db_path: Path, grafo: str) -> pd.DataFrame:
     return pd.DataFrame([dict(r) for r in rows])
 
 
+@cached_loader
 def list_red_grafos(db_path: Path) -> list[str]:
     """Grafos con aristas persistidas (vacío si `emoparse network` no corrió)."""
     with _ro_connect(db_path) as conn:
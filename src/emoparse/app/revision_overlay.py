@@ -6,8 +6,17 @@
 #
 #  El overlay es un parche que se aplica al leer: la vista efectiva es
 #  merge(registro_DB, overlay). Los borrados son tombstones (reversibles); nada
-#  se elimina físicamente. La escritura es atómica (tmp + os.replace) y con
-#  backup .bak, de modo que un fallo a mitad de guardado no corrompe el archivo.
+#  se elimina físicamente.
+#
+#  Persistencia: `revision_overlay.json` es la base compactada y cada acción
+#  del analista agrega una línea a un journal append-only al lado
+#  (`revision_overlay.journal.jsonl`) con el nuevo estado del nodo que tocó
+#  (un discurso, una frase, una emoción). Guardar cuesta una línea y no
+#  reescribir el archivo; el estado replayado queda en memoria por proceso y
+#  un rerun solo lee las líneas nuevas. Cada `COMPACT_EVERY` entradas el
+#  journal se vuelca a la base (tmp + os.replace, con backup .bak) y se vacía.
+#  Las entradas fijan un nodo entero, así que replayarlas dos veces es
+#  inocuo: un corte entre la compactación y el vaciado no pierde nada.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
@@ -15,12 +24,27 @@ from __future__ import annotations
 import json
 import os
 import shutil
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 SCHEMA_VERSION = 1
 
+#: Entradas de journal a partir de las cuales se compacta sobre la base JSON.
+COMPACT_EVERY = 2000
+
+#: Secciones del overlay y cuántas claves identifican un nodo de cada una.
+_NODE_DEPTH = {
+    "discursos": 1,
+    "frases": 2,
+    "emociones": 3,
+    "emociones_nuevas": 2,
+    "actores_kb_propuestos": 1,
+}
+
 
 def default_overlay_path(db_path: Path) -> Path:
     """Ruta por defecto del overlay para un run.
@@ -32,6 +56,12 @@ def default_overlay_path(db_path: Path) -> Path:
     return db_path.parent / db_path.stem / "revision_overlay.json"
 
 
+def journal_path_for(path: Path) -> Path:
+    """Journal append-only que acompaña a la base JSON del overlay."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.journal.jsonl")
+
+
 def _now() -> str:
     return datetime.now(UTC).isoformat()
 
@@ -53,52 +83,212 @@ class OverlayCorruptError(RuntimeError):
     """El archivo de overlay existe pero no es JSON válido."""
 
 
+# ── Estado replayado por proceso ─────────────────────────────────────────────
+
+
+@dataclass
+class _Estado:
+    """Overlay en memoria y hasta dónde se leyó su journal."""
+
+    data: dict[str, Any]
+    base_sig: tuple[int, int] | None
+    offset: int = 0
+    entradas: int = 0
+
+
+_ESTADOS: dict[Path, _Estado] = {}
+_LOCKS: dict[Path, threading.RLock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.RLock:
+    with _LOCKS_GUARD:
+        return _LOCKS.setdefault(path, threading.RLock())
+
+
+def _file_sig(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_base(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return _empty()
+    try:
+        with path.open(encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (json.JSONDecodeError, OSError) as exc:
+        # Nunca pisamos un archivo corrupto en silencio: avisamos.
+        raise OverlayCorruptError(f"Overlay ilegible en {path}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise OverlayCorruptError(f"Overlay con formato inesperado en {path}")
+    # Garantizar todas las secciones (tolerante a versiones previas).
+    for k, v in _empty().items():
+        data.setdefault(k, v)
+    return data
+
+
+def _apply(data: dict[str, Any], entry: dict[str, Any]) -> None:
+    """Aplica una entrada del journal: fija el nodo `entry['k']` de `entry['s']`."""
+    keys = [str(k) for k in entry["k"]]
+    node = data.setdefault(entry["s"], {})
+    for key in keys[:-1]:
+        node = node.setdefault(key, {})
+    node[keys[-1]] = entry["v"]
+    if entry.get("t"):
+        data["updated_at"] = entry["t"]
+
+
+def _replay(journal: Path, estado: _Estado) -> None:
+    """Aplica las líneas del journal posteriores a `estado.offset`.
+
+    Una última línea sin salto es una escritura cortada: se ignora y se
+    vuelve a intentar en la próxima lectura. Una línea ilegible en el medio
+    es corrupción y se reporta.
+    """
+    try:
+        with journal.open("rb") as fh:
+            fh.seek(estado.offset)
+            chunk = fh.read()
+    except FileNotFoundError:
+        return
+    consumido = 0
+    for raw in chunk.splitlines(keepends=True):
+        if not raw.endswith(b"\n"):
+            break
+        try:
+            entry = json.loads(raw)
+            _apply(estado.data, entry)
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as exc:
+            raise OverlayCorruptError(
+                f"Journal ilegible en {journal} (byte {estado.offset + consumido}): {exc}"
+            ) from exc
+        consumido += len(raw)
+        estado.entradas += 1
+    estado.offset += consumido
+
+
+def _write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+    """Escritura atómica con backup .bak del archivo previo."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        try:
+            shutil.copy2(path, path.with_suffix(path.suffix + ".bak"))
+        except OSError:
+            pass
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False, indent=2, default=str)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
 class RevisionOverlay:
-    """Almacén de correcciones del analista (write-through, atómico).
+    """Almacén de correcciones del analista (write-through, journal append-only).
 
-    Se instancia por render (carga fresca desde disco), se muta con un método,
-    y cada método persiste. Como Streamlit recarga en cada rerun, no hay estado
-    rancio que pueda pisar ediciones concurrentes de la propia UI.
+    Se instancia por render y cada método que muta persiste su nodo. Las
+    instancias de un mismo archivo comparten el estado replayado del proceso;
+    al instanciar se leen solo las líneas que otro proceso haya agregado. Como
+    cada entrada fija un nodo completo, la última escritura de un nodo gana.
     """
 
     def __init__(self, path: Path) -> None:
         self.path = Path(path)
+        self.journal_path = journal_path_for(self.path)
+        self._lock = _lock_for(self.path.resolve())
         self._data = self._load()
 
     # ── Carga / guardado ─────────────────────────────────────────────────────
 
+    def _estado(self) -> _Estado:
+        """Estado replayado al día con los archivos en disco (con el lock tomado)."""
+        key = self.path.resolve()
+        base_sig = _file_sig(self.path)
+        journal_sig = _file_sig(self.journal_path)
+        estado = _ESTADOS.get(key)
+        if (
+            estado is None
+            or estado.base_sig != base_sig
+            or (journal_sig is None and estado.offset)
+            or (journal_sig is not None and journal_sig[1] < estado.offset)
+        ):
+            estado = _Estado(data=_read_base(self.path), base_sig=base_sig)
+            _ESTADOS[key] = estado
+        _replay(self.journal_path, estado)
+        return estado
+
     def _load(self) -> dict[str, Any]:
-        if not self.path.exists():
-            return _empty()
-        try:
-            with self.path.open(encoding="utf-8") as fh:
-                data = json.load(fh)
-        except (json.JSONDecodeError, OSError) as exc:
-            # Nunca pisamos un archivo corrupto en silencio: avisamos.
-            raise OverlayCorruptError(f"Overlay ilegible en {self.path}: {exc}") from exc
-        if not isinstance(data, dict):
-            raise OverlayCorruptError(f"Overlay con formato inesperado en {self.path}")
-        # Garantizar todas las secciones (tolerante a versiones previas).
-        base = _empty()
-        for k, v in base.items():
-            data.setdefault(k, v)
-        return data
-
-    def _save(self) -> None:
-        """Escritura atómica con backup .bak."""
-        self._data["updated_at"] = _now()
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        if self.path.exists():
-            try:
-                shutil.copy2(self.path, self.path.with_suffix(self.path.suffix + ".bak"))
-            except OSError:
-                pass
-        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
-        with tmp.open("w", encoding="utf-8") as fh:
-            json.dump(self._data, fh, ensure_ascii=False, indent=2, default=str)
-            fh.flush()
-            os.fsync(fh.fileno())
-        os.replace(tmp, self.path)
+        with self._lock:
+            return self._estado().data
+
+    def _save_node(self, section: str, *keys: str) -> None:
+        """Agrega al journal el estado actual de un nodo y compacta si toca."""
+        node: Any = self._data[section]
+        for key in keys:
+            node = node[key]
+        entry = {"s": section, "k": list(keys), "v": node, "t": _now()}
+        line = (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            self._data["updated_at"] = entry["t"]
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal_path.open("ab") as fh:
+                start = fh.tell()
+                fh.write(line)
+                fh.flush()
+                os.fsync(fh.fileno())
+                end = fh.tell()
+            estado = _ESTADOS[self.path.resolve()]
+            # Si otro proceso escribió en el medio, la próxima lectura replaya
+            # desde el offset viejo, incluida esta línea (idempotente).
+            if start == estado.offset and estado.data is self._data:
+                estado.offset = end
+                estado.entradas += 1
+            if estado.entradas >= COMPACT_EVERY:
+                self.compact()
+
+    def compact(self) -> None:
+        """Vuelca el estado a la base JSON y vacía el journal."""
+        with self._lock:
+            estado = self._estado()
+            _write_json_atomic(self.path, estado.data)
+            with self.journal_path.open("wb") as fh:
+                fh.flush()
+                os.fsync(fh.fileno())
+            estado.base_sig = _file_sig(self.path)
+            estado.offset = 0
+            estado.entradas = 0
+            self._data = estado.data
+
+    def export_json(self, dest: Path) -> Path:
+        """Escribe el overlay completo (base + journal) como un único JSON.
+
+        Es el mismo formato que `revision_overlay.json` y que lee `import_json`.
+        """
+        with self._lock:
+            _write_json_atomic(Path(dest), self._estado().data)
+        return Path(dest)
+
+    def import_json(self, src: Path) -> int:
+        """Incorpora un overlay JSON existente, nodo por nodo.
+
+        Cada nodo del archivo importado reemplaza al del overlay actual (la
+        importación es un conjunto de ediciones más). Devuelve los nodos
+        importados y compacta al terminar.
+        """
+        data = _read_base(Path(src))
+        n = 0
+        with self._lock:
+            self._data = self._load()
+            for section, depth in _NODE_DEPTH.items():
+                for keys, value in _iter_nodes(data.get(section) or {}, depth):
+                    _apply(self._data, {"s": section, "k": keys, "v": value, "t": _now()})
+                    n += 1
+            self.compact()
+        return n
 
     # ── Helpers internos ─────────────────────────────────────────────────────
 
@@ -131,15 +321,15 @@ class RevisionOverlay:
 
     def set_discurso_override(self, codigo: str, field: str, value: Any) -> None:
         self._disc(codigo)["overrides"][field] = value
-        self._save()
+        self._save_node("discursos", codigo)
 
     def clear_discurso_override(self, codigo: str, field: str) -> None:
         self._disc(codigo)["overrides"].pop(field, None)
-        self._save()
+        self._save_node("discursos", codigo)
 
     def confirm_discurso_field(self, codigo: str, field: str, value: bool = True) -> None:
         self._disc(codigo)["confirmado"][field] = bool(value)
-        self._save()
+        self._save_node("discursos", codigo)
 
     # ── Frase: correspondencia frase↔actor (NO toca la KB) ───────────────────
 
@@ -157,12 +347,12 @@ class RevisionOverlay:
         fr = self._frase(codigo, unit_idx)
         if actor_key not in fr["actores_removidos"]:
             fr["actores_removidos"].append(actor_key)
-        self._save()
+        self._save_node("frases", codigo, self._si(unit_idx))
 
     def restore_actor(self, codigo: str, unit_idx: int, actor_key: str) -> None:
         fr = self._frase(codigo, unit_idx)
         fr["actores_removidos"] = [a for a in fr["actores_removidos"] if a != actor_key]
-        self._save()
+        self._save_node("frases", codigo, self._si(unit_idx))
 
     def add_actor(self, codigo: str, unit_idx: int, actor: dict[str, Any]) -> None:
         """Agrega una correspondencia frase↔actor (link a canónico o propuesto).
@@ -171,17 +361,17 @@ class RevisionOverlay:
         en la KB: si es un actor nuevo, su propuesta vive en el overlay.
         """
         self._frase(codigo, unit_idx)["actores_agregados"].append(actor)
-        self._save()
+        self._save_node("frases", codigo, self._si(unit_idx))
 
     def remove_added_actor(self, codigo: str, unit_idx: int, pos: int) -> None:
         fr = self._frase(codigo, unit_idx)
         if 0 <= pos < len(fr["actores_agregados"]):
             fr["actores_agregados"].pop(pos)
-            self._save()
+            self._save_node("frases", codigo, self._si(unit_idx))
 
     def confirm_frase_actores(self, codigo: str, unit_idx: int, value: bool = True) -> None:
         self._frase(codigo, unit_idx)["confirmado_actores"] = bool(value)
-        self._save()
+        self._save_node("frases", codigo, self._si(unit_idx))
 
     # ── Emoción: edición / borrado / confirmación por campo ──────────────────
 
@@ -216,7 +406,7 @@ class RevisionOverlay:
         value: Any,
     ) -> None:
         self._emo(codigo, frase_idx, emocion_idx)["overrides"][field] = value
-        self._save()
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
 
     def set_emocion_override_path(
         self,
@@ -235,7 +425,7 @@ class RevisionOverlay:
                 node[p] = nxt
             node = nxt
         node[path[-1]] = value
-        self._save()
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
 
     def clear_emocion_override_path(
         self,
@@ -250,7 +440,7 @@ class RevisionOverlay:
             if not isinstance(node, dict):
                 return
         node.pop(path[-1], None)
-        self._save()
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
 
     def clear_emocion_override(
         self,
@@ -260,7 +450,7 @@ class RevisionOverlay:
         field: str,
     ) -> None:
         self._emo(codigo, frase_idx, emocion_idx)["overrides"].pop(field, None)
-        self._save()
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
 
     def confirm_emocion_field(
         self,
@@ -271,7 +461,7 @@ class RevisionOverlay:
         value: bool = True,
     ) -> None:
         self._emo(codigo, frase_idx, emocion_idx)["confirmado"][field] = bool(value)
-        self._save()
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
 
     # ── Sugerencias del juez (aceptar / rechazar por campo) ──────────────────
 
@@ -299,7 +489,7 @@ class RevisionOverlay:
         modo que el analista pueda luego editar libremente el override.
         """
         self._emo(codigo, frase_idx, emocion_idx).setdefault("sugerencias", {})[campo] = state
-        self._save()
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
 
     def clear_suggestion_state(
         self,
@@ -309,15 +499,22 @@ class RevisionOverlay:
         campo: str,
     ) -> None:
         self._emo(codigo, frase_idx, emocion_idx).get("sugerencias", {}).pop(campo, None)
-        self._save()
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
+
+    def revert_emocion(self, codigo: str, frase_idx: int, emocion_idx: int) -> None:
+        """Descarta todos los overrides y estados de sugerencia de una emoción."""
+        node = self._emo(codigo, frase_idx, emocion_idx)
+        node["overrides"] = {}
+        node["sugerencias"] = {}
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
 
     def delete_emocion(self, codigo: str, frase_idx: int, emocion_idx: int) -> None:
         self._emo(codigo, frase_idx, emocion_idx)["deleted"] = True
-        self._save()
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
 
     def restore_emocion(self, codigo: str, frase_idx: int, emocion_idx: int) -> None:
         self._emo(codigo, frase_idx, emocion_idx)["deleted"] = False
-        self._save()
+        self._save_node("emociones", codigo, self._si(frase_idx), self._si(emocion_idx))
 
     # ── Emociones nuevas (agregadas a mano) ──────────────────────────────────
 
@@ -327,13 +524,13 @@ class RevisionOverlay:
     def add_emocion(self, codigo: str, frase_idx: int, emocion: dict[str, Any]) -> None:
         c = self._data["emociones_nuevas"].setdefault(codigo, {})
         c.setdefault(self._si(frase_idx), []).append(emocion)
-        self._save()
+        self._save_node("emociones_nuevas", codigo, self._si(frase_idx))
 
     def remove_new_emocion(self, codigo: str, frase_idx: int, pos: int) -> None:
         lst = self._data["emociones_nuevas"].get(codigo, {}).get(self._si(frase_idx), [])
         if 0 <= pos < len(lst):
             lst.pop(pos)
-            self._save()
+            self._save_node("emociones_nuevas", codigo, self._si(frase_idx))
 
     # ── Actores nuevos propuestos (overlay, NO se escriben en la KB acá) ─────
 
@@ -364,7 +561,7 @@ class RevisionOverlay:
             "tipo": tipo,
             "propuesto_at": _now(),
         }
-        self._save()
+        self._save_node("actores_kb_propuestos", cid)
 
     # ── Aplicación efectiva (lectura) ────────────────────────────────────────
 
@@ -396,3 +593,15 @@ def _deep_merge(base: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
         else:
             base[k] = v
     return base
+
+
+def _iter_nodes(
+    section: dict[str, Any], depth: int, prefix: tuple[str, ...] = ()
+) -> Iterator[tuple[list[str], Any]]:
+    """Itera (claves, nodo) de una sección del overlay hasta `depth` niveles."""
+    for key, value in section.items():
+        keys = (*prefix, str(key))
+        if depth == 1:
+            yield list(keys), value
+        elif isinstance(value, dict):
+            yield from _iter_nodes(value, depth - 1, keys)
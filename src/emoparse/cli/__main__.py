@@ -6,6 +6,10 @@
 #  Define el parser principal con sus flags globales, delega el registro de
 #  cada subcomando en su propio módulo (`COMMANDS`) y despacha la ejecución
 #  al handler que ese módulo dejó en `set_defaults(handler=...)`.
+#
+#  Al despachar solo se importa el módulo del subcomando invocado: `status`
+#  o `--help` no pagan la importación de pandas, el pipeline ni los
+#  backends. `benchmarks/bench_cli_startup.py` mide ese arranque.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
@@ -15,7 +19,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import argparse
-from collections.abc import Callable
+from collections.abc import Callable, Collection
 
 from loguru import logger
 
@@ -26,9 +30,14 @@ from emoparse.cli.commands import COMMANDS
 HandlerFn = Callable[[argparse.Namespace], int]
 
 
-def build_parser() -> argparse.ArgumentParser:
+def build_parser(completos: Collection[str] | None = None) -> argparse.ArgumentParser:
     """Construye el parser principal y registra los subcomandos.
 
+    Con `completos`, solo esos subcomandos se registran con todas sus
+    opciones (importando su módulo); el resto queda con nombre y ayuda,
+    suficiente para `emoparse --help` y para rechazar nombres desconocidos.
+    Sin `completos` se registran todos.
+
     Público: además del entry point, lo consume el generador de la
     referencia de comandos.
     """
@@ -50,10 +59,26 @@ def build_parser() -> argparse.ArgumentParser:
         required=True,
     )
     for command in COMMANDS:
-        command.register(sub)
+        if completos is None or command.name in completos:
+            command.load().register(sub)
+        else:
+            sub.add_parser(command.name, help=command.help)
     return parser
 
 
+def _comando_invocado(argv: list[str] | None) -> tuple[str, ...]:
+    """El subcomando de `argv` (salteando las flags globales), o () si no hay."""
+    prefijo = argparse.ArgumentParser(prog="emoparse", add_help=False, exit_on_error=False)
+    _add_global_flags(prefijo)
+    prefijo.add_argument("command", nargs="?")
+    try:
+        conocidos, _ = prefijo.parse_known_args(argv)
+    except argparse.ArgumentError:
+        # El parser completo repite el error con el mensaje y el uso correctos.
+        return ()
+    return (conocidos.command,) if conocidos.command else ()
+
+
 def _add_global_flags(parser: argparse.ArgumentParser) -> None:
     """Flags que aplican a cualquier subcomando, leídas antes de despachar."""
     parser.add_argument(
@@ -88,7 +113,7 @@ def _add_global_flags(parser: argparse.ArgumentParser) -> None:
 
 def main(argv: list[str] | None = None) -> int:
     """Entry point del CLI. Devuelve el exit code del proceso."""
-    parser = build_parser()
+    parser = build_parser(_comando_invocado(argv))
     args = parser.parse_args(argv)
 
     archivo_log = logging_setup.configure(
@@ -6,7 +6,14 @@
 #  Cada módulo de este paquete expone `register(subparsers)`, que crea su
 #  propio parser y deja su handler en `set_defaults(handler=...)`. El entry
 #  point recorre `COMMANDS` y no conoce ningún subcomando por nombre: sumar
-#  uno es agregar un módulo acá y nada más.
+#  uno es agregar su módulo y una entrada acá, y nada más.
+#
+#  El registro es perezoso: `COMMANDS` guarda nombre, módulo y ayuda corta
+#  de cada subcomando sin importarlo. Al despachar solo se importa el módulo
+#  del subcomando invocado (con sus dependencias: pandas, el pipeline, los
+#  backends); para el resto alcanza con el nombre y la ayuda que lista
+#  `emoparse --help`. Un contrato verifica que la ayuda de acá coincida con
+#  la que registra cada módulo.
 #
 #  El orden de `COMMANDS` es el orden en que aparecen en `emoparse --help`.
 # ══════════════════════════════════════════════════════════════════════════════
@@ -14,27 +21,9 @@
 from __future__ import annotations
 
 import argparse
-from typing import Protocol
-
-from emoparse.cli.commands import (
-    acquire_cmd,
-    app_cmd,
-    eval_cmd,
-    export_cmd,
-    follows_cmd,
-    inspect_cmd,
-    judge_cmd,
-    metrics_cmd,
-    modalidad_cmd,
-    network_cmd,
-    retry_cmd,
-    run_cmd,
-    scrape_cmd,
-    semas_cmd,
-    stats_cmd,
-    status_cmd,
-    validate_cmd,
-)
+import importlib
+from dataclasses import dataclass
+from typing import Protocol, cast
 
 
 class CommandModule(Protocol):
@@ -45,25 +34,54 @@ class CommandModule(Protocol):
         ...
 
 
+@dataclass(frozen=True, slots=True)
+class CommandSpec:
+    """Un subcomando registrado, sin importar su implementación."""
+
+    name: str
+    module: str
+    help: str
+
+    def load(self) -> CommandModule:
+        """Importa el módulo del subcomando."""
+        return cast(CommandModule, importlib.import_module(self.module))
+
+
+def _spec(name: str, help: str) -> CommandSpec:
+    return CommandSpec(name=name, module=f"{__name__}.{name}_cmd", help=help)
+
+
 #: Subcomandos registrados, en orden de aparición en la ayuda.
-COMMANDS: tuple[CommandModule, ...] = (
-    run_cmd,
-    status_cmd,
-    retry_cmd,
-    inspect_cmd,
-    stats_cmd,
-    metrics_cmd,
-    judge_cmd,
-    modalidad_cmd,
-    semas_cmd,
-    export_cmd,
-    validate_cmd,
-    scrape_cmd,
-    acquire_cmd,
-    network_cmd,
-    follows_cmd,
-    eval_cmd,
-    app_cmd,
+COMMANDS: tuple[CommandSpec, ...] = (
+    _spec("run", "Ejecuta el pipeline completo sobre un input."),
+    _spec("status", "Muestra el progreso del pipeline en una DB."),
+    _spec(
+        "retry",
+        "Limpia errors / prepara reproceso. Dos modos: "
+        "--stage (legacy, una stage entera) o --policy (declarativo).",
+    ),
+    _spec("inspect", "Imprime los datos asociados a un discurso en la DB."),
+    _spec("stats", "Muestra estadísticas del cache LLM."),
+    _spec("metrics", "Muestra telemetría por stage del run (latencias, tokens, cache)."),
+    _spec("judge", "Muestra los juicios del JudgeAgent (capa 3 de validación)."),
+    _spec("modalidad", "Clasifica la modalidad referencial de los vínculos (NLP-only)."),
+    _spec("semas", "Mantenimiento de los semas de referentes canónicos de una DB."),
+    _spec(
+        "export",
+        "Exporta los resultados del run a CSV, Parquet o JSONL, incluida la "
+        "metadata de género declarada.",
+    ),
+    _spec("snapshot", "Materializa una instantánea Parquet del run para las vistas agregadas."),
+    _spec(
+        "validate",
+        "Ejecuta validators de coherencia semiótica sobre las emociones caracterizadas.",
+    ),
+    _spec("scrape", "Scrapear discursos de una fuente al CSV."),
+    _spec("acquire", "Adquirir posts de una fuente al JSONL."),
+    _spec("network", "Construye y analiza las redes de interacción de un run de posts."),
+    _spec("follows", "Adquiere el grafo de seguimiento entre las cuentas del corpus."),
+    _spec("eval", "Evaluación de validez: muestras, acuerdo, golden sets y controles."),
+    _spec("app", "Lanza el dashboard Streamlit de EmoParse."),
 )
 
-__all__ = ["COMMANDS", "CommandModule"]
+__all__ = ["COMMANDS", "CommandModule", "CommandSpec"]
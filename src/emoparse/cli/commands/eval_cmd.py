@@ -13,10 +13,11 @@ import sqlite3
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
-from emoparse.evaluation.agreement import krippendorff_alpha
+from emoparse.evaluation.agreement import Metric, agreement_by_dimension
 from emoparse.evaluation.annotations import (
     ANNOTATION_DECISION_COLUMNS,
     EMOTION_SLOTS,
@@ -34,13 +35,14 @@ from emoparse.evaluation.golden import (
     load_run_emotions,
     load_run_genre,
 )
+from emoparse.evaluation.golden_batch import RunEvaluation, evaluate_runs
 from emoparse.evaluation.matching import DIMENSIONES, MatchReport, match_units
 from emoparse.evaluation.sampling import make_annotation_sample
 from emoparse.storage.db import Database
 from emoparse.storage.eval_reports import EvalReportsRepository
 from emoparse.storage.runs import RunsRepository
 
-_AGREEMENT_DIMENSIONS: tuple[tuple[str, str, str], ...] = (
+_AGREEMENT_DIMENSIONS: tuple[tuple[str, str, Metric], ...] = (
     ("hay_emocion", "hay_emocion", "nominal"),
     ("tipo", "tipo", "nominal"),
     ("experienciador", "experienciador", "nominal"),
@@ -63,8 +65,8 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         action="append",
         default=None,
         help=(
-            "DB del run. Puede repetirse con --golden --por-genero; los otros modos "
-            "requieren una sola."
+            "DB del run. Puede repetirse con --golden --por-genero o --golden --lote; "
+            "los otros modos requieren una sola."
         ),
     )
     parser.add_argument(
@@ -75,6 +77,20 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         action="store_true",
         help="Separa el reporte del golden por género y admite un --db por género.",
     )
+    parser.add_argument(
+        "--lote",
+        action="store_true",
+        help=(
+            "Evalúa el golden contra cada --db en paralelo y reporta las diferencias "
+            "respecto del primero (línea base)."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Con --lote, runs evaluados en paralelo. Default: uno por run hasta las CPUs.",
+    )
     parser.add_argument(
         "--persist-report",
         action="store_true",
@@ -146,6 +162,15 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         default=None,
         help=("CSV concatenado con `anotador`, `pasada`, `id_muestra` y columnas de anotación."),
     )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=0,
+        help=(
+            "Con --agreement, réplicas bootstrap para el intervalo de confianza del 95%% "
+            "de cada alpha (p. ej. 1000). 0 lo omite."
+        ),
+    )
     parser.add_argument(
         "--control",
         action="store_true",
@@ -191,8 +216,10 @@ def _golden(args: argparse.Namespace) -> int:
 
     if args.por_genero:
         return _golden_by_genre(dataset, db_paths, args)
+    if getattr(args, "lote", False):
+        return _golden_batch(dataset, db_paths, args)
     if len(db_paths) != 1:
-        logger.error("[eval] Varios --db requieren --por-genero.")
+        logger.error("[eval] Varios --db requieren --por-genero o --lote.")
         return 1
     if len(dataset.genres_present()) > 1:
         logger.error(
@@ -292,6 +319,91 @@ def _golden_by_genre(
     return 0
 
 
+def _golden_batch(
+    dataset: GoldenDataset,
+    db_paths: list[Path],
+    args: argparse.Namespace,
+) -> int:
+    declared_genres = dataset.genres_present()
+    if len(declared_genres) > 1:
+        logger.error("[eval] --lote requiere un golden de un solo género.")
+        return 1
+    declared = declared_genres[0] if declared_genres else None
+    evaluations = evaluate_runs(
+        dataset.units,
+        db_paths,
+        declared_genre=declared,
+        workers=getattr(args, "workers", None),
+    )
+    failed = [e for e in evaluations if e.report is None]
+    for evaluation in failed:
+        logger.error(f"[eval] {evaluation.db_path}: {evaluation.error}")
+    if getattr(args, "persist_report", False):
+        try:
+            for evaluation in evaluations:
+                if evaluation.report is not None:
+                    _persist_golden_report(
+                        db_path=evaluation.db_path,
+                        golden_path=args.golden,
+                        explicit_version=getattr(args, "golden_version", None),
+                        genre=evaluation.genre or declared,
+                        report=evaluation.report,
+                    )
+        except (OSError, RuntimeError, sqlite3.Error) as exc:
+            logger.error(f"[eval] No se pudo persistir el reporte: {exc}")
+            return 1
+    _emit_markdown(_golden_batch_markdown(evaluations), args.out)
+    return 1 if failed else 0
+
+
+def _golden_batch_markdown(evaluations: list[RunEvaluation]) -> str:
+    ok = [(e.db_path.name, e, e.report) for e in evaluations if e.report is not None]
+    lines = [f"# Evaluación contra golden — lote de {len(evaluations)} runs", ""]
+    if not ok:
+        lines.append("Ningún run pudo evaluarse.")
+        return "\n".join(lines) + "\n"
+    base_name, _, base = ok[0]
+    lines += [
+        f"Línea base: `{base_name}`. Las diferencias (Δ) son contra ella.",
+        "",
+        "## Detección de emociones",
+        "",
+        "| run | unidades | TP / FP / FN | precisión | recall | F1 | ΔF1 | segundos |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for name, evaluation, report in ok:
+        lines.append(
+            f"| `{name}` | {report.unidades} | {report.tp} / {report.fp} / {report.fn} "
+            f"| {_fmt(report.precision)} | {_fmt(report.recall)} | {_fmt(report.f1)} "
+            f"| {_delta(report.f1, base.f1)} | {evaluation.seconds:.2f} |"
+        )
+    lines += [
+        "",
+        "## Accuracy por dimensión",
+        "",
+        "| run | " + " | ".join(DIMENSIONES) + " |",
+        "|---|" + "---|" * len(DIMENSIONES),
+    ]
+    for name, _, report in ok:
+        celdas = []
+        for dimension in DIMENSIONES:
+            accuracy = report.dim_accuracy(dimension)
+            delta = _delta(accuracy, base.dim_accuracy(dimension))
+            celdas.append(f"{_fmt(accuracy)} ({delta})")
+        lines.append(f"| `{name}` | " + " | ".join(celdas) + " |")
+    failed = [e for e in evaluations if e.report is None]
+    if failed:
+        lines += ["", "## Runs sin evaluar", ""]
+        lines += [f"- `{e.db_path.name}`: {e.error}" for e in failed]
+    return "\n".join(lines) + "\n"
+
+
+def _delta(value: float | None, base: float | None) -> str:
+    if value is None or base is None:
+        return "-"
+    return f"{value - base:+.3f}"
+
+
 def _golden_markdown(
     report: MatchReport,
     *,
@@ -427,7 +539,7 @@ def _agreement(args: argparse.Namespace) -> int:
         logger.error(f"[eval] Planilla de acuerdo inválida: {exc}")
         return 1
 
-    rows = frame.to_dict(orient="records")
+    rows = frame[["anotador", "pasada", "id_muestra"]].to_dict(orient="records")
     for row in rows:
         row["_coder"] = coder_id(row)
     if any(not str(row.get("anotador") or "").strip() for row in rows):
@@ -451,55 +563,79 @@ def _agreement(args: argparse.Namespace) -> int:
     if len(coders) < 2:
         logger.error("[eval] El acuerdo requiere al menos dos anotadores o pasadas.")
         return 1
-    index = {(str(row["_coder"]), str(row["id_muestra"])): row for row in rows}
+
+    n_bootstrap = getattr(args, "bootstrap", 0) or 0
+    results = agreement_by_dimension(
+        _agreement_dimensions(frame.assign(_coder=[row["_coder"] for row in rows]), coders, units),
+        n_bootstrap=n_bootstrap,
+        seed=getattr(args, "seed", 42),
+    )
 
     lines = [
         "# Acuerdo de anotación (alpha de Krippendorff)",
         "",
         f"Codificadores: {len(coders)} ({', '.join(coders)}) — Unidades: {len(units)}",
         "",
-        "| dimensión | métrica | alpha |",
-        "|---|---|---|",
     ]
-    for label, suffix, metric in _AGREEMENT_DIMENSIONS:
-        matrix = _agreement_matrix(index, coders, units, suffix)
-        alpha = krippendorff_alpha(matrix, metric=metric)  # type: ignore[arg-type]
-        value = f"{alpha:.3f}" if alpha is not None else "insuf. datos"
-        lines.append(f"| {label} | {metric} | {value} |")
+    if n_bootstrap:
+        lines += [
+            f"| dimensión | métrica | alpha | IC 95% ({n_bootstrap} réplicas) |",
+            "|---|---|---|---|",
+        ]
+    else:
+        lines += ["| dimensión | métrica | alpha |", "|---|---|---|"]
+    for label, result in results.items():
+        value = f"{result.alpha:.3f}" if result.alpha is not None else "insuf. datos"
+        row_md = f"| {label} | {result.metric} | {value} |"
+        if n_bootstrap:
+            ci = (
+                f"[{result.ci_low:.3f}, {result.ci_high:.3f}]"
+                if result.ci_low is not None and result.ci_high is not None
+                else "-"
+            )
+            row_md += f" {ci} |"
+        lines.append(row_md)
 
     markdown = "\n".join(lines) + "\n"
     _emit_markdown(markdown, args.out)
     return 0
 
 
-def _agreement_matrix(
-    index: dict[tuple[str, str], dict[str, Any]],
+def _agreement_dimensions(
+    frame: pd.DataFrame,
     coders: list[str],
     units: list[str],
-    suffix: str,
-) -> list[list[Any]]:
-    if suffix == "hay_emocion":
-        return [
-            [_agreement_value(index.get((coder, unit)), "hay_emocion") for unit in units]
-            for coder in coders
-        ]
-    items = [(unit, slot) for unit in units for slot in range(1, EMOTION_SLOTS + 1)]
-    return [
-        [
-            _agreement_value(index.get((coder, unit)), f"emocion_{slot}_{suffix}")
-            for unit, slot in items
-        ]
-        for coder in coders
-    ]
-
+) -> dict[str, tuple[list[list[Any]], Metric]]:
+    """Matrices codificadores × unidades de cada dimensión, armadas por columnas.
+
+    Las dimensiones por emoción ponen los slots de una unidad uno detrás del
+    otro: la columna (unidad, slot) es una unidad de acuerdo.
+    """
+    indexed = frame.set_index(["_coder", "id_muestra"])
+
+    def wide(column: str) -> np.ndarray:
+        values = _agreement_values(indexed[column], column)
+        return (
+            values.unstack("id_muestra").reindex(index=coders, columns=units).to_numpy(dtype=object)
+        )
 
-def _agreement_value(row: dict[str, Any] | None, column: str) -> str | None:
-    if row is None:
-        return None
-    value = " ".join(str(row.get(column) or "").strip().lower().split())
+    dimensions: dict[str, tuple[list[list[Any]], Metric]] = {}
+    for label, suffix, metric in _AGREEMENT_DIMENSIONS:
+        if suffix == "hay_emocion":
+            matrix = wide("hay_emocion")
+        else:
+            slots = [wide(f"emocion_{slot}_{suffix}") for slot in range(1, EMOTION_SLOTS + 1)]
+            matrix = np.stack(slots, axis=2).reshape(len(coders), -1)
+        dimensions[label] = (matrix.tolist(), metric)
+    return dimensions
+
+
+def _agreement_values(values: pd.Series, column: str) -> pd.Series:
+    """Normaliza una columna de anotación: minúsculas, espacios colapsados, '' → None."""
+    normalized = values.fillna("").astype(str).str.lower().str.split().str.join(" ")
     if column == "hay_emocion":
-        value = {"sí": "si", "s": "si", "1": "si", "n": "no", "0": "no"}.get(value, value)
-    return value or None
+        normalized = normalized.replace({"sí": "si", "s": "si", "1": "si", "n": "no", "0": "no"})
+    return normalized.where(normalized != "", None)
 
 
 def _control(args: argparse.Namespace) -> int:
@@ -4,20 +4,38 @@
 #  Subcomando `emoparse export`.
 #
 #  Exporta las tablas principales de una corrida desde una DB SQLite
-#  hacia archivos CSV en un directorio de salida.
+#  hacia archivos CSV, Parquet o JSONL comprimido en un directorio de salida.
+#  Reporta filas por segundo de cada tabla y el pico de memoria del proceso.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 
 from loguru import logger
 
-from emoparse.io.exporters import export_full_run
+from emoparse.io.exporters import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    ExportUnavailableError,
+    export_run,
+)
 from emoparse.storage.db import Database
 
 
+def _peak_memory_mb() -> float | None:
+    """Pico de memoria residente del proceso en MB, o None si no se puede medir."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB; macOS, bytes.
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
 def handle(args: argparse.Namespace) -> int:
     """Ejecuta el subcomando `export`."""
     db_path = Path(args.db)
@@ -26,19 +44,32 @@ def handle(args: argparse.Namespace) -> int:
         return 1
 
     output_dir = Path(args.output_dir)
+    fmt = getattr(args, "format", "csv")
 
+    db = Database(db_path)
     try:
-        db = Database(db_path)
-        counts = export_full_run(db, output_dir)
+        report = export_run(
+            db,
+            output_dir,
+            fmt=fmt,
+            chunk_size=getattr(args, "chunk_size", DEFAULT_CHUNK_SIZE),
+            workers=getattr(args, "workers", 4),
+        )
+    except ExportUnavailableError as e:
+        logger.error(f"[export] {e}")
+        return 1
     except Exception as e:
         logger.error(f"[export] Error inesperado: {e}")
         return 1
+    finally:
+        db.close_thread_connection()
 
     print(f"Export completado → {output_dir.resolve()}")
-    print(f"  discursos.csv       : {counts['discursos']} filas")
-    print(f"  metadata_genero.csv : {counts['metadata_genero']} filas")
-    print(f"  frases.csv          : {counts['frases']} filas")
-    print(f"  emociones.csv       : {counts['emociones']} filas")
+    for table in report.tables.values():
+        print(f"  {table.path.name:<24}: {table.rows} filas  ({table.rows_per_s:,.0f} filas/s)")
+    print(f"  tiempo total            : {report.elapsed_s:.1f}s")
+    peak = _peak_memory_mb()
+    print(f"  pico de memoria         : {f'{peak:.0f} MB' if peak is not None else 'n/d'}")
 
     return 0
 
@@ -47,13 +78,19 @@ def register(subparsers: argparse._SubParsersAction) -> None:
     """Registra `export` como subcomando en el CLI principal."""
     p = subparsers.add_parser(
         "export",
-        help=("Exporta los resultados del run a CSVs, incluida la metadata de género declarada."),
+        help=(
+            "Exporta los resultados del run a CSV, Parquet o JSONL, incluida la "
+            "metadata de género declarada."
+        ),
         description=(
-            "Genera cuatro CSVs en el directorio de salida: discursos.csv, "
-            "metadata_genero.csv, frases.csv y emociones.csv. La metadata "
-            "propia del género se exporta en formato largo, con etiquetas y "
-            "presencia por campo. Los payloads de stages a nivel discurso se "
-            "flatten a columnas; los de frases se preservan como JSON strings."
+            "Genera cuatro archivos en el directorio de salida: discursos, "
+            "metadata_genero, frases y emociones, con la extensión del formato "
+            "elegido (.csv, .parquet o .jsonl.gz). La metadata propia del género "
+            "se exporta en formato largo, con etiquetas y presencia por campo. "
+            "Los payloads de stages a nivel discurso se flatten a columnas; los "
+            "de frases se preservan como JSON strings. Las tablas se leen en "
+            "lotes y se exportan en paralelo; al final se informan filas por "
+            "segundo y el pico de memoria."
         ),
     )
     p.add_argument("--db", required=True, help="Path al .sqlite del run.")
@@ -61,6 +98,25 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         "--output-dir",
         required=True,
         dest="output_dir",
-        help="Directorio donde escribir los CSVs. Se crea si no existe.",
+        help="Directorio donde escribir los archivos. Se crea si no existe.",
+    )
+    p.add_argument(
+        "--format",
+        choices=tuple(EXPORT_FORMATS),
+        default="csv",
+        help="Formato de salida. parquet requiere el extra `data`. Default: csv.",
+    )
+    p.add_argument(
+        "--chunk-size",
+        dest="chunk_size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Filas por lote de lectura y escritura. Default: {DEFAULT_CHUNK_SIZE}.",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Tablas exportadas en paralelo. 1 las exporta en serie. Default: 4.",
     )
     p.set_defaults(handler=handle)
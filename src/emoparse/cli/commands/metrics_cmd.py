@@ -5,7 +5,8 @@
 #
 #  Lee la tabla `run_metrics` y muestra la última ejecución registrada
 #  para cada stage de un run. Incluye cantidades procesadas, latencias,
-#  uso de tokens y estadísticas de cache.
+#  uso de tokens, estadísticas de cache y prefill evitado por snapshots del
+#  system prompt (llama_cpp).
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
@@ -59,6 +60,8 @@ def handle(args: argparse.Namespace) -> int:
         ("tok/s", 8),
         ("hits", 6),
         ("misses", 7),
+        ("saved_tok", 10),
+        ("render_ms", 10),
     ]
     header_line = " ".join(f"{h:>{w}}" for h, w in headers)
     print(header_line)
@@ -66,6 +69,8 @@ def handle(args: argparse.Namespace) -> int:
 
     for r in rows:
         model_alias = r["model_alias"] if "model_alias" in r.keys() else None
+        prefill_saved = r["prefill_tokens_saved"] if "prefill_tokens_saved" in r.keys() else 0
+        render_ms = r["render_ms"] if "render_ms" in r.keys() else None
         cells = [
             (r["stage_name"], 18, "left"),
             (str(model_alias or "—"), 22, "left"),
@@ -79,6 +84,8 @@ def handle(args: argparse.Namespace) -> int:
             (_fmt_tok_s(r["total_completion_tokens"], r["total_latency_ms"]), 8, "right"),
             (str(r["cache_hits"]), 6, "right"),
             (str(r["cache_misses"]), 7, "right"),
+            (str(prefill_saved or 0), 10, "right"),
+            (_fmt_ms(render_ms), 10, "right"),
         ]
         line_parts = []
         for value, width, align in cells:
@@ -8,8 +8,12 @@
 #  2) Construye las aristas de los grafos pedidos (--graphs). El grafo
 #     `follow` no se construye: se lee ya persistido por `emoparse follows`.
 #  3) Calcula métricas por nodo, comunidades (Louvain, seed fija) y, con
-#     --cliques, las cliques de vínculos recíprocos.
-#  4) Persiste aristas y métricas en la DB (idempotente por grafo).
+#     --cliques, las cliques de vínculos recíprocos. Los grafos son
+#     independientes: con --workers (o automático en corpus grandes) se
+#     miden en procesos aparte.
+#  4) Persiste aristas y métricas en la DB (idempotente por grafo). Con
+#     --incremental solo rehace las aristas de los posts cambiados desde la
+#     última construcción (anotados por triggers en `red_pendientes`).
 #  5) Acoplamiento emocional: perfil fórico por comunidad, matriz de
 #     transición en hilos y, con --flujo, cómo circula la emoción entre
 #     comunidades (contagio por tipo y transición intra vs inter).
@@ -27,6 +31,10 @@
 from __future__ import annotations
 
 import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 import pandas as pd
@@ -37,6 +45,7 @@ from emoparse.network import (
     GRAFOS,
     GRAFOS_AUTOR,
     build_edges,
+    build_edges_for_posts,
     community_emotion_profile,
     compute_node_metrics,
     contagion_lift,
@@ -46,11 +55,13 @@ from emoparse.network import (
     foria_by_post,
     foria_transition_by_scope,
     foria_transition_matrix,
+    pares_respuesta,
+    posts_afectados,
     tipos_por_post,
     to_graph,
 )
 from emoparse.network import simulacro_similarity as sim
-from emoparse.network.emotion_coupling import FORIAS
+from emoparse.network.emotion_coupling import FORIAS, ParesRespuesta
 from emoparse.network.export import export_graph, export_table
 from emoparse.network.metrics import NetworkUnavailableError
 from emoparse.storage.db import Database
@@ -139,7 +150,23 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         "--seed",
         type=int,
         default=42,
-        help="Seed para la detección de comunidades (reproducibilidad).",
+        help="Seed para la detección de comunidades y el muestreo de la "
+        "intermediación en grafos grandes (reproducibilidad).",
+    )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reconstruye solo las aristas de los posts que cambiaron (o cuyas "
+        "menciones y hashtags cambiaron) desde la última construcción de cada "
+        "grafo, y reutiliza las métricas de los grafos sin cambios. Un grafo "
+        "nunca construido va entero.",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Procesos que miden los grafos en paralelo (uno por grafo). "
+        "Default: automático (paralelo solo en corpus grandes).",
     )
     p.add_argument(
         "--profile-graph",
@@ -181,6 +208,12 @@ def run(args: argparse.Namespace) -> int:
 
     db = Database(db_path)
     RunsRepository(db).ensure_migrations()
+    red_repo = RedRepository(db)
+    # Qué reconstruir se decide antes de leer el corpus: un cambio posterior a
+    # este punto queda anotado para la próxima construcción.
+    preparados = red_repo.preparar_construccion(
+        [g for g in graphs if g in GRAFOS], getattr(args, "incremental", False)
+    )
     df_posts = _read_df(db, "SELECT * FROM posts")
     df_tecno = _read_df(db, "SELECT * FROM tecno_entidades")
     df_emociones = _read_df(db, "SELECT * FROM emociones")
@@ -206,19 +239,25 @@ def run(args: argparse.Namespace) -> int:
                 "Los grafos de interacción requieren un corpus de posts. Para "
                 "similitud entre discursos, agregá --semantico o --similitud."
             )
+            red_repo.revertir_construccion(preparados)
             return 1
+        red_repo.revertir_construccion(preparados)
+        preparados = {}
 
     logger.info(
         f"[network] Corpus: {len(df_posts)} posts, {len(df_tecno)} "
         f"tecno-entidades, {len(df_emociones)} emociones."
     )
 
-    red_repo = RedRepository(db)
     try:
-        comunidades = _procesar_grafos(red_repo, df_posts, df_tecno, graphs, args)
+        comunidades = _procesar_grafos(red_repo, df_posts, df_tecno, graphs, preparados, args)
     except NetworkUnavailableError as e:
+        red_repo.revertir_construccion(preparados)
         logger.error(f"[network] {e}")
         return 2
+    except BaseException:
+        red_repo.revertir_construccion(preparados)
+        raise
 
     if not df_posts.empty:
         _reporte_emocional(df_posts, df_emociones, comunidades, args)
@@ -239,76 +278,226 @@ def _procesar_grafos(
     df_posts: pd.DataFrame,
     df_tecno: pd.DataFrame,
     graphs: tuple[str, ...],
+    preparados: dict[str, set[str] | None],
     args: argparse.Namespace,
 ) -> dict[str, dict[str, int]]:
     """Construye, mide, persiste y (opcionalmente) exporta cada grafo.
 
-    Devuelve las comunidades detectadas por grafo (insumo del perfil
-    emocional por comunidad).
+    `preparados` (de `RedRepository.preparar_construccion`) dice, por grafo
+    construible, si va entero (None) o incremental (los posts cambiados): en
+    ese caso solo se reconstruyen las aristas de los posts afectados y, si no
+    cambió ninguno, se reutilizan las métricas persistidas. Los grafos son
+    independientes entre sí: se miden en paralelo (ver `_medir_grafos`) y se
+    persisten y reportan después, en el orden pedido. Devuelve las
+    comunidades detectadas por grafo (insumo del perfil emocional por
+    comunidad).
     """
-    construibles = tuple(g for g in graphs if g in GRAFOS)
-    df_all = build_edges(df_posts, df_tecno, graphs=construibles)
-    comunidades_por_grafo: dict[str, dict[str, int]] = {}
-
-    print()
+    completos = tuple(g for g in graphs if g in GRAFOS and preparados.get(g) is None)
+    df_all = build_edges(df_posts, df_tecno, graphs=completos) if completos else pd.DataFrame()
+    aristas_por_grafo: dict[str, pd.DataFrame] = {}
+    pagerank_previo: dict[str, dict[str, float]] = {}
+    reutilizados: dict[str, pd.DataFrame] = {}
+    avisos: dict[str, str] = {}
     for grafo in graphs:
+        cambiados = preparados.get(grafo)
         if grafo == GRAFO_FOLLOW:
             # Adquirido de la plataforma, no derivable del corpus: se lee de
             # donde lo dejó `emoparse follows` y solo se vuelve a medir.
             df_edges = red_repo.load_edges(grafo)
             if df_edges.empty:
-                print(
+                avisos[grafo] = (
                     f"── {grafo}: sin aristas persistidas. Adquirilo con "
                     "`emoparse follows --db <run> --source <fuente>`."
                 )
                 continue
+        elif cambiados is not None:
+            previas = red_repo.load_metrics(grafo)
+            if not cambiados and not (args.cliques or args.export_dir is not None):
+                reutilizados[grafo] = previas
+                continue
+            if cambiados:
+                afectados = posts_afectados(df_posts, grafo, cambiados)
+                nuevas = build_edges_for_posts(df_posts, df_tecno, grafo, afectados)
+                red_repo.replace_edges_for_posts(grafo, afectados, nuevas)
+                logger.info(
+                    f"[network] {grafo}: {len(cambiados)} post(s) cambiados desde la última "
+                    f"construcción; se rehacen las aristas de {len(afectados)}."
+                )
+            df_edges = red_repo.load_edges(grafo)
+            if not previas.empty:
+                pagerank_previo[grafo] = dict(
+                    zip(previas["nodo"].astype(str), previas["pagerank"], strict=True)
+                )
         else:
             df_edges = df_all[df_all["grafo"] == grafo] if not df_all.empty else df_all
         if df_edges.empty:
-            print(
+            avisos[grafo] = (
                 f"── {grafo}: sin aristas (referencias no capturadas o corpus sin ese tipo de interacción)"
             )
             continue
+        aristas_por_grafo[grafo] = df_edges
+
+    medidos = _medir_grafos(aristas_por_grafo, pagerank_previo, args)
+    comunidades_por_grafo: dict[str, dict[str, int]] = {}
 
-        directed = grafo != "hashtag_co"
-        G = to_graph(df_edges, directed=directed)
-        df_metrics = compute_node_metrics(G)
-        communities = detect_communities(G, seed=args.seed)
+    print()
+    for grafo in graphs:
+        if grafo in avisos:
+            print(avisos[grafo])
+            continue
+        if grafo in reutilizados:
+            _reporte_reutilizado(grafo, reutilizados[grafo], comunidades_por_grafo, args)
+            continue
+        medido = medidos[grafo]
+        df_metrics, communities = medido.metricas, medido.comunidades
         comunidades_por_grafo[grafo] = communities
 
-        if grafo != GRAFO_FOLLOW:
-            red_repo.replace_edges(grafo, df_edges)
+        if grafo in completos:
+            red_repo.replace_edges(grafo, aristas_por_grafo[grafo])
         red_repo.replace_metrics(grafo, df_metrics, communities)
 
         n_com = len(set(communities.values())) if communities else 0
         print(
-            f"── {grafo}: {G.number_of_nodes()} nodos, "
-            f"{G.number_of_edges()} aristas, {n_com} comunidades"
+            f"── {grafo}: {medido.n_nodos} nodos, {medido.n_aristas} aristas, {n_com} comunidades"
         )
-        top = df_metrics.head(args.top)
-        for _, r in top.iterrows():
-            com = communities.get(str(r["nodo"]))
-            print(
-                f"     {r['nodo'][:40]:<42s} pagerank={r['pagerank']:.4f} "
-                f"grado={int(r['grado_total'])}" + (f" comunidad={com}" if com is not None else "")
-            )
+        _imprimir_top(df_metrics, communities, args)
 
-        if args.cliques and grafo in GRAFOS_AUTOR:
-            _reporte_cliques(G, grafo, args)
+        if medido.cliques is not None:
+            _reporte_cliques(medido.cliques, grafo, args)
 
-        if args.export_dir is not None:
-            paths = export_graph(
-                G,
-                args.export_dir,
-                grafo,
-                node_attrs=df_metrics,
-                communities=communities,
+        if medido.exportados:
+            logger.info(
+                f"[network] {grafo}: exportado → " + ", ".join(p.name for p in medido.exportados)
             )
-            logger.info(f"[network] {grafo}: exportado → " + ", ".join(p.name for p in paths))
     print()
     return comunidades_por_grafo
 
 
+def _reporte_reutilizado(
+    grafo: str,
+    previas: pd.DataFrame,
+    comunidades_por_grafo: dict[str, dict[str, int]],
+    args: argparse.Namespace,
+) -> None:
+    """Reporta un grafo sin cambios desde la última construcción, con sus métricas persistidas."""
+    if previas.empty:
+        print(f"── {grafo}: sin aristas (sin cambios desde la última construcción)")
+        return
+    con_comunidad = previas[previas["comunidad"].notna()]
+    communities = dict(
+        zip(con_comunidad["nodo"].astype(str), con_comunidad["comunidad"].astype(int), strict=True)
+    )
+    comunidades_por_grafo[grafo] = communities
+    n_com = len(set(communities.values()))
+    print(
+        f"── {grafo}: sin cambios desde la última construcción; {len(previas)} nodos, "
+        f"{n_com} comunidades"
+    )
+    _imprimir_top(previas, communities, args)
+
+
+def _imprimir_top(
+    df_metrics: pd.DataFrame, communities: dict[str, int], args: argparse.Namespace
+) -> None:
+    for _, r in df_metrics.head(args.top).iterrows():
+        com = communities.get(str(r["nodo"]))
+        print(
+            f"     {r['nodo'][:40]:<42s} pagerank={r['pagerank']:.4f} "
+            f"grado={int(r['grado_total'])}" + (f" comunidad={com}" if com is not None else "")
+        )
+
+
+@dataclass
+class _GrafoMedido:
+    """Lo que `_medir_grafo` calcula de un grafo, listo para persistir y reportar."""
+
+    n_nodos: int
+    n_aristas: int
+    metricas: pd.DataFrame
+    comunidades: dict[str, int]
+    cliques: list[list[str]] | None
+    exportados: list[Path]
+
+
+#: Aristas totales desde las que `--workers` automático mide en paralelo.
+_PARALLEL_FROM_ARISTAS = 200_000
+
+
+def _medir_grafos(
+    aristas_por_grafo: dict[str, pd.DataFrame],
+    pagerank_previo: dict[str, dict[str, float]],
+    args: argparse.Namespace,
+) -> dict[str, _GrafoMedido]:
+    """Mide cada grafo, uno por proceso si hay varios y el corpus lo amerita.
+
+    Con `--workers` None es automático: en el proceso actual por debajo de
+    `_PARALLEL_FROM_ARISTAS` aristas en total, un proceso por CPU desde ahí.
+    `pagerank_previo` arranca en caliente el PageRank de los grafos
+    reconstruidos incrementalmente.
+    """
+    tareas = [
+        (
+            grafo,
+            df_edges,
+            args.seed,
+            args.min_clique if args.cliques and grafo in GRAFOS_AUTOR else None,
+            args.export_dir,
+            pagerank_previo.get(grafo),
+        )
+        for grafo, df_edges in aristas_por_grafo.items()
+    ]
+    n_workers = getattr(args, "workers", None)
+    if n_workers is None:
+        n_aristas = sum(len(df) for df in aristas_por_grafo.values())
+        n_workers = (os.cpu_count() or 1) if n_aristas >= _PARALLEL_FROM_ARISTAS else 1
+    n_workers = min(n_workers, len(tareas))
+    if n_workers <= 1:
+        return {tarea[0]: _medir_grafo(*tarea) for tarea in tareas}
+
+    logger.info(f"[network] Midiendo {len(tareas)} grafos en {n_workers} procesos.")
+    # `spawn`: los workers no heredan hilos ni la conexión abierta a la DB.
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        futuros = {tarea[0]: pool.submit(_medir_grafo, *tarea) for tarea in tareas}
+        return {grafo: futuro.result() for grafo, futuro in futuros.items()}
+
+
+def _medir_grafo(
+    grafo: str,
+    df_edges: pd.DataFrame,
+    seed: int,
+    min_clique: int | None,
+    export_dir: Path | None,
+    pagerank_inicial: dict[str, float] | None = None,
+) -> _GrafoMedido:
+    """Grafo networkx, métricas, comunidades, cliques y export de un grafo."""
+    G = to_graph(df_edges, directed=grafo != "hashtag_co")
+    df_metrics = compute_node_metrics(G, seed=seed, pagerank_inicial=pagerank_inicial)
+    communities = detect_communities(G, seed=seed)
+    cliques = (
+        detect_cliques(G, min_size=min_clique, mutual_only=True) if min_clique is not None else None
+    )
+    exportados: list[Path] = []
+    if export_dir is not None:
+        exportados = export_graph(
+            G,
+            export_dir,
+            grafo,
+            node_attrs=df_metrics,
+            communities=communities,
+        )
+    return _GrafoMedido(
+        n_nodos=G.number_of_nodes(),
+        n_aristas=G.number_of_edges(),
+        metricas=df_metrics,
+        comunidades=communities,
+        cliques=cliques,
+        exportados=exportados,
+    )
+
+
 def _reporte_emocional(
     df_posts: pd.DataFrame,
     df_emociones: pd.DataFrame,
@@ -323,7 +512,8 @@ def _reporte_emocional(
         )
         return
     foria_map = foria_by_post(df_emociones)
-    matrix = foria_transition_matrix(df_posts, foria_map)
+    pares = pares_respuesta(df_posts)
+    matrix = foria_transition_matrix(df_posts, foria_map, pares=pares)
     if int(matrix.values.sum()) == 0:
         logger.info(
             "[network] Sin pares padre-hijo con foria caracterizada: se "
@@ -335,7 +525,7 @@ def _reporte_emocional(
         print()
     _reporte_comunidades(df_posts, df_emociones, comunidades_por_grafo, args)
     if args.flujo:
-        _reporte_flujo(df_posts, df_emociones, foria_map, comunidades_por_grafo, args)
+        _reporte_flujo(df_posts, df_emociones, foria_map, pares, comunidades_por_grafo, args)
 
 
 def _reporte_comunidades(
@@ -379,9 +569,8 @@ def _reporte_comunidades(
         logger.info(f"[network] perfil por comunidad: exportado → {path.name}")
 
 
-def _reporte_cliques(G, grafo: str, args: argparse.Namespace) -> None:
+def _reporte_cliques(cliques: list[list[str]], grafo: str, args: argparse.Namespace) -> None:
     """Cliques de vínculos recíprocos de un grafo de cuentas."""
-    cliques = detect_cliques(G, min_size=args.min_clique, mutual_only=True)
     if not cliques:
         print(f"     cliques: ninguna de {args.min_clique}+ cuentas con vínculo recíproco")
         return
@@ -400,12 +589,16 @@ def _reporte_flujo(
     df_posts: pd.DataFrame,
     df_emociones: pd.DataFrame,
     foria_map: dict[str, str],
+    pares: ParesRespuesta,
     comunidades_por_grafo: dict[str, dict[str, int]],
     args: argparse.Namespace,
 ) -> None:
-    """Circulación de la emoción: contagio por tipo y transición por alcance."""
+    """Circulación de la emoción: contagio por tipo y transición por alcance.
+
+    Todas las medidas cuentan sobre los mismos `pares` padre→respuesta.
+    """
     tipos = tipos_por_post(df_emociones)
-    lift = contagion_lift(df_posts, tipos)
+    lift = contagion_lift(df_posts, tipos, pares=pares)
     if lift.empty:
         logger.info(
             "[network] Sin pares padre-respuesta con emociones suficientes: "
@@ -426,7 +619,7 @@ def _reporte_flujo(
         return
     comunidades = comunidades_por_grafo[grafo]
 
-    matrices = foria_transition_by_scope(df_posts, foria_map, comunidades)
+    matrices = foria_transition_by_scope(df_posts, foria_map, comunidades, pares=pares)
     for alcance, matriz in matrices.items():
         if int(matriz.values.sum()) == 0:
             continue
@@ -443,7 +636,7 @@ def _reporte_flujo(
                 f"transicion_forica_{alcance}_{grafo}",
             )
 
-    flujo = flujo_entre_comunidades(df_posts, foria_map, comunidades)
+    flujo = flujo_entre_comunidades(df_posts, foria_map, comunidades, pares=pares)
     if flujo.empty:
         return
     print(f"── Circulación entre comunidades ({grafo}):")
@@ -514,7 +707,7 @@ def _reporte_similitud(
     G = to_graph(df_edges, directed=False)
     red_repo.replace_metrics(
         "simulacro",
-        compute_node_metrics(G),
+        compute_node_metrics(G, seed=args.seed),
         {claves[i]: g for i, g in grupos.items()},
     )
 
@@ -577,7 +770,7 @@ def _reporte_semantico(
     ]
     red_repo.replace_edges("semantico", df_edges)
     G = to_graph(df_edges, directed=False)
-    red_repo.replace_metrics("semantico", compute_node_metrics(G), comunidades)
+    red_repo.replace_metrics("semantico", compute_node_metrics(G, seed=args.seed), comunidades)
 
     terminos = emb.terminos_por_comunidad(df_posts, comunidades)
     n_com = len(set(comunidades.values()))
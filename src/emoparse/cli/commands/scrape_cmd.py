@@ -8,6 +8,10 @@
 #  2) Inicializa CsvAppender sobre --output (append idempotente por URL).
 #  3) Itera URLs vía adapter.list_discursos(...) hasta agotar o --max.
 #  4) Para cada URL, salta si ya está en el CSV, sino fetch + append.
+#     Si el adapter separa descarga y parseo (`html_parser`), las URLs
+#     pendientes van al `FetchEngine`: descargas concurrentes con cortesía
+#     por dominio, caché HTTP condicional (--cache-dir) y parseo en otros
+#     procesos. Si no, se descargan de a una con `fetch_discurso`.
 #  5) Filtra por --from / --to (best-effort, después del fetch).
 #
 #  El comando es interruptible: Ctrl-C deja el CSV con todo lo extraído
@@ -18,12 +22,22 @@
 from __future__ import annotations
 
 import argparse
+from collections.abc import Generator, Iterator
+from contextlib import closing
 from datetime import date, datetime
 from pathlib import Path
 
 from loguru import logger
 
-from emoparse.acquisition import SOURCES, CsvAppender, get_source
+from emoparse.acquisition import SOURCES, CsvAppender, DiscursoRecord, SourceAdapter, get_source
+from emoparse.acquisition.fetch_engine import (
+    DEFAULT_INTERVAL,
+    DEFAULT_PER_DOMAIN,
+    DEFAULT_WORKERS,
+    FetchEngine,
+    FetchResult,
+    HttpCache,
+)
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
@@ -92,6 +106,39 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         default=20.0,
         help="Timeout HTTP por request (segundos).",
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Descargas simultáneas (fuentes que separan descarga y parseo; "
+        "casarosada solo con --mode http). 1 = de a una.",
+    )
+    p.add_argument(
+        "--per-domain",
+        type=int,
+        default=DEFAULT_PER_DOMAIN,
+        help="Descargas simultáneas por dominio, como máximo.",
+    )
+    p.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="Segundos mínimos entre inicios de solicitud a un mismo dominio.",
+    )
+    p.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Caché HTTP local: guarda cada página con su ETag/Last-Modified y "
+        "la revalida con solicitudes condicionales en corridas siguientes.",
+    )
+    p.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Procesos de parseo del HTML. Default: uno por CPU; 1 = en el "
+        "mismo hilo de la descarga.",
+    )
     p.set_defaults(handler=run)
 
 
@@ -144,6 +191,10 @@ def run(args: argparse.Namespace) -> int:
             return False
         return True
 
+    if args.workers < 1 or args.per_domain < 1 or args.interval < 0:
+        logger.error("[scrape] --workers y --per-domain deben ser ≥ 1, e --interval ≥ 0.")
+        return 2
+
     adapter_kwargs: dict[str, object] = {
         "mode": args.mode,
         "timeout": args.timeout,
@@ -162,28 +213,31 @@ def run(args: argparse.Namespace) -> int:
 
     appender = CsvAppender(args.output)
 
-    try:
-        with adapter:
-            for url in adapter.list_discursos(
-                max_items=max_items_for_listing,
-                from_date=args.from_date,
-                to_date=args.to_date,
-            ):
-                if appender.has_url(url):
-                    n_skipped += 1
-                    logger.debug(f"[scrape] Ya en CSV, skip: {url}")
-                    continue
+    def _pendientes() -> Iterator[str]:
+        nonlocal n_skipped
+        for url in adapter.list_discursos(
+            max_items=max_items_for_listing,
+            from_date=args.from_date,
+            to_date=args.to_date,
+        ):
+            if appender.has_url(url):
+                n_skipped += 1
+                logger.debug(f"[scrape] Ya en CSV, skip: {url}")
+                continue
+            yield url
 
-                try:
-                    record = adapter.fetch_discurso(url)
-                except Exception as e:
+    try:
+        with adapter, closing(_resultados(adapter, _pendientes(), args)) as resultados:
+            for resultado in resultados:
+                if resultado.error is not None:
                     n_failed += 1
-                    logger.exception(f"[scrape] Error fetcheando {url}: {e}")
+                    logger.error(f"[scrape] Error fetcheando {resultado.url}: {resultado.error}")
                     continue
 
+                record = resultado.record
                 if record is None:
                     n_failed += 1
-                    logger.warning(f"[scrape] Sin contenido: {url}")
+                    logger.warning(f"[scrape] Sin contenido: {resultado.url}")
                     continue
 
                 if not _date_in_range(record.fecha):
@@ -213,3 +267,35 @@ def run(args: argparse.Namespace) -> int:
         f"→ {args.output}"
     )
     return 0
+
+
+def _resultados(
+    adapter: SourceAdapter, urls: Iterator[str], args: argparse.Namespace
+) -> Generator[FetchResult, None, None]:
+    """Descarga y parsea `urls`: con `FetchEngine` si el adapter lo permite, si no en serie."""
+    parser = adapter.html_parser()
+    if parser is None:
+        for url in urls:
+            yield _fetch_serial(adapter, url)
+        return
+    engine = FetchEngine(
+        parser,
+        workers=args.workers,
+        per_domain=args.per_domain,
+        interval=args.interval,
+        cache=HttpCache(args.cache_dir) if args.cache_dir is not None else None,
+        parse_workers=args.parse_workers,
+        timeout=args.timeout,
+    )
+    with closing(engine.run(urls)) as resultados:
+        yield from resultados
+
+
+def _fetch_serial(adapter: SourceAdapter, url: str) -> FetchResult:
+    record: DiscursoRecord | None
+    try:
+        record = adapter.fetch_discurso(url)
+    except Exception as e:
+        logger.opt(exception=e).debug(f"[scrape] Traza del error en {url}")
+        return FetchResult(url=url, record=None, error=f"{type(e).__name__}: {e}")
+    return FetchResult(url=url, record=record)
@@ -0,0 +1,91 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.cli.commands.snapshot_cmd
+#
+#  Subcomando `emoparse snapshot`.
+#
+#  Materializa (o refresca) la instantánea Parquet de uno o más runs: tablas
+#  aplanadas y tipadas de emociones, menciones, posts y aristas, que leen las
+#  tabs agregadas del dashboard y la capa analítica (DuckDB). El refresco es
+#  incremental por código salvo con --full.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from loguru import logger
+
+from emoparse.storage.analytics import AnalyticsUnavailableError
+
+
+def handle(args: argparse.Namespace) -> int:
+    """Ejecuta el subcomando `snapshot`."""
+    from emoparse.storage.snapshot import build_snapshot
+
+    db_paths = [Path(p).expanduser() for p in args.db]
+    faltantes = [p for p in db_paths if not p.is_file()]
+    if faltantes:
+        for p in faltantes:
+            logger.error(f"[snapshot] DB no encontrada: {p}")
+        return 1
+    if args.output_dir and len(db_paths) > 1:
+        logger.error("[snapshot] --output-dir admite un único --db.")
+        return 1
+
+    for db_path in db_paths:
+        try:
+            report = build_snapshot(
+                db_path,
+                Path(args.output_dir) if args.output_dir else None,
+                full=args.full,
+            )
+        except AnalyticsUnavailableError as e:
+            logger.error(f"[snapshot] {e}")
+            return 1
+
+        modo = "completa" if report.full else "incremental"
+        print(f"Instantánea {modo} → {report.snapshot_dir.resolve()}")
+        print(
+            f"  códigos recalculados : {report.n_changed}/{report.n_codigos}"
+            f" ({report.n_removed} eliminados)"
+        )
+        for table, n in report.rows.items():
+            print(f"  {table + '.parquet':<21}: {n} filas")
+        print(f"  tiempo               : {report.elapsed_s:.1f}s")
+    return 0
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    """Registra `snapshot` como subcomando en el CLI principal."""
+    p = subparsers.add_parser(
+        "snapshot",
+        help="Materializa una instantánea Parquet del run para las vistas agregadas.",
+        description=(
+            "Escribe emociones.parquet, menciones.parquet, posts.parquet y "
+            "aristas.parquet en <run>.snapshot/, junto al .sqlite. Las emociones "
+            "traen la caracterización en columnas y los referentes canónicos "
+            "resueltos. Un refresco recalcula solo los códigos que cambiaron. "
+            "Requiere pyarrow (extra `data`); el dashboard la usa mientras la "
+            "base no cambie y `storage.analytics.attach_snapshots` la consulta "
+            "con DuckDB."
+        ),
+    )
+    p.add_argument(
+        "--db",
+        required=True,
+        action="append",
+        help="Path al .sqlite del run. Repetible para refrescar varios runs.",
+    )
+    p.add_argument(
+        "--output-dir",
+        dest="output_dir",
+        default=None,
+        help="Directorio de la instantánea. Default: <run>.snapshot/ junto a la base.",
+    )
+    p.add_argument(
+        "--full",
+        action="store_true",
+        help="Reconstruye todo en vez de refrescar los códigos cambiados.",
+    )
+    p.set_defaults(handler=handle)
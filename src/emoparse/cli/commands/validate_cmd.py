@@ -58,16 +58,15 @@ def handle(args: argparse.Namespace) -> int:
     # Filtro por código si está definido.
     codigo_filter: str | None = getattr(args, "codigo", None)
 
-    runner = ValidationRunner(db, characterization_constraints=characterization_constraints)
-
-    if codigo_filter:
-        # Ejecución limitada al discurso especificado.
-        issues = runner._run_discurso(codigo_filter)  # noqa: SLF001
-        if issues:
-            runner._repo.delete_issues_for_codigo(codigo_filter)  # noqa: SLF001
-            runner._repo.save_issues(issues)  # noqa: SLF001
-    else:
-        issues = runner.run()
+    runner = ValidationRunner(
+        db,
+        characterization_constraints=characterization_constraints,
+        workers=getattr(args, "workers", None),
+    )
+    runner.run(
+        [codigo_filter] if codigo_filter else None,
+        incremental=getattr(args, "incremental", False),
+    )
 
     repo = ValidationRepository(db)
     total = repo.count_total()
@@ -175,6 +174,23 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         dest="verbose_issues",
         help="Mostrar detalle de cada issue aunque sean muchas.",
     )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Revalidar solo los discursos cuyas emociones, caracterización o "
+            "enunciación cambiaron desde la última validación."
+        ),
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=(
+            "Procesos que aplican los validators. Default: automático (paralelo "
+            "solo en corpus grandes)."
+        ),
+    )
     p.add_argument(
         "--knowledge-dir",
         dest="knowledge_dir",
@@ -91,6 +91,14 @@ class PipelineConfig(BaseModel):
         "lmstudio); con llama_cpp in-process el runner lo "
         "fuerza a 1.",
     )
+    prefetch: int = Field(
+        default=1,
+        ge=0,
+        description="Discursos (o paquetes) y batches que las stages por frase "
+        "preparan por delante del que está en el modelo: lecturas de la DB, "
+        "contexto, prompt y gramática del siguiente se arman en un hilo "
+        "auxiliar mientras se decodifica el actual. 0 = todo en serie.",
+    )
     max_retries: int = Field(default=3, ge=0)
     retry_delays_seconds: list[int] = Field(
         default_factory=lambda: [2, 8, 15],
@@ -129,7 +137,9 @@ class VersionsConfig(BaseModel):
     """Versions del run. Strings opacos; actualizar manualmente.
 
     Campos equivalentes a `storage.models.Versions`, unificados al construir
-    RunContext en Runner.
+    RunContext en Runner. Son etiquetas de auditoría y de purga del caché: la
+    clave del caché LLM se deriva del contenido de cada llamada, así que no
+    hace falta bumpearlas para invalidarlo.
     """
 
     model_config = ConfigDict(extra="forbid")
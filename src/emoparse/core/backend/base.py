@@ -157,6 +157,16 @@ class LLMBackend(ABC):
         Ejemplo: KV-cache en llama.cpp. Default: no-op. Override en backends con estado.
         """
 
+    def prepare(self, schema: type[BaseModel], max_items: int | None = None) -> None:
+        """Deja lista la parte de una llamada futura que no depende del prompt.
+
+        La invocan los agentes desde un hilo auxiliar mientras el modelo
+        decodifica el batch anterior (ver `emoparse.core.prefetch`). Ejemplo:
+        compilar la gramática GBNF de `schema` acotada a `max_items`. No debe
+        lanzar: si algo falla, `generate` lo reproduce y lo informa en el hilo
+        que llama. Default: no-op.
+        """
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} alias={getattr(self, 'alias', '?')!r}>"
 
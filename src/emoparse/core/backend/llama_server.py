@@ -269,6 +269,13 @@ class LlamaServerBackend(LLMBackend):
         logger.debug(f"[LlamaServer:{self.alias}] Gramática generada: {key}")
         return gbnf
 
+    def prepare(self, schema: type[BaseModel], max_items: int | None = None) -> None:
+        """Genera de antemano la gramática de la próxima llamada."""
+        try:
+            self._get_grammar(schema, max_items)
+        except SchemaViolationError:
+            pass  # `generate` la vuelve a generar y lanza en el hilo que llama.
+
     # ── Liberación de recursos ───────────────────────────────────────────────
 
     def close(self) -> None:
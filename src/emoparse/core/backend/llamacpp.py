@@ -5,11 +5,17 @@
 #
 #  Soporta generación estructurada (GBNF), aplicación de chat templates,
 #  configuración de seed/temperatura, errores tipados y métricas en LLMResponse.
+#  Evalúa una sola vez el prefijo del chat template que lleva el system prompt
+#  y guarda su KV-state (LRU acotado): todas las llamadas con ese system
+#  arrancan del mismo snapshot y solo evalúan lo que sigue.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
+import hashlib
 import time
+from collections import OrderedDict
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from loguru import logger
@@ -31,7 +37,7 @@ from emoparse.core.grammar import GrammarError, schema_to_gbnf
 
 if TYPE_CHECKING:
     # Solo se importa al chequear tipos.
-    from llama_cpp import Llama, LlamaGrammar
+    from llama_cpp import Llama, LlamaGrammar, LlamaState
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -39,12 +45,20 @@ T = TypeVar("T", bound=BaseModel)
 _DEFAULT_TEMPERATURE = 0.0
 _DEFAULT_MAX_TOKENS = 2048
 _DEFAULT_SEED = 42
+#: Snapshots de KV-state por system prompt que se conservan (0 = desactivado).
+_DEFAULT_PREFIX_CACHE_SLOTS = 4
 
 
 class LlamaCppBackend(LLMBackend):
     """Backend llama.cpp para GGUFs locales con generación estructurada.
 
-    Usa caché de gramáticas GBNF compiladas.
+    Usa caché de gramáticas GBNF compiladas y, con `prefix_cache_slots > 0`
+    en el config del modelo, un LRU de snapshots del KV-state por system
+    prompt: el prefijo del chat template hasta el turno del usuario se evalúa
+    solo y se guarda, y toda llamada con ese system (la primera incluida)
+    arranca de ese snapshot. El estado de partida no depende del orden de
+    las llamadas ni de cuáles resolvió el caché LLM, y el prefill del
+    prefijo compartido se evita.
     """
 
     def __init__(
@@ -101,6 +115,11 @@ class LlamaCppBackend(LLMBackend):
         # Cache de gramáticas compiladas; se limpia al descargar backend.
         self._grammar_cache: dict[str, LlamaGrammar] = {}
 
+        # Snapshots del KV-state por system prompt; se limpian al descargar.
+        self._prefix_cache = _PrefixStateCache(
+            int(self._cfg.get("prefix_cache_slots", _DEFAULT_PREFIX_CACHE_SLOTS))
+        )
+
         logger.info(f"[LlamaCpp:{alias}] Cargando modelo: {path}")
 
         # Seed en constructor para determinismo; reproducible entre runs.
@@ -156,11 +175,6 @@ class LlamaCppBackend(LLMBackend):
                 "Usá un modelo multimodal vía backend llama_server "
                 "(llama-server --mmproj ...)."
             )
-        # Reset opcional del KV-cache antes de resolver parámetros y
-        # construir prompts.
-        if reset_before:
-            self.reset_state()
-
         # Resolver parámetros con defaults del modelo.
         eff_max_tokens = max_tokens if max_tokens is not None else self._default_max_tokens
         eff_temp = temperature if temperature is not None else self._default_temperature
@@ -172,6 +186,18 @@ class LlamaCppBackend(LLMBackend):
         if self._no_think:
             sys_content = f"{sys_content}\n\n/no_think" if sys_content else "/no_think"
 
+        # Con snapshots activos, cada llamada arranca del KV-state del prefijo
+        # de su system (evaluado una vez, en el primer uso): siempre el mismo
+        # estado de partida, como con `reset_before`. Si el snapshot no se
+        # puede armar (GGUF sin chat template) se vacía el KV; sin snapshots
+        # configurados, reset opcional.
+        snapshot_ids = None
+        hit = False
+        if self._prefix_cache.enabled:
+            snapshot_ids, hit = self._restore_prefix(sys_content)
+        if snapshot_ids is None and (reset_before or self._prefix_cache.enabled):
+            self.reset_state()
+
         messages: list[dict[str, str]] = []
         if sys_content:
             messages.append({"role": "system", "content": sys_content})
@@ -256,6 +282,17 @@ class LlamaCppBackend(LLMBackend):
             completion_tokens=usage_dict.get("completion_tokens", 0),
         )
 
+        # Prefill evitado: tokens del prompt que coinciden con un snapshot
+        # reusado. El que se acaba de construir no ahorra nada en esta
+        # llamada; llama.cpp re-evalúa siempre al menos el último token.
+        extra: dict[str, Any] = {}
+        if self._prefix_cache.enabled:
+            reused = 0
+            if hit and snapshot_ids is not None:
+                reused = _common_prefix_len(snapshot_ids, self._llm.input_ids)
+                reused = max(0, min(reused, usage.prompt_tokens - 1))
+            extra["prefill_tokens_saved"] = reused
+
         # Parseo Pydantic; con GBNF no debería fallar.
         parsed: BaseModel | None = None
         if schema is not None:
@@ -276,6 +313,79 @@ class LlamaCppBackend(LLMBackend):
             model_alias=self.alias,
             cache_hit=False,
             finish_reason=finish,
+            extra=extra,
+        )
+
+    # ── Snapshots del prefijo del system ─────────────────────────────────────
+
+    def _restore_prefix(self, sys_content: str) -> tuple[list[int] | None, bool]:
+        """Carga el snapshot del prefijo de `sys_content`, construyéndolo si falta.
+
+        Devuelve los token ids del snapshot (None si no se pudo armar) y si
+        ya existía antes de esta llamada.
+        """
+        key = _prefix_key(sys_content)
+        hit = key in self._prefix_cache
+        if not hit:
+            try:
+                tokens = self._system_prefix_tokens(sys_content)
+            except Exception as e:
+                logger.warning(f"[LlamaCpp:{self.alias}] No se pudo tokenizar el prefijo: {e}")
+                return None, False
+            if tokens is None:
+                return None, False
+            self._prefix_cache.build(self._llm, key, tokens)
+        return self._prefix_cache.restore(self._llm, key), hit
+
+    def _system_prefix_tokens(self, sys_content: str) -> list[int] | None:
+        """Tokens del prompt de chat hasta el contenido del turno del usuario.
+
+        Se renderiza el template con dos user distintos y se toma el texto
+        común: depende solo del system. Si el chat_format que elige
+        llama-cpp-python difiere del template del GGUF, el snapshot coincide
+        menos con el prompt real y se ahorra menos, pero llama.cpp re-evalúa
+        todo lo que no coincide.
+        """
+        formatter = self._chat_formatter
+        if formatter is None:
+            return None
+        prompts = [
+            formatter(
+                messages=[
+                    *([{"role": "system", "content": sys_content}] if sys_content else []),
+                    {"role": "user", "content": sonda},
+                ]
+            )
+            for sonda in ("A", "B")
+        ]
+        a, b = (p.prompt for p in prompts)
+        prefix = a[: _common_prefix_len(a, b)]
+        tokens = self._llm.tokenize(
+            prefix.encode("utf-8"), add_bos=not prompts[0].added_special, special=True
+        )
+        return list(tokens)
+
+    @cached_property
+    def _chat_formatter(self) -> Any | None:
+        """Formatter del chat template del GGUF; None si el modelo no trae uno."""
+        template = self._llm.metadata.get("tokenizer.chat_template")
+        if not template:
+            logger.info(
+                f"[LlamaCpp:{self.alias}] GGUF sin chat template: snapshots de prefijo desactivados"
+            )
+            return None
+        from llama_cpp.llama_chat_format import Jinja2ChatFormatter
+
+        def _texto(token_id: int) -> str:
+            if token_id == -1:
+                return ""
+            return self._llm.detokenize([token_id], special=True).decode("utf-8", errors="ignore")
+
+        return Jinja2ChatFormatter(
+            template=template,
+            eos_token=_texto(self._llm.token_eos()),
+            bos_token=_texto(self._llm.token_bos()),
+            stop_token_ids=[self._llm.token_eos()],
         )
 
     # ── Cache de gramáticas compiladas ───────────────────────────────────────
@@ -312,6 +422,13 @@ class LlamaCppBackend(LLMBackend):
         logger.debug(f"[LlamaCpp:{self.alias}] Gramática compilada: {key}")
         return grammar
 
+    def prepare(self, schema: type[BaseModel], max_items: int | None = None) -> None:
+        """Compila de antemano la gramática de la próxima llamada."""
+        try:
+            self._get_grammar(schema, max_items)
+        except SchemaViolationError:
+            pass  # `generate` la vuelve a compilar y lanza en el hilo que llama.
+
     # ── Reset de estado ──────────────────────────────────────────────────────
 
     def reset_state(self) -> None:
@@ -343,7 +460,83 @@ class LlamaCppBackend(LLMBackend):
             except Exception as e:
                 logger.warning(f"[LlamaCpp:{self.alias}] Error al liberar modelo: {e}")
         self._grammar_cache.clear()
+        self._prefix_cache.clear()
         import gc
 
         gc.collect()
         logger.info(f"[LlamaCpp:{self.alias}] Modelo descargado de memoria")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Snapshots de KV-state por system prompt
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+class _PrefixStateCache:
+    """LRU de `LlamaState` indexado por hash del system prompt.
+
+    Cada snapshot es el KV de evaluar solo el prefijo del chat template con
+    el system, desde un contexto vacío. Al restaurarlo, llama.cpp reusa el
+    prefijo común con el prompt de la llamada y re-evalúa solo el resto. Un
+    snapshot ocupa RAM del host proporcional a los tokens del prefijo;
+    `slots` acota cuántos se conservan.
+    """
+
+    def __init__(self, slots: int) -> None:
+        self._slots = max(0, slots)
+        self._states: OrderedDict[str, LlamaState] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._slots > 0
+
+    def restore(self, llm: Any, key: str) -> list[int] | None:
+        """Carga el snapshot de `key` en `llm`.
+
+        Devuelve sus token ids, o None si no hay (la llamada debe vaciar el KV).
+        """
+        state = self._states.get(key)
+        if state is None:
+            return None
+        self._states.move_to_end(key)
+        llm.load_state(state)
+        return list(state.input_ids[: state.n_tokens])
+
+    def build(self, llm: Any, key: str, tokens: list[int]) -> None:
+        """Evalúa `tokens` desde un KV vacío y guarda el estado bajo `key`."""
+        if not self.enabled:
+            return
+        try:
+            llm.reset()
+            llm.eval(tokens)
+            self._states[key] = llm.save_state()
+        except Exception as e:
+            # Sin snapshot la llamada prefillea desde cero; no se pierde nada más.
+            logger.warning(f"[LlamaCpp] Snapshot del prefijo falló: {e}")
+            return
+        self._states.move_to_end(key)
+        while len(self._states) > self._slots:
+            self._states.popitem(last=False)
+
+    def clear(self) -> None:
+        self._states.clear()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+def _prefix_key(system: str) -> str:
+    """Clave del snapshot: hash del system prompt tal como llega al backend."""
+    return hashlib.sha256(system.encode("utf-8")).hexdigest()
+
+
+def _common_prefix_len(a: Any, b: Any) -> int:
+    """Largo del prefijo común entre dos secuencias de token ids."""
+    n = min(len(a), len(b))
+    for i in range(n):
+        if a[i] != b[i]:
+            return i
+    return n
@@ -22,7 +22,11 @@ from emoparse.core.backend.base import (
     TokenUsage,
 )
 from emoparse.core.backend.exceptions import SchemaViolationError
-from emoparse.core.cache.keys import compute_images_digest, make_cache_key
+from emoparse.core.cache.keys import (
+    compute_images_digest,
+    compute_schema_digest,
+    make_cache_key,
+)
 from emoparse.core.cache.repository import CacheRepository
 from emoparse.storage.models import RunContext
 
@@ -42,7 +46,7 @@ class CachedBackend(LLMBackend):
         Args:
             backend: LLMBackend a envolver.
             repo: Repositorio de cache.
-            ctx: RunContext con versiones activas.
+            ctx: RunContext; sus versions se guardan como metadata de cada entrada.
         """
         self._backend = backend
         self._repo = repo
@@ -66,7 +70,8 @@ class CachedBackend(LLMBackend):
         max_items: int | None = None,
         images: list[str] | None = None,
     ) -> LLMResponse:
-        # Construir clave; si seed no se pasa, se usa None. Las llamadas con
+        # Construir clave desde el contenido de la llamada (prompts y JSON
+        # schema); si seed no se pasa, se usa None. Las llamadas con
         # imágenes incorporan un digest del contenido visual (bytes de paths
         # locales; string de las URLs), de modo que también son cacheables.
         schema_qualname = f"{schema.__module__}.{schema.__qualname__}" if schema else None
@@ -77,6 +82,7 @@ class CachedBackend(LLMBackend):
             schema_qualname=schema_qualname,
             seed=seed,
             versions=self._ctx.versions,
+            schema_digest=compute_schema_digest(schema),
             images_digest=compute_images_digest(images),
         )
 
@@ -161,5 +167,9 @@ class CachedBackend(LLMBackend):
         """Resetea el estado del backend; el cache es persistente y no aplica reset."""
         self._backend.reset_state()
 
+    def prepare(self, schema: type[BaseModel], max_items: int | None = None) -> None:
+        """Delega al backend: un hit no la usa, pero no se sabe hasta el lookup."""
+        self._backend.prepare(schema, max_items)
+
     def __repr__(self) -> str:
         return f"<CachedBackend wrapping={self._backend!r}>"
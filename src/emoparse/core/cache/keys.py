@@ -3,27 +3,30 @@
 #
 #  Generación de claves de cache LLM.
 #
-#  La clave es un hash determinístico de todos los factores que afectan la respuesta:
+#  La clave es un hash determinístico del contenido que recibe el modelo:
 #  - model_alias
-#  - system_hash
+#  - system_hash (template renderizado + conocimiento inyectado)
 #  - user_hash
 #  - schema_qualname
+#  - schema_digest (JSON schema del modelo Pydantic; define la gramática)
 #  - seed
-#  - knowledge_version
-#  - prompt_version
-#  - ontology_version
-#  - schema_version
 #  - images_digest (solo en llamadas con imágenes; hash del contenido visual)
 #
-#  Bumpear cualquier *_version invalida selectivamente los agentes afectados.
+#  Las versions del run no entran en el digest: quedan en CacheKey como
+#  etiquetas de auditoría y purga. Editar una heurística cambia el system de
+#  los agentes que la cargan y solo esos vuelven a llamar al modelo.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
 import hashlib
+import json
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+from pydantic import BaseModel
+
 from emoparse.storage.models import Versions
 
 
@@ -65,11 +68,26 @@ def compute_images_digest(images: list[str] | None) -> str | None:
     return agg.hexdigest()
 
 
+@lru_cache(maxsize=256)
+def compute_schema_digest(schema: type[BaseModel] | None) -> str | None:
+    """Digest del JSON schema de `schema` (None si la llamada es de texto libre).
+
+    Es lo que el backend traduce a gramática: un cambio de campos, de
+    restricciones o de los `Literal` que vienen de la ontología cambia el
+    digest aunque el qualname siga igual. Se memoiza por clase.
+    """
+    if schema is None:
+        return None
+    payload = json.dumps(schema.model_json_schema(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 @dataclass(frozen=True, slots=True)
 class CacheKey:
     """Clave de cache y metadatos de auditoría.
 
-    digest es el PK en llm_cache; otros campos sirven para debug, queries y cleanup.
+    digest es el PK en llm_cache; otros campos sirven para debug, queries y
+    cleanup. Las versions se registran pero no forman parte del digest.
     """
 
     digest: str
@@ -89,6 +107,7 @@ def make_cache_key(
     schema_qualname: str | None,
     seed: int | None,
     versions: Versions,
+    schema_digest: str | None = None,
     images_digest: str | None = None,
 ) -> CacheKey:
     """Genera una clave de cache determinística.
@@ -100,7 +119,8 @@ def make_cache_key(
         schema_qualname: Qualified name del schema Pydantic o None
                          si la llamada es de texto libre.
         seed: Seed del sampler.
-        versions: Las 4 versions del run.
+        versions: Las 4 versions del run; solo metadata (purga, auditoría).
+        schema_digest: Hash del JSON schema (ver `compute_schema_digest`).
         images_digest: Hash del contenido visual de la llamada (ver
                        `compute_images_digest`) o None si no hay imágenes.
                        Se incorpora a la clave solo cuando existe, así las
@@ -120,11 +140,8 @@ def make_cache_key(
         f"system={system_hash}",
         f"user={user_hash}",
         f"schema={schema_qualname or ''}",
+        f"schema_digest={schema_digest or ''}",
         f"seed={seed if seed is not None else ''}",
-        f"kv={versions.knowledge or ''}",
-        f"pv={versions.prompt or ''}",
-        f"ov={versions.ontology or ''}",
-        f"sv={versions.schema or ''}",
     ]
     if images_digest:
         # Componente condicional: preserva intactas las claves ya emitidas
@@ -0,0 +1,76 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.core.prefetch
+#
+#  Preparación anticipada de trabajo en serie.
+#
+#  Las llamadas al LLM son bloqueantes y dominan el tiempo de una stage,
+#  pero entre una y otra Python arma el insumo de la siguiente (lecturas de
+#  SQLite, bloques de contexto, render del prompt) con el modelo ocioso.
+#  `anticipar` recorre los items en orden y prepara los próximos en un hilo
+#  auxiliar mientras el llamador procesa el actual: la preparación de N+1 se
+#  superpone con la inferencia de N.
+#
+#  La anticipación es acotada (a lo sumo `anticipacion` items preparados por
+#  delante) y el procesamiento sigue siendo en serie y en orden: solo la
+#  preparación cambia de hilo, así que `preparar` no debe depender de lo que
+#  `procesar` persista para los items anteriores.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+P = TypeVar("P")
+
+#: Items preparados por delante del que se procesa.
+DEFAULT_ANTICIPACION = 1
+
+
+def anticipar(
+    items: Sequence[T],
+    preparar: Callable[[T], P],
+    *,
+    anticipacion: int = DEFAULT_ANTICIPACION,
+) -> Generator[tuple[T, Future[P]], None, None]:
+    """Recorre `items` en orden con la preparación de cada uno en curso.
+
+    Devuelve pares `(item, futuro)`: `futuro.result()` es `preparar(item)` o
+    relanza su excepción, en el punto del procesamiento en que el llamador
+    lo pida. Con `anticipacion` ≤ 0 o un solo item prepara en el mismo hilo,
+    sin crear el auxiliar.
+    """
+    if anticipacion <= 0 or len(items) <= 1:
+        for item in items:
+            yield item, _inmediato(preparar, item)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+    en_curso: deque[Future[P]] = deque()
+    siguiente = 0
+    try:
+        for i, item in enumerate(items):
+            while siguiente < len(items) and siguiente <= i + anticipacion:
+                en_curso.append(pool.submit(preparar, items[siguiente]))
+                siguiente += 1
+            yield item, en_curso.popleft()
+    finally:
+        for futuro in en_curso:
+            futuro.cancel()
+        pool.shutdown(wait=True)
+
+
+def _inmediato(preparar: Callable[[T], P], item: T) -> Future[P]:
+    """Futuro ya resuelto con `preparar(item)` (o su excepción)."""
+    futuro: Future[P] = Future()
+    try:
+        futuro.set_result(preparar(item))
+    except Exception as e:
+        futuro.set_exception(e)
+    return futuro
+
+
+__all__ = ["DEFAULT_ANTICIPACION", "anticipar"]
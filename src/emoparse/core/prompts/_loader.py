@@ -2,18 +2,46 @@
 #  emoparse.core.prompts._loader
 #
 #  Loader Jinja2 compartido por todos los prompts del proyecto.
+#
+#  El bytecode compilado de cada template se guarda en disco (directorio
+#  temporal del usuario), así cada proceso nuevo — un `emoparse run`, un
+#  worker de tests — salta el parseo y la compilación de los .jinja2. Cada
+#  render suma su duración a un reloj de proceso (`render_time_ms`) que el
+#  runner descuenta por stage y persiste en `run_metrics`.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
+import threading
+import time
 from functools import lru_cache
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+)
+from loguru import logger
 
 #: Path al directorio templates/.
 _TEMPLATES_DIR: Path = Path(__file__).parent / "templates"
 
+_reloj_lock = threading.Lock()
+_render_s = 0.0
+
+
+def _bytecode_cache() -> BytecodeCache | None:
+    """Cache de bytecode en disco; None si el directorio no es usable."""
+    try:
+        return FileSystemBytecodeCache(pattern="emoparse-%s.cache")
+    except (OSError, RuntimeError) as e:
+        logger.debug(f"[Prompts] Sin cache de bytecode Jinja: {e}")
+        return None
+
 
 @lru_cache(maxsize=1)
 def _env() -> Environment:
@@ -25,6 +53,7 @@ def _env() -> Environment:
         keep_trailing_newline=False,
         trim_blocks=True,
         lstrip_blocks=True,
+        bytecode_cache=_bytecode_cache(),
     )
 
 
@@ -35,5 +64,24 @@ def get_template(name: str) -> Template:
 
 def render(name: str, **context: object) -> str:
     """Renderiza un template y devuelve el string resultado."""
-    tmpl = get_template(name)
-    return tmpl.render(**context)
+    inicio = time.perf_counter()
+    try:
+        tmpl = get_template(name)
+        return tmpl.render(**context)
+    finally:
+        _sumar(time.perf_counter() - inicio)
+
+
+def _sumar(segundos: float) -> None:
+    global _render_s
+    with _reloj_lock:
+        _render_s += segundos
+
+
+def render_time_ms() -> float:
+    """Tiempo acumulado de render de prompts en el proceso, en ms.
+
+    Monótono: para medir un tramo, restar dos lecturas.
+    """
+    with _reloj_lock:
+        return _render_s * 1000.0
@@ -14,14 +14,21 @@ def render_system(
     tipo_discurso: str,
     enunciador: str,
     heuristicas: str | None = None,
+    empaquetado: bool = False,
 ) -> str:
-    """SYSTEM de actors con contexto del discurso."""
+    """SYSTEM de actors con contexto del discurso.
+
+    Con `empaquetado` el batch mezcla unidades de varios discursos: el
+    contexto de cada uno viaja en el bloque de su unidad y el system prompt
+    solo lo anuncia.
+    """
     return render(
         "actors_system",
         titulo=titulo,
         tipo_discurso=tipo_discurso,
         enunciador=enunciador,
         heuristicas=heuristicas,
+        empaquetado=empaquetado,
     )
 
 
@@ -14,14 +14,20 @@ def render_system(
     tipo_discurso: str,
     heuristicas: str | None = None,
     enunciador: str = "",
+    empaquetado: bool = False,
 ) -> str:
-    """SYSTEM del characterizer con contexto del discurso."""
+    """SYSTEM del characterizer con contexto del discurso.
+
+    Con `empaquetado` el contexto de cada discurso viaja en el bloque de su
+    emoción (ver `actors.render_system`).
+    """
     return render(
         "characterizer_system",
         titulo=titulo,
         tipo_discurso=tipo_discurso,
         enunciador=enunciador,
         heuristicas=heuristicas,
+        empaquetado=empaquetado,
     )
 
 
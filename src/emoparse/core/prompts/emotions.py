@@ -22,6 +22,7 @@ def render_system(
     contexto_genero: str = "",
     modos_existencia: str = "",
     template: str = "emotions_system",
+    empaquetado: bool = False,
 ) -> str:
     """Renderiza el system prompt de EmotionsAgent.
 
@@ -50,6 +51,10 @@ def render_system(
             pueden sustituirlo vía `Genre.prompt_overrides` (p. ej.
             'emotions_system_tuit'). El template alternativo debe aceptar
             las mismas variables que el default.
+        empaquetado: True cuando el batch mezcla unidades de varios
+            discursos. El contexto de cada discurso (título, enunciador,
+            resumen, contexto de género) viaja en el bloque de su unidad y
+            el system prompt solo lo anuncia.
     """
     return render(
         template,
@@ -64,6 +69,7 @@ def render_system(
         resumen=resumen,
         contexto_genero=contexto_genero,
         modos_existencia=modos_existencia,
+        empaquetado=empaquetado,
     )
 
 
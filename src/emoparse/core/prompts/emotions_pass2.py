@@ -21,6 +21,7 @@ def render_system(
     resumen: str = "",
     modos_existencia: str = "",
     template: str = "emotions_pass2_system",
+    empaquetado: bool = False,
 ) -> str:
     """SYSTEM del pase 2.
 
@@ -39,6 +40,10 @@ def render_system(
     géneros pueden sustituirlo vía `Genre.prompt_overrides` (p. ej.
     'emotions_pass2_system_tuit'). El template alternativo debe aceptar
     las mismas variables que el default.
+
+    `empaquetado` indica que el batch mezcla unidades de varios discursos,
+    con el contexto de cada uno en el bloque de su unidad (ver
+    `emotions.render_system`).
     """
     return render(
         template,
@@ -52,6 +57,7 @@ def render_system(
         alcance=alcance,
         resumen=resumen,
         modos_existencia=modos_existencia,
+        empaquetado=empaquetado,
     )
 
 
@@ -4,16 +4,27 @@
 #  Orquesta la ejecución de validators sobre una DB de EmoParse.
 #
 #  Diseño:
-#   - Lee emociones caracterizadas de la DB.
-#   - Aplica RowValidators sobre cada emoción.
-#   - Agrupa por discurso y aplica DiscursoValidators.
-#   - Persiste issues en la tabla validation_issues.
+#   - Lee de una vez las emociones caracterizadas de todos los discursos a
+#     validar y su contexto enunciativo (dos consultas; los campos de la
+#     caracterización se extraen en SQL, sin decodificar el JSON en Python).
+#   - Reparte los discursos en tandas contiguas entre procesos: cada tanda
+#     aplica RowValidators sobre cada emoción y DiscursoValidators sobre el
+#     discurso.
+#   - Persiste issues en la tabla validation_issues en una sola transacción.
 #   - Idempotente: borra issues previas del discurso antes de reinsertar.
+#   - Incremental: la vigencia de la validación por discurso vive en
+#     `materializaciones` (stage 'validacion'); los triggers del esquema la
+#     borran cuando cambia la emoción, su caracterización o la enunciación.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
+import hashlib
 import json
+import multiprocessing
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 from loguru import logger
@@ -29,8 +40,27 @@ from emoparse.domain.validators.rules import (
     V11_DesviacionOntologica,
 )
 from emoparse.storage.db import Database
+from emoparse.storage.materializaciones import MaterializacionesRepository
 from emoparse.storage.validation import ValidationRepository
 
+#: Stage con la que la validación registra su vigencia en `materializaciones`.
+STAGE = "validacion"
+
+#: Con menos emociones a validar, los procesos cuestan más de lo que ahorran.
+_PARALLEL_FROM_EMOCIONES = 20_000
+
+#: Tandas por proceso: varias, para que un discurso largo no deje procesos ociosos.
+_TANDAS_POR_WORKER = 4
+
+#: Campos de `caracterizacion_payload` que leen los validators.
+_CAMPOS_CARACTERIZACION = ("foria", "dominancia", "intensidad", "fuente_marca", "fuente_inferencia")
+
+#: Validators del proceso worker (los fija `_init_worker`).
+_VALIDATORS: tuple[list[RowValidator], list[DiscursoValidator]] = ([], [])
+
+#: Un discurso listo para validar: (codigo, enunciador, enunciatarios, emociones).
+Discurso = tuple[str, str, list[dict[str, Any]], list[dict[str, Any]]]
+
 
 class ValidationRunner:
     """Ejecuta todos los validators sobre las emociones caracterizadas de una DB.
@@ -43,6 +73,9 @@ class ValidationRunner:
             KnowledgeLoader.load_emotion_characterization_constraints(). Si se proveen, se
             construye V11_DesviacionOntologica y se agrega al final de
             row_validators. Si es None, V11 no se ejecuta.
+        workers: procesos que aplican los validators. None = automático (en el
+            proceso actual hasta `_PARALLEL_FROM_EMOCIONES` emociones, uno por
+            CPU desde ahí). Con 1 se valida siempre en el proceso actual.
     """
 
     def __init__(
@@ -51,9 +84,12 @@ class ValidationRunner:
         row_validators: list[RowValidator] | None = None,
         discurso_validators: list[DiscursoValidator] | None = None,
         characterization_constraints: dict[str, Any] | None = None,
+        workers: int | None = None,
     ) -> None:
         self._db = db
         self._repo = ValidationRepository(db)
+        self._mat_repo = MaterializacionesRepository(db)
+        self._workers = workers
 
         row = list(row_validators) if row_validators is not None else list(ROW_VALIDATORS)
         if characterization_constraints is not None:
@@ -65,34 +101,78 @@ class ValidationRunner:
             discurso_validators if discurso_validators is not None else DISCURSO_VALIDATORS
         )
 
-    def run(self) -> list[ValidationIssue]:
-        """Ejecuta la validación completa.
+    def run(
+        self,
+        codigos: Iterable[str] | None = None,
+        *,
+        incremental: bool = False,
+    ) -> list[ValidationIssue]:
+        """Ejecuta la validación.
 
         Flujo:
-          1. Cargar emociones caracterizadas agrupadas por discurso.
-          2. Cargar contexto enunciativo.
-          3. Aplicar RowValidators.
-          4. Aplicar DiscursoValidators.
-          5. Persistir issues.
+          1. Elegir los discursos (con emociones caracterizadas; con
+             `incremental`, solo los que no tienen validación vigente).
+          2. Cargar de una vez sus emociones y su contexto enunciativo.
+          3. Aplicar RowValidators y DiscursoValidators (en paralelo si
+             corresponde).
+          4. Reemplazar sus issues y marcar la validación vigente.
+
+        Args:
+            codigos: Discursos a validar; None = todos.
+            incremental: Revalidar solo los discursos cuyas emociones,
+                caracterización o enunciación cambiaron (o cuyos validators
+                cambiaron) desde la última validación.
 
         Returns:
-            Lista de ValidationIssue. Vacía si no hay incoherencias.
+            Lista de ValidationIssue de los discursos validados. Vacía si no
+            hay incoherencias.
         """
-        all_issues: list[ValidationIssue] = []
-
-        codigos = self._load_codigos_con_emociones_caracterizadas()
-        if not codigos:
+        pedidos = None if codigos is None else set(codigos)
+        objetivo = [
+            c
+            for c in self._load_codigos_con_emociones_caracterizadas()
+            if pedidos is None or c in pedidos
+        ]
+        if not objetivo:
             logger.info("[ValidationRunner] No hay emociones caracterizadas para validar.")
             return []
 
-        logger.info(f"[ValidationRunner] Validando {len(codigos)} discurso(s).")
+        vigencia = self._hay_vigencia()
+        huella = self._huella()
+        if incremental:
+            if vigencia:
+                previas = self._mat_repo.huellas(STAGE)
+                sucios = [c for c in objetivo if previas.get(c) != huella]
+                if len(sucios) < len(objetivo):
+                    logger.info(
+                        f"[ValidationRunner] {len(objetivo) - len(sucios)} discurso(s) sin "
+                        f"cambios desde la última validación; se revalidan {len(sucios)}."
+                    )
+                objetivo = sucios
+                if not objetivo:
+                    return []
+            else:
+                logger.info(
+                    "[ValidationRunner] La DB no registra vigencia de validación "
+                    "(esquema previo): se validan todos los discursos."
+                )
 
-        for codigo in codigos:
-            issues = self._run_discurso(codigo)
-            all_issues.extend(issues)
+        logger.info(f"[ValidationRunner] Validando {len(objetivo)} discurso(s).")
+
+        if vigencia:
+            # La vigencia se marca antes de leer: una escritura concurrente
+            # posterior la borra (triggers) y el discurso queda pendiente.
+            self._mat_repo.marcar(STAGE, dict.fromkeys(objetivo, huella))
+        try:
+            discursos = self._load_discursos(objetivo)
+            all_issues = self._validar(discursos)
+            self._repo.replace_issues([d[0] for d in discursos], all_issues)
+        except BaseException:
+            if vigencia:
+                self._mat_repo.invalidar(STAGE, objetivo)
+            raise
 
         if all_issues:
-            self._repo.save_issues(all_issues)
             logger.info(f"[ValidationRunner] {len(all_issues)} issue(s) encontradas y persistidas.")
         else:
             logger.info("[ValidationRunner] Sin issues. Discursos coherentes.")
@@ -101,60 +181,46 @@ class ValidationRunner:
 
     # ── Internals ────────────────────────────────────────────────────────────
 
-    def _run_discurso(self, codigo: str) -> list[ValidationIssue]:
-        """Valida un discurso completo. Devuelve sus issues."""
-        enunciador, enunciatarios = self._load_enunciacion(codigo)
-        emociones = self._load_emociones_con_caracterizacion(codigo)
-        if not emociones:
-            return []
-
-        issues: list[ValidationIssue] = []
-
-        self._repo.delete_issues_for_codigo(codigo)
-
-        for emo in emociones:
-            for validator in self._row_validators:
-                try:
-                    row_issues = validator.validate(
-                        codigo=codigo,
-                        frase_idx=emo["frase_idx"],
-                        emocion_idx=emo["emocion_idx"],
-                        experienciador=emo.get("experienciador", ""),
-                        experienciador_marca=emo.get("experienciador_marca", ""),
-                        tipo_emocion=(
-                            emo.get("tipo_emocion_canonico") or emo.get("tipo_emocion", "")
-                        ),
-                        fuente_marca=emo.get("fuente_marca", ""),
-                        fuente_inferencia=emo.get("fuente_inferencia", ""),
-                        modo_existencia=emo.get("modo_existencia", ""),
-                        foria=emo.get("foria", ""),
-                        dominancia=emo.get("dominancia", ""),
-                        intensidad=emo.get("intensidad", ""),
-                        enunciador=enunciador,
-                        enunciatarios=enunciatarios,
-                    )
-                    issues.extend(row_issues)
-                except Exception as e:
-                    logger.warning(
-                        f"[ValidationRunner] {validator.VALIDATOR_ID} falló en "
-                        f"{codigo}:{emo['frase_idx']}:{emo['emocion_idx']}: {e}"
-                    )
-
-        for validator in self._discurso_validators:
+    def _validar(self, discursos: list[Discurso]) -> list[ValidationIssue]:
+        """Issues de `discursos`, en su orden; en paralelo si corresponde."""
+        n_emociones = sum(len(d[3]) for d in discursos)
+        n_workers = self._workers
+        if n_workers is None:
+            n_workers = (os.cpu_count() or 1) if n_emociones >= _PARALLEL_FROM_EMOCIONES else 1
+        n_workers = min(n_workers, len(discursos))
+        validators = (self._row_validators, self._discurso_validators)
+        if n_workers <= 1:
+            _init_worker(validators)
             try:
-                disc_issues = validator.validate(
-                    codigo=codigo,
-                    emociones=emociones,
-                    enunciador=enunciador,
-                    enunciatarios=enunciatarios,
-                )
-                issues.extend(disc_issues)
-            except Exception as e:
-                logger.warning(
-                    f"[ValidationRunner] {validator.VALIDATOR_ID} falló en {codigo}: {e}"
-                )
+                return _validar_tanda(discursos)
+            finally:
+                _init_worker(([], []))
+        tandas = _tandas(discursos, n_workers * _TANDAS_POR_WORKER)
+        # `spawn`: los workers no heredan hilos ni conexiones abiertas del padre.
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(validators,),
+        ) as pool:
+            return [issue for issues in pool.map(_validar_tanda, tandas) for issue in issues]
+
+    def _hay_vigencia(self) -> bool:
+        """True si la DB tiene los triggers que sostienen la vigencia."""
+        row = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+            (f"trg_{STAGE}_emociones_update",),
+        ).fetchone()
+        return row is not None
 
-        return issues
+    def _huella(self) -> str:
+        """Digest de los validators activos: si cambian, todo queda pendiente."""
+        config = [
+            (type(v).__qualname__, v.VALIDATOR_ID, getattr(v, "__dict__", {}))
+            for v in (*self._row_validators, *self._discurso_validators)
+        ]
+        texto = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
 
     def _load_codigos_con_emociones_caracterizadas(self) -> list[str]:
         """Devuelve códigos de discursos con al menos una emoción caracterizada."""
@@ -168,73 +234,172 @@ class ValidationRunner:
         ).fetchall()
         return [r["codigo"] for r in rows]
 
-    def _load_emociones_con_caracterizacion(self, codigo: str) -> list[dict[str, Any]]:
-        """Carga emociones con sus caracterizaciones para un discurso."""
-        rows = self._db.execute(
-            """
-            SELECT
-                frase_idx,
-                emocion_idx,
-                experienciador,
-                experienciador_marca,
-                tipo_emocion,
-                tipo_emocion_canonico,
-                modo_existencia,
-                caracterizacion_payload
-            FROM emociones
-            WHERE codigo = ?
-              AND caracterizacion_payload IS NOT NULL
-            ORDER BY frase_idx, emocion_idx
-            """,
-            (codigo,),
-        ).fetchall()
+    def _load_discursos(self, codigos: list[str]) -> list[Discurso]:
+        """Emociones caracterizadas y enunciación de `codigos`, en dos consultas.
 
-        result: list[dict[str, Any]] = []
+        Los discursos sin ninguna caracterización parseable quedan afuera
+        (sus issues previas no se tocan).
+        """
+        db = self._db
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS validacion_codigos (codigo TEXT PRIMARY KEY)")
+        try:
+            db.execute("DELETE FROM temp.validacion_codigos")
+            db.executemany(
+                "INSERT OR IGNORE INTO temp.validacion_codigos VALUES (?)",
+                [(c,) for c in codigos],
+            )
+            enunciacion = {
+                r["codigo"]: _enunciacion(r["enunciation_payload"])
+                for r in db.execute(
+                    "SELECT d.codigo, d.enunciation_payload FROM discursos d "
+                    "JOIN temp.validacion_codigos USING (codigo)"
+                )
+            }
+            # Campo ausente → "" y presente → su valor (aun null), como `dict.get(c, "")`.
+            campos = ", ".join(
+                f"CASE WHEN NOT json_valid(e.caracterizacion_payload) THEN NULL "
+                f"WHEN json_type(e.caracterizacion_payload, '$.{c}') IS NULL THEN '' "
+                f"ELSE json_extract(e.caracterizacion_payload, '$.{c}') END AS {c}"
+                for c in _CAMPOS_CARACTERIZACION
+            )
+            rows = db.execute(
+                f"""
+                SELECT
+                    e.codigo,
+                    e.frase_idx,
+                    e.emocion_idx,
+                    e.experienciador,
+                    e.experienciador_marca,
+                    e.tipo_emocion,
+                    e.tipo_emocion_canonico,
+                    e.modo_existencia,
+                    json_valid(e.caracterizacion_payload) AS payload_valido,
+                    {campos}
+                FROM emociones e
+                JOIN temp.validacion_codigos USING (codigo)
+                WHERE e.caracterizacion_payload IS NOT NULL
+                ORDER BY e.codigo, e.frase_idx, e.emocion_idx
+                """
+            ).fetchall()
+        finally:
+            db.execute("DELETE FROM temp.validacion_codigos")
+
+        por_codigo: dict[str, list[dict[str, Any]]] = {}
         for row in rows:
-            try:
-                caract = json.loads(row["caracterizacion_payload"])
-            except (json.JSONDecodeError, TypeError):
+            codigo = row["codigo"]
+            if not row["payload_valido"]:
                 logger.warning(
                     f"[ValidationRunner] {codigo}: caracterizacion_payload "
                     f"no parseable en ({row['frase_idx']}, {row['emocion_idx']})"
                 )
                 continue
+            emocion = {
+                "frase_idx": row["frase_idx"],
+                "emocion_idx": row["emocion_idx"],
+                "experienciador": row["experienciador"] or "",
+                "experienciador_marca": row["experienciador_marca"] or "",
+                "tipo_emocion": row["tipo_emocion"] or "",
+                "tipo_emocion_canonico": row["tipo_emocion_canonico"] or "",
+                "modo_existencia": row["modo_existencia"] or "",
+            }
+            emocion.update({c: row[c] for c in _CAMPOS_CARACTERIZACION})
+            por_codigo.setdefault(codigo, []).append(emocion)
+
+        sin_enunciacion = ("no identificado", [])
+        return [
+            (codigo, *enunciacion.get(codigo, sin_enunciacion), emociones)
+            for codigo, emociones in por_codigo.items()
+        ]
+
+
+def _enunciacion(raw: str | None) -> tuple[str, list[dict[str, Any]]]:
+    """(enunciador, enunciatarios) del `enunciation_payload` de un discurso."""
+    if raw is None:
+        return "no identificado", []
+    try:
+        payload = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return "no identificado", []
+
+    enunciador = payload.get("enunciador", "no identificado") or "no identificado"
+    enunciatarios = payload.get("enunciatarios", []) or []
+
+    return enunciador, enunciatarios
+
+
+def _tandas(discursos: list[Discurso], n: int) -> list[list[Discurso]]:
+    """Parte `discursos` en hasta `n` tandas contiguas de emociones parejas."""
+    total = sum(len(d[3]) for d in discursos)
+    objetivo = max(1, -(-total // n))
+    tandas: list[list[Discurso]] = [[]]
+    acumuladas = 0
+    for discurso in discursos:
+        if acumuladas >= objetivo:
+            tandas.append([])
+            acumuladas = 0
+        tandas[-1].append(discurso)
+        acumuladas += len(discurso[3])
+    return tandas
+
+
+def _init_worker(validators: tuple[list[RowValidator], list[DiscursoValidator]]) -> None:
+    global _VALIDATORS
+    _VALIDATORS = validators
+
+
+def _validar_tanda(discursos: list[Discurso]) -> list[ValidationIssue]:
+    issues: list[ValidationIssue] = []
+    for codigo, enunciador, enunciatarios, emociones in discursos:
+        issues.extend(_validar_discurso(codigo, enunciador, enunciatarios, emociones))
+    return issues
+
+
+def _validar_discurso(
+    codigo: str,
+    enunciador: str,
+    enunciatarios: list[dict[str, Any]],
+    emociones: list[dict[str, Any]],
+) -> list[ValidationIssue]:
+    """Valida un discurso completo. Devuelve sus issues."""
+    row_validators, discurso_validators = _VALIDATORS
+    issues: list[ValidationIssue] = []
+
+    for emo in emociones:
+        for validator in row_validators:
+            try:
+                row_issues = validator.validate(
+                    codigo=codigo,
+                    frase_idx=emo["frase_idx"],
+                    emocion_idx=emo["emocion_idx"],
+                    experienciador=emo.get("experienciador", ""),
+                    experienciador_marca=emo.get("experienciador_marca", ""),
+                    tipo_emocion=(emo.get("tipo_emocion_canonico") or emo.get("tipo_emocion", "")),
+                    fuente_marca=emo.get("fuente_marca", ""),
+                    fuente_inferencia=emo.get("fuente_inferencia", ""),
+                    modo_existencia=emo.get("modo_existencia", ""),
+                    foria=emo.get("foria", ""),
+                    dominancia=emo.get("dominancia", ""),
+                    intensidad=emo.get("intensidad", ""),
+                    enunciador=enunciador,
+                    enunciatarios=enunciatarios,
+                )
+                issues.extend(row_issues)
+            except Exception as e:
+                logger.warning(
+                    f"[ValidationRunner] {validator.VALIDATOR_ID} falló en "
+                    f"{codigo}:{emo['frase_idx']}:{emo['emocion_idx']}: {e}"
+                )
 
-            result.append(
-                {
-                    "frase_idx": row["frase_idx"],
-                    "emocion_idx": row["emocion_idx"],
-                    "experienciador": row["experienciador"] or "",
-                    "experienciador_marca": row["experienciador_marca"] or "",
-                    "tipo_emocion": row["tipo_emocion"] or "",
-                    "tipo_emocion_canonico": row["tipo_emocion_canonico"] or "",
-                    "modo_existencia": row["modo_existencia"] or "",
-                    "foria": caract.get("foria", ""),
-                    "dominancia": caract.get("dominancia", ""),
-                    "intensidad": caract.get("intensidad", ""),
-                    "fuente_marca": caract.get("fuente_marca", ""),
-                    "fuente_inferencia": caract.get("fuente_inferencia", ""),
-                }
-            )
-
-        return result
-
-    def _load_enunciacion(self, codigo: str) -> tuple[str, list[dict[str, Any]]]:
-        """Carga el enunciador y enunciatarios del discurso."""
-        row = self._db.execute(
-            "SELECT enunciation_payload FROM discursos WHERE codigo = ?",
-            (codigo,),
-        ).fetchone()
-
-        if row is None or row["enunciation_payload"] is None:
-            return "no identificado", []
-
+    for validator in discurso_validators:
         try:
-            payload = json.loads(row["enunciation_payload"])
-        except (json.JSONDecodeError, TypeError):
-            return "no identificado", []
-
-        enunciador = payload.get("enunciador", "no identificado") or "no identificado"
-        enunciatarios = payload.get("enunciatarios", []) or []
+            disc_issues = validator.validate(
+                codigo=codigo,
+                emociones=emociones,
+                enunciador=enunciador,
+                enunciatarios=enunciatarios,
+            )
+            issues.extend(disc_issues)
+        except Exception as e:
+            logger.warning(f"[ValidationRunner] {validator.VALIDATOR_ID} falló en {codigo}: {e}")
 
-        return enunciador, enunciatarios
+    return issues
@@ -6,10 +6,18 @@
 #  y controles de sobre-detección. CLI: `emoparse eval`.
 # ══════════════════════════════════════════════════════════════════════════════
 
-from emoparse.evaluation.agreement import krippendorff_alpha
+from emoparse.evaluation.agreement import (
+    AlphaResult,
+    agreement_by_dimension,
+    alpha_with_ci,
+    krippendorff_alpha,
+)
 from emoparse.evaluation.matching import MatchReport, match_units
 
 __all__ = [
+    "AlphaResult",
+    "agreement_by_dimension",
+    "alpha_with_ci",
     "krippendorff_alpha",
     "MatchReport",
     "match_units",
@@ -3,25 +3,47 @@
 #
 #  Alpha de Krippendorff para acuerdo inter-anotador.
 #
-#  Implementación propia (sin dependencias) del algoritmo canónico por matriz
-#  de coincidencias, con soporte de valores faltantes y tres métricas de
-#  distancia: nominal (categorías), ordinal (rangos) e interval (numérica).
-#  Verificada contra los valores publicados del ejemplo clásico de
-#  Krippendorff (4 anotadores, 12 unidades): nominal ≈ 0.743,
-#  interval ≈ 0.849, ordinal ≈ 0.815.
+#  Implementación propia del algoritmo canónico por matriz de coincidencias,
+#  con soporte de valores faltantes y tres métricas de distancia: nominal
+#  (categorías), ordinal (rangos) e interval (numérica). Verificada contra los
+#  valores publicados del ejemplo clásico de Krippendorff (4 anotadores,
+#  12 unidades): nominal ≈ 0.743, interval ≈ 0.849, ordinal ≈ 0.815.
+#
+#  Las anotaciones se codifican a una matriz entera anotadores × unidades y
+#  la matriz de coincidencias sale de un producto de matrices sobre los
+#  conteos por unidad (NumPy), sin recorrer pares. El intervalo de confianza
+#  se estima por bootstrap de unidades, todas las réplicas a la vez.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
-from collections import Counter
-from collections.abc import Hashable, Sequence
+from collections.abc import Hashable, Mapping, Sequence
+from dataclasses import dataclass
 from typing import Any, Literal
 
+import numpy as np
+import pandas as pd
+
 Metric = Literal["nominal", "ordinal", "interval"]
 
 #: Marcadores tratados como valor faltante.
 _MISSING = {None, "", "na", "n/a", "nan", "none"}
 
+#: Tope de celdas (réplicas × unidades) por bloque del bootstrap.
+_BOOTSTRAP_BLOCK_CELLS = 4_000_000
+
+
+@dataclass(frozen=True)
+class AlphaResult:
+    """Alpha de una dimensión, con su base y, si se pidió, su intervalo."""
+
+    alpha: float | None
+    metric: Metric
+    n_units: int
+    n_values: int
+    ci_low: float | None = None
+    ci_high: float | None = None
+
 
 def krippendorff_alpha(
     reliability_data: Sequence[Sequence[Any]],
@@ -43,61 +65,214 @@ def krippendorff_alpha(
         con una única categoría el desacuerdo esperado es 0 y alpha es
         indefinido).
     """
-    # Unidades con al menos dos anotaciones.
-    n_units = max((len(fila) for fila in reliability_data), default=0)
-    unidades: list[list[Any]] = []
-    for u in range(n_units):
-        valores = []
-        for fila in reliability_data:
-            if u < len(fila) and not _is_missing(fila[u]):
-                valores.append(_norm(fila[u], metric))
-        if len(valores) >= 2:
-            unidades.append(valores)
-    if len(unidades) < 2:
-        return None
+    return alpha_with_ci(reliability_data, metric).alpha
 
-    # Matriz de coincidencias.
-    coincidencias: Counter[tuple[Hashable, Hashable]] = Counter()
-    for valores in unidades:
-        m = len(valores)
-        for i, c in enumerate(valores):
-            for j, k in enumerate(valores):
-                if i != j:
-                    coincidencias[(c, k)] += 1.0 / (m - 1)  # type: ignore[assignment]
-
-    categorias = sorted({c for c, _ in coincidencias})
-    n_c = {c: sum(v for (a, _), v in coincidencias.items() if a == c) for c in categorias}
-    n_total = sum(n_c.values())
-    if len(categorias) < 2 or n_total <= 1:
-        return None
 
-    delta = _delta_fn(metric, categorias, n_c)
+def alpha_with_ci(
+    reliability_data: Sequence[Sequence[Any]],
+    metric: Metric = "nominal",
+    *,
+    n_bootstrap: int = 0,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> AlphaResult:
+    """Alpha de Krippendorff con intervalo de confianza por bootstrap.
 
-    do = sum(v * delta(c, k) for (c, k), v in coincidencias.items() if c != k) / n_total
-    de = sum(n_c[c] * n_c[k] * delta(c, k) for c in categorias for k in categorias if c != k) / (
-        n_total * (n_total - 1)
-    )
+    Con `n_bootstrap > 0` se remuestrean con reposición las unidades
+    apareables y se recalcula el desacuerdo observado de cada réplica; el
+    esperado queda fijo en el de los datos completos, como en el bootstrap
+    de Hayes y Krippendorff (2007). El intervalo es percentil.
+    """
+    codes, values = _encode(reliability_data, metric)
+    counts = _unit_counts(codes, len(values))
+    m = counts.sum(axis=1)
+    pairable = m >= 2
+    counts, m = counts[pairable], m[pairable]
+    base = {"metric": metric, "n_units": int(pairable.sum()), "n_values": int(m.sum())}
+    if len(m) < 2:
+        return AlphaResult(alpha=None, **base)
+
+    # o[c, k] = Σ_u (n_uc · n_uk − [c = k] · n_uc) / (m_u − 1)
+    weighted = counts / (m - 1)[:, None]
+    coincidences = weighted.T @ counts - np.diag(weighted.sum(axis=0))
+    n_c = coincidences.sum(axis=1)
+    used = n_c > 0
+    n_total = float(n_c.sum())
+    if int(used.sum()) < 2 or n_total <= 1:
+        return AlphaResult(alpha=None, **base)
+
+    delta = _delta_matrix(metric, values, n_c)
+    do = float((coincidences * delta).sum()) / n_total
+    de = float((np.outer(n_c, n_c) * delta).sum()) / (n_total * (n_total - 1))
+    if de == 0:
+        return AlphaResult(alpha=None, **base)
+    alpha = 1.0 - do / de
+    if n_bootstrap <= 0:
+        return AlphaResult(alpha=alpha, **base)
+
+    # Desacuerdo observado por unidad: n_uᵀ Δ n_u / (m_u − 1) (la diagonal
+    # de Δ es 0). La réplica b suma las unidades sorteadas.
+    per_unit = ((counts @ delta) * counts).sum(axis=1) / (m - 1)
+    alphas = _bootstrap_alphas(per_unit, m, de, n_bootstrap, seed)
+    tail = (1.0 - confidence) / 2.0
+    low, high = np.quantile(alphas, [tail, 1.0 - tail])
+    return AlphaResult(alpha=alpha, ci_low=float(low), ci_high=float(high), **base)
+
+
+def agreement_by_dimension(
+    dimensions: Mapping[str, tuple[Sequence[Sequence[Any]], Metric]],
+    *,
+    n_bootstrap: int = 0,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> dict[str, AlphaResult]:
+    """Alpha (y su intervalo) de cada dimensión: {nombre: (matriz, métrica)}.
+
+    Todas las dimensiones comparten la semilla, así que los intervalos son
+    reproducibles corrida a corrida.
+    """
+    return {
+        name: alpha_with_ci(data, metric, n_bootstrap=n_bootstrap, confidence=confidence, seed=seed)
+        for name, (data, metric) in dimensions.items()
+    }
+
+
+def nominal_alpha_from_annotations(
+    units: np.ndarray,
+    codes: np.ndarray,
+    categories: Sequence[Any],
+) -> float | None:
+    """Alpha nominal desde anotaciones sueltas, sin la matriz anotadores × unidades.
+
+    Cada posición es una anotación: `units[i]` identifica la unidad (entero
+    cualquiera) y `codes[i]` indexa `categories`. Las categorías se
+    normalizan como en `krippendorff_alpha` (faltantes descartados,
+    equivalentes fundidas), así que el resultado es el mismo. Sirve cuando
+    anotadores × unidades no entra en memoria pero las anotaciones sí.
+    """
+    index: dict[Hashable, int] = {}
+    mapping = np.full(len(categories) + 1, -1, dtype=np.int64)
+    for j, valor in enumerate(categories):
+        if not _is_missing(valor):
+            mapping[j] = index.setdefault(_norm(valor, "nominal"), len(index))
+    cats = mapping[np.asarray(codes, dtype=np.int64)]
+    present = cats >= 0
+    if not present.any():
+        return None
+    unit_ids = _dense_ids(np.asarray(units, dtype=np.int64)[present])
+    cats = cats[present]
+    m = np.bincount(unit_ids)
+    pairable = m >= 2
+    if int(pairable.sum()) < 2:
+        return None
+    keep = pairable[unit_ids]
+    unit_ids, cats = unit_ids[keep], cats[keep]
+    n_c = np.bincount(cats, minlength=len(index))
+    n_total = int(n_c.sum())
+    if int((n_c > 0).sum()) < 2 or n_total <= 1:
+        return None
+
+    # Σ_{c≠k} o_ck = Σ_u (m_u² − Σ_c n_uc²) / (m_u − 1), con numeradores enteros.
+    celdas = unit_ids * len(index) + cats
+    if len(m) * len(index) <= 4 * len(celdas):
+        n_uc = np.bincount(celdas, minlength=len(m) * len(index)).reshape(len(m), len(index))
+        cuadrados = (n_uc.astype(float) ** 2).sum(axis=1)
+    else:
+        celdas, n_cell = np.unique(celdas, return_counts=True)
+        cuadrados = np.bincount(
+            celdas // len(index), weights=n_cell.astype(float) ** 2, minlength=len(m)
+        )
+    m_u = m[pairable].astype(float)
+    do = float(((m_u**2 - cuadrados[pairable]) / (m_u - 1)).sum()) / n_total
+    de = float(n_total**2 - int((n_c**2).sum())) / (n_total * (n_total - 1))
     if de == 0:
         return None
     return 1.0 - do / de
 
 
-def _delta_fn(metric: Metric, categorias: list, n_c: dict):
-    """Función de distancia al cuadrado según la métrica."""
+# ── Internos ─────────────────────────────────────────────────────────────────
+
+
+def _encode(
+    reliability_data: Sequence[Sequence[Any]], metric: Metric
+) -> tuple[np.ndarray, list[Hashable]]:
+    """Codifica la matriz a enteros (−1 = faltante) y devuelve las categorías.
+
+    En ordinal/interval factoriza los valores crudos de una vez y normaliza
+    solo los distintos: `float()` ya une `1`, `1.0` y `True`. En nominal cada
+    valor se normaliza antes, porque factorize también los une por hash y
+    como strings son categorías distintas (`'1'`, `'1.0'`, `'true'`).
+    """
+    n_units = max((len(fila) for fila in reliability_data), default=0)
+    raw = np.full((len(reliability_data), n_units), None, dtype=object)
+    for i, fila in enumerate(reliability_data):
+        raw[i, : len(fila)] = list(fila)
+    flat = raw.ravel()
+    if metric == "nominal":
+        flat = np.array([None if _is_missing(v) else _norm(v, metric) for v in flat], dtype=object)
+    raw_codes, uniques = pd.factorize(flat)
+    index: dict[Hashable, int] = {}
+    # Una posición extra al final: el −1 de factorize (NA) cae ahí.
+    mapping = np.full(len(uniques) + 1, -1, dtype=np.int64)
+    for j, valor in enumerate(uniques):
+        if not _is_missing(valor):
+            mapping[j] = index.setdefault(_norm(valor, metric), len(index))
+    return mapping[raw_codes].reshape(raw.shape), list(index)
+
+
+def _dense_ids(ids: np.ndarray) -> np.ndarray:
+    """Enteros → ids en [0, n); sin renumerar si ya son chicos y no negativos."""
+    if len(ids) and ids.min() >= 0 and ids.max() < 4 * len(ids):
+        return ids
+    return np.unique(ids, return_inverse=True)[1].reshape(-1)
+
+
+def _unit_counts(codes: np.ndarray, n_categories: int) -> np.ndarray:
+    """Conteos unidades × categorías de las anotaciones presentes."""
+    n_units = codes.shape[1]
+    coder_idx, unit_idx = np.nonzero(codes >= 0)
+    flat = unit_idx * n_categories + codes[coder_idx, unit_idx]
+    counts = np.bincount(flat, minlength=n_units * n_categories)
+    return counts.reshape(n_units, n_categories).astype(float)
+
+
+def _delta_matrix(metric: Metric, values: list[Hashable], n_c: np.ndarray) -> np.ndarray:
+    """Distancias al cuadrado entre categorías según la métrica."""
+    k = len(values)
     if metric == "nominal":
-        return lambda c, k: 0.0 if c == k else 1.0
+        return 1.0 - np.eye(k)
+    numeric = np.array([float(v) for v in values])  # type: ignore[arg-type]
     if metric == "interval":
-        return lambda c, k: (float(c) - float(k)) ** 2
+        return (numeric[:, None] - numeric[None, :]) ** 2
     # ordinal: delta = (suma de marginales entre c y k - (n_c+n_k)/2)^2
-    orden = sorted(categorias, key=float)
-    pos = {c: i for i, c in enumerate(orden)}
+    order = np.argsort(numeric, kind="stable")
+    rank = np.empty(k, dtype=np.int64)
+    rank[order] = np.arange(k)
+    cumulative = np.concatenate([[0.0], np.cumsum(n_c[order])])
+    lo = np.minimum(rank[:, None], rank[None, :])
+    hi = np.maximum(rank[:, None], rank[None, :])
+    between = cumulative[hi + 1] - cumulative[lo]
+    return (between - (n_c[:, None] + n_c[None, :]) / 2.0) ** 2
 
-    def delta(c, k):
-        i, j = sorted((pos[c], pos[k]))
-        acumulado = sum(n_c[orden[g]] for g in range(i, j + 1))
-        return (acumulado - (n_c[c] + n_c[k]) / 2.0) ** 2
 
-    return delta
+def _bootstrap_alphas(
+    per_unit: np.ndarray,
+    values_per_unit: np.ndarray,
+    de: float,
+    n_bootstrap: int,
+    seed: int,
+) -> np.ndarray:
+    """Alphas de `n_bootstrap` réplicas, por bloques de réplicas a la vez."""
+    rng = np.random.default_rng(seed)
+    n_units = len(per_unit)
+    block = max(1, _BOOTSTRAP_BLOCK_CELLS // n_units)
+    out = np.empty(n_bootstrap)
+    for start in range(0, n_bootstrap, block):
+        stop = min(start + block, n_bootstrap)
+        sample = rng.integers(0, n_units, size=(stop - start, n_units))
+        observed = per_unit[sample].sum(axis=1) / values_per_unit[sample].sum(axis=1)
+        out[start:stop] = 1.0 - observed / de
+    return out
 
 
 def _is_missing(valor: Any) -> bool:
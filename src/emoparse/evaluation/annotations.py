@@ -76,7 +76,8 @@ ANNOTATION_DECISION_COLUMNS: tuple[str, ...] = (
 def validate_annotation_decisions(df: pd.DataFrame) -> None:
     """Valida presencia y coherencia de todas las decisiones humanas."""
     _require_columns(df, ANNOTATION_DECISION_COLUMNS)
-    for row_number, row in enumerate(df.to_dict(orient="records"), start=2):
+    decisions = df[list(ANNOTATION_DECISION_COLUMNS)].to_dict(orient="records")
+    for row_number, row in enumerate(decisions, start=2):
         hay = _normalizar_hay(_cell(row, "hay_emocion"), row_number)
         emotions = _row_emotions(row, row_number)
         if hay == "no" and emotions:
@@ -106,31 +106,64 @@ def load_run_genre(db_path: Path | str) -> str | None:
     return presentation.genre_id if presentation is not None else None
 
 
+#: Columnas de `emociones` que consume el matching (`evaluation.matching`).
+#: Las canónicas llegaron con migraciones: en runs viejos se leen como NULL.
+_COLUMNAS_EVALUADAS: tuple[str, ...] = (
+    "experienciador",
+    "experienciador_canonico",
+    "tipo_emocion",
+    "tipo_emocion_canonico",
+    "fuente_inferencia",
+    "fuente_canonico",
+    "modo_existencia",
+)
+
+#: `foria` del payload de caracterización, sin parsearlo en Python. Un
+#: payload que no es JSON (o no es un objeto) no aporta foria.
+_SQL_FORIA = (
+    "CASE WHEN json_valid(e.caracterizacion_payload) "
+    "AND json_type(e.caracterizacion_payload) = 'object' "
+    "THEN json_extract(e.caracterizacion_payload, '$.foria') END"
+)
+
+
 def load_run_emotions(
     db_path: Path | str,
     keys: set[tuple[str, int]] | None = None,
 ) -> dict[tuple[str, int], list[dict[str, Any]]]:
-    """Emociones del run agrupadas por ``(codigo, unit_idx)``."""
+    """Emociones del run agrupadas por ``(codigo, unit_idx)``.
+
+    Cada emoción trae `codigo`, `frase_idx`, `emocion_idx`, las columnas que
+    evalúa el matching y `foria` (None si el payload de caracterización no
+    la tiene).
+    Con `keys`, las unidades del golden se cargan en una tabla temporal y el
+    filtro es un join: el run no se lee entero.
+    """
     conn = sqlite3.connect(f"file:{Path(db_path)}?mode=ro", uri=True)
     conn.row_factory = sqlite3.Row
     try:
-        rows = conn.execute("SELECT * FROM emociones").fetchall()
+        existentes = {r["name"] for r in conn.execute("PRAGMA table_info(emociones)")}
+        columnas = ", ".join(
+            f"e.{c}" if c in existentes else f"NULL AS {c}" for c in _COLUMNAS_EVALUADAS
+        )
+        foria = _SQL_FORIA if "caracterizacion_payload" in existentes else "NULL"
+        sql = (
+            f"SELECT e.codigo, e.frase_idx, e.emocion_idx, {columnas}, {foria} AS foria "
+            "FROM emociones e"
+        )
+        if keys is not None:
+            conn.execute("CREATE TEMP TABLE golden_keys (codigo TEXT, frase_idx INTEGER)")
+            conn.executemany("INSERT INTO golden_keys VALUES (?, ?)", sorted(keys))
+            sql += " JOIN golden_keys k ON k.codigo = e.codigo AND k.frase_idx = e.frase_idx"
+        # El orden de inserción, como antes: el matching desempata por posición.
+        rows = conn.execute(sql + " ORDER BY e.rowid").fetchall()
     finally:
         conn.close()
 
     output: dict[tuple[str, int], list[dict[str, Any]]] = {}
     for row in rows:
         key = (str(row["codigo"]), int(row["frase_idx"]))
-        if keys is not None and key not in keys:
-            continue
-        emotion = dict(row)
-        payload = emotion.get("caracterizacion_payload")
-        if isinstance(payload, str) and payload:
-            try:
-                emotion["foria"] = json.loads(payload).get("foria")
-            except json.JSONDecodeError:
-                pass
-        output.setdefault(key, []).append(emotion)
+        output.setdefault(key, []).append(dict(row))
     if keys is not None:
         for key in keys:
             output.setdefault(key, [])
@@ -0,0 +1,102 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.evaluation.golden_batch
+#
+#  Evaluación de un golden contra muchos runs a la vez (`emoparse eval
+#  --golden --lote`): la regresión de un cambio de prompt compara el mismo
+#  golden contra decenas de bases.
+#
+#  Cada run se evalúa en un proceso aparte. El golden se envía una sola vez
+#  por proceso (inicializador del pool), no una vez por run; cada proceso
+#  lee de su run solo las unidades del golden (`load_run_emotions` con
+#  tabla temporal) y devuelve el `MatchReport`, no las emociones.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sqlite3
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from emoparse.evaluation.golden import load_run_emotions, load_run_genre
+from emoparse.evaluation.matching import MatchReport, match_units
+
+#: Unidades del golden del proceso worker (las fija `_init_worker`).
+_UNIDADES: dict[tuple[str, int], list[dict[str, Any]]] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class RunEvaluation:
+    """Resultado del golden sobre un run. `report` es None si el run falló."""
+
+    db_path: Path
+    genre: str | None
+    report: MatchReport | None
+    seconds: float
+    error: str | None = None
+
+
+def evaluate_runs(
+    units: dict[tuple[str, int], list[dict[str, Any]]],
+    db_paths: Sequence[Path],
+    *,
+    declared_genre: str | None = None,
+    workers: int | None = None,
+) -> list[RunEvaluation]:
+    """Evalúa `units` contra cada run, en el orden de `db_paths`.
+
+    Args:
+        units: Unidades del golden (`GoldenDataset.units`).
+        db_paths: Bases de los runs a evaluar.
+        declared_genre: Género que declara el golden; un run de otro género
+            queda con error en lugar de evaluarse.
+        workers: Procesos en paralelo; None = uno por run hasta la cantidad
+            de CPUs. Con 1 (o un solo run) se evalúa en el proceso actual.
+    """
+    paths = [Path(p) for p in db_paths]
+    n_workers = min(len(paths), workers or os.cpu_count() or 1)
+    if n_workers <= 1:
+        _init_worker(units)
+        try:
+            return [_evaluar(p, declared_genre) for p in paths]
+        finally:
+            _init_worker({})
+    # `spawn`: los workers no heredan hilos ni conexiones abiertas del padre.
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(units,),
+    ) as pool:
+        return list(pool.map(_evaluar, paths, [declared_genre] * len(paths)))
+
+
+def _init_worker(units: dict[tuple[str, int], list[dict[str, Any]]]) -> None:
+    global _UNIDADES
+    _UNIDADES = units
+
+
+def _evaluar(db_path: Path, declared_genre: str | None) -> RunEvaluation:
+    inicio = time.perf_counter()
+    try:
+        genre = load_run_genre(db_path)
+        if declared_genre and genre and declared_genre != genre:
+            return RunEvaluation(
+                db_path,
+                genre,
+                None,
+                time.perf_counter() - inicio,
+                error=f"el golden declara `{declared_genre}` pero el run es `{genre}`",
+            )
+        predictions = load_run_emotions(db_path, keys=set(_UNIDADES))
+    except sqlite3.Error as exc:
+        return RunEvaluation(
+            db_path, None, None, time.perf_counter() - inicio, error=f"no se pudo leer: {exc}"
+        )
+    report = match_units(_UNIDADES, predictions)
+    return RunEvaluation(db_path, genre, report, time.perf_counter() - inicio)
@@ -9,16 +9,22 @@ from __future__ import annotations
 import hashlib
 import itertools
 import json
+import multiprocessing
+import os
 import re
 import sqlite3
 import unicodedata
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
 
-from emoparse.evaluation.agreement import krippendorff_alpha
+import numpy as np
+import pandas as pd
+
+from emoparse.evaluation.agreement import nominal_alpha_from_annotations
 from emoparse.genres.presentation import GenrePresentation, presentation_from_config
 
 REFERENCE_MATCHES: tuple[str, ...] = (
@@ -115,35 +121,72 @@ def load_run_overview(db_path: Path | str) -> RunOverview:
         )
 
 
-def compare_runs(db_paths: list[Path] | tuple[Path, ...]) -> RunComparison:
-    """Compara acuerdo, referencias y obediencia al contrato entre runs."""
+def compare_runs(
+    db_paths: list[Path] | tuple[Path, ...],
+    *,
+    workers: int | None = None,
+) -> RunComparison:
+    """Compara acuerdo, referencias y obediencia al contrato entre runs.
+
+    Los runs se attachean de a uno a una sesión SQLite de trabajo, así que la
+    cantidad de runs no choca con el tope de bases attacheadas. El corpus
+    común sale de una tabla de unidades de la sesión y de cada run se leen
+    solo las columnas comparadas, ya reducidas a un valor por dimensión e
+    internadas como códigos enteros. Las tres tablas se calculan sobre esos
+    códigos: cada valor distinto se normaliza y clasifica una sola vez.
+
+    `workers` son los procesos que leen las emociones de los runs en
+    paralelo (la etapa más cara). None = automático: en el proceso actual
+    con pocos runs (levantar procesos cuesta más que leerlos) y uno por CPU
+    desde `_PARALLEL_FROM_RUNS`. Con 1 se leen siempre en el proceso actual.
+    """
     paths = [Path(path).expanduser().resolve() for path in db_paths]
     if len(paths) < 2:
         raise ValueError("La comparación requiere al menos dos runs.")
 
     names = _unique_names(paths)
-    unit_maps: dict[str, dict[tuple[str, int], str]] = {}
-    emotion_maps: dict[str, dict[tuple[str, int], dict[int, dict[str, Any]]]] = {}
+    values = _InternedValues()
     signatures: dict[str, str] = {}
-    for name, path in zip(names, paths, strict=True):
-        with _connect_ro(path) as connection:
-            unit_maps[name] = _load_units(connection)
-            emotion_maps[name] = _load_emotions(connection)
-            signatures[name] = _signature_for_units(unit_maps[name])
-
-    common = set.intersection(*(set(units) for units in unit_maps.values()))
-    common_units = sorted(common)
-    max_slot = _max_slot(emotion_maps)
-    agreement = _agreement_rows(names, common_units, emotion_maps, max_slot)
-    references = _reference_rows(names, common_units, emotion_maps, max_slot)
-    violations = _contract_violation_rows(names, emotion_maps)
+    unit_counts: list[int] = []
+    runs: list[_RunEmotions] = []
+    with _work_session() as work:
+        for name, path in zip(names, paths, strict=True):
+            with _attached(work, path):
+                signatures[name] = _corpus_signature(work, _ATTACHED)
+                unit_counts.append(_register_units(work))
+        common_units = _register_common_units(work, len(paths))
+        if workers is None:
+            workers = (os.cpu_count() or 1) if len(paths) >= _PARALLEL_FROM_RUNS else 1
+        n_workers = min(len(paths), workers)
+        if n_workers <= 1:
+            for path in paths:
+                with _attached(work, path):
+                    runs.append(values.adopt(_read_emotions(work)))
+        else:
+            common_keys = work.execute(
+                "SELECT codigo, unit_idx FROM comunes ORDER BY id"
+            ).fetchall()
+            # `spawn`: los lectores no heredan la sesión de trabajo del padre.
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_reader,
+                initargs=(common_keys,),
+            ) as pool:
+                runs.extend(values.adopt(run) for run in pool.map(_read_in_worker, paths))
+
+    features = _ValueFeatures.build(values)
+    max_slot = max((int(run.max_slot) for run in runs), default=0)
+    agreement = _agreement_rows(runs, features, common_units, max_slot)
+    references = _reference_rows(names, runs, features, max_slot)
+    violations = _contract_violation_rows(names, runs, features)
     nonempty_signatures = {signature for signature in signatures.values() if signature}
     same_corpus = len(nonempty_signatures) == 1 and all(
-        set(units) == set(next(iter(unit_maps.values()))) for units in unit_maps.values()
+        count == common_units for count in unit_counts
     )
     return RunComparison(
         run_names=tuple(names),
-        common_units=len(common_units),
+        common_units=common_units,
         same_corpus=same_corpus,
         corpus_signatures=signatures,
         agreement=tuple(agreement),
@@ -193,38 +236,41 @@ def is_role_label(value: str | None) -> bool:
     )
 
 
+# ── Tablas de la comparación ─────────────────────────────────────────────────
+
+
 def _agreement_rows(
-    names: list[str],
-    units: list[tuple[str, int]],
-    emotions: dict[str, dict[tuple[str, int], dict[int, dict[str, Any]]]],
+    runs: list[_RunEmotions],
+    features: _ValueFeatures,
+    common_units: int,
     max_slot: int,
 ) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
-    presence_matrix = [
-        ["si" if emotions[name].get(unit) else "no" for unit in units] for name in names
-    ]
-    rows.append(
+    """Alpha nominal por dimensión sobre las posiciones (unidad común, slot)."""
+    slots = max_slot + 1
+    presence = [np.zeros(common_units, dtype=np.int64) for _ in runs]
+    for flags, run in zip(presence, runs, strict=True):
+        flags[run.units] = 1
+    rows: list[dict[str, Any]] = [
         {
             "dimension": "hay_emocion",
-            "alpha": krippendorff_alpha(presence_matrix, metric="nominal"),
-            "items": len(units),
+            "alpha": nominal_alpha_from_annotations(
+                np.tile(np.arange(common_units), len(runs)),
+                np.concatenate(presence) if presence else np.empty(0, dtype=np.int64),
+                ("no", "si"),
+            ),
+            "items": common_units,
         }
-    )
-    dimensions = ("tipo", "experienciador", "fuente", "modo_existencia", "foria")
-    positions = [(unit, slot) for unit in units for slot in range(max_slot + 1)]
-    for dimension in dimensions:
-        matrix = [
-            [
-                _emotion_value(emotions[name].get(unit, {}).get(slot), dimension)
-                for unit, slot in positions
-            ]
-            for name in names
-        ]
+    ]
+    positions = np.concatenate([run.items(slots) for run in runs])
+    for dimension in _DIMENSIONS:
+        codes = np.concatenate([run.codes[dimension] for run in runs])
         rows.append(
             {
                 "dimension": dimension,
-                "alpha": krippendorff_alpha(matrix, metric="nominal"),
-                "items": len(positions),
+                "alpha": nominal_alpha_from_annotations(
+                    positions, codes, features.category[dimension]
+                ),
+                "items": common_units * slots,
             }
         )
     return rows
@@ -232,29 +278,49 @@ def _agreement_rows(
 
 def _reference_rows(
     names: list[str],
-    units: list[tuple[str, int]],
-    emotions: dict[str, dict[tuple[str, int], dict[int, dict[str, Any]]]],
+    runs: list[_RunEmotions],
+    features: _ValueFeatures,
     max_slot: int,
 ) -> list[dict[str, Any]]:
+    """Grado de coincidencia de cada par de runs en cada posición con emoción.
+
+    Las posiciones se alinean entre runs (−1 = el run no tiene emoción ahí).
+    Donde ambos runs traen el mismo valor el grado sale directo (idéntico o
+    ausente); en el resto se cuentan las combinaciones distintas de valores
+    y cada una se clasifica una sola vez (`_ValueFeatures.grades`).
+    """
+    slots = max_slot + 1
+    per_run = [run.items(slots) for run in runs]
+    positions = np.unique(np.concatenate(per_run)) if per_run else np.empty(0, dtype=np.int64)
     counts: dict[tuple[str, str, str, str], int] = {}
-    for left_name, right_name in itertools.combinations(names, 2):
-        for unit in units:
-            for slot in range(max_slot + 1):
-                left_row = emotions[left_name].get(unit, {}).get(slot)
-                right_row = emotions[right_name].get(unit, {}).get(slot)
-                if left_row is None and right_row is None:
-                    continue
-                for field in ("experienciador", "fuente"):
-                    left_raw, left_canon = _reference_values(left_row, field)
-                    right_raw, right_canon = _reference_values(right_row, field)
-                    grade = classify_reference(
-                        left_raw,
-                        right_raw,
-                        left_canonical=left_canon,
-                        right_canonical=right_canon,
-                    )
-                    key = (left_name, right_name, field, grade)
-                    counts[key] = counts.get(key, 0) + 1
+    for field in _REFERENCE_FIELDS:
+        aligned = []
+        for items, run in zip(per_run, runs, strict=True):
+            column = np.full(len(positions), -1, dtype=np.int32)
+            column[np.searchsorted(positions, items)] = run.codes[field]
+            aligned.append(column)
+        surface = features.surface[field]
+        width = len(surface)
+        for (left, left_codes), (right, right_codes) in itertools.combinations(
+            zip(names, aligned, strict=True), 2
+        ):
+            same = left_codes == right_codes
+            empty = int((surface[left_codes[same] + 1] == 0).sum())
+            totals = dict.fromkeys(REFERENCE_MATCHES, 0)
+            # Las posiciones sin emoción en ninguno de los dos son iguales (−1).
+            totals["valor_ausente"] = empty - int((left_codes[same] < 0).sum())
+            totals["identico"] = int(same.sum()) - empty
+            differ = ~same
+            combos, n = np.unique(
+                (left_codes[differ].astype(np.int64) + 1) * width + (right_codes[differ] + 1),
+                return_counts=True,
+            )
+            grades = features.grades(field, combos // width - 1, combos % width - 1)
+            for grade_idx, grade in enumerate(REFERENCE_MATCHES):
+                totals[grade] += int(n[grades == grade_idx].sum())
+            for grade, total in totals.items():
+                if total:
+                    counts[(left, right, field, grade)] = total
     return [
         {
             "run_a": left,
@@ -269,67 +335,389 @@ def _reference_rows(
 
 def _contract_violation_rows(
     names: list[str],
-    emotions: dict[str, dict[tuple[str, int], dict[int, dict[str, Any]]]],
+    runs: list[_RunEmotions],
+    features: _ValueFeatures,
 ) -> list[dict[str, Any]]:
     output: list[dict[str, Any]] = []
-    for name in names:
-        counts = {"experienciador": 0, "fuente": 0}
-        examples: dict[str, set[str]] = {"experienciador": set(), "fuente": set()}
-        for slots in emotions[name].values():
-            for row in slots.values():
-                for field in counts:
-                    raw, canonical = _reference_values(row, field)
-                    for value in (canonical, raw):
-                        if is_role_label(value):
-                            counts[field] += 1
-                            examples[field].add(str(value))
-                            break
-        for field in counts:
+    for name, run in zip(names, runs, strict=True):
+        for field in _REFERENCE_FIELDS:
+            frequency = run.frequency[field]
+            flagged = [
+                (value, int(frequency[code]))
+                for code, value in features.violation[field].items()
+                if code < len(frequency) and frequency[code]
+            ]
             output.append(
                 {
                     "run": name,
                     "dimension": field,
-                    "violaciones": counts[field],
-                    "ejemplos": ", ".join(sorted(examples[field])[:5]),
+                    "violaciones": sum(n for _, n in flagged),
+                    "ejemplos": ", ".join(sorted({value for value, _ in flagged})[:5]),
                 }
             )
     return output
 
 
-def _emotion_value(row: dict[str, Any] | None, dimension: str) -> str | None:
-    if row is None:
-        return None
-    if dimension == "tipo":
-        return _surface_norm(row.get("tipo_emocion_canonico") or row.get("tipo_emocion")) or None
-    if dimension == "experienciador":
-        raw, canonical = _reference_values(row, dimension)
-        return _canonical_norm(canonical or raw) or None
-    if dimension == "fuente":
-        raw, canonical = _reference_values(row, dimension)
-        return _canonical_norm(canonical or raw) or None
-    if dimension == "modo_existencia":
-        return _surface_norm(row.get("modo_existencia")) or None
-    if dimension == "foria":
-        payload = _json_object(row.get("caracterizacion_payload"))
-        return _surface_norm(payload.get("foria")) or None
-    raise ValueError(f"Dimensión desconocida: {dimension}")
-
-
-def _reference_values(
-    row: dict[str, Any] | None,
-    field: str,
-) -> tuple[str | None, str | None]:
-    if row is None:
-        return None, None
-    if field == "experienciador":
-        raw = row.get("experienciador")
-        canonical = row.get("experienciador_canonico")
-    elif field == "fuente":
-        raw = row.get("fuente_inferencia") or row.get("fuente_marca")
-        canonical = row.get("fuente_canonico")
+# ── Lectura de los runs ──────────────────────────────────────────────────────
+
+#: Alias con que cada run se attachea (de a uno) a la sesión de trabajo.
+_ATTACHED = "corrida"
+
+#: Cantidad de runs desde la que `compare_runs` lee en paralelo por defecto.
+_PARALLEL_FROM_RUNS = 8
+
+#: Sesión de trabajo de un proceso lector (la abre `_init_reader`).
+_READER: sqlite3.Connection | None = None
+
+#: Filas por tanda al leer de los runs.
+_FETCH_ROWS = 50_000
+
+#: Separador de (inferencia, canónico) en los valores referenciales internados.
+_PAIR_SEP = "\x1f"
+
+_DIMENSIONS = ("tipo", "experienciador", "fuente", "modo_existencia", "foria")
+_REFERENCE_FIELDS = ("experienciador", "fuente")
+
+
+class _InternedValues:
+    """Códigos enteros de los valores de texto leídos, por columna."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, dict[str, int]] = {kind: {} for kind in _DIMENSIONS}
+
+    def encode(self, kind: str, column: Sequence[str]) -> np.ndarray:
+        codes, uniques = pd.factorize(np.asarray(column, dtype=object))
+        return self._mapping(kind, uniques)[codes]
+
+    def adopt(self, run: _RunEmotions) -> _RunEmotions:
+        """Pasa los códigos de `run`, internados aparte, a los de esta instancia."""
+        codes: dict[str, np.ndarray] = {}
+        frequency: dict[str, np.ndarray] = {}
+        for kind in _DIMENSIONS:
+            mapping = self._mapping(kind, run.values[kind])
+            codes[kind] = mapping[run.codes[kind]]
+            if kind in run.frequency:
+                frequency[kind] = np.bincount(
+                    mapping, weights=run.frequency[kind], minlength=len(self.values[kind])
+                ).astype(np.int64)
+        return replace(run, codes=codes, frequency=frequency, values={})
+
+    def _mapping(self, kind: str, uniques: Sequence[Any]) -> np.ndarray:
+        index = self.values[kind]
+        return np.fromiter(
+            (index.setdefault(str(value), len(index)) for value in uniques),
+            dtype=np.int32,
+            count=len(uniques),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _RunEmotions:
+    """Emociones de un run en las unidades comunes, como códigos internados.
+
+    `units` y `slots` ubican cada emoción (unidad común, `emocion_idx`);
+    `codes` tiene, por columna, el código de cada una. `frequency` cuenta los
+    códigos referenciales sobre todas las emociones del run (también las de
+    unidades no comunes), para la tabla de violaciones del contrato.
+    `values` son los textos de los códigos mientras el run no pasó por
+    `_InternedValues.adopt` (la lectura interna cada run por separado).
+    """
+
+    units: np.ndarray
+    slots: np.ndarray
+    codes: dict[str, np.ndarray]
+    frequency: dict[str, np.ndarray]
+    max_slot: int
+    values: dict[str, list[str]]
+
+    def items(self, slots: int) -> np.ndarray:
+        return self.units.astype(np.int64) * slots + self.slots
+
+
+@dataclass(frozen=True, slots=True)
+class _ValueFeatures:
+    """Lo que cada valor internado aporta a las tablas, calculado una vez.
+
+    `category`: valor de la dimensión para el acuerdo (None = faltante).
+    `surface`/`canonical`: ids de la forma superficial y del slug canónico
+    de cada valor referencial (0 = vacío), con una posición 0 extra para
+    "sin emoción". `tokens`: (offsets, ids) de los tokens de cada valor, en
+    formato CSR con la misma posición extra. `violation`: valores que
+    nombran un rol analítico en lugar de un referente.
+    """
+
+    category: dict[str, list[str | None]]
+    surface: dict[str, np.ndarray]
+    canonical: dict[str, np.ndarray]
+    tokens: dict[str, tuple[np.ndarray, np.ndarray]]
+    violation: dict[str, dict[int, str]]
+
+    @classmethod
+    def build(cls, values: _InternedValues) -> _ValueFeatures:
+        category: dict[str, list[str | None]] = {}
+        surface: dict[str, np.ndarray] = {}
+        canonical: dict[str, np.ndarray] = {}
+        tokens: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        token_ids: dict[str, int] = {}
+        violation: dict[str, dict[int, str]] = {}
+        for kind in ("tipo", "modo_existencia", "foria"):
+            category[kind] = [_surface_norm(value) or None for value in values.values[kind]]
+        for field in _REFERENCE_FIELDS:
+            pairs = [
+                tuple(_optional_text(part) for part in value.split(_PAIR_SEP, 1))
+                for value in values.values[field]
+            ]
+            category[field] = [_canonical_norm(canon or raw) or None for raw, canon in pairs]
+            surface_ids: dict[str, int] = {"": 0}
+            canonical_ids: dict[str, int] = {"": 0}
+            surface[field] = np.array(
+                [0]
+                + [
+                    surface_ids.setdefault(_surface_norm(raw), len(surface_ids)) for raw, _ in pairs
+                ],
+                dtype=np.int64,
+            )
+            canonical[field] = np.array(
+                [0]
+                + [
+                    canonical_ids.setdefault(
+                        _canonical_norm(canon) or _canonical_norm(raw), len(canonical_ids)
+                    )
+                    for raw, canon in pairs
+                ],
+                dtype=np.int64,
+            )
+            per_value = [
+                [token_ids.setdefault(tok, len(token_ids)) for tok in _tokens(raw)]
+                for raw, _ in pairs
+            ]
+            tokens[field] = (
+                np.cumsum([0, 0, *(len(ids) for ids in per_value)], dtype=np.int64),
+                np.fromiter(itertools.chain.from_iterable(per_value), dtype=np.int64),
+            )
+            violation[field] = {
+                code: str(flagged)
+                for code, (raw, canon) in enumerate(pairs)
+                if (flagged := next((v for v in (canon, raw) if is_role_label(v)), None))
+            }
+        return cls(category, surface, canonical, tokens, violation)
+
+    def grades(self, field: str, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Índice en `REFERENCE_MATCHES` de cada par de códigos (−1 = sin emoción).
+
+        Misma prelación que `classify_reference`, vectorizada: el
+        solapamiento de tokens se resuelve cruzando (par, token) de ambos
+        lados en lugar de intersecar conjuntos par por par.
+        """
+        surface, canonical = self.surface[field], self.canonical[field]
+        left_surface, right_surface = surface[left + 1], surface[right + 1]
+        left_canon, right_canon = canonical[left + 1], canonical[right + 1]
+        grades = np.full(len(left), REFERENCE_MATCHES.index("distinto"), dtype=np.int64)
+        pending = (
+            (left_surface > 0)
+            & (right_surface > 0)
+            & (left_surface != right_surface)
+            & ~((left_canon > 0) & (left_canon == right_canon))
+        )
+        pending_idx = np.flatnonzero(pending)
+        overlap = self._shared_token(field, left[pending_idx], right[pending_idx])
+        grades[pending_idx[overlap]] = REFERENCE_MATCHES.index("solapamiento_parcial")
+        grades[(left_canon > 0) & (left_canon == right_canon)] = REFERENCE_MATCHES.index(
+            "mismo_canonico"
+        )
+        grades[left_surface == right_surface] = REFERENCE_MATCHES.index("identico")
+        grades[(left_surface == 0) | (right_surface == 0)] = REFERENCE_MATCHES.index(
+            "valor_ausente"
+        )
+        return grades
+
+    def _shared_token(self, field: str, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """True donde los valores `left[i]` y `right[i]` comparten algún token."""
+        offsets, ids = self.tokens[field]
+        width = int(ids.max()) + 1 if len(ids) else 1
+
+        def keys(codes: np.ndarray) -> np.ndarray:
+            starts = offsets[codes + 1]
+            lengths = offsets[codes + 2] - starts
+            owner = np.repeat(np.arange(len(codes)), lengths)
+            within = np.arange(int(lengths.sum())) - np.repeat(
+                np.cumsum(lengths) - lengths, lengths
+            )
+            return owner * width + ids[np.repeat(starts, lengths) + within]
+
+        shared = np.intersect1d(keys(left), keys(right), assume_unique=True)
+        out = np.zeros(len(left), dtype=bool)
+        out[shared // width] = True
+        return out
+
+
+@contextmanager
+def _work_session() -> Iterator[sqlite3.Connection]:
+    """Sesión SQLite de trabajo en una base temporal (se borra al cerrar)."""
+    connection = _open_work_session()
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+def _open_work_session() -> sqlite3.Connection:
+    connection = sqlite3.connect("", uri=True)
+    connection.executescript(
+        """
+        CREATE TABLE unidades (
+            codigo   TEXT NOT NULL,
+            unit_idx INTEGER NOT NULL,
+            runs     INTEGER NOT NULL,
+            PRIMARY KEY (codigo, unit_idx)
+        );
+        CREATE TABLE comunes (
+            id       INTEGER PRIMARY KEY,
+            codigo   TEXT NOT NULL,
+            unit_idx INTEGER NOT NULL,
+            UNIQUE (codigo, unit_idx)
+        );
+        """
+    )
+    return connection
+
+
+@contextmanager
+def _attached(connection: sqlite3.Connection, path: Path) -> Iterator[None]:
+    connection.execute(f"ATTACH DATABASE ? AS {_ATTACHED}", (f"file:{path}?mode=ro",))
+    try:
+        yield
+    finally:
+        connection.execute(f"DETACH DATABASE {_ATTACHED}")
+
+
+def _register_units(connection: sqlite3.Connection) -> int:
+    """Suma las unidades del run attacheado a `unidades`; devuelve cuántas son."""
+    if not _table_exists(connection, "frases", _ATTACHED):
+        return 0
+    with connection:
+        cursor = connection.execute(
+            f"""
+            INSERT INTO unidades (codigo, unit_idx, runs)
+            SELECT DISTINCT CAST(codigo AS TEXT), CAST(unit_idx AS INTEGER), 1
+            FROM {_ATTACHED}.frases WHERE true
+            ON CONFLICT (codigo, unit_idx) DO UPDATE SET runs = runs + 1
+            """
+        )
+    return int(cursor.rowcount)
+
+
+def _register_common_units(connection: sqlite3.Connection, n_runs: int) -> int:
+    """Numera en `comunes` las unidades presentes en todos los runs."""
+    with connection:
+        cursor = connection.execute(
+            "INSERT INTO comunes (codigo, unit_idx) SELECT codigo, unit_idx FROM unidades "
+            "WHERE runs = ? ORDER BY codigo, unit_idx",
+            (n_runs,),
+        )
+    return int(cursor.rowcount)
+
+
+def _read_emotions(connection: sqlite3.Connection) -> _RunEmotions:
+    """Lee del run attacheado un valor por dimensión de cada emoción.
+
+    La reducción de columnas a valor (canónico o inferencia, `foria` del
+    payload de caracterización) se hace en SQL; solo viaja el texto de las
+    columnas comparadas, que se interna a códigos enteros.
+    """
+    columns = _columns(connection, "emociones", _ATTACHED)
+    if not columns:
+        empty = np.empty(0, dtype=np.int32)
+        return _RunEmotions(
+            units=empty,
+            slots=empty,
+            codes={kind: empty for kind in _DIMENSIONS},
+            frequency={field: empty for field in _REFERENCE_FIELDS},
+            max_slot=0,
+            values={kind: [] for kind in _DIMENSIONS},
+        )
+
+    def column(name: str) -> str:
+        return f"e.{name}" if name in columns else "NULL"
+
+    def first_nonempty(preferred: str, fallback: str) -> str:
+        return (
+            f"CASE WHEN COALESCE({column(preferred)}, '') <> '' "
+            f"THEN {column(preferred)} ELSE {column(fallback)} END"
+        )
+
+    payload = column("caracterizacion_payload")
+    selected = {
+        "tipo": first_nonempty("tipo_emocion_canonico", "tipo_emocion"),
+        "experienciador": (
+            f"COALESCE(CAST({column('experienciador')} AS TEXT), '') || '{_PAIR_SEP}' || "
+            f"COALESCE(CAST({column('experienciador_canonico')} AS TEXT), '')"
+        ),
+        "fuente": (
+            f"COALESCE(CAST({first_nonempty('fuente_inferencia', 'fuente_marca')} AS TEXT), '')"
+            f" || '{_PAIR_SEP}' || COALESCE(CAST({column('fuente_canonico')} AS TEXT), '')"
+        ),
+        "modo_existencia": column("modo_existencia"),
+        "foria": (
+            f"CASE WHEN json_valid({payload}) AND json_type({payload}) = 'object' "
+            f"THEN json_extract({payload}, '$.foria') END"
+        ),
+    }
+    cursor = connection.execute(
+        f"""
+        SELECT COALESCE(cu.id - 1, -1),
+               CAST(COALESCE({column("emocion_idx")}, 0) AS INTEGER),
+               {", ".join(f"COALESCE(CAST({sql} AS TEXT), '')" for sql in selected.values())}
+        FROM {_ATTACHED}.emociones e
+        LEFT JOIN comunes cu
+            ON cu.codigo = CAST(e.codigo AS TEXT)
+           AND cu.unit_idx = CAST(COALESCE({column("frase_idx")}, 0) AS INTEGER)
+        """
+    )
+    values = _InternedValues()
+    units: list[np.ndarray] = []
+    slots: list[np.ndarray] = []
+    codes: dict[str, list[np.ndarray]] = {kind: [] for kind in _DIMENSIONS}
+    while rows := cursor.fetchmany(_FETCH_ROWS):
+        row_columns = list(zip(*rows, strict=True))
+        units.append(np.array(row_columns[0], dtype=np.int32))
+        slots.append(np.array(row_columns[1], dtype=np.int32))
+        for kind, texts in zip(_DIMENSIONS, row_columns[2:], strict=True):
+            codes[kind].append(values.encode(kind, texts))
+    all_units = np.concatenate(units) if units else np.empty(0, dtype=np.int32)
+    all_slots = np.concatenate(slots) if slots else np.empty(0, dtype=np.int32)
+    all_codes = {
+        kind: np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+        for kind, parts in codes.items()
+    }
+    common = all_units >= 0
+    if common.all():
+        kept_units, kept_slots, kept_codes = all_units, all_slots, all_codes
     else:
-        raise ValueError(f"Campo referencial desconocido: {field}")
-    return _optional_text(raw), _optional_text(canonical)
+        kept_units, kept_slots = all_units[common], all_slots[common]
+        kept_codes = {kind: kind_codes[common] for kind, kind_codes in all_codes.items()}
+    return _RunEmotions(
+        units=kept_units,
+        slots=kept_slots,
+        codes=kept_codes,
+        frequency={field: np.bincount(all_codes[field]) for field in _REFERENCE_FIELDS},
+        max_slot=int(all_slots.max()) if len(all_slots) else 0,
+        values={kind: list(index) for kind, index in values.values.items()},
+    )
+
+
+def _read_in_worker(path: Path) -> _RunEmotions:
+    assert _READER is not None, "_init_reader no corrió en este proceso"
+    with _attached(_READER, path):
+        return _read_emotions(_READER)
+
+
+def _init_reader(common_keys: list[tuple[str, int]]) -> None:
+    """Sesión de trabajo del proceso lector, con las mismas unidades comunes."""
+    global _READER
+    _READER = _open_work_session()
+    with _READER:
+        _READER.executemany("INSERT INTO comunes (codigo, unit_idx) VALUES (?, ?)", common_keys)
 
 
 @contextmanager
@@ -342,19 +730,19 @@ def _connect_ro(path: Path) -> Iterator[sqlite3.Connection]:
         connection.close()
 
 
-def _table_exists(connection: sqlite3.Connection, table: str) -> bool:
+def _table_exists(connection: sqlite3.Connection, table: str, schema: str = "main") -> bool:
     return (
         connection.execute(
-            "SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (table,)
+            f"SELECT 1 FROM {schema}.sqlite_master WHERE type='table' AND name = ?", (table,)
         ).fetchone()
         is not None
     )
 
 
-def _columns(connection: sqlite3.Connection, table: str) -> set[str]:
-    if not _table_exists(connection, table):
+def _columns(connection: sqlite3.Connection, table: str, schema: str = "main") -> set[str]:
+    if not _table_exists(connection, table, schema):
         return set()
-    return {str(row["name"]) for row in connection.execute(f"PRAGMA table_info({table})")}
+    return {str(row[1]) for row in connection.execute(f"PRAGMA {schema}.table_info({table})")}
 
 
 def _first_row(connection: sqlite3.Connection, table: str) -> dict[str, Any] | None:
@@ -532,57 +920,25 @@ def _latest_reports(
     return latest
 
 
-def _load_units(connection: sqlite3.Connection) -> dict[tuple[str, int], str]:
-    if not _table_exists(connection, "frases"):
-        return {}
-    columns = _columns(connection, "frases")
-    text_expr = "frase" if "frase" in columns else "''"
-    rows = connection.execute(
-        f"SELECT codigo, unit_idx, {text_expr} AS frase FROM frases ORDER BY codigo, unit_idx"
-    ).fetchall()
-    return {(str(row["codigo"]), int(row["unit_idx"])): str(row["frase"] or "") for row in rows}
-
-
-def _load_emotions(
-    connection: sqlite3.Connection,
-) -> dict[tuple[str, int], dict[int, dict[str, Any]]]:
-    if not _table_exists(connection, "emociones"):
-        return {}
-    rows = connection.execute(
-        "SELECT * FROM emociones ORDER BY codigo, frase_idx, emocion_idx"
-    ).fetchall()
-    output: dict[tuple[str, int], dict[int, dict[str, Any]]] = {}
-    for row in rows:
-        item = dict(row)
-        key = (str(item.get("codigo")), int(item.get("frase_idx") or 0))
-        slot = int(item.get("emocion_idx") or 0)
-        output.setdefault(key, {})[slot] = item
-    return output
-
-
-def _corpus_signature(connection: sqlite3.Connection) -> str:
-    return _signature_for_units(_load_units(connection))
-
-
-def _signature_for_units(units: dict[tuple[str, int], str]) -> str:
-    if not units:
+def _corpus_signature(connection: sqlite3.Connection, schema: str = "main") -> str:
+    """Hash de las unidades (código, índice, texto) en orden, leídas por tandas."""
+    if not _table_exists(connection, "frases", schema):
         return ""
+    text_expr = "frase" if "frase" in _columns(connection, "frases", schema) else "''"
+    cursor = connection.execute(
+        f"SELECT CAST(codigo AS TEXT), CAST(unit_idx AS INTEGER), {text_expr} "
+        f"FROM {schema}.frases ORDER BY 1, 2"
+    )
     digest = hashlib.sha256()
-    for (codigo, unit_idx), text in sorted(units.items()):
-        digest.update(codigo.encode("utf-8"))
-        digest.update(b"\0")
-        digest.update(str(unit_idx).encode("ascii"))
-        digest.update(b"\0")
-        digest.update(text.encode("utf-8"))
-        digest.update(b"\n")
-    return digest.hexdigest()
-
-
-def _max_slot(
-    emotion_maps: dict[str, dict[tuple[str, int], dict[int, dict[str, Any]]]],
-) -> int:
-    slots = [slot for run in emotion_maps.values() for unit in run.values() for slot in unit]
-    return max(slots, default=0)
+    empty = True
+    while rows := cursor.fetchmany(_FETCH_ROWS):
+        empty = False
+        digest.update(
+            "".join(
+                f"{codigo}\0{unit_idx}\0{text or ''}\n" for codigo, unit_idx, text in rows
+            ).encode("utf-8")
+        )
+    return "" if empty else digest.hexdigest()
 
 
 def _unique_names(paths: list[Path]) -> list[str]:
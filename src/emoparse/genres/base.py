@@ -210,6 +210,18 @@ class Genre(BaseModel):
         description="Override de batch size por stage. Solo aplica a "
         "stages batch (actors, emotions, characterizer, judge).",
     )
+    pack_batch_size: dict[str, int] = Field(
+        default_factory=dict,
+        description="Empaquetado entre discursos: stage → unidades por "
+        "llamada. Las stages presentes (actors, emotions, "
+        "emotions_pass2, characterizer) arman cada batch con "
+        "unidades de varios discursos en lugar de un agente por "
+        "discurso; el contexto de cada discurso (título, "
+        "enunciador, resumen) pasa del system prompt a un bloque "
+        "por unidad del user prompt. Pensado para géneros de "
+        "textos cortos, donde cada discurso aporta una sola "
+        "unidad y el batch por discurso queda de 1.",
+    )
     summarizer: bool = Field(
         default=True,
         description="Si False, la stage summarizer se desactiva para este "
@@ -175,6 +175,13 @@ def get_genre() -> Genre:
             "hashtag_semiotics": 6,
             "tecno_usage": 3,
         },
+        # Un post es una sola unidad: sin empaquetar, cada llamada lleva un
+        # post y re-prefillea un system prompt propio de ese post.
+        pack_batch_size={
+            "actors": 6,
+            "emotions": 4,
+            "characterizer": 4,
+        },
         summarizer=False,
         # El pase 2 relee cada frase con las anteriores como contexto: en un
         # tuit, que es una sola unidad, no hay contexto previo que aportar.
@@ -15,11 +15,19 @@
 #  Obligatorios: `id`, `texto` (puede ser vacío solo en reposts puros) y
 #  `autor_handle`. Todo lo demás es opcional y se normaliza con defaults.
 #  Los adapters de `emoparse.acquisition` producen exactamente este formato.
+#
+#  La carga es por columnas: cada post se normaliza y se vuelca a listas por
+#  columna sin retener la fila cruda ni la normalizada. Las columnas de valores
+#  repetidos (plataforma, handles, tipo, idioma y las referencias entre posts)
+#  se codifican con diccionario: cada string distinto vive una sola vez y las
+#  celdas lo comparten, así que un millón de posts de pocos autores no carga
+#  un millón de copias de cada handle.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
 import json
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -53,6 +61,21 @@ POST_COLUMNS: tuple[str, ...] = (
     "raw",
 )
 
+#: Columnas codificadas con diccionario. Las de ids comparten uno solo, así
+#: una referencia (`en_respuesta_a`, ...) reutiliza el string de su post_id.
+_DICT_COLUMNS: dict[str, str] = {
+    "plataforma": "plataforma",
+    "autor_handle": "autor",
+    "autor_display": "autor",
+    "lang": "lang",
+    "tipo": "tipo",
+    "post_id": "id",
+    "conversacion_id": "id",
+    "en_respuesta_a": "id",
+    "cita_a": "id",
+    "reposteo_a": "id",
+}
+
 
 @dataclass
 class PostsBundle:
@@ -75,16 +98,16 @@ def load_posts(path: Path | str) -> PostsBundle:
 
     ext = p.suffix.lower()
     if ext == ".jsonl":
-        rows = _load_jsonl(p)
+        rows = _iter_jsonl(p)
     elif ext == ".csv":
         rows = _load_csv(p)
     else:
         raise InputError(f"Extensión no soportada para posts: '{ext}'. Use .jsonl o .csv.")
 
-    if not rows:
+    df = _to_frame(_normalize_row(r, p) for r in rows)
+    if df.empty:
         raise InputError(f"{p} no contiene posts.")
 
-    df = pd.DataFrame([_normalize_row(r, p) for r in rows], columns=list(POST_COLUMNS))
     _validate_unique_ids(df, p)
     _validate_texto(df, p)
 
@@ -136,9 +159,8 @@ def posts_to_discursos(df_posts: pd.DataFrame) -> pd.DataFrame:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
-def _load_jsonl(path: Path) -> list[dict[str, Any]]:
+def _iter_jsonl(path: Path) -> Iterator[dict[str, Any]]:
     """Lee un JSONL: un objeto post por línea (líneas vacías se ignoran)."""
-    rows: list[dict[str, Any]] = []
     try:
         with path.open(encoding="utf-8") as fh:
             for lineno, line in enumerate(fh, start=1):
@@ -154,10 +176,9 @@ def _load_jsonl(path: Path) -> list[dict[str, Any]]:
                         f"En {path}:{lineno}, la línea debe ser un objeto "
                         f"JSON, recibí: {type(obj).__name__}"
                     )
-                rows.append(obj)
+                yield obj
     except OSError as e:
         raise InputError(f"No pude leer {path}: {e}") from e
-    return rows
 
 
 def _load_csv(path: Path) -> list[dict[str, Any]]:
@@ -229,6 +250,25 @@ def _normalize_row(row: dict[str, Any], path: Path) -> dict[str, Any]:
     }
 
 
+def _to_frame(rows: Iterable[dict[str, Any]]) -> pd.DataFrame:
+    """Vuelca posts normalizados a un DataFrame columna por columna.
+
+    Las columnas de `_DICT_COLUMNS` comparten cada string distinto entre
+    celdas (y entre columnas del mismo diccionario).
+    """
+    columns: dict[str, list[Any]] = {c: [] for c in POST_COLUMNS}
+    diccionarios: dict[str, dict[str, str]] = {d: {} for d in set(_DICT_COLUMNS.values())}
+    codificadas = [(c, diccionarios[d]) for c, d in _DICT_COLUMNS.items()]
+    for row in rows:
+        for c, diccionario in codificadas:
+            value = row[c]
+            if value is not None:
+                row[c] = diccionario.setdefault(value, value)
+        for c, values in columns.items():
+            values.append(row[c])
+    return pd.DataFrame(columns, columns=list(POST_COLUMNS))
+
+
 def _infer_tipo(
     en_respuesta_a: str | None,
     cita_a: str | None,
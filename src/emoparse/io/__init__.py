@@ -1,20 +1,34 @@
 # ══════════════════════════════════════════════════════════════════════════════
 #  emoparse.io
 #
-#  Export de datos de un run a CSV.
+#  Export de datos de un run a CSV, Parquet o JSONL comprimido.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from emoparse.io.exporters import (
+    EXPORT_FORMATS,
+    ExportReport,
+    ExportUnavailableError,
+    export_discursos,
     export_discursos_csv,
+    export_emociones,
     export_emociones_csv,
+    export_frases,
     export_frases_csv,
     export_full_run,
+    export_run,
 )
 
 #: Funciones de export disponibles.
 __all__ = [
+    "EXPORT_FORMATS",
+    "ExportReport",
+    "ExportUnavailableError",
+    "export_discursos",
     "export_discursos_csv",
+    "export_emociones",
     "export_emociones_csv",
+    "export_frases",
     "export_frases_csv",
     "export_full_run",
+    "export_run",
 ]
@@ -1,13 +1,26 @@
 # ══════════════════════════════════════════════════════════════════════════════
 #  emoparse.io.exporters
 #
-#  Export de datos desde DB SQLite a CSV.
+#  Export de datos desde DB SQLite a CSV, Parquet o JSONL comprimido.
+#
+#  Los exporters leen en lotes de tamaño fijo con un cursor abierto y escriben
+#  cada lote apenas se arma: la memoria queda acotada por el lote y no por el
+#  run. Las columnas que salen de los payloads JSON se descubren antes, con
+#  `json_each` en SQLite, así el schema queda fijo desde la primera fila y es
+#  el mismo en los tres formatos.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
 import csv
+import gzip
 import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -20,11 +33,21 @@ from emoparse.genres.presentation import (
     presented_metadata,
 )
 from emoparse.storage.db import Database
-from emoparse.storage.referencia import (
-    marca_canonicos_index,
-    resolver_canonico,
-    resolver_canonicos,
-)
+from emoparse.storage.emocion_canonico import ResolucionRoles, columnas_resolucion
+
+#: Formatos de salida y la extensión de archivo de cada uno.
+EXPORT_FORMATS: dict[str, str] = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "jsonl": ".jsonl.gz",
+}
+
+#: Filas por lote de lectura y escritura.
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class ExportUnavailableError(RuntimeError):
+    """El formato pedido necesita una dependencia opcional que no está instalada."""
 
 
 def _json_or_empty(raw: str | None) -> Any:
@@ -104,6 +127,230 @@ def _flat2(value: Any, prefix: str, result: dict[str, str]) -> None:
             result[sub_prefix] = str(sub)
 
 
+# ── Schema y lectura por lotes ────────────────────────────────────────────────
+
+
+def _json_columns(
+    db: Database,
+    table: str,
+    column: str,
+    prefix: str,
+    *,
+    order_by: str,
+    depth: int = 1,
+) -> list[str]:
+    """Columnas que `_flat` (depth=1) o `_flat2` (depth=2) generan para un payload.
+
+    Recorre las claves con `json_each` sin deserializar en Python. El orden es
+    el de primera aparición, en el orden del export y, dentro de la fila, en el
+    del objeto: el mismo que daba acumular las claves fila por fila.
+    """
+    nested = (
+        "LEFT JOIN json_each(CASE WHEN j.type = 'object' THEN j.value END) j2"
+        if depth == 2
+        else "LEFT JOIN (SELECT NULL AS id, NULL AS key) j2"
+    )
+    sql = f"""
+        WITH o AS (
+            SELECT ROW_NUMBER() OVER (ORDER BY {order_by}) AS n, {column} AS p
+            FROM {table}
+            WHERE json_valid({column})
+        ),
+        k AS (
+            SELECT o.n AS n, j.id AS pos, COALESCE(j2.id, 0) AS pos2,
+                   j.key AS k1, j2.key AS k2
+            FROM o, json_each(o.p) j {nested}
+            WHERE json_type(o.p) = 'object'
+              AND NOT (j.type = 'object' AND j2.key IS NULL AND {int(depth == 2)})
+            UNION ALL
+            SELECT o.n, -1, 0, NULL, NULL
+            FROM o
+            WHERE json_type(o.p) NOT IN ('object', 'null')
+        ),
+        f AS (
+            SELECT k1, k2, MIN(n) AS n0 FROM k GROUP BY k1, k2
+        )
+        SELECT f.k1 AS k1, f.k2 AS k2
+        FROM f JOIN k ON k.n = f.n0 AND k.k1 IS f.k1 AND k.k2 IS f.k2
+        GROUP BY f.k1, f.k2
+        ORDER BY f.n0, MIN(k.pos), MIN(k.pos2)
+    """
+    cols: list[str] = []
+    for row in db.execute(sql):
+        parts = [p for p in (row["k1"], row["k2"]) if p is not None]
+        cols.append("__".join([prefix, *map(str, parts)]) if prefix else "__".join(parts))
+    return cols
+
+
+def _iter_chunks(
+    db: Database, sql: str, chunk_size: int, params: tuple[Any, ...] = ()
+) -> Iterator[list[sqlite3.Row]]:
+    """Itera el resultado de una consulta en lotes de `chunk_size` filas."""
+    cur = db.execute(sql, params)
+    try:
+        while rows := cur.fetchmany(chunk_size):
+            yield rows
+    finally:
+        cur.close()
+
+
+def _dedupe(columns: list[str]) -> list[str]:
+    """Quita columnas repetidas conservando la primera aparición."""
+    return list(dict.fromkeys(columns))
+
+
+# ── Escritores ────────────────────────────────────────────────────────────────
+
+
+def _format_for(output_path: Path, fmt: str | None) -> str:
+    """Formato explícito o inferido por la extensión del archivo."""
+    if fmt is not None:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Formato de export desconocido: {fmt!r}. Opciones: {', '.join(EXPORT_FORMATS)}"
+            )
+        return fmt
+    name = output_path.name.lower()
+    for candidate, suffix in EXPORT_FORMATS.items():
+        if name.endswith(suffix):
+            return candidate
+    return "csv"
+
+
+class _TableWriter(ABC):
+    """Escribe lotes de registros con un schema fijo de columnas.
+
+    Los valores ausentes de un registro se escriben como "" en las tres
+    salidas; las columnas de `int_columns` quedan enteras en Parquet y JSONL.
+    """
+
+    def __init__(self, path: Path, columns: list[str], int_columns: frozenset[str]) -> None:
+        self.path = path
+        self.columns = columns
+        self.int_columns = int_columns
+        self.rows = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _values(self, rec: dict[str, Any]) -> dict[str, Any]:
+        return {
+            k: (int(rec[k]) if rec.get(k) not in (None, "") else None)
+            if k in self.int_columns
+            else rec.get(k, "")
+            for k in self.columns
+        }
+
+    @abstractmethod
+    def write(self, records: list[dict[str, Any]]) -> None:
+        """Agrega un lote de registros al archivo."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Cierra el archivo de salida."""
+
+
+class _CsvWriter(_TableWriter):
+    """CSV con header. Sin filas, el archivo queda vacío salvo `header_if_empty`."""
+
+    header_if_empty = False
+
+    def __init__(self, path: Path, columns: list[str], int_columns: frozenset[str]) -> None:
+        super().__init__(path, columns, int_columns)
+        self._file = path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(
+            self._file, fieldnames=columns, restval="", extrasaction="ignore"
+        )
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        if self.rows == 0:
+            self._writer.writeheader()
+        self._writer.writerows(records)
+        self.rows += len(records)
+
+    def close(self) -> None:
+        if self.rows == 0 and self.header_if_empty:
+            self._writer.writeheader()
+        self._file.close()
+
+
+class _JsonlWriter(_TableWriter):
+    """Un objeto JSON por línea, con todas las columnas, comprimido con gzip."""
+
+    def __init__(self, path: Path, columns: list[str], int_columns: frozenset[str]) -> None:
+        super().__init__(path, columns, int_columns)
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        self._file.writelines(
+            json.dumps(self._values(rec), ensure_ascii=False) + "\n" for rec in records
+        )
+        self.rows += len(records)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter(_TableWriter):
+    """Parquet con un row group por lote; string salvo las columnas enteras."""
+
+    def __init__(self, path: Path, columns: list[str], int_columns: frozenset[str]) -> None:
+        super().__init__(path, columns, int_columns)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ExportUnavailableError(
+                'pyarrow no está instalado. Instalá el extra: pip install -e ".[data]"'
+            ) from e
+        self._pa = pa
+        self._schema = pa.schema(
+            [(c, pa.int64() if c in int_columns else pa.string()) for c in columns]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        values = [self._values(rec) for rec in records]
+        table = self._pa.Table.from_pydict(
+            {c: [v[c] for v in values] for c in self.columns}, schema=self._schema
+        )
+        self._writer.write_table(table)
+        self.rows += len(records)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+_WRITERS: dict[str, type[_TableWriter]] = {
+    "csv": _CsvWriter,
+    "parquet": _ParquetWriter,
+    "jsonl": _JsonlWriter,
+}
+
+
+def _write_chunks(
+    output_path: Path,
+    fmt: str | None,
+    columns: list[str],
+    chunks: Iterator[list[dict[str, Any]]],
+    *,
+    int_columns: frozenset[str] = frozenset(),
+    header_if_empty: bool = False,
+) -> int:
+    """Escribe los lotes en el formato pedido y devuelve las filas escritas."""
+    writer = _WRITERS[_format_for(output_path, fmt)](output_path, columns, int_columns)
+    if isinstance(writer, _CsvWriter):
+        writer.header_if_empty = header_if_empty
+    try:
+        for records in chunks:
+            writer.write(records)
+    finally:
+        writer.close()
+    return writer.rows
+
+
 # ── Export discursos ──────────────────────────────────────────────────────────
 
 #: Columnas fijas de input que siempre existen (vienen del CSV de input).
@@ -113,66 +360,75 @@ _DISCURSO_INPUT_COLS = ("codigo", "contenido", "titulo", "fecha", "url")
 _DISCURSO_STAGES = ("summarizer", "metadata", "enunciation")
 
 
+def export_discursos(
+    db: Database,
+    output_path: Path,
+    *,
+    fmt: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Exporta la tabla `discursos` con payloads flatten.
+
+    El formato sale de `fmt` o, si es None, de la extensión de `output_path`.
+    """
+    columns = list(_DISCURSO_INPUT_COLS)
+    columns += [
+        c
+        for c in _json_columns(db, "discursos", "input", "input", order_by="codigo")
+        if c.startswith("input__") and c.removeprefix("input__") not in _DISCURSO_INPUT_COLS
+    ]
+    for stage in _DISCURSO_STAGES:
+        columns += _json_columns(db, "discursos", f"{stage}_payload", stage, order_by="codigo")
+        columns.append(f"{stage}__error")
+    columns += ["created_at", "updated_at"]
+
+    def records() -> Iterator[list[dict[str, Any]]]:
+        for rows in _iter_chunks(
+            db,
+            """
+            SELECT
+                codigo, input,
+                summarizer_payload, summarizer_error,
+                metadata_payload, metadata_error,
+                enunciation_payload, enunciation_error,
+                created_at, updated_at
+            FROM discursos
+            ORDER BY codigo
+            """,
+            chunk_size,
+        ):
+            chunk: list[dict[str, Any]] = []
+            for row in rows:
+                record: dict[str, str] = {}
+
+                input_data = _json_or_empty(row["input"]) or {}
+                for k in _DISCURSO_INPUT_COLS:
+                    record[k] = str(input_data.get(k, "") or "")
+                record["codigo"] = str(row["codigo"] or "")
+                for k, v in input_data.items():
+                    if k not in _DISCURSO_INPUT_COLS:
+                        record[f"input__{k}"] = _csv_value(v)
+
+                for stage in _DISCURSO_STAGES:
+                    payload = _json_or_empty(row[f"{stage}_payload"])
+                    _flat(payload, stage, record)
+                    record[f"{stage}__error"] = str(row[f"{stage}_error"] or "")
+
+                record["created_at"] = str(row["created_at"] or "")
+                record["updated_at"] = str(row["updated_at"] or "")
+                chunk.append(record)
+            yield chunk
+
+    n = _write_chunks(output_path, fmt, _dedupe(columns), records())
+    if n == 0:
+        logger.warning("[export_discursos] No hay discursos en la DB.")
+    logger.info(f"[export_discursos] {n} filas → {output_path}")
+    return n
+
+
 def export_discursos_csv(db: Database, output_path: Path) -> int:
     """Exporta la tabla `discursos` a CSV con payloads flatten."""
-    rows = db.execute(
-        """
-        SELECT
-            codigo, input,
-            summarizer_payload, summarizer_error,
-            metadata_payload, metadata_error,
-            enunciation_payload, enunciation_error,
-            created_at, updated_at
-        FROM discursos
-        ORDER BY codigo
-        """
-    ).fetchall()
-
-    if not rows:
-        logger.warning("[export_discursos_csv] No hay discursos en la DB.")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text("", encoding="utf-8")
-        return 0
-
-    records: list[dict[str, str]] = []
-    all_keys: list[str] = []
-    seen_keys: set[str] = set()
-
-    for row in rows:
-        record: dict[str, str] = {}
-
-        input_data = _json_or_empty(row["input"]) or {}
-        for k in _DISCURSO_INPUT_COLS:
-            record[k] = str(input_data.get(k, "") or "")
-        record["codigo"] = str(row["codigo"] or "")
-        for k, v in input_data.items():
-            if k not in _DISCURSO_INPUT_COLS:
-                record[f"input__{k}"] = _csv_value(v)
-
-        for stage in _DISCURSO_STAGES:
-            payload = _json_or_empty(row[f"{stage}_payload"])
-            _flat(payload, stage, record)
-            record[f"{stage}__error"] = str(row[f"{stage}_error"] or "")
-
-        record["created_at"] = str(row["created_at"] or "")
-        record["updated_at"] = str(row["updated_at"] or "")
-
-        for k in record:
-            if k not in seen_keys:
-                seen_keys.add(k)
-                all_keys.append(k)
-
-        records.append(record)
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=all_keys, extrasaction="ignore")
-        writer.writeheader()
-        for rec in records:
-            writer.writerow({k: rec.get(k, "") for k in all_keys})
-
-    logger.info(f"[export_discursos_csv] {len(records)} filas → {output_path}")
-    return len(records)
+    return export_discursos(db, output_path, fmt="csv")
 
 
 # ── Export metadata de género ─────────────────────────────────────────────────
@@ -188,7 +444,13 @@ _METADATA_GENERO_FIELDS = (
 )
 
 
-def export_metadata_genero_csv(db: Database, output_path: Path) -> int:
+def export_metadata_genero(
+    db: Database,
+    output_path: Path,
+    *,
+    fmt: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
     """Exporta la metadata declarada por el género en formato largo.
 
     Una fila representa un campo de un discurso. Se incluyen también los
@@ -196,105 +458,108 @@ def export_metadata_genero_csv(db: Database, output_path: Path) -> int:
     antemano el schema de cada género.
     """
     presentation = _run_genre_presentation(db)
-    rows = db.execute("SELECT codigo, input FROM discursos ORDER BY codigo").fetchall()
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    records: list[dict[str, str]] = []
-    if presentation is not None:
-        for row in rows:
-            payload = _json_or_empty(row["input"]) or {}
-            for item in presented_metadata(presentation, payload, include_missing=True):
-                records.append(
-                    {
-                        "codigo": str(row["codigo"] or ""),
-                        "genero": presentation.genre_id,
-                        "genero_nombre": presentation.display_name,
-                        "campo": item["field"],
-                        "etiqueta": item["label"],
-                        "valor": _csv_value(item["value"]),
-                        "presente": "1" if item["present"] else "0",
-                    }
-                )
-
-    with output_path.open("w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=_METADATA_GENERO_FIELDS)
-        writer.writeheader()
-        writer.writerows(records)
+
+    def records() -> Iterator[list[dict[str, Any]]]:
+        if presentation is None:
+            return
+        for rows in _iter_chunks(
+            db, "SELECT codigo, input FROM discursos ORDER BY codigo", chunk_size
+        ):
+            chunk: list[dict[str, Any]] = []
+            for row in rows:
+                payload = _json_or_empty(row["input"]) or {}
+                for item in presented_metadata(presentation, payload, include_missing=True):
+                    chunk.append(
+                        {
+                            "codigo": str(row["codigo"] or ""),
+                            "genero": presentation.genre_id,
+                            "genero_nombre": presentation.display_name,
+                            "campo": item["field"],
+                            "etiqueta": item["label"],
+                            "valor": _csv_value(item["value"]),
+                            "presente": "1" if item["present"] else "0",
+                        }
+                    )
+            yield chunk
+
+    # El CSV de metadata lleva header aun sin filas: su schema no depende del run.
+    n = _write_chunks(
+        output_path, fmt, list(_METADATA_GENERO_FIELDS), records(), header_if_empty=True
+    )
 
     if presentation is None:
         logger.info(
-            "[export_metadata_genero_csv] El run no contiene una declaración "
+            "[export_metadata_genero] El run no contiene una declaración "
             "de presentación de género; se escribió un archivo sin filas."
         )
-    logger.info(f"[export_metadata_genero_csv] {len(records)} filas → {output_path}")
-    return len(records)
+    logger.info(f"[export_metadata_genero] {n} filas → {output_path}")
+    return n
+
+
+def export_metadata_genero_csv(db: Database, output_path: Path) -> int:
+    """Exporta la metadata declarada por el género a CSV, en formato largo."""
+    return export_metadata_genero(db, output_path, fmt="csv")
 
 
 # ── Export frases ─────────────────────────────────────────────────────────────
 
+_FRASES_FIELDS = (
+    "codigo",
+    "unit_idx",
+    "frase",
+    "actores_payload",
+    "actores_version",
+    "actores_error",
+    "emociones_payload",
+    "emociones_version",
+    "emociones_error",
+    "emociones_pass2_payload",
+    "emociones_pass2_version",
+    "emociones_pass2_error",
+    "created_at",
+    "updated_at",
+)
+
+
+def export_frases(
+    db: Database,
+    output_path: Path,
+    *,
+    fmt: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Exporta la tabla `frases`; los payloads quedan como JSON strings."""
+
+    def records() -> Iterator[list[dict[str, Any]]]:
+        for rows in _iter_chunks(
+            db,
+            f"SELECT {', '.join(_FRASES_FIELDS)} FROM frases ORDER BY codigo, unit_idx",
+            chunk_size,
+        ):
+            yield [
+                {
+                    k: row[k] if k in ("codigo", "unit_idx", "frase") else str(row[k] or "")
+                    for k in _FRASES_FIELDS
+                }
+                for row in rows
+            ]
+
+    n = _write_chunks(
+        output_path,
+        fmt,
+        list(_FRASES_FIELDS),
+        records(),
+        int_columns=frozenset({"unit_idx"}),
+    )
+    if n == 0:
+        logger.warning("[export_frases] No hay frases en la DB.")
+    logger.info(f"[export_frases] {n} filas → {output_path}")
+    return n
+
 
 def export_frases_csv(db: Database, output_path: Path) -> int:
     """Exporta la tabla `frases` a CSV."""
-    rows = db.execute(
-        """
-        SELECT
-            codigo, unit_idx, frase,
-            actores_payload, actores_version, actores_error,
-            emociones_payload, emociones_version, emociones_error,
-            emociones_pass2_payload, emociones_pass2_version, emociones_pass2_error,
-            created_at, updated_at
-        FROM frases
-        ORDER BY codigo, unit_idx
-        """
-    ).fetchall()
-
-    if not rows:
-        logger.warning("[export_frases_csv] No hay frases en la DB.")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text("", encoding="utf-8")
-        return 0
-
-    fieldnames = [
-        "codigo",
-        "unit_idx",
-        "frase",
-        "actores_payload",
-        "actores_version",
-        "actores_error",
-        "emociones_payload",
-        "emociones_version",
-        "emociones_error",
-        "emociones_pass2_payload",
-        "emociones_pass2_version",
-        "emociones_pass2_error",
-    ]
-    fieldnames += ["created_at", "updated_at"]
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in rows:
-            record: dict[str, str] = {
-                "codigo": row["codigo"],
-                "unit_idx": row["unit_idx"],
-                "frase": row["frase"],
-                "actores_payload": row["actores_payload"] or "",
-                "actores_version": row["actores_version"] or "",
-                "actores_error": row["actores_error"] or "",
-                "emociones_payload": row["emociones_payload"] or "",
-                "emociones_version": row["emociones_version"] or "",
-                "emociones_error": row["emociones_error"] or "",
-                "emociones_pass2_payload": row["emociones_pass2_payload"] or "",
-                "emociones_pass2_version": row["emociones_pass2_version"] or "",
-                "emociones_pass2_error": row["emociones_pass2_error"] or "",
-                "created_at": str(row["created_at"] or ""),
-                "updated_at": str(row["updated_at"] or ""),
-            }
-            writer.writerow(record)
-
-    logger.info(f"[export_frases_csv] {len(rows)} filas → {output_path}")
-    return len(rows)
+    return export_frases(db, output_path, fmt="csv")
 
 
 def _has_columns(db: Database, table: str, columns: tuple[str, ...]) -> bool:
@@ -305,9 +570,22 @@ def _has_columns(db: Database, table: str, columns: tuple[str, ...]) -> bool:
 
 # ── Export emociones ──────────────────────────────────────────────────────────
 
+_EMOCIONES_ORDER = "codigo, frase_idx, emocion_idx"
 
-def export_emociones_csv(db: Database, output_path: Path) -> int:
-    """Exporta la tabla `emociones` a CSV con caracterización flatten."""
+
+def export_emociones(
+    db: Database,
+    output_path: Path,
+    *,
+    fmt: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Exporta la tabla `emociones` con caracterización flatten.
+
+    El referente canónico de experienciador y fuente sale de la resolución
+    materializada (`emocion_canonico`); los discursos sin ella vigente se
+    resuelven por lote, indexando solo los vínculos marca↔referente del lote.
+    """
     # Columnas agregadas en versiones posteriores. Se incluyen solo si
     # existen para no romper el export sobre DBs que aún no corrieron las
     # migraciones aditivas.
@@ -333,37 +611,7 @@ def export_emociones_csv(db: Database, output_path: Path) -> int:
     if has_fte_canonico:
         extra_select += ", fuente_canonico"
 
-    # Vínculos marca↔referente del run: permiten exportar el referente
-    # canónico de cada emoción junto a la inferencia cruda del modelo.
-    exp_index = marca_canonicos_index(db, "experienciador")
-    fte_index = marca_canonicos_index(db, "fuente")
-
-    rows = db.execute(
-        f"""
-        SELECT
-            codigo, frase_idx, emocion_idx,
-            experienciador, experienciador_marca, tipo_emocion, fuente_marca,
-            fuente_inferencia, modo_existencia,
-            caracterizacion_payload, caracterizacion_version,
-            caracterizacion_error
-            {extra_select},
-            created_at, updated_at
-        FROM emociones
-        ORDER BY codigo, frase_idx, emocion_idx
-        """
-    ).fetchall()
-
-    if not rows:
-        logger.warning("[export_emociones_csv] No hay emociones en la DB.")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text("", encoding="utf-8")
-        return 0
-
-    records: list[dict[str, str]] = []
-    all_keys: list[str] = []
-    seen_keys: set[str] = set()
-
-    base_keys = [
+    columns = [
         "codigo",
         "frase_idx",
         "emocion_idx",
@@ -376,87 +624,198 @@ def export_emociones_csv(db: Database, output_path: Path) -> int:
         "fuente_referente",
         "modo_existencia",
     ]
-    for k in base_keys:
-        seen_keys.add(k)
-        all_keys.append(k)
-
-    for row in rows:
-        unidad = (row["codigo"], int(row["frase_idx"]))
-        record: dict[str, str] = {
-            "codigo": row["codigo"],
-            "frase_idx": str(row["frase_idx"]),
-            "emocion_idx": str(row["emocion_idx"]),
-            "experienciador": row["experienciador"] or "",
-            "experienciador_marca": row["experienciador_marca"] or "",
-            "experienciador_referente": resolver_canonico(
-                exp_index.get(unidad),
-                row["experienciador_marca"],
-                override=(row["experienciador_canonico"] if has_exp_canonico else None),
-                inferencia=row["experienciador"],
-            ),
-            "tipo_emocion": row["tipo_emocion"] or "",
-            "fuente_marca": row["fuente_marca"] or "",
-            "fuente_inferencia": row["fuente_inferencia"] or "",
-            "fuente_referente": "; ".join(
-                resolver_canonicos(
-                    fte_index.get(unidad),
-                    row["fuente_marca"],
-                    override=row["fuente_canonico"] if has_fte_canonico else None,
-                    inferencia=row["fuente_inferencia"],
-                )
-            ),
-            "modo_existencia": row["modo_existencia"] or "",
-        }
+    columns += _json_columns(
+        db, "emociones", "caracterizacion_payload", "caracterizacion", order_by=_EMOCIONES_ORDER
+    )
+    columns += ["caracterizacion_version", "caracterizacion_error"]
+    if has_tipo_conf:
+        columns += ["tipo_configuracion", "modo_semiotizacion", "modo_identificacion"]
+    if has_canonico:
+        columns.append("tipo_emocion_canonico")
+    if has_actantes:
+        columns += _json_columns(
+            db, "emociones", "actantes_payload", "actantes", order_by=_EMOCIONES_ORDER, depth=2
+        )
+        columns += ["actantes_version", "actantes_error"]
+    columns += ["created_at", "updated_at"]
+    resolucion_cols, resolucion_join = columnas_resolucion(db, "e")
+
+    def records() -> Iterator[list[dict[str, Any]]]:
+        for rows in _iter_chunks(
+            db,
+            f"""
+            SELECT e.*, {resolucion_cols}
+            FROM (
+                SELECT
+                    codigo, frase_idx, emocion_idx,
+                    experienciador, experienciador_marca, tipo_emocion, fuente_marca,
+                    fuente_inferencia, modo_existencia,
+                    caracterizacion_payload, caracterizacion_version,
+                    caracterizacion_error
+                    {extra_select},
+                    created_at, updated_at
+                FROM emociones
+            ) e
+            {resolucion_join}
+            ORDER BY e.codigo, e.frase_idx, e.emocion_idx
+            """,
+            chunk_size,
+        ):
+            # Referente canónico de cada emoción junto a la inferencia cruda
+            # del modelo: la resolución materializada viene en la fila; los
+            # vínculos marca↔referente se indexan solo para los discursos del
+            # lote que todavía no la tienen vigente.
+            resolucion = ResolucionRoles(db, {row["codigo"] for row in rows})
+
+            chunk: list[dict[str, Any]] = []
+            for row in rows:
+                record: dict[str, Any] = {
+                    "codigo": row["codigo"],
+                    "frase_idx": row["frase_idx"],
+                    "emocion_idx": row["emocion_idx"],
+                    "experienciador": row["experienciador"] or "",
+                    "experienciador_marca": row["experienciador_marca"] or "",
+                    "experienciador_referente": resolucion.canonico(
+                        row,
+                        "experienciador",
+                        override=(row["experienciador_canonico"] if has_exp_canonico else None),
+                        inferencia=row["experienciador"],
+                    ),
+                    "tipo_emocion": row["tipo_emocion"] or "",
+                    "fuente_marca": row["fuente_marca"] or "",
+                    "fuente_inferencia": row["fuente_inferencia"] or "",
+                    "fuente_referente": "; ".join(
+                        resolucion.canonicos(
+                            row,
+                            "fuente",
+                            override=row["fuente_canonico"] if has_fte_canonico else None,
+                            inferencia=row["fuente_inferencia"],
+                        )
+                    ),
+                    "modo_existencia": row["modo_existencia"] or "",
+                }
+
+                payload = _json_or_empty(row["caracterizacion_payload"])
+                _flat(payload, "caracterizacion", record)
+
+                record["caracterizacion_version"] = row["caracterizacion_version"] or ""
+                record["caracterizacion_error"] = row["caracterizacion_error"] or ""
+
+                if has_tipo_conf:
+                    record["tipo_configuracion"] = row["tipo_configuracion"] or ""
+                    semiotizacion, identificacion = semiosis_from_config(row["tipo_configuracion"])
+                    record["modo_semiotizacion"] = semiotizacion
+                    record["modo_identificacion"] = identificacion
+                if has_canonico:
+                    record["tipo_emocion_canonico"] = row["tipo_emocion_canonico"] or ""
+                if has_actantes:
+                    actantes_payload = _json_or_empty(row["actantes_payload"])
+                    _flat2(actantes_payload, "actantes", record)
+                    record["actantes_version"] = row["actantes_version"] or ""
+                    record["actantes_error"] = row["actantes_error"] or ""
+
+                record["created_at"] = str(row["created_at"] or "")
+                record["updated_at"] = str(row["updated_at"] or "")
+                chunk.append(record)
+            yield chunk
+
+    n = _write_chunks(
+        output_path,
+        fmt,
+        _dedupe(columns),
+        records(),
+        int_columns=frozenset({"frase_idx", "emocion_idx"}),
+    )
+    if n == 0:
+        logger.warning("[export_emociones] No hay emociones en la DB.")
+    logger.info(f"[export_emociones] {n} filas → {output_path}")
+    return n
 
-        payload = _json_or_empty(row["caracterizacion_payload"])
-        _flat(payload, "caracterizacion", record)
 
-        record["caracterizacion_version"] = row["caracterizacion_version"] or ""
-        record["caracterizacion_error"] = row["caracterizacion_error"] or ""
+def export_emociones_csv(db: Database, output_path: Path) -> int:
+    """Exporta la tabla `emociones` a CSV con caracterización flatten."""
+    return export_emociones(db, output_path, fmt="csv")
 
-        if has_tipo_conf:
-            record["tipo_configuracion"] = row["tipo_configuracion"] or ""
-            semiotizacion, identificacion = semiosis_from_config(row["tipo_configuracion"])
-            record["modo_semiotizacion"] = semiotizacion
-            record["modo_identificacion"] = identificacion
-        if has_canonico:
-            record["tipo_emocion_canonico"] = row["tipo_emocion_canonico"] or ""
-        if has_actantes:
-            actantes_payload = _json_or_empty(row["actantes_payload"])
-            _flat2(actantes_payload, "actantes", record)
-            record["actantes_version"] = row["actantes_version"] or ""
-            record["actantes_error"] = row["actantes_error"] or ""
 
-        record["created_at"] = str(row["created_at"] or "")
-        record["updated_at"] = str(row["updated_at"] or "")
+# ── Export full run ───────────────────────────────────────────────────────────
 
-        for k in record:
-            if k not in seen_keys:
-                seen_keys.add(k)
-                all_keys.append(k)
+#: Tablas del export completo, en el orden del reporte.
+_RUN_TABLES: dict[str, Callable[..., int]] = {
+    "discursos": export_discursos,
+    "metadata_genero": export_metadata_genero,
+    "frases": export_frases,
+    "emociones": export_emociones,
+}
 
-        records.append(record)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=all_keys, extrasaction="ignore")
-        writer.writeheader()
-        for rec in records:
-            writer.writerow({k: rec.get(k, "") for k in all_keys})
+@dataclass
+class TableExport:
+    """Resultado del export de una tabla."""
 
-    logger.info(f"[export_emociones_csv] {len(records)} filas → {output_path}")
-    return len(records)
+    path: Path
+    rows: int
+    elapsed_s: float
 
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.elapsed_s if self.elapsed_s > 0 else 0.0
 
-# ── Export full run ───────────────────────────────────────────────────────────
 
+@dataclass
+class ExportReport:
+    """Resultado de `export_run`: una entrada por tabla, en orden fijo."""
 
-def export_full_run(db: Database, output_dir: Path) -> dict[str, int]:
-    """Corre los exporters y devuelve conteos."""
+    fmt: str
+    tables: dict[str, TableExport] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+
+    @property
+    def counts(self) -> dict[str, int]:
+        return {name: t.rows for name, t in self.tables.items()}
+
+
+def export_run(
+    db: Database,
+    output_dir: Path,
+    *,
+    fmt: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = len(_RUN_TABLES),
+) -> ExportReport:
+    """Exporta las tablas del run, en paralelo si `workers > 1`.
+
+    Cada tabla corre en su hilo con su propia conexión (la de `Database` es
+    por hilo) y la cierra al terminar. SQLite y la compresión sueltan el GIL,
+    así que la lectura de una tabla se solapa con la escritura de otra.
+    """
+    _format_for(output_dir, fmt)
     output_dir.mkdir(parents=True, exist_ok=True)
-    return {
-        "discursos": export_discursos_csv(db, output_dir / "discursos.csv"),
-        "metadata_genero": export_metadata_genero_csv(db, output_dir / "metadata_genero.csv"),
-        "frases": export_frases_csv(db, output_dir / "frases.csv"),
-        "emociones": export_emociones_csv(db, output_dir / "emociones.csv"),
-    }
+    suffix = EXPORT_FORMATS[fmt]
+
+    def export_one(name: str, close: bool) -> TableExport:
+        path = output_dir / f"{name}{suffix}"
+        t0 = time.perf_counter()
+        try:
+            rows = _RUN_TABLES[name](db, path, fmt=fmt, chunk_size=chunk_size)
+        finally:
+            if close:
+                db.close_thread_connection()
+        return TableExport(path=path, rows=rows, elapsed_s=time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    report = ExportReport(fmt=fmt)
+    if workers <= 1:
+        for name in _RUN_TABLES:
+            report.tables[name] = export_one(name, close=False)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(export_one, name, True) for name in _RUN_TABLES}
+            for name, future in futures.items():
+                report.tables[name] = future.result()
+    report.elapsed_s = time.perf_counter() - t0
+    return report
+
+
+def export_full_run(db: Database, output_dir: Path, *, fmt: str = "csv") -> dict[str, int]:
+    """Corre los exporters y devuelve conteos."""
+    return export_run(db, output_dir, fmt=fmt).counts
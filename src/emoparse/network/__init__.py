@@ -25,11 +25,14 @@ from emoparse.network.builders import (
     GRAFOS,
     GRAFOS_AUTOR,
     build_edges,
+    build_edges_for_posts,
+    posts_afectados,
 )
 from emoparse.network.emotion_coupling import (
     community_emotion_profile,
     foria_by_post,
     foria_transition_matrix,
+    pares_respuesta,
 )
 from emoparse.network.emotion_flow import (
     contagion_lift,
@@ -60,6 +63,8 @@ __all__ = [
     "GRAFOS_AUTOR",
     "GRAFO_FOLLOW",
     "build_edges",
+    "build_edges_for_posts",
+    "posts_afectados",
     "to_graph",
     "compute_node_metrics",
     "detect_communities",
@@ -67,6 +72,7 @@ __all__ = [
     "mutual_subgraph",
     "foria_by_post",
     "foria_transition_matrix",
+    "pares_respuesta",
     "community_emotion_profile",
     "tipos_por_post",
     "contagion_lift",
@@ -19,6 +19,11 @@
 #
 #  En reply/rt/qt el destino requiere que el post referido esté capturado
 #  (para conocer a su autor); las referencias a posts ausentes se omiten.
+#
+#  Construcción incremental: las aristas de un post dependen solo de él (y,
+#  en reply/rt/qt, del autor del post referido), así que cuando cambia un
+#  conjunto de posts basta reconstruir las de `posts_afectados`
+#  (`build_edges_for_posts`) y reemplazar esas en la tabla.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
@@ -36,6 +41,9 @@ GRAFO_FOLLOW: str = "follow"
 #: Grafos cuyos nodos son autores (en hashtag_co los nodos son hashtags).
 GRAFOS_AUTOR: tuple[str, ...] = ("reply", "mention", "rt", "qt", GRAFO_FOLLOW)
 
+#: Columna de `posts` que referencia al post destino, en los grafos por referencia.
+REF_COLS: dict[str, str] = {"reply": "en_respuesta_a", "rt": "reposteo_a", "qt": "cita_a"}
+
 #: Columnas del DataFrame de aristas.
 EDGE_COLUMNS: tuple[str, ...] = ("grafo", "origen", "destino", "post_id", "peso", "fecha")
 
@@ -57,7 +65,7 @@ def build_edges(
     }
     fecha_por_post = {str(r["post_id"]): r.get("fecha") for r in df_posts.to_dict(orient="records")}
 
-    for ref_col, grafo in (("en_respuesta_a", "reply"), ("reposteo_a", "rt"), ("cita_a", "qt")):
+    for grafo, ref_col in REF_COLS.items():
         if grafo not in graphs:
             continue
         frames.append(_ref_edges(df_posts, autor_por_post, ref_col, grafo))
@@ -74,6 +82,50 @@ def build_edges(
     return out[list(EDGE_COLUMNS)] if not out.empty else out
 
 
+def posts_afectados(df_posts: pd.DataFrame, grafo: str, cambiados: set[str]) -> set[str]:
+    """Posts cuyas aristas de `grafo` pueden cambiar si cambian `cambiados`.
+
+    Los cambiados mismos (incluidos los borrados) y, en reply/rt/qt, los
+    posts que los referencian: el destino de su arista es el autor del post
+    referido.
+    """
+    afectados = set(cambiados)
+    ref_col = REF_COLS.get(grafo)
+    if ref_col is not None and ref_col in df_posts.columns and not df_posts.empty:
+        refs = df_posts[ref_col]
+        referencian = refs.notna() & refs.astype(str).isin(cambiados)
+        afectados.update(df_posts.loc[referencian, "post_id"].astype(str))
+    return afectados
+
+
+def build_edges_for_posts(
+    df_posts: pd.DataFrame,
+    df_tecno: pd.DataFrame | None,
+    grafo: str,
+    post_ids: set[str],
+) -> pd.DataFrame:
+    """Las aristas de `grafo` que materializan los posts `post_ids`.
+
+    Las mismas que `build_edges` emite para esos posts, construyendo solo
+    sobre ellos (y los posts que referencian, para conocer a su autor).
+    """
+    if df_posts.empty:
+        return pd.DataFrame(columns=list(EDGE_COLUMNS))
+    ids = df_posts["post_id"].astype(str)
+    propios = ids.isin(post_ids)
+    ref_col = REF_COLS.get(grafo)
+    if ref_col is not None and ref_col in df_posts.columns:
+        refs = df_posts.loc[propios, ref_col]
+        propios |= ids.isin(set(refs[refs.notna()].astype(str)))
+    tecno = None
+    if df_tecno is not None and not df_tecno.empty:
+        tecno = df_tecno[df_tecno["codigo"].astype(str).isin(post_ids)]
+    edges = build_edges(df_posts[propios], tecno, graphs=(grafo,))
+    if edges.empty:
+        return edges
+    return edges[edges["post_id"].isin(post_ids)].reset_index(drop=True)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  Constructores por grafo
 # ══════════════════════════════════════════════════════════════════════════════
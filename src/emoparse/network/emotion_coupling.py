@@ -6,6 +6,8 @@
 #  Funciones puras sobre DataFrames:
 #  - foria_by_post: foria dominante por post, desde la caracterización de
 #    sus emociones (payload del characterizer).
+#  - pares_respuesta: los pares padre→respuesta del corpus como arreglos,
+#    calculados una vez y compartidos por todas las medidas sobre hilos.
 #  - foria_transition_matrix: matriz de transición fórica padre→hijo en los
 #    árboles de respuesta (contagio, escalada, inversión).
 #  - community_emotion_profile: distribución de tipos de emoción y forias
@@ -16,8 +18,10 @@ from __future__ import annotations
 
 import json
 from collections import Counter
+from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 #: Orden canónico de forias en las matrices.
@@ -56,35 +60,86 @@ def foria_by_post(df_emociones: pd.DataFrame) -> dict[str, str]:
     return out
 
 
+@dataclass(frozen=True)
+class ParesRespuesta:
+    """Pares (post padre, respuesta) con ambos extremos en el corpus.
+
+    Arreglos paralelos, uno por par, en el orden de los posts: los ids de
+    ambos extremos y el handle de sus autores en minúsculas.
+    """
+
+    padre: np.ndarray
+    hijo: np.ndarray
+    autor_padre: np.ndarray
+    autor_hijo: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.padre)
+
+
+def pares_respuesta(df_posts: pd.DataFrame) -> ParesRespuesta:
+    """Los pares padre→respuesta de `df_posts`, para compartir entre medidas."""
+    vacio = np.array([], dtype=object)
+    if df_posts.empty or "en_respuesta_a" not in df_posts.columns:
+        return ParesRespuesta(vacio, vacio, vacio, vacio)
+    ids = df_posts["post_id"].astype(str)
+    padres = df_posts["en_respuesta_a"]
+    con_padre = padres.notna()
+    padre = padres[con_padre].astype(str)
+    en_corpus = padre.isin(set(ids)).to_numpy()
+    padre_arr = padre.to_numpy(dtype=object)[en_corpus]
+    hijo_arr = ids[con_padre].to_numpy(dtype=object)[en_corpus]
+
+    if "autor_handle" in df_posts.columns:
+        autores = df_posts["autor_handle"].astype(str).str.lower()
+        autor = dict(zip(ids, autores, strict=True))
+    else:
+        autor = {}
+    return ParesRespuesta(
+        padre=padre_arr,
+        hijo=hijo_arr,
+        autor_padre=np.array([autor.get(p, "") for p in padre_arr], dtype=object),
+        autor_hijo=np.array([autor.get(h, "") for h in hijo_arr], dtype=object),
+    )
+
+
 def foria_transition_matrix(
     df_posts: pd.DataFrame,
     foria_map: dict[str, str],
     include_sin_emocion: bool = False,
+    *,
+    pares: ParesRespuesta | None = None,
 ) -> pd.DataFrame:
     """Matriz de transición fórica padre→hijo sobre las aristas de reply.
 
     Filas: foria del post padre; columnas: foria de la respuesta; celdas:
     conteos. Con `include_sin_emocion`, los posts sin emociones entran como
     categoría propia (útil para medir des-escalada hacia lo no emocional).
+    `pares` reutiliza los pares ya calculados con `pares_respuesta`.
     """
     labels = list(FORIAS) + ([SIN_EMOCION] if include_sin_emocion else [])
-    matrix = pd.DataFrame(0, index=labels, columns=labels, dtype=int)
+    if pares is None:
+        pares = pares_respuesta(df_posts)
+    f_padre = _codigos_foria(pares.padre, foria_map, labels)
+    f_hijo = _codigos_foria(pares.hijo, foria_map, labels)
+    validos = (f_padre >= 0) & (f_hijo >= 0)
+    return _matriz_transicion(f_padre[validos], f_hijo[validos], labels)
 
-    posts_ids = {str(r["post_id"]) for r in df_posts.to_dict(orient="records")}
-    for r in df_posts.to_dict(orient="records"):
-        parent = r.get("en_respuesta_a")
-        if parent is None or (isinstance(parent, float) and pd.isna(parent)):
-            continue
-        parent = str(parent)
-        if parent not in posts_ids:
-            continue
-        f_padre = foria_map.get(parent, SIN_EMOCION)
-        f_hijo = foria_map.get(str(r["post_id"]), SIN_EMOCION)
-        if not include_sin_emocion and SIN_EMOCION in (f_padre, f_hijo):
-            continue
-        if f_padre in matrix.index and f_hijo in matrix.columns:
-            matrix.loc[f_padre, f_hijo] += 1
-    return matrix
+
+def _codigos_foria(posts: np.ndarray, foria_map: dict[str, str], labels: list[str]) -> np.ndarray:
+    """Posición en `labels` de la foria de cada post (-1 si no está en `labels`).
+
+    Los posts ausentes de `foria_map` valen `SIN_EMOCION`.
+    """
+    forias = pd.Index([foria_map.get(p, SIN_EMOCION) for p in posts], dtype=object)
+    return pd.Index(labels).get_indexer(forias)
+
+
+def _matriz_transicion(f_padre: np.ndarray, f_hijo: np.ndarray, labels: list[str]) -> pd.DataFrame:
+    """Conteos de transición padre→hijo desde códigos de foria ya filtrados."""
+    n = len(labels)
+    conteos = np.bincount(f_padre * n + f_hijo, minlength=n * n).reshape(n, n)
+    return pd.DataFrame(conteos.astype(int), index=labels, columns=labels)
 
 
 def community_emotion_profile(
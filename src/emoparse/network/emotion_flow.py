@@ -9,17 +9,28 @@
 #  entre comunidades, y qué tipos de emoción se propagan más que lo que su
 #  frecuencia haría esperar.
 #
-#  Funciones puras sobre DataFrames, sin DB ni networkx.
+#  Funciones puras sobre DataFrames, sin DB ni networkx. Todas parten de los
+#  mismos pares padre→respuesta (`pares_respuesta`, que pueden calcularse una
+#  vez y pasarse a cada función) y cuentan con matrices de incidencia par ×
+#  tipo o par × foria en vez de recorrer los pares una vez por categoría.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
-from collections import Counter
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from emoparse.network.emotion_coupling import FORIAS, SIN_EMOCION, _clean
+from emoparse.network.emotion_coupling import (
+    FORIAS,
+    SIN_EMOCION,
+    ParesRespuesta,
+    _clean,
+    _codigos_foria,
+    _matriz_transicion,
+    pares_respuesta,
+)
 
 #: Alcance de una arista según las comunidades de sus extremos.
 ALCANCES: tuple[str, ...] = ("intra", "inter")
@@ -48,10 +59,23 @@ def tipos_por_post(df_emociones: pd.DataFrame) -> dict[str, set[str]]:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+_COLUMNAS_CONTAGIO = [
+    "tipo_emocion",
+    "pares",
+    "pares_con_padre",
+    "replicas",
+    "p_condicional",
+    "p_base",
+    "lift",
+]
+
+
 def contagion_lift(
     df_posts: pd.DataFrame,
     tipos: dict[str, set[str]],
     min_soporte: int = MIN_SOPORTE_CONTAGIO,
+    *,
+    pares: ParesRespuesta | None = None,
 ) -> pd.DataFrame:
     """Cuánto más probable es un tipo de emoción en la respuesta si ya estaba.
 
@@ -64,55 +88,44 @@ def contagion_lift(
     Es una medida de asociación sobre el corpus capturado, no una prueba de
     causalidad: dos cuentas de la misma comunidad pueden coincidir en la
     emoción sin que una la contagie a la otra.
+
+    `pares` reutiliza los pares ya calculados con `pares_respuesta`.
     """
-    pares = _pares_respuesta(df_posts)
-    if not pares:
-        return pd.DataFrame(
-            columns=[
-                "tipo_emocion",
-                "pares",
-                "pares_con_padre",
-                "replicas",
-                "p_condicional",
-                "p_base",
-                "lift",
-            ]
-        )
+    if pares is None:
+        pares = pares_respuesta(df_posts)
+    if not len(pares):
+        return pd.DataFrame(columns=_COLUMNAS_CONTAGIO)
+
+    # Incidencia par × tipo de cada extremo: los tres conteos de todos los
+    # tipos salen de sumar columnas.
+    universo = sorted({t for tt in tipos.values() for t in tt})
+    en_padre = _incidencia_tipos(pares.padre, tipos, universo)
+    en_hijo = _incidencia_tipos(pares.hijo, tipos, universo)
+    con_padre = en_padre.sum(axis=0)
+    replicas = (en_padre & en_hijo).sum(axis=0)
+    base = en_hijo.sum(axis=0)
 
     total = len(pares)
     filas: list[dict[str, Any]] = []
-    universo = sorted({t for tt in tipos.values() for t in tt})
-    for tipo in universo:
-        con_padre = [(p, h) for p, h in pares if tipo in tipos.get(p, ())]
-        if len(con_padre) < min_soporte:
+    for j, tipo in enumerate(universo):
+        n_con_padre = int(con_padre[j])
+        if n_con_padre < min_soporte:
             continue
-        replicas = sum(1 for _, h in con_padre if tipo in tipos.get(h, ()))
-        base = sum(1 for _, h in pares if tipo in tipos.get(h, ()))
-        p_cond = replicas / len(con_padre)
-        p_base = base / total
+        p_cond = int(replicas[j]) / n_con_padre
+        p_base = int(base[j]) / total
         filas.append(
             {
                 "tipo_emocion": tipo,
                 "pares": total,
-                "pares_con_padre": len(con_padre),
-                "replicas": replicas,
+                "pares_con_padre": n_con_padre,
+                "replicas": int(replicas[j]),
                 "p_condicional": round(p_cond, 4),
                 "p_base": round(p_base, 4),
                 "lift": round(p_cond / p_base, 3) if p_base else None,
             }
         )
     if not filas:
-        return pd.DataFrame(
-            columns=[
-                "tipo_emocion",
-                "pares",
-                "pares_con_padre",
-                "replicas",
-                "p_condicional",
-                "p_base",
-                "lift",
-            ]
-        )
+        return pd.DataFrame(columns=_COLUMNAS_CONTAGIO)
     return (
         pd.DataFrame(filas)
         .sort_values("lift", ascending=False, na_position="last")
@@ -129,6 +142,8 @@ def foria_transition_by_scope(
     df_posts: pd.DataFrame,
     foria_map: dict[str, str],
     comunidades: dict[str, int],
+    *,
+    pares: ParesRespuesta | None = None,
 ) -> dict[str, pd.DataFrame]:
     """Matriz de transición fórica partida en intra e inter comunidad.
 
@@ -138,65 +153,67 @@ def foria_transition_by_scope(
 
     `comunidades` mapea handle (sin distinguir mayúsculas) a id de comunidad;
     las aristas con algún extremo sin comunidad no entran en ninguna matriz.
+    `pares` reutiliza los pares ya calculados con `pares_respuesta`.
     """
-    comunidades = {str(k).lower(): v for k, v in comunidades.items()}
-    autor = _autor_por_post(df_posts)
+    if pares is None:
+        pares = pares_respuesta(df_posts)
     labels = list(FORIAS)
-    out = {
-        alcance: pd.DataFrame(0, index=labels, columns=labels, dtype=int) for alcance in ALCANCES
+    c_padre, c_hijo = _comunidades_de_pares(pares, comunidades)
+    f_padre = _codigos_foria(pares.padre, foria_map, labels)
+    f_hijo = _codigos_foria(pares.hijo, foria_map, labels)
+    validos = ~np.isnan(c_padre) & ~np.isnan(c_hijo) & (f_padre >= 0) & (f_hijo >= 0)
+    intra = c_padre == c_hijo
+    return {
+        alcance: _matriz_transicion(f_padre[validos & mask], f_hijo[validos & mask], labels)
+        for alcance, mask in zip(ALCANCES, (intra, ~intra), strict=True)
     }
-    for padre, hijo in _pares_respuesta(df_posts):
-        alcance = _alcance(padre, hijo, autor, comunidades)
-        if alcance is None:
-            continue
-        f_padre = foria_map.get(padre, SIN_EMOCION)
-        f_hijo = foria_map.get(hijo, SIN_EMOCION)
-        if SIN_EMOCION in (f_padre, f_hijo):
-            continue
-        if f_padre in labels and f_hijo in labels:
-            out[alcance].loc[f_padre, f_hijo] += 1
-    return out
 
 
 def flujo_entre_comunidades(
     df_posts: pd.DataFrame,
     foria_map: dict[str, str],
     comunidades: dict[str, int],
+    *,
+    pares: ParesRespuesta | None = None,
 ) -> pd.DataFrame:
     """Aristas comunidad→comunidad con la composición fórica de la respuesta.
 
     Una fila por par de comunidades que se responden, con el volumen de
     respuestas y cómo se reparten fóricamente. Es el mapa de por dónde
     circula la emoción: qué comunidad le contesta a cuál, y en qué tono.
+    `pares` reutiliza los pares ya calculados con `pares_respuesta`.
     """
-    comunidades = {str(k).lower(): v for k, v in comunidades.items()}
-    autor = _autor_por_post(df_posts)
-    acumulado: dict[tuple[int, int], Counter] = {}
-    for padre, hijo in _pares_respuesta(df_posts):
-        c_padre = comunidades.get(autor.get(padre, ""))
-        c_hijo = comunidades.get(autor.get(hijo, ""))
-        if c_padre is None or c_hijo is None:
-            continue
-        foria = foria_map.get(hijo, SIN_EMOCION)
-        if foria == SIN_EMOCION:
-            continue
-        acumulado.setdefault((c_padre, c_hijo), Counter())[foria] += 1
-
-    if not acumulado:
+    if pares is None:
+        pares = pares_respuesta(df_posts)
+    c_padre, c_hijo = _comunidades_de_pares(pares, comunidades)
+    forias = np.array([foria_map.get(h, SIN_EMOCION) for h in pares.hijo], dtype=object)
+    validos = ~np.isnan(c_padre) & ~np.isnan(c_hijo) & (forias != SIN_EMOCION)
+    if not validos.any():
         return pd.DataFrame(
             columns=["comunidad_origen", "comunidad_destino", "alcance", "respuestas", *FORIAS]
         )
+    c_padre, c_hijo = c_padre[validos].astype(np.int64), c_hijo[validos].astype(np.int64)
+    # Un grupo por par de comunidades, en el orden en que aparece cada uno.
+    grupo, claves = pd.factorize(pd.MultiIndex.from_arrays([c_padre, c_hijo]))
+    n_grupos = len(claves)
+    respuestas = np.bincount(grupo, minlength=n_grupos)
+    f_hijo = _codigos_foria(pares.hijo[validos], foria_map, list(FORIAS))
+    conocidas = f_hijo >= 0
+    por_foria = np.bincount(
+        grupo[conocidas] * len(FORIAS) + f_hijo[conocidas], minlength=n_grupos * len(FORIAS)
+    ).reshape(n_grupos, len(FORIAS))
+
     filas = [
         {
             # `origen` es la comunidad interpelada y `destino` la que responde:
             # la arista sigue el sentido de la respuesta, como en `aristas`.
-            "comunidad_origen": int(c_padre),
-            "comunidad_destino": int(c_hijo),
-            "alcance": "intra" if c_padre == c_hijo else "inter",
-            "respuestas": int(sum(counts.values())),
-            **{f: int(counts.get(f, 0)) for f in FORIAS},
+            "comunidad_origen": int(origen),
+            "comunidad_destino": int(destino),
+            "alcance": "intra" if origen == destino else "inter",
+            "respuestas": int(respuestas[g]),
+            **{f: int(por_foria[g, j]) for j, f in enumerate(FORIAS)},
         }
-        for (c_padre, c_hijo), counts in acumulado.items()
+        for g, (origen, destino) in enumerate(claves)
     ]
     return pd.DataFrame(filas).sort_values("respuestas", ascending=False).reset_index(drop=True)
 
@@ -206,38 +223,26 @@ def flujo_entre_comunidades(
 # ══════════════════════════════════════════════════════════════════════════════
 
 
-def _pares_respuesta(df_posts: pd.DataFrame) -> list[tuple[str, str]]:
-    """Pares (post padre, respuesta) con ambos extremos en el corpus."""
-    registros = df_posts.to_dict(orient="records")
-    ids = {str(r["post_id"]) for r in registros}
-    pares: list[tuple[str, str]] = []
-    for r in registros:
-        padre = r.get("en_respuesta_a")
-        if padre is None or (isinstance(padre, float) and pd.isna(padre)):
-            continue
-        padre = str(padre)
-        if padre in ids:
-            pares.append((padre, str(r["post_id"])))
-    return pares
+def _incidencia_tipos(
+    posts: np.ndarray, tipos: dict[str, set[str]], universo: list[str]
+) -> np.ndarray:
+    """Matriz booleana post × tipo: si cada post porta cada tipo de `universo`."""
+    columna = {tipo: j for j, tipo in enumerate(universo)}
+    con_tipos = list(tipos)
+    # Una fila extra, vacía, para los posts sin emociones.
+    por_post = np.zeros((len(con_tipos) + 1, len(universo)), dtype=bool)
+    for i, post in enumerate(con_tipos):
+        por_post[i, [columna[t] for t in tipos[post]]] = True
+    return por_post[pd.Index(con_tipos, dtype=object).get_indexer(posts)]
 
 
-def _autor_por_post(df_posts: pd.DataFrame) -> dict[str, str]:
-    """Handle del autor de cada post, sin distinguir mayúsculas."""
-    return {
-        str(r["post_id"]): str(r["autor_handle"]).lower()
-        for r in df_posts.to_dict(orient="records")
-    }
+def _comunidades_de_pares(
+    pares: ParesRespuesta, comunidades: dict[str, int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Comunidad del autor de cada extremo de los pares (NaN si no tiene)."""
+    comunidades = {str(k).lower(): v for k, v in comunidades.items()}
 
+    def _de(autores: np.ndarray) -> np.ndarray:
+        return np.array([comunidades.get(a, np.nan) for a in autores], dtype=float)
 
-def _alcance(
-    padre: str,
-    hijo: str,
-    autor: dict[str, str],
-    comunidades: dict[str, int],
-) -> str | None:
-    """'intra', 'inter' o None si algún extremo no tiene comunidad."""
-    c_padre = comunidades.get(autor.get(padre, ""))
-    c_hijo = comunidades.get(autor.get(hijo, ""))
-    if c_padre is None or c_hijo is None:
-        return None
-    return "intra" if c_padre == c_hijo else "inter"
+    return _de(pares.autor_padre), _de(pares.autor_hijo)
@@ -3,10 +3,11 @@
 #
 #  Grafos networkx, métricas por nodo y detección de comunidades.
 #
-#  Requiere el extra `network` (networkx). La intermediación se omite en
-#  grafos grandes (costo O(n·m)); las comunidades usan Louvain (built-in de
-#  networkx ≥3) sobre la versión no dirigida, con seed fija para
-#  reproducibilidad.
+#  Requiere el extra `network` (networkx). Las métricas por nodo las calcula
+#  `centrality` sobre arreglos de aristas: en grafos grandes la intermediación
+#  exacta (costo O(n·m)) se reemplaza por una estimación muestreada con cota
+#  de error. Las comunidades usan Louvain (built-in de networkx ≥3) sobre la
+#  versión no dirigida, con seed fija para reproducibilidad.
 #
 #  Comunidad y clique responden preguntas distintas: la comunidad es una zona
 #  densa que particiona el grafo, la clique es un conjunto donde todos se
@@ -17,9 +18,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
+import numpy as np
 import pandas as pd
+from loguru import logger
+
+from emoparse.network import centrality
 
 
 class NetworkUnavailableError(RuntimeError):
@@ -36,9 +42,25 @@ def _nx() -> Any:
     return networkx
 
 
-#: Umbral de nodos por encima del cual se omite la intermediación.
+#: Umbral de nodos por encima del cual la intermediación se estima por muestreo.
 BETWEENNESS_MAX_NODES = 2000
 
+#: Error absoluto tolerado por nodo en la intermediación estimada…
+BETWEENNESS_EPSILON = 0.02
+
+#: …con probabilidad de al menos 1 - BETWEENNESS_DELTA.
+BETWEENNESS_DELTA = 0.05
+
+_COLUMNAS_METRICAS = [
+    "nodo",
+    "grado_in",
+    "grado_out",
+    "grado_total",
+    "pagerank",
+    "intermediacion",
+    "intermediacion_error",
+]
+
 
 def to_graph(df_edges: pd.DataFrame, directed: bool = True) -> Any:
     """Construye un grafo networkx agregando pesos de aristas repetidas."""
@@ -57,33 +79,62 @@ def to_graph(df_edges: pd.DataFrame, directed: bool = True) -> Any:
 def compute_node_metrics(
     G: Any,
     betweenness_max_nodes: int = BETWEENNESS_MAX_NODES,
+    *,
+    betweenness_epsilon: float = BETWEENNESS_EPSILON,
+    seed: int = 42,
+    pagerank_inicial: Mapping[str, float] | None = None,
 ) -> pd.DataFrame:
-    """Métricas por nodo: grados, PageRank e intermediación (si es viable)."""
-    nx = _nx()
-    if G.number_of_nodes() == 0:
-        return pd.DataFrame(
-            columns=["nodo", "grado_in", "grado_out", "grado_total", "pagerank", "intermediacion"]
-        )
+    """Métricas por nodo: grados, PageRank e intermediación.
+
+    Hasta `betweenness_max_nodes` nodos la intermediación es exacta; por
+    encima se estima desde fuentes muestreadas con `seed`, con error
+    absoluto ≤ `betweenness_epsilon` por nodo (con probabilidad
+    1 - `BETWEENNESS_DELTA`). La cota queda en `intermediacion_error`
+    (0 si es exacta). `pagerank_inicial` ({nodo: pagerank} de una medición
+    anterior) arranca PageRank en caliente; los nodos nuevos parten de 1/n.
+    """
+    n = G.number_of_nodes()
+    if n == 0:
+        return pd.DataFrame(columns=_COLUMNAS_METRICAS)
     dirigido = G.is_directed()
-    pagerank = nx.pagerank(G, weight="weight")
-    if G.number_of_nodes() <= betweenness_max_nodes:
-        intermediacion = nx.betweenness_centrality(G, weight=None)
-    else:
-        intermediacion = {}
-
-    rows = []
-    for nodo in G.nodes():
-        rows.append(
-            {
-                "nodo": str(nodo),
-                "grado_in": int(G.in_degree(nodo)) if dirigido else None,
-                "grado_out": int(G.out_degree(nodo)) if dirigido else None,
-                "grado_total": int(G.degree(nodo)),
-                "pagerank": float(pagerank.get(nodo, 0.0)),
-                "intermediacion": (float(intermediacion[nodo]) if nodo in intermediacion else None),
-            }
+    nodos = pd.Index(list(G.nodes()))
+    aristas = list(G.edges(data="weight", default=1.0))
+    origen, destino, peso = zip(*aristas, strict=True) if aristas else ((), (), ())
+    src = nodos.get_indexer(pd.Index(origen, dtype=object))
+    dst = nodos.get_indexer(pd.Index(destino, dtype=object))
+    pesos = np.asarray(peso, dtype=float)
+
+    grado_in, grado_out, grado_total = centrality.grados(n, src, dst)
+    a_src, a_dst, a_peso = centrality.arcos(src, dst, pesos, dirigido)
+    inicial = None
+    if pagerank_inicial:
+        inicial = np.array([pagerank_inicial.get(str(nodo), 1.0 / n) for nodo in nodos])
+    pagerank = centrality.pagerank(n, a_src, a_dst, a_peso, inicial=inicial)
+
+    k = None
+    if n > betweenness_max_nodes:
+        k = centrality.muestras_para_error(n, betweenness_epsilon, BETWEENNESS_DELTA)
+    intermediacion = centrality.intermediacion(n, a_src, a_dst, k=k, seed=seed)
+    error = centrality.cota_de_error(n, k if k is not None else n, BETWEENNESS_DELTA)
+    if error:
+        logger.info(
+            f"[network] Intermediación estimada desde {k} de {n} nodos: error ≤ {error:.3f} "
+            f"por nodo (confianza {1 - BETWEENNESS_DELTA:.0%})."
         )
-    return pd.DataFrame(rows).sort_values("pagerank", ascending=False).reset_index(drop=True)
+
+    df = pd.DataFrame(
+        {
+            "nodo": [str(nodo) for nodo in nodos],
+            "grado_in": grado_in if dirigido else None,
+            "grado_out": grado_out if dirigido else None,
+            "grado_total": grado_total,
+            "pagerank": pagerank,
+            "intermediacion": intermediacion,
+            "intermediacion_error": error,
+        },
+        columns=_COLUMNAS_METRICAS,
+    )
+    return df.sort_values("pagerank", ascending=False, kind="stable").reset_index(drop=True)
 
 
 def mutual_subgraph(G: Any) -> Any:
@@ -1,23 +1,73 @@
-"""Orquestador del pipeline EmoParse."""
-
-from emoparse.pipeline.chunking import split_into_sentences
-from emoparse.pipeline.dag import EMOPARSE_DAG, StageDAG, StageNode
-from emoparse.pipeline.runner import DEFAULT_ENABLED_STAGES, STAGE_ORDER, PipelineRunner
-from emoparse.pipeline.stages import (
-    ActorsStage,
-    CharacterizerStage,
-    DeixisStage,
-    EmotionsPass2Stage,
-    EmotionsStage,
-    EnunciationStage,
-    ExplodeEmotionsStage,
-    JudgeStage,
-    MetadataStage,
-    ModalidadStage,
-    Stage,
-    SummarizerStage,
-    TechnoparseStage,
-)
+"""Orquestador del pipeline EmoParse.
+
+Los nombres públicos se importan a demanda: importar un submódulo liviano
+(`emoparse.pipeline.status`, `emoparse.pipeline.dag`) no arrastra el runner
+con todos sus agentes y stages.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from emoparse.pipeline.chunking import split_into_sentences
+    from emoparse.pipeline.dag import EMOPARSE_DAG, StageDAG, StageNode
+    from emoparse.pipeline.runner import DEFAULT_ENABLED_STAGES, STAGE_ORDER, PipelineRunner
+    from emoparse.pipeline.stages import (
+        ActorsStage,
+        CharacterizerStage,
+        DeixisStage,
+        EmotionsPass2Stage,
+        EmotionsStage,
+        EnunciationStage,
+        ExplodeEmotionsStage,
+        JudgeStage,
+        MetadataStage,
+        ModalidadStage,
+        Stage,
+        SummarizerStage,
+        TechnoparseStage,
+    )
+
+#: Submódulo que define cada nombre público.
+_ORIGEN: dict[str, str] = {
+    "split_into_sentences": "chunking",
+    "EMOPARSE_DAG": "dag",
+    "StageDAG": "dag",
+    "StageNode": "dag",
+    "DEFAULT_ENABLED_STAGES": "runner",
+    "STAGE_ORDER": "runner",
+    "PipelineRunner": "runner",
+    **{
+        nombre: "stages"
+        for nombre in (
+            "ActorsStage",
+            "CharacterizerStage",
+            "DeixisStage",
+            "EmotionsPass2Stage",
+            "EmotionsStage",
+            "EnunciationStage",
+            "ExplodeEmotionsStage",
+            "JudgeStage",
+            "MetadataStage",
+            "ModalidadStage",
+            "Stage",
+            "SummarizerStage",
+            "TechnoparseStage",
+        )
+    },
+}
+
+
+def __getattr__(name: str) -> Any:
+    origen = _ORIGEN.get(name)
+    if origen is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    valor = getattr(importlib.import_module(f"{__name__}.{origen}"), name)
+    globals()[name] = valor
+    return valor
+
 
 #: API pública del pipeline.
 __all__ = [
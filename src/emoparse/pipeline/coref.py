@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import unicodedata
 from collections.abc import Iterable
+from itertools import combinations
 
 from emoparse.core.text import STOPWORDS
 
@@ -43,26 +44,10 @@ def _tokenize(s: str) -> list[str]:
     return [t for t in raw if len(t) > 1 and t not in STOPWORDS]
 
 
-def cluster_mentions_within_discurso(
+def _extract_mentions(
     actors_by_frase: Iterable[tuple[int, list[dict]]],
-) -> list[set[MentionKey]]:
-    """Agrupa menciones de actores que claramente refieren a la misma entidad.
-
-    Heurística conservadora:
-      1. Normalización (lowercase, sin tildes, strip).
-      2. Match exacto sobre el string normalizado → mismo cluster.
-      3. Subconjunto de tokens significativos: si el set de tokens de una
-         mención está contenido en el de la otra Y tiene al menos
-         `_MIN_SUBSET_TOKENS` tokens, se agrupan.
-      4. Solapamiento sin subconjunto: si comparten al menos
-         `_MIN_SHARED_TOKENS` tokens significativos, se agrupan.
-
-    No agrupa (para evitar falsos positivos):
-      - Menciones que comparten un único token significativo sin relación de
-        subconjunto (p. ej. "víctimas del Holocausto" / "víctimas del atentado").
-      - Subconjuntos de un solo token (p. ej. apellido suelto).
-      - Menciones cuyos únicos tokens en común sean stopwords.
-    """
+) -> list[tuple[MentionKey, str, frozenset[str]]]:
+    """(clave, string normalizado, tokens significativos) de cada mención válida."""
     mentions: list[tuple[MentionKey, str, frozenset[str]]] = []
     for unit_idx, actors in actors_by_frase:
         if not isinstance(actors, list):
@@ -76,22 +61,117 @@ def cluster_mentions_within_discurso(
             norm = _normalize(raw)
             tokens = frozenset(_tokenize(raw))
             mentions.append(((unit_idx, i), norm, tokens))
+    return mentions
 
-    if not mentions:
-        return []
 
-    parent: dict[int, int] = {i: i for i in range(len(mentions))}
+class _UnionFind:
+    """Union-find con compresión de caminos sobre índices 0..n-1."""
+
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
 
-    def find(x: int) -> int:
+    def find(self, x: int) -> int:
+        parent = self.parent
         while parent[x] != x:
             parent[x] = parent[parent[x]]
             x = parent[x]
         return x
 
-    def union(a: int, b: int) -> None:
-        ra, rb = find(a), find(b)
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
         if ra != rb:
-            parent[rb] = ra
+            self.parent[rb] = ra
+
+
+def _clusters(
+    mentions: list[tuple[MentionKey, str, frozenset[str]]],
+    uf: _UnionFind,
+) -> list[set[MentionKey]]:
+    """Agrupa por raíz, en orden de primera aparición de cada cluster."""
+    clusters: dict[int, set[MentionKey]] = {}
+    for i, (key, _, _) in enumerate(mentions):
+        clusters.setdefault(uf.find(i), set()).add(key)
+    return list(clusters.values())
+
+
+def cluster_mentions_within_discurso(
+    actors_by_frase: Iterable[tuple[int, list[dict]]],
+) -> list[set[MentionKey]]:
+    """Agrupa menciones de actores que claramente refieren a la misma entidad.
+
+    Heurística conservadora:
+      1. Normalización (lowercase, sin tildes, strip).
+      2. Match exacto sobre el string normalizado → mismo cluster.
+      3. Subconjunto de tokens significativos: si el set de tokens de una
+         mención está contenido en el de la otra Y tiene al menos
+         `_MIN_SUBSET_TOKENS` tokens, se agrupan.
+      4. Solapamiento sin subconjunto: si comparten al menos
+         `_MIN_SHARED_TOKENS` tokens significativos, se agrupan.
+
+    No agrupa (para evitar falsos positivos):
+      - Menciones que comparten un único token significativo sin relación de
+        subconjunto (p. ej. "víctimas del Holocausto" / "víctimas del atentado").
+      - Subconjuntos de un solo token (p. ej. apellido suelto).
+      - Menciones cuyos únicos tokens en común sean stopwords.
+
+    Evita comparar todos los pares: (2) se resuelve con buckets por string
+    normalizado; (3) y (4) exigen compartir al menos dos tokens, así que se
+    comparan solo los sets de tokens distintos que comparten algún par de
+    tokens (índice invertido par → sets). Produce los mismos clusters que la
+    comparación par a par (`_cluster_mentions_pairwise`).
+    """
+    mentions = _extract_mentions(actors_by_frase)
+    if not mentions:
+        return []
+    uf = _UnionFind(len(mentions))
+
+    # (2) Buckets por string normalizado y por set de tokens. Dos menciones
+    # con el mismo set de ≥ `_MIN_SUBSET_TOKENS` tokens son subconjunto una
+    # de otra: se funden sin compararlas.
+    by_norm: dict[str, int] = {}
+    by_tokens: dict[frozenset[str], int] = {}
+    for i, (_, norm, toks) in enumerate(mentions):
+        first = by_norm.setdefault(norm, i)
+        if first != i:
+            uf.union(first, i)
+        if len(toks) >= _MIN_SUBSET_TOKENS:
+            first = by_tokens.setdefault(toks, i)
+            if first != i:
+                uf.union(first, i)
+
+    # (3) y (4) sobre sets distintos: índice invertido por par de tokens,
+    # así solo se comparan los sets que comparten al menos dos.
+    sets = list(by_tokens.items())
+    index: dict[tuple[str, str], list[int]] = {}
+    for pos, (toks, rep) in enumerate(sets):
+        candidates: set[int] = set()
+        for pair in combinations(sorted(toks), 2):
+            posting = index.setdefault(pair, [])
+            candidates.update(posting)
+            posting.append(pos)
+        n = len(toks)
+        for other in candidates:
+            other_toks, other_rep = sets[other]
+            shared = len(toks & other_toks)
+            is_subset = shared == n or shared == len(other_toks)
+            if shared >= _MIN_SHARED_TOKENS or is_subset:
+                uf.union(other_rep, rep)
+
+    return _clusters(mentions, uf)
+
+
+def _cluster_mentions_pairwise(
+    actors_by_frase: Iterable[tuple[int, list[dict]]],
+) -> list[set[MentionKey]]:
+    """Versión par a par (O(n²)) de `cluster_mentions_within_discurso`.
+
+    Referencia de equivalencia para los tests y el benchmark; no se usa en
+    el pipeline.
+    """
+    mentions = _extract_mentions(actors_by_frase)
+    if not mentions:
+        return []
+    uf = _UnionFind(len(mentions))
 
     for i in range(len(mentions)):
         _, norm_i, toks_i = mentions[i]
@@ -99,7 +179,7 @@ def cluster_mentions_within_discurso(
             _, norm_j, toks_j = mentions[j]
 
             if norm_i == norm_j:
-                union(i, j)
+                uf.union(i, j)
                 continue
 
             if not toks_i or not toks_j:
@@ -108,18 +188,13 @@ def cluster_mentions_within_discurso(
             is_subset = toks_i <= toks_j or toks_j <= toks_i
             smaller = min(len(toks_i), len(toks_j))
             if is_subset and smaller >= _MIN_SUBSET_TOKENS:
-                union(i, j)
+                uf.union(i, j)
                 continue
 
             if len(toks_i & toks_j) >= _MIN_SHARED_TOKENS:
-                union(i, j)
+                uf.union(i, j)
 
-    clusters: dict[int, set[MentionKey]] = {}
-    for i, (key, _, _) in enumerate(mentions):
-        root = find(i)
-        clusters.setdefault(root, set()).add(key)
-
-    return list(clusters.values())
+    return _clusters(mentions, uf)
 
 
 def pick_representative(
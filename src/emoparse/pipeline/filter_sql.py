@@ -2,12 +2,33 @@
 #  emoparse.pipeline.filter_sql
 #
 #  Traducción compartida de filtros declarativos a SQL sobre payloads JSON.
+#
+#  Los filtros se evalúan con `json_extract(payload, '$.path')`, que sin
+#  índice obliga a recorrer (y parsear) la tabla entera. `ensure_json_indexes`
+#  crea índices de expresión sobre exactamente esa expresión para los paths
+#  que un selector o una policy usan con operaciones que el planificador
+#  resuelve por índice (igualdad, pertenencia y rangos). Quedan en la DB, así
+#  que la próxima corrida con el mismo path los reutiliza.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
+import hashlib
+import re
+from collections.abc import Iterable
 from typing import Any, Protocol
 
+from loguru import logger
+
+from emoparse.storage.db import Database
+
+#: Operaciones que SQLite puede resolver con un índice sobre la expresión
+#: (`contains` es un LIKE con comodín inicial, `ne` y los nulos no acotan).
+_OPS_INDEXABLES: frozenset[str] = frozenset({"eq", "in", "gte", "lte", "between"})
+
+#: Paths que se pueden escribir literales en el DDL de un índice.
+_PATH_INDEXABLE = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+|\[[0-9]+\])*$")
+
 
 class JsonFilter(Protocol):
     """Contrato mínimo de un filtro declarativo sobre JSON."""
@@ -73,3 +94,46 @@ def where_for_json_filters(
         else:
             raise ValueError(f"op desconocida: {item.op}")
     return clauses, params
+
+
+def ensure_json_indexes(
+    db: Database,
+    table: str,
+    payload_col: str,
+    filters: Iterable[JsonFilter],
+) -> list[str]:
+    """Crea (si faltan) los índices de expresión que aceleran `filters`.
+
+    Un índice por path, sobre `json_extract(payload_col, '$.path')` en
+    `table`: la misma expresión que arma `where_for_json_filters` cuando la
+    consulta nombra la columna del payload. Devuelve los nombres de los
+    índices que cubren los filtros (creados ahora o ya existentes).
+    """
+    paths = sorted(
+        {
+            item.field
+            for item in filters
+            if item.op in _OPS_INDEXABLES and _PATH_INDEXABLE.match(item.field)
+        }
+    )
+    nombres: list[str] = []
+    for path in paths:
+        nombre = _nombre_indice(table, payload_col, path)
+        existe = db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (nombre,)
+        ).fetchone()
+        if existe is None:
+            logger.info(f"[Filtros] Indexando {table}.{payload_col} → $.{path}")
+            db.execute(
+                f"CREATE INDEX IF NOT EXISTS {nombre} "
+                f"ON {table}(json_extract({payload_col}, '$.{path}'))"
+            )
+        nombres.append(nombre)
+    return nombres
+
+
+def _nombre_indice(table: str, payload_col: str, path: str) -> str:
+    """Nombre estable y válido como identificador para el índice de un path."""
+    legible = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_").lower()[:40]
+    huella = hashlib.sha256(f"{table}.{payload_col}.{path}".encode()).hexdigest()[:8]
+    return f"idx_json_{table}_{payload_col}_{legible}_{huella}"
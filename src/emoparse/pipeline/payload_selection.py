@@ -2,29 +2,43 @@
 #  emoparse.pipeline.payload_selection
 #
 #  Resolución de selectores cuyo campo proviene de payloads ya persistidos.
+#
+#  Los paths que usa el selector se indexan por expresión antes de la primera
+#  consulta (`filter_sql.ensure_json_indexes`). La completitud de cada
+#  productor y los códigos que cumplen sus filtros se calculan una vez por
+#  corrida: `scope_for` solo mira productores anteriores a la stage en el
+#  DAG, que el runner ya ejecutó y cuyos payloads no vuelve a escribir.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
 
 from emoparse.inputs.seleccion import Seleccion, SeleccionError, SelectorFiltro
 from emoparse.pipeline.dag import EMOPARSE_DAG
-from emoparse.pipeline.filter_sql import where_for_json_filters
+from emoparse.pipeline.filter_sql import ensure_json_indexes, where_for_json_filters
 from emoparse.storage.db import Database
 from emoparse.storage.selector_scope import SelectorScopeRepository
 
 
 @dataclass(frozen=True, slots=True)
 class PayloadSource:
-    """Ubicación SQL de un payload y su vínculo con el discurso."""
+    """Ubicación SQL de un payload y su vínculo con el discurso.
+
+    `payload_table` es la tabla de la columna del payload cuando `from_sql`
+    es un JOIN (para indexarla); si no, la tabla es `from_sql`.
+    """
 
     from_sql: str
     codigo_expr: str
     payload_expr: str
     completion_where: str
     base_where: str = "1"
+    payload_table: str | None = None
+
+    def payload_column(self) -> tuple[str, str]:
+        """(tabla, columna) donde vive el payload."""
+        return self.payload_table or self.from_sql, self.payload_expr.rsplit(".", 1)[-1]
 
 
 _PAYLOAD_SOURCES: dict[str, PayloadSource] = {
@@ -97,6 +111,7 @@ _PAYLOAD_SOURCES: dict[str, PayloadSource] = {
         "h.analisis_payload",
         "h.analisis_payload IS NOT NULL AND h.analisis_error IS NULL",
         "te.tipo = 'hashtag' AND h.n_usos >= 1",
+        payload_table="hashtags",
     ),
 }
 
@@ -117,6 +132,9 @@ class PayloadSelectionEngine:
         self._order_index = {name: index for index, name in enumerate(self._order)}
         self._repo = SelectorScopeRepository(db)
         self._filters = self._group_payload_filters(selection)
+        self._completos: set[str] = set()
+        self._coincidencias: dict[str, frozenset[str]] = {}
+        self._codigos: list[str] | None = None
 
     @property
     def active(self) -> bool:
@@ -124,8 +142,14 @@ class PayloadSelectionEngine:
         return bool(self._filters)
 
     def prepare(self) -> None:
-        """Valida productores, orden y disponibilidad previa."""
+        """Valida productores, orden y disponibilidad previa.
+
+        Abre la corrida: descarta lo memorizado por una anterior.
+        """
         self._repo.clear_all()
+        self._completos.clear()
+        self._coincidencias.clear()
+        self._codigos = None
         if not self.active:
             return
 
@@ -189,23 +213,31 @@ class PayloadSelectionEngine:
         return frozenset(scope)
 
     def _producer_complete(self, producer: str) -> bool:
-        source = _PAYLOAD_SOURCES[producer]
-        total = self._scalar(f"SELECT COUNT(*) FROM {source.from_sql} WHERE ({source.base_where})")
-        if total == 0:
+        """True si `producer` terminó todas sus unidades (memorizado si lo está)."""
+        if producer in self._completos:
             return True
-        completed = self._scalar(
-            f"SELECT COUNT(*) FROM {source.from_sql} "
-            f"WHERE ({source.base_where}) AND ({source.completion_where})"
-        )
-        return completed == total
+        source = _PAYLOAD_SOURCES[producer]
+        row = self._db.execute(
+            f"SELECT COUNT(*), SUM(CASE WHEN {source.completion_where} THEN 1 ELSE 0 END) "
+            f"FROM {source.from_sql} WHERE ({source.base_where})"
+        ).fetchone()
+        completo = row is None or int(row[0] or 0) == int(row[1] or 0)
+        if completo:
+            self._completos.add(producer)
+        return completo
 
     def _matching_codes(
         self,
         producer: str,
         filters: list[SelectorFiltro],
-    ) -> set[str]:
+    ) -> frozenset[str]:
+        """Códigos cuyo payload de `producer` cumple `filters` (una vez por corrida)."""
+        memo = self._coincidencias.get(producer)
+        if memo is not None:
+            return memo
         source = _PAYLOAD_SOURCES[producer]
         local_filters = [item.without_stage_prefix() for item in filters]
+        ensure_json_indexes(self._db, *source.payload_column(), local_filters)
         clauses, params = where_for_json_filters(
             local_filters,
             source.payload_expr,
@@ -218,15 +250,15 @@ class PayloadSelectionEngine:
             f"FROM {source.from_sql} WHERE " + " AND ".join(where),
             tuple(params),
         ).fetchall()
-        return {str(row["codigo"]) for row in rows}
+        memo = frozenset(str(row["codigo"]) for row in rows)
+        self._coincidencias[producer] = memo
+        return memo
 
     def _all_codes(self) -> list[str]:
-        rows = self._db.execute("SELECT codigo FROM discursos ORDER BY codigo").fetchall()
-        return [str(row["codigo"]) for row in rows]
-
-    def _scalar(self, sql: str, params: tuple[Any, ...] = ()) -> int:
-        row = self._db.execute(sql, params).fetchone()
-        return int(row[0] or 0) if row is not None else 0
+        if self._codigos is None:
+            rows = self._db.execute("SELECT codigo FROM discursos ORDER BY codigo").fetchall()
+            self._codigos = [str(row["codigo"]) for row in rows]
+        return self._codigos
 
     @staticmethod
     def _group_payload_filters(
@@ -23,10 +23,16 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Callable
 from typing import Any
 
+import numpy as np
+import pandas as pd
+from loguru import logger
+
 from emoparse.pipeline.context_blocks import ContextBlockProvider
 from emoparse.pipeline.technoparse import menciones_handles, parse_texto
+from emoparse.storage.contexto_hilo import ContextoHiloRepository
 from emoparse.storage.emociones import EmocionesRepository
 from emoparse.storage.frases import FrasesRepository
 from emoparse.storage.hilos import HilosRepository
@@ -73,6 +79,7 @@ def make_hilo_context_provider(
     include_participants: bool = True,
     max_participant_posts: int = _MAX_PARTICIPANT_POSTS,
     participant_post_chars: int = _PARTICIPANT_POST_CHARS,
+    contextos_repo: ContextoHiloRepository | None = None,
 ) -> ContextBlockProvider:
     """Provider codigo → contexto conversacional formateado (o None).
 
@@ -87,22 +94,32 @@ def make_hilo_context_provider(
     `max_participant_posts` intervenciones (acotadas a
     `participant_post_chars`) de cuentas mencionadas en el texto que además
     participan del hilo. El bloque se recorta a `max_chars` conservando el
-    final (padre inmediato, cita y participantes)."""
+    final (padre inmediato, cita y participantes).
+
+    Con `contextos_repo`, el provider es una búsqueda en el diccionario de
+    bloques materializados para sus parámetros (`materialize_hilo_contexts`,
+    la primera vez que se pide si el corpus cambió); sin él, recorre la
+    cadena con una consulta por post."""
+    parametros = {
+        "max_parents": max_parents,
+        "include_root": include_root,
+        "include_participants": include_participants,
+        "max_participant_posts": max_participant_posts,
+        "participant_post_chars": participant_post_chars,
+    }
+    # Los bloques de la clave, cargados (o materializados) en el primer pedido.
+    materializados: list[dict[str, str]] = []
 
     def provider(codigo: str) -> str | None:
         post = posts_repo.get_post(codigo)
         if post is None:
             return None
-
-        lineas: list[str] = []
         conv_id = post.get("conversacion_id")
 
-        # Señal de pertenencia a un hilo (barata, del repositorio de hilos).
+        n_posts = None
         if hilos_repo is not None and conv_id:
             hilo = hilos_repo.get_hilo(str(conv_id))
             n_posts = hilo.get("n_posts") if isinstance(hilo, dict) else None
-            if isinstance(n_posts, int) and n_posts > 1:
-                lineas.append(f"(este post forma parte de un hilo de {n_posts} mensajes)")
 
         # Cadena de padres, del inmediato hacia arriba.
         padres: list[dict[str, Any] | None] = []
@@ -122,59 +139,31 @@ def make_hilo_context_provider(
             padres.append(padre)
             actual = padre
 
-        inmediato = padres[0] if padres else None
-        mostrados = {str(p["post_id"]) for p in padres if isinstance(p, dict)}
-
-        # Post que abrió la conversación. Va primero: es el que fija el objeto
-        # del que se habla cuando las respuestas son elípticas. Se omite si es
-        # la propia unidad o si ya aparece en la cadena de padres.
-        if (
-            include_root
-            and conv_id
-            and str(conv_id) not in mostrados
-            and str(conv_id) != str(post["post_id"])
-        ):
-            raiz = posts_repo.get_post(str(conv_id))
-            if raiz is not None:
-                mostrados.add(str(raiz["post_id"]))
-                lineas.append("inicio del hilo → " + _format_post(raiz))
-
-        # Del más lejano al inmediato; el inmediato (al que responde) marcado.
-        for p in reversed(padres):
-            if p is None:
-                lineas.append("(post anterior no capturado)")
-            elif p is inmediato:
-                lineas.append("responde a → " + _format_post(p))
-            else:
-                lineas.append(_format_post(p))
-
-        # Post citado (quote): discurso referido explícito.
+        raiz = posts_repo.get_post(str(conv_id)) if include_root and conv_id else None
         cita_id = post.get("cita_a")
-        if cita_id:
-            citado = posts_repo.get_post(str(cita_id))
-            if citado is not None:
-                lineas.append("POST CITADO (discurso referido): " + _format_post(citado))
-            else:
-                lineas.append("POST CITADO (discurso referido): (no capturado)")
-
-        # Posts de cuentas mencionadas que participan del hilo.
-        if include_participants and conv_id and max_participant_posts > 0:
-            extra = _posts_menciones_participantes(
-                post,
-                posts_repo,
-                str(conv_id),
-                mostrados,
-                max_participant_posts,
-                participant_post_chars,
-            )
-            if extra:
-                lineas.append("POSTS DE CUENTAS MENCIONADAS QUE PARTICIPAN DEL HILO:")
-                lineas.extend(extra)
+        citado = posts_repo.get_post(str(cita_id)) if cita_id else None
 
-        if not lineas:
-            return None
-        texto = "\n".join(lineas)
-        return texto
+        def conv_posts() -> list[dict[str, Any]]:
+            try:
+                return posts_repo.list_by_conversacion(str(conv_id))
+            except Exception:
+                return []
+
+        return _render_contexto_hilo(post, n_posts, padres, raiz, citado, conv_posts, **parametros)
+
+    def render(codigo: str, _unit_idx: int | None) -> str | None:
+        if contextos_repo is None:
+            return provider(codigo)
+        if not materializados:
+            textos = contextos_repo.textos(
+                clave_contexto_hilo(hilos_repo is not None, **parametros)
+            )
+            if textos is None:
+                textos = materialize_hilo_contexts(
+                    contextos_repo, con_hilos=hilos_repo is not None, **parametros
+                )
+            materializados.append(textos)
+        return materializados[0].get(codigo)
 
     return ContextBlockProvider(
         name="contexto_hilo",
@@ -183,21 +172,215 @@ def make_hilo_context_provider(
         token_budget=_tokens_for_chars(max_chars),
         scope="discurso",
         keep_tail=True,
-        render_fn=lambda codigo, _unit_idx: provider(codigo),
+        render_fn=render,
     )
 
 
+def clave_contexto_hilo(
+    con_hilos: bool,
+    *,
+    max_parents: int,
+    include_root: bool,
+    include_participants: bool,
+    max_participant_posts: int,
+    participant_post_chars: int,
+) -> str:
+    """Clave de materialización: los parámetros que cambian el bloque.
+
+    `max_chars` no entra: el recorte al presupuesto lo hace el provider al
+    renderizar, sobre el bloque materializado.
+    """
+    return (
+        f"p{max_parents}:r{int(include_root)}:i{int(include_participants)}:"
+        f"n{max_participant_posts}:c{participant_post_chars}:h{int(con_hilos)}"
+    )
+
+
+def materialize_hilo_contexts(
+    contextos_repo: ContextoHiloRepository,
+    *,
+    con_hilos: bool = True,
+    max_parents: int = _MAX_PARENTS,
+    include_root: bool = False,
+    include_participants: bool = True,
+    max_participant_posts: int = _MAX_PARTICIPANT_POSTS,
+    participant_post_chars: int = _PARTICIPANT_POST_CHARS,
+) -> dict[str, str]:
+    """Renderiza y guarda el contexto de hilo de todos los posts de una vez.
+
+    Carga el grafo de posts en memoria con una consulta (más una para los
+    hilos), resuelve padres, raíz y cita de todos los posts con arreglos de
+    índices y agrupa las conversaciones una sola vez; cada bloque sale del
+    mismo renderizado que el provider por consultas. Devuelve {codigo:
+    bloque} de los posts con contexto.
+    """
+    parametros = {
+        "max_parents": max_parents,
+        "include_root": include_root,
+        "include_participants": include_participants,
+        "max_participant_posts": max_participant_posts,
+        "participant_post_chars": participant_post_chars,
+    }
+    posts = contextos_repo.posts()
+    n_por_hilo = contextos_repo.n_posts_por_hilo() if con_hilos else {}
+    textos: dict[str, str] = {}
+    if posts:
+        ids = pd.Index([str(p["post_id"]) for p in posts])
+        padre = _indices(ids, [p["en_respuesta_a"] for p in posts])
+        raiz = _indices(ids, [p["conversacion_id"] for p in posts])
+        cita = _indices(ids, [p["cita_a"] for p in posts])
+        cadenas = _cadenas_de_padres(padre, max_parents)
+        por_conv: dict[str, list[int]] = {}
+        if include_participants and max_participant_posts > 0:
+            for i, post in enumerate(posts):
+                if post["conversacion_id"] is not None:
+                    por_conv.setdefault(str(post["conversacion_id"]), []).append(i)
+
+        for i, post in enumerate(posts):
+            conv_id = post["conversacion_id"]
+            padres = [
+                None if j == _NO_CAPTURADO else posts[j] for j in cadenas[i] if j != _SIN_PADRE
+            ]
+            texto = _render_contexto_hilo(
+                post,
+                n_por_hilo.get(str(conv_id)) if conv_id else None,
+                padres,
+                posts[raiz[i]] if include_root and conv_id and raiz[i] >= 0 else None,
+                posts[cita[i]] if post["cita_a"] and cita[i] >= 0 else None,
+                lambda conv_id=conv_id: [posts[j] for j in por_conv.get(str(conv_id), ())],
+                **parametros,
+            )
+            if texto:
+                textos[ids[i]] = texto
+
+    contextos_repo.guardar(clave_contexto_hilo(con_hilos, **parametros), textos)
+    logger.info(
+        f"[post_context] Contexto de hilo materializado: {len(textos)} de {len(posts)} post(s)."
+    )
+    return textos
+
+
+#: Marcas de `_cadenas_de_padres`: fin de la cadena y padre no capturado.
+_SIN_PADRE = -1
+_NO_CAPTURADO = -2
+
+
+def _indices(ids: pd.Index, referencias: list[Any]) -> np.ndarray:
+    """Posición de cada referencia en `ids`: −1 si vacía, −2 si no capturada."""
+    vacias = np.array([not r for r in referencias], dtype=bool)
+    pos = ids.get_indexer([str(r) if r else "" for r in referencias])
+    pos[pos < 0] = _NO_CAPTURADO
+    pos[vacias] = _SIN_PADRE
+    return pos
+
+
+def _cadenas_de_padres(padre: np.ndarray, max_parents: int) -> np.ndarray:
+    """Matriz posts × `max_parents` con los padres, del inmediato hacia arriba.
+
+    Avanza un nivel por vez para todos los posts. Cada fila termina en
+    `_SIN_PADRE` (raíz, o un padre ya visto: ciclo) o en `_NO_CAPTURADO`.
+    """
+    n = len(padre)
+    propios = np.arange(n)
+    cadenas = np.full((n, max(max_parents, 0)), _SIN_PADRE, dtype=np.int64)
+    actual = propios
+    vivo = np.ones(n, dtype=bool)
+    for k in range(max_parents):
+        siguiente = np.where(vivo, padre[actual], _SIN_PADRE)
+        visto = (siguiente == propios) | (cadenas[:, :k] == siguiente[:, None]).any(axis=1)
+        siguiente[(siguiente >= 0) & visto] = _SIN_PADRE
+        cadenas[:, k] = siguiente
+        vivo = siguiente >= 0
+        if not vivo.any():
+            break
+        actual = np.where(vivo, siguiente, 0)
+    return cadenas
+
+
+def _render_contexto_hilo(
+    post: dict[str, Any],
+    n_posts: Any,
+    padres: list[dict[str, Any] | None],
+    raiz: dict[str, Any] | None,
+    citado: dict[str, Any] | None,
+    conv_posts: Callable[[], list[dict[str, Any]]],
+    *,
+    max_parents: int,
+    include_root: bool,
+    include_participants: bool,
+    max_participant_posts: int,
+    participant_post_chars: int,
+) -> str | None:
+    """El bloque de contexto de hilo de un post, con sus vecinos ya resueltos."""
+    lineas: list[str] = []
+    conv_id = post.get("conversacion_id")
+
+    # Señal de pertenencia a un hilo (barata, del repositorio de hilos).
+    if isinstance(n_posts, int) and n_posts > 1:
+        lineas.append(f"(este post forma parte de un hilo de {n_posts} mensajes)")
+
+    inmediato = padres[0] if padres else None
+    mostrados = {str(p["post_id"]) for p in padres if isinstance(p, dict)}
+
+    # Post que abrió la conversación. Va primero: es el que fija el objeto
+    # del que se habla cuando las respuestas son elípticas. Se omite si es
+    # la propia unidad o si ya aparece en la cadena de padres.
+    if (
+        include_root
+        and conv_id
+        and str(conv_id) not in mostrados
+        and str(conv_id) != str(post["post_id"])
+        and raiz is not None
+    ):
+        mostrados.add(str(raiz["post_id"]))
+        lineas.append("inicio del hilo → " + _format_post(raiz))
+
+    # Del más lejano al inmediato; el inmediato (al que responde) marcado.
+    for p in reversed(padres):
+        if p is None:
+            lineas.append("(post anterior no capturado)")
+        elif p is inmediato:
+            lineas.append("responde a → " + _format_post(p))
+        else:
+            lineas.append(_format_post(p))
+
+    # Post citado (quote): discurso referido explícito.
+    if post.get("cita_a"):
+        if citado is not None:
+            lineas.append("POST CITADO (discurso referido): " + _format_post(citado))
+        else:
+            lineas.append("POST CITADO (discurso referido): (no capturado)")
+
+    # Posts de cuentas mencionadas que participan del hilo.
+    if include_participants and conv_id and max_participant_posts > 0:
+        extra = _posts_menciones_participantes(
+            post,
+            conv_posts,
+            mostrados,
+            max_participant_posts,
+            participant_post_chars,
+        )
+        if extra:
+            lineas.append("POSTS DE CUENTAS MENCIONADAS QUE PARTICIPAN DEL HILO:")
+            lineas.extend(extra)
+
+    if not lineas:
+        return None
+    return "\n".join(lineas)
+
+
 def _posts_menciones_participantes(
     post: dict[str, Any],
-    posts_repo: PostsRepository,
-    conv_id: str,
+    conv_posts: Callable[[], list[dict[str, Any]]],
     ya_mostrados: set[str],
     max_posts: int,
     max_chars: int,
 ) -> list[str]:
     """Intervenciones (hasta `max_posts`) de cuentas mencionadas en el post que
     además participan del hilo, en su propia voz. Vacío si no hay menciones,
-    si ninguna participa del hilo, o si sus posts ya se mostraron como padres."""
+    si ninguna participa del hilo, o si sus posts ya se mostraron como padres.
+    `conv_posts` da los posts de la conversación; se pide solo si hay
+    menciones."""
     texto = str(post.get("texto") or "")
     if not texto:
         return []
@@ -209,13 +392,9 @@ def _posts_menciones_participantes(
     handles.discard("")
     if not handles:
         return []
-    try:
-        conv_posts = posts_repo.list_by_conversacion(conv_id)
-    except Exception:
-        return []
     pid_actual = str(post["post_id"])
     out: list[str] = []
-    for p in conv_posts:
+    for p in conv_posts():
         if len(out) >= max_posts:
             break
         pid = str(p.get("post_id"))
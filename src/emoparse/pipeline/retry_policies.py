@@ -15,7 +15,7 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator, model_valida
 
 from emoparse.config.models import RunConfig
 from emoparse.pipeline.dag import EMOPARSE_DAG
-from emoparse.pipeline.filter_sql import where_for_json_filters
+from emoparse.pipeline.filter_sql import ensure_json_indexes, where_for_json_filters
 from emoparse.storage.db import Database
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -88,6 +88,9 @@ _STAGE_REGISTRY: dict[str, dict[str, Any]] = {
 
 SUPPORTED_STAGES: tuple[str, ...] = tuple(_STAGE_REGISTRY)
 
+#: Tablas cuyos payloads llevan `payload_rev` (insumos de materializaciones).
+_TABLAS_CON_REVISION: frozenset[str] = frozenset({"discursos", "frases"})
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  Modelos Pydantic
@@ -274,6 +277,7 @@ class RetryPolicyApplier:
             policy.target, payload_col, error_col
         )
 
+        ensure_json_indexes(self._db, table, payload_col, policy.filters)
         filter_clauses, filter_params = self._where_for_filters(policy.filters, payload_col)
 
         if (
@@ -311,8 +315,16 @@ class RetryPolicyApplier:
                 override_model=policy.override_model,
             )
 
+        # Las tablas con `payload_rev` registran el vaciado como un cambio de
+        # payload, igual que `set_payload`/`set_error`.
+        rev_sql = (
+            f"payload_rev = payload_rev + ({payload_col} IS NOT NULL), "
+            if table in _TABLAS_CON_REVISION
+            else ""
+        )
         update_sql = (
             f"UPDATE {table} SET "
+            f"{rev_sql}"
             f"{payload_col} = NULL, "
             f"{version_col} = NULL, "
             f"{error_col}   = NULL "
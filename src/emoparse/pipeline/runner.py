@@ -6,6 +6,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -22,6 +23,7 @@ from emoparse.core.backend.registry import BackendRegistry
 from emoparse.core.backend.retry import RetryConfig
 from emoparse.core.cache.backend import CachedBackend
 from emoparse.core.cache.repository import CacheRepository
+from emoparse.core.prompts._loader import render_time_ms
 from emoparse.genres.presentation import attach_genre_presentation
 from emoparse.inputs.seleccion import Seleccion
 from emoparse.knowledge.loader import KnowledgeError, KnowledgeLoader
@@ -52,13 +54,16 @@ from emoparse.pipeline.stages import (
     VisionDescribeStage,
     _FraseStage,
 )
+from emoparse.storage.contexto_hilo import ContextoHiloRepository
 from emoparse.storage.db import Database
 from emoparse.storage.discursos import DiscursosRepository
+from emoparse.storage.emocion_canonico import EmocionCanonicoRepository
 from emoparse.storage.emociones import EmocionesRepository
 from emoparse.storage.frases import FrasesRepository
 from emoparse.storage.hashtags import HashtagsRepository
 from emoparse.storage.hilos import HilosRepository
 from emoparse.storage.judgments import JudgmentsRepository
+from emoparse.storage.materializaciones import MaterializacionesRepository
 from emoparse.storage.menciones import MencionesRepository
 from emoparse.storage.metrics import (
     MetricsRepository,
@@ -66,10 +71,13 @@ from emoparse.storage.metrics import (
 )
 from emoparse.storage.models import RunContext, Versions
 from emoparse.storage.posts import PostsRepository
+from emoparse.storage.referent_index import sync_referent_index
 from emoparse.storage.runs import RunsRepository
 from emoparse.storage.tecno import TecnoRepository
 
 if TYPE_CHECKING:
+    from pydantic import BaseModel
+
     from emoparse.genres.base import Genre
     from emoparse.inputs.posts_loader import PostsBundle
 
@@ -104,6 +112,16 @@ DEFAULT_ENABLED_STAGES: tuple[str, ...] = tuple(
     )
 )
 
+#: Filas por lote al volcar el corpus de posts a la DB: acota la memoria de
+#: los dicts intermedios sin partir la transacción.
+_LOTE_POSTS = 5_000
+
+
+def _registros(df: pd.DataFrame) -> Iterator[dict[str, Any]]:
+    """Filas de `df` como dicts, materializadas de a `_LOTE_POSTS`."""
+    for inicio in range(0, len(df), _LOTE_POSTS):
+        yield from df.iloc[inicio : inicio + _LOTE_POSTS].to_dict(orient="records")
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  _MeteredBackend — decorator que registra métricas por llamada.
@@ -129,6 +147,7 @@ class _MeteredBackend(LLMBackend):
             prompt_tokens=response.usage.prompt_tokens,
             completion_tokens=response.usage.completion_tokens,
             cache_hit=response.cache_hit,
+            prefill_tokens_saved=int(response.extra.get("prefill_tokens_saved", 0)),
         )
         return response
 
@@ -141,6 +160,9 @@ class _MeteredBackend(LLMBackend):
     def reset_state(self) -> None:
         self._wrapped.reset_state()
 
+    def prepare(self, schema: type[BaseModel], max_items: int | None = None) -> None:
+        self._wrapped.prepare(schema, max_items)
+
     def __repr__(self) -> str:
         return f"<MeteredBackend wrapping={self._wrapped!r}>"
 
@@ -362,8 +384,7 @@ class PipelineRunner:
             logger.warning("[Runner] ingest_posts llamado con bundle vacío.")
             return
 
-        posts_rows = bundle.posts.to_dict(orient="records")
-        n_posts = self._p_repo.upsert_posts(posts_rows)
+        n_posts = self._p_repo.upsert_posts(_registros(bundle.posts))
 
         autores_rows = [
             {
@@ -377,10 +398,9 @@ class PipelineRunner:
         n_autores = self._p_repo.upsert_autores(autores_rows)
 
         n_media = 0
-        for r in posts_rows:
-            media = r.get("media") or []
+        for post_id, media in zip(bundle.posts["post_id"], bundle.posts["media"], strict=True):
             if isinstance(media, list) and media:
-                n_media += self._p_repo.replace_media(str(r["post_id"]), media)
+                n_media += self._p_repo.replace_media(str(post_id), media)
 
         n_hilos = 0
         if bundle.hilos is not None and not bundle.hilos.empty:
@@ -470,6 +490,7 @@ class PipelineRunner:
                 # Liberar VRAM si el siguiente stage usa otro modelo.
                 self._maybe_unload_for_next(stage_name)
 
+            self._materializar_resolucion()
             self._runs_repo.mark_completed()
         except Exception as e:
             logger.exception(f"[Runner] Falló: {e}")
@@ -483,6 +504,7 @@ class PipelineRunner:
         """Construye, ejecuta y persiste métricas de un stage."""
         accumulator = StageMetricsAccumulator()
         self._current_accumulator = accumulator
+        render_inicio = render_time_ms()
         try:
             stage = self._build_stage(stage_name)
             stage.set_selector_scope(self._payload_selection.scope_for(stage_name))
@@ -490,9 +512,12 @@ class PipelineRunner:
             stage.validate_contracts = self._validate_contracts
             if isinstance(stage, (_FraseStage, EmotionsPass2Stage)):
                 stage.parallel = self._effective_parallel(stage_name)
+            if isinstance(stage, (_FraseStage, CharacterizerStage, EmotionsPass2Stage)):
+                stage.prefetch = self._cfg.pipeline.prefetch
             ok = stage.run_pending()
         finally:
             self._current_accumulator = None
+            accumulator.record_render(render_time_ms() - render_inicio)
 
         self._metrics_repo.insert(
             run_id=self._run_id,
@@ -502,6 +527,18 @@ class PipelineRunner:
         )
         return ok
 
+    def _materializar_resolucion(self) -> None:
+        """Deja vigente la resolución de referentes de los discursos que
+        cambiaron en la corrida, para que el dashboard y el export la lean
+        sin rearmar el índice de marcas; alinea también el índice de
+        referentes que usa el dashboard para sugerir fusiones."""
+        n = EmocionCanonicoRepository(self._db).refresh()
+        if n:
+            logger.info(f"[Runner] Resolución de referentes materializada: {n} discursos.")
+        cambios = sync_referent_index(self._db)
+        if cambios:
+            logger.info(f"[Runner] Índice de referentes actualizado: {cambios} canónicos.")
+
     def _frases_exist(self) -> bool:
         """True si ya existen frases en DB."""
         row = self._db.execute("SELECT 1 FROM frases LIMIT 1").fetchone()
@@ -909,6 +946,7 @@ class PipelineRunner:
                 self._e_repo,
                 self._m_repo,
                 referentes_kb=self._load_referentes_kb_safe(),
+                materializaciones_repo=MaterializacionesRepository(self._db),
             )
 
         if name == "deixis":
@@ -1057,7 +1095,10 @@ class PipelineRunner:
         es la que más margen tiene y recibe la cadena larga con los posts de
         las cuentas mencionadas que participan del hilo; `emotions_pass2`, que
         además carga el contexto previo, recibe la versión mínima. Cacheado
-        por combinación de parámetros. None si el género no es conversacional.
+        por combinación de parámetros; los bloques se materializan una vez
+        por combinación en `contexto_hilo` y sirven a todas las stages y runs
+        hasta que cambie el corpus de posts. None si el género no es
+        conversacional.
         """
         if self._genre.context_unit != "hilo":
             return None
@@ -1077,6 +1118,7 @@ class PipelineRunner:
                 max_chars=max_chars,
                 include_root=include_root,
                 include_participants=include_participants,
+                contextos_repo=ContextoHiloRepository(self._db),
             )
         return cache[key]
 
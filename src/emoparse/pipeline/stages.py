@@ -6,6 +6,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 import threading
@@ -13,7 +14,8 @@ from abc import ABC, abstractmethod
 from collections import Counter
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Literal
+from contextlib import closing
+from typing import Any, Literal, TypeVar
 
 import pandas as pd
 import pandera.pandas as pa
@@ -21,6 +23,7 @@ from loguru import logger
 
 from emoparse.agents.actants import ACTANTS_COMPONENTS, ActantsAgent
 from emoparse.agents.actors import ActorsAgent
+from emoparse.agents.base import BaseBatchAgent
 from emoparse.agents.characterizer import CharacterizerAgent
 from emoparse.agents.deixis import DeixisAgent
 from emoparse.agents.emotions import (
@@ -36,6 +39,7 @@ from emoparse.agents.modalidad import ModalidadAgent
 from emoparse.agents.semas import SemasAgent
 from emoparse.core.backend.base import LLMBackend
 from emoparse.core.backend.retry import RetryConfig
+from emoparse.core.prefetch import DEFAULT_ANTICIPACION, anticipar
 from emoparse.core.text import canonical_slug
 from emoparse.genres.base import Genre
 from emoparse.genres.enunciator import resolve_from_input_field
@@ -75,6 +79,7 @@ from emoparse.storage.emociones import EmocionesRepository
 from emoparse.storage.frases import FrasesRepository
 from emoparse.storage.hashtags import HashtagsRepository
 from emoparse.storage.judgments import JudgmentsRepository
+from emoparse.storage.materializaciones import MaterializacionesRepository
 from emoparse.storage.menciones import MencionesRepository
 from emoparse.storage.metrics import StageMetricsAccumulator
 from emoparse.storage.posts import PostsRepository
@@ -696,6 +701,117 @@ def _auditorio_predeterminado(row_dict: dict[str, Any]) -> list[dict[str, str]]:
     return entries
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+#  Empaquetado entre discursos
+# ══════════════════════════════════════════════════════════════════════════════
+
+#: Pendientes de un discurso: (codigo, unidades). Las unidades son `unit_idx`
+#: en las stages por frase y (frase_idx, emocion_idx) en el characterizer.
+_Pendientes = tuple[str, list[Any]]
+
+#: Item a procesar (un discurso o un paquete) y lo que su preparación deja.
+_Item = TypeVar("_Item")
+_Preparado = TypeVar("_Preparado")
+
+#: Agente e input validado de un discurso; None si no quedó nada que correr.
+_Insumo = tuple[Any, pd.DataFrame] | None
+
+#: Campos del contexto de discurso y su etiqueta en el bloque por unidad.
+_CONTEXTO_DISCURSO_ETIQUETAS: tuple[tuple[str, str], ...] = (
+    ("titulo", "Título"),
+    ("tipo_discurso", "Tipo"),
+    ("enunciador", "Enunciador"),
+    ("enunciatarios", "Enunciatarios"),
+    ("auditorio", "Auditorio"),
+    ("resumen", "Resumen (fondo, NO fuente de emociones)"),
+    ("contexto_genero", "Contexto de género"),
+)
+
+
+def _pack_size(genre: Genre | None, stage_name: str) -> int:
+    """Unidades por llamada del empaquetado de la stage; 0 = por discurso."""
+    if genre is None:
+        return 0
+    size = int(genre.pack_batch_size.get(stage_name, 0))
+    return size if size > 1 else 0
+
+
+def _paquetes(by_codigo: dict[str, list[Any]], size: int) -> list[list[_Pendientes]]:
+    """Agrupa discursos enteros hasta juntar al menos `size` unidades.
+
+    Un discurso nunca se parte entre paquetes: el agente del paquete reparte
+    después sus unidades en batches de `size`, así que un discurso largo
+    simplemente ocupa varias llamadas.
+    """
+    paquetes: list[list[_Pendientes]] = []
+    actual: list[_Pendientes] = []
+    unidades = 0
+    for codigo, items in by_codigo.items():
+        actual.append((codigo, items))
+        unidades += len(items)
+        if unidades >= size:
+            paquetes.append(actual)
+            actual, unidades = [], 0
+    if actual:
+        paquetes.append(actual)
+    return paquetes
+
+
+def _correr_pendientes(
+    items: list[_Item],
+    preparar: Callable[[_Item], _Preparado],
+    procesar: Callable[[_Item, _Preparado], int],
+    parallel: int,
+    anticipacion: int,
+) -> int:
+    """Procesa discursos o paquetes en serie o, con `parallel` > 1, en threads.
+
+    `preparar` arma el insumo del item (lecturas de la DB, contexto, agente,
+    validación) y `procesar` lo corre contra el modelo y persiste. En serie
+    el item siguiente se prepara en un hilo auxiliar mientras el actual está
+    en el modelo (hasta `anticipacion` items por delante, ver `anticipar`);
+    en threads cada uno prepara y procesa el suyo. `preparar` solo puede leer lo que dejaron stages anteriores, nunca
+    lo que `procesar` persiste para otro item de la misma stage.
+    """
+    total = 0
+    if parallel <= 1:
+        with closing(anticipar(items, preparar, anticipacion=anticipacion)) as anticipados:
+            for item, preparado in anticipados:
+                total += procesar(item, preparado.result())
+        return total
+
+    def _completo(item: _Item) -> int:
+        return procesar(item, preparar(item))
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        for future in as_completed([pool.submit(_completo, item) for item in items]):
+            total += future.result()
+    return total
+
+
+def _con_contexto_discurso(df: pd.DataFrame, contexto: dict[str, str]) -> pd.DataFrame:
+    """Agrega a las filas de un discurso su contexto como bloque de unidad.
+
+    Es lo que en el modo por discurso va al system prompt: en un batch
+    empaquetado cada unidad lleva el suyo, y el enunciador viaja aparte para
+    el posprocesado del agente.
+    """
+    lineas = [
+        f"  {etiqueta}: {valor}"
+        for clave, etiqueta in _CONTEXTO_DISCURSO_ETIQUETAS
+        if (valor := str(contexto.get(clave) or "").strip())
+    ]
+    bloque = (
+        "CONTEXTO DEL DISCURSO (referencia, no analizar):\n" + "\n".join(lineas) if lineas else ""
+    )
+    return df.assign(
+        **{
+            BaseBatchAgent.CONTEXT_COLUMN: bloque,
+            BaseBatchAgent.ENUNCIADOR_COLUMN: str(contexto.get("enunciador") or ""),
+        }
+    )
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  Etapas a nivel frase
 # ══════════════════════════════════════════════════════════════════════════════
@@ -710,6 +826,13 @@ class _FraseStage(Stage):
     persistencia se serializa bajo lock. Con el backend in-process de
     llama.cpp debe quedar en 1 (un solo modelo en memoria, llamadas
     bloqueantes); el runner lo fuerza.
+
+    Si el género declara `pack_batch_size` para la stage, los discursos se
+    empaquetan: un único agente, sin contexto de discurso en el system
+    prompt, arma cada batch con unidades de varios discursos y cada unidad
+    lleva el contexto del suyo. Los resultados vuelven a su discurso por
+    (codigo, unit_idx). En géneros de una unidad por discurso (tuit) reduce
+    las llamadas en un factor cercano al tamaño del paquete.
     """
 
     STAGE_KEY: str  # "actores" | "emociones"
@@ -718,6 +841,10 @@ class _FraseStage(Stage):
     #: `pipeline.parallel` y el tipo de backend de la stage; 1 = secuencial.
     parallel: int = 1
 
+    #: Discursos (o paquetes) y batches preparados por delante del que está
+    #: en el modelo. Lo asigna el runner según `pipeline.prefetch`.
+    prefetch: int = DEFAULT_ANTICIPACION
+
     def __init__(
         self,
         backend: LLMBackend,
@@ -735,6 +862,9 @@ class _FraseStage(Stage):
         self._retry_config = retry_config
         self._genre = genre
         self._persist_lock = threading.Lock()
+        #: Unidades por llamada del empaquetado entre discursos; 0 = un
+        #: agente por discurso.
+        self.pack_size = _pack_size(genre, self.NAME)
 
     def run_pending(self) -> int:
         """Procesa frases pendientes agrupadas por discurso."""
@@ -752,57 +882,124 @@ class _FraseStage(Stage):
         logger.info(
             f"[Stage:{self.NAME}] Procesando {len(by_codigo)} discurso(s) "
             f"con {sum(len(v) for v in by_codigo.values())} frases pendientes"
+            + (f", empaquetadas de a {self.pack_size}" if self.pack_size else "")
             + (f" (parallel={self.parallel})." if self.parallel > 1 else ".")
         )
 
-        total_ok = 0
         self.progress.start(sum(len(v) for v in by_codigo.values()), "frases")
-        if self.parallel <= 1:
-            for codigo, pending_idxs in by_codigo.items():
-                total_ok += self._process_codigo(codigo, pending_idxs)
+        if self.pack_size:
+            agent = self._make_agent({}, empaquetado=True)
+            agent.BATCH_SIZE = self.pack_size
+            agent.prefetch = self.prefetch
+            total_ok = _correr_pendientes(
+                _paquetes(by_codigo, self.pack_size),
+                self._preparar_paquete,
+                lambda paquete, df_in: self._process_paquete(agent, paquete, df_in),
+                self.parallel,
+                self.prefetch,
+            )
         else:
-            with ThreadPoolExecutor(max_workers=self.parallel) as pool:
-                futures = {
-                    pool.submit(self._process_codigo, codigo, idxs): codigo
-                    for codigo, idxs in by_codigo.items()
-                }
-                for future in as_completed(futures):
-                    total_ok += future.result()
+            total_ok = _correr_pendientes(
+                list(by_codigo.items()),
+                lambda p: self._preparar_codigo(*p),
+                lambda p, insumo: self._process_codigo(*p, insumo),
+                self.parallel,
+                self.prefetch,
+            )
         self.progress.finish()
 
         logger.info(f"[Stage:{self.NAME}] Completado: {total_ok} frases ok.")
         return total_ok
 
-    def _process_codigo(self, codigo: str, pending_idxs: list[int]) -> int:
-        """Procesa un discurso completo. Thread-safe: la inferencia corre
-        fuera del lock; persistencia y métricas, adentro."""
+    def _preparar_codigo(self, codigo: str, pending_idxs: list[int]) -> _Insumo:
+        """Agente e input validado de un discurso; None si no hay frases."""
         input_data = self._d_repo.get_input(codigo) or {}
 
         agent = self._build_agent(input_data, codigo)
+        agent.prefetch = self.prefetch
 
         df_in = self._build_input_df(codigo, pending_idxs)
         if df_in.empty:
-            return 0
+            return None
         self._validate(self._input_contract(), df_in, "entrada")
+        return agent, df_in
 
+    def _process_codigo(self, codigo: str, pending_idxs: list[int], insumo: _Insumo) -> int:
+        """Procesa un discurso completo. Thread-safe: la inferencia corre
+        fuera del lock; persistencia y métricas, adentro."""
+        if insumo is None:
+            return 0
+        agent, df_in = insumo
         try:
             df_out = agent.run(df_in)
         except Exception as e:
             logger.error(f"[Stage:{self.NAME}] {codigo}: error inesperado: {e}")
-            with self._persist_lock:
+            self._mark_failed([(codigo, pending_idxs)], str(e))
+            return 0
+
+        ok = self._persist(df_out)
+        self.progress.advance(len(pending_idxs))
+        return ok
+
+    def _preparar_paquete(self, paquete: list[_Pendientes]) -> pd.DataFrame | None:
+        """Input validado de un paquete; None si no hay frases.
+
+        Cada fila lleva el contexto de su discurso (`_agent_context`).
+        """
+        frames: list[pd.DataFrame] = []
+        for codigo, pending_idxs in paquete:
+            df = self._build_input_df(codigo, pending_idxs)
+            if df.empty:
+                continue
+            contexto = self._agent_context(self._d_repo.get_input(codigo) or {}, codigo)
+            frames.append(_con_contexto_discurso(df, contexto))
+        if not frames:
+            return None
+        df_in = pd.concat(frames, ignore_index=True)
+        self._validate(self._input_contract(), df_in, "entrada")
+        return df_in
+
+    def _process_paquete(
+        self, agent: Any, paquete: list[_Pendientes], df_in: pd.DataFrame | None
+    ) -> int:
+        """Procesa varios discursos con el agente empaquetado.
+
+        La persistencia usa el (codigo, unit_idx) de cada fila, como en
+        `_process_codigo`.
+        """
+        if df_in is None:
+            return 0
+        try:
+            df_out = agent.run(df_in)
+        except Exception as e:
+            codigos = ", ".join(codigo for codigo, _ in paquete)
+            logger.error(f"[Stage:{self.NAME}] paquete [{codigos}]: error inesperado: {e}")
+            self._mark_failed(paquete, str(e))
+            return 0
+
+        ok = self._persist(df_out)
+        self.progress.advance(sum(len(idxs) for _, idxs in paquete))
+        return ok
+
+    def _mark_failed(self, pendientes: list[_Pendientes], motivo: str) -> None:
+        """Marca con error todas las frases de los discursos dados."""
+        with self._persist_lock:
+            for codigo, pending_idxs in pendientes:
                 for idx in pending_idxs:
                     self._f_repo.set_error(
                         codigo,
                         idx,
-                        self.STAGE_KEY,
-                        str(e),  # type: ignore[arg-type]
+                        self.STAGE_KEY,  # type: ignore[arg-type]
+                        motivo,
                     )
                     self.metrics.record_item_failed()
-            return 0
 
+    def _persist(self, df_out: pd.DataFrame) -> int:
+        """Guarda el output del agente por (codigo, unit_idx) de cada fila."""
         ok = 0
         with self._persist_lock:
             for _, row in df_out.iterrows():
+                codigo = str(row["codigo"])
                 idx = int(row["unit_idx"])
                 payload_raw = self._extract_payload(row)
                 if payload_raw is None:
@@ -823,7 +1020,6 @@ class _FraseStage(Stage):
                 )
                 ok += 1
                 self.metrics.record_item_ok()
-        self.progress.advance(len(pending_idxs))
         return ok
 
     def _build_input_df(
@@ -850,9 +1046,17 @@ class _FraseStage(Stage):
         """Contrato Pandera para el DF de entrada."""
         return FraseInputContract
 
-    @abstractmethod
     def _build_agent(self, input_data: dict[str, Any], codigo: str) -> Any:
         """Construye el agente con el contexto del discurso."""
+        return self._make_agent(self._agent_context(input_data, codigo))
+
+    @abstractmethod
+    def _agent_context(self, input_data: dict[str, Any], codigo: str) -> dict[str, str]:
+        """Contexto del discurso que recibe el agente (título, enunciador...)."""
+
+    @abstractmethod
+    def _make_agent(self, contexto: dict[str, str], *, empaquetado: bool = False) -> Any:
+        """Construye el agente; con `empaquetado`, sin contexto de discurso."""
 
     @abstractmethod
     def _extract_payload(self, row: pd.Series) -> Any:
@@ -876,18 +1080,24 @@ class ActorsStage(_FraseStage):
         super().__init__(backend, discursos_repo, frases_repo, agent_version, retry_config, genre)
         self._heuristicas = heuristicas
 
-    def _build_agent(self, input_data: dict[str, Any], codigo: str) -> ActorsAgent:
+    def _agent_context(self, input_data: dict[str, Any], codigo: str) -> dict[str, str]:
         # Los metadatos pueden no estar: usar defaults seguros.
         meta = self._d_repo.get_payload(codigo, "metadata") or {}
         enun = self._d_repo.get_payload(codigo, "enunciation") or {}
+        return {
+            "titulo": str(input_data.get("titulo", "")),
+            "tipo_discurso": str(meta.get("tipo_discurso", "")),
+            "enunciador": str(enun.get("enunciador", "")),
+        }
+
+    def _make_agent(self, contexto: dict[str, str], *, empaquetado: bool = False) -> ActorsAgent:
         return ActorsAgent(
             self._backend,
-            titulo=str(input_data.get("titulo", "")),
-            tipo_discurso=str(meta.get("tipo_discurso", "")),
-            enunciador=str(enun.get("enunciador", "")),
+            **contexto,
             heuristicas=self._heuristicas,
             retry_config=self._retry_config,
             genre=self._genre,
+            empaquetado=empaquetado,
         )
 
     def _extract_payload(self, row: pd.Series) -> Any:
@@ -989,8 +1199,8 @@ class EmotionsStage(_FraseStage):
         self._media_ctx = media_context_provider
         self._genre_context = genre_context_provider
 
-    def _build_agent(self, input_data: dict[str, Any], codigo: str) -> EmotionsAgent:
-        """Construye EmotionsAgent con modos, configuraciones y heurísticas."""
+    def _agent_context(self, input_data: dict[str, Any], codigo: str) -> dict[str, str]:
+        """Contexto del discurso: metadata, enunciación, resumen y género."""
         meta = self._d_repo.get_payload(codigo, "metadata") or {}
         enun = self._d_repo.get_payload(codigo, "enunciation") or {}
         summ = self._d_repo.get_payload(codigo, "summarizer") or {}
@@ -999,21 +1209,28 @@ class EmotionsStage(_FraseStage):
             if self._genre_context is not None
             else None
         )
+        return {
+            "titulo": str(input_data.get("titulo", "")),
+            "tipo_discurso": str(meta.get("tipo_discurso", "")),
+            "enunciador": str(enun.get("enunciador", "")),
+            "enunciatarios": _format_enunciatarios(enun.get("enunciatarios")),
+            "auditorio": _format_enunciatarios(enun.get("auditorio")),
+            "resumen": _resumen_global(summ),
+            "contexto_genero": contexto_genero or "",
+        }
+
+    def _make_agent(self, contexto: dict[str, str], *, empaquetado: bool = False) -> EmotionsAgent:
+        """Construye EmotionsAgent con modos, configuraciones y heurísticas."""
         return EmotionsAgent(
             self._backend,
             heuristicas=self._heuristicas,
             configuraciones=self._configuraciones,
-            titulo=str(input_data.get("titulo", "")),
-            tipo_discurso=str(meta.get("tipo_discurso", "")),
-            enunciador=str(enun.get("enunciador", "")),
-            enunciatarios=_format_enunciatarios(enun.get("enunciatarios")),
-            auditorio=_format_enunciatarios(enun.get("auditorio")),
-            resumen=_resumen_global(summ),
-            contexto_genero=contexto_genero or "",
+            **contexto,
             modos_existencia=self._modos_existencia,
             emotion_scope=self._emotion_scope,
             retry_config=self._retry_config,
             genre=self._genre,
+            empaquetado=empaquetado,
         )
 
     def _build_input_df(
@@ -1211,10 +1428,19 @@ def _dedupe_emociones(emos: list[Any]) -> list[Any]:
 
 
 class ExplodeEmotionsStage(Stage):
-    """Explota emociones detectadas a la tabla `emociones`."""
+    """Explota emociones detectadas a la tabla `emociones`.
+
+    Con `materializaciones_repo`, solo re-materializa los discursos cuya
+    huella de insumos (revisión de payloads de discurso y frases, estado de
+    sus menciones, KB de referentes) cambió desde la última vez; el resto se
+    saltea sin leer payloads. Sin repo, recorre todo el alcance.
+    """
 
     NAME = "explode_emotions"
 
+    #: Versión de la derivación: cambiarla re-materializa todos los discursos.
+    DERIVACION_VERSION = "1"
+
     def __init__(
         self,
         discursos_repo: DiscursosRepository,
@@ -1222,6 +1448,7 @@ class ExplodeEmotionsStage(Stage):
         emociones_repo: EmocionesRepository,
         menciones_repo: MencionesRepository | None = None,
         referentes_kb: dict[str, Any] | None = None,
+        materializaciones_repo: MaterializacionesRepository | None = None,
     ) -> None:
         super().__init__()
         self._d_repo = discursos_repo
@@ -1229,20 +1456,53 @@ class ExplodeEmotionsStage(Stage):
         self._e_repo = emociones_repo
         self._m_repo = menciones_repo
         self._referentes_kb = referentes_kb
+        self._mat_repo = materializaciones_repo
 
     def run_pending(self) -> int:
         """Procesa discursos y explota emociones pendientes."""
         codigos = self._scope_codes(self._d_repo.list_codigos())
+        if self._mat_repo is not None:
+            codigos = self._codigos_sucios(self._mat_repo, codigos)
         total = 0
         for codigo in self.progress.track(codigos, "discursos"):
             count = self._explode_for_codigo(codigo)
             total += count
+            if self._mat_repo is not None:
+                # La huella se toma después de escribir: el rebuild de
+                # menciones cambia el estado que la propia huella observa.
+                self._mat_repo.marcar(
+                    self.NAME,
+                    self._mat_repo.huellas_de_insumos([codigo], extra=self._huella_extra()),
+                )
         for _ in range(total):
             self.metrics.record_item_ok()
         if total > 0:
             logger.info(f"[Stage:{self.NAME}] Explotadas {total} emociones.")
         return total
 
+    def _codigos_sucios(
+        self,
+        mat_repo: MaterializacionesRepository,
+        codigos: list[str],
+    ) -> list[str]:
+        """Códigos del alcance cuyos insumos cambiaron desde su materialización."""
+        actuales = mat_repo.huellas_de_insumos(codigos, extra=self._huella_extra())
+        previas = mat_repo.huellas(self.NAME)
+        sucios = [c for c in codigos if previas.get(c) != actuales.get(c)]
+        if len(sucios) < len(codigos):
+            logger.info(
+                f"[Stage:{self.NAME}] {len(codigos) - len(sucios)} discursos sin cambios "
+                f"en sus insumos; se re-materializan {len(sucios)}."
+            )
+        return sucios
+
+    def _huella_extra(self) -> str:
+        """Parte común de la huella: derivación, modo de menciones y KB."""
+        kb = json.dumps(self._referentes_kb or {}, sort_keys=True, ensure_ascii=False, default=str)
+        kb_digest = hashlib.sha256(kb.encode("utf-8")).hexdigest()[:16]
+        menciones = "m" if self._m_repo is not None else "-"
+        return f"v{self.DERIVACION_VERSION}:{menciones}:{kb_digest}"
+
     def _explode_for_codigo(self, codigo: str) -> int:
         """Explota emociones de un discurso a filas individuales.
 
@@ -2549,10 +2809,18 @@ class NormalizeEmotionsStage(Stage):
 
 
 class CharacterizerStage(Stage):
-    """Caracteriza emociones individuales."""
+    """Caracteriza emociones individuales.
+
+    Con `pack_batch_size["characterizer"]` en el género, las emociones de
+    varios discursos comparten batch (ver `_FraseStage`).
+    """
 
     NAME = "characterizer"
 
+    #: Discursos (o paquetes) y batches preparados por delante del que está
+    #: en el modelo. Lo asigna el runner según `pipeline.prefetch`.
+    prefetch: int = DEFAULT_ANTICIPACION
+
     def __init__(
         self,
         backend: LLMBackend,
@@ -2573,6 +2841,7 @@ class CharacterizerStage(Stage):
         self._version = agent_version
         self._retry_config = retry_config
         self._genre = genre
+        self.pack_size = _pack_size(genre, self.NAME)
 
     def run_pending(self) -> int:
         """Procesa emociones pendientes y guarda caracterización."""
@@ -2585,62 +2854,143 @@ class CharacterizerStage(Stage):
         for codigo, frase_idx, emo_idx in pending:
             by_codigo.setdefault(codigo, []).append((frase_idx, emo_idx))
 
-        total_ok = 0
         self.progress.start(len(pending), "emociones")
-        for codigo, items in by_codigo.items():
-            self.progress.advance(len(items))
-            input_data = self._d_repo.get_input(codigo) or {}
-            meta = self._d_repo.get_payload(codigo, "metadata") or {}
-            enun = self._d_repo.get_payload(codigo, "enunciation") or {}
-            agent = CharacterizerAgent(
-                self._backend,
-                titulo=str(input_data.get("titulo", "")),
-                tipo_discurso=str(meta.get("tipo_discurso", "")),
-                enunciador=str(enun.get("enunciador", "")),
-                heuristicas=self._heuristicas,
-                retry_config=self._retry_config,
-                genre=self._genre,
+        if self.pack_size:
+            agent = self._make_agent({}, empaquetado=True)
+            agent.BATCH_SIZE = self.pack_size  # type: ignore[misc]
+            agent.prefetch = self.prefetch
+            total_ok = _correr_pendientes(
+                _paquetes(by_codigo, self.pack_size),
+                self._preparar_paquete,
+                lambda paquete, df_in: self._process_paquete(agent, paquete, df_in),
+                1,
+                self.prefetch,
+            )
+        else:
+            total_ok = _correr_pendientes(
+                list(by_codigo.items()),
+                lambda p: self._preparar_codigo(*p),
+                lambda p, insumo: self._process_codigo(*p, insumo),
+                1,
+                self.prefetch,
             )
 
-            df_in = self._build_input_df(codigo, items)
-            if df_in.empty:
-                continue
-            self._validate(EmocionExplodedContract, df_in, "entrada")
+        logger.info(f"[Stage:{self.NAME}] Completado: {total_ok} ok.")
+        return total_ok
 
-            try:
-                df_out = agent.run(df_in)
-            except Exception as e:
-                logger.error(f"[Stage:{self.NAME}] {codigo}: error inesperado: {e}")
-                for frase_idx, emo_idx in items:
-                    self._e_repo.set_caracterizacion_error(codigo, frase_idx, emo_idx, str(e))
-                    self.metrics.record_item_failed()
+    def _preparar_codigo(self, codigo: str, items: list[tuple[int, int]]) -> _Insumo:
+        """Agente e input validado de un discurso; None si no hay emociones."""
+        input_data = self._d_repo.get_input(codigo) or {}
+        agent = self._make_agent(self._agent_context(input_data, codigo))
+        agent.prefetch = self.prefetch
+
+        df_in = self._build_input_df(codigo, items)
+        if df_in.empty:
+            return None
+        self._validate(EmocionExplodedContract, df_in, "entrada")
+        return agent, df_in
+
+    def _process_codigo(self, codigo: str, items: list[tuple[int, int]], insumo: _Insumo) -> int:
+        """Caracteriza las emociones pendientes de un discurso."""
+        self.progress.advance(len(items))
+        if insumo is None:
+            return 0
+        agent, df_in = insumo
+        try:
+            df_out = agent.run(df_in)
+        except Exception as e:
+            logger.error(f"[Stage:{self.NAME}] {codigo}: error inesperado: {e}")
+            self._mark_failed([(codigo, items)], str(e))
+            return 0
+        return self._persist(df_out)
+
+    def _preparar_paquete(self, paquete: list[_Pendientes]) -> pd.DataFrame | None:
+        """Input validado de un paquete con el contexto de cada discurso."""
+        frames: list[pd.DataFrame] = []
+        for codigo, items in paquete:
+            df = self._build_input_df(codigo, items)
+            if df.empty:
                 continue
+            contexto = self._agent_context(self._d_repo.get_input(codigo) or {}, codigo)
+            frames.append(_con_contexto_discurso(df, contexto))
+        if not frames:
+            return None
+        df_in = pd.concat(frames, ignore_index=True)
+        self._validate(EmocionExplodedContract, df_in, "entrada")
+        return df_in
 
-            for _, row in df_out.iterrows():
-                payload = self._extract_payload(row)
-                frase_idx = int(row["frase_idx"])
-                emo_idx = int(row["emocion_idx"])
-                if payload is None:
-                    self._e_repo.set_caracterizacion_error(
-                        codigo,
-                        frase_idx,
-                        emo_idx,
-                        "Backend error (ver logs)",
-                    )
-                    self.metrics.record_item_failed()
-                    continue
-                self._e_repo.set_caracterizacion(
+    def _process_paquete(
+        self, agent: CharacterizerAgent, paquete: list[_Pendientes], df_in: pd.DataFrame | None
+    ) -> int:
+        """Caracteriza emociones de varios discursos con el agente empaquetado."""
+        self.progress.advance(sum(len(items) for _, items in paquete))
+        if df_in is None:
+            return 0
+        try:
+            df_out = agent.run(df_in)
+        except Exception as e:
+            codigos = ", ".join(codigo for codigo, _ in paquete)
+            logger.error(f"[Stage:{self.NAME}] paquete [{codigos}]: error inesperado: {e}")
+            self._mark_failed(paquete, str(e))
+            return 0
+        return self._persist(df_out)
+
+    def _agent_context(self, input_data: dict[str, Any], codigo: str) -> dict[str, str]:
+        """Contexto del discurso que usa el characterizer."""
+        meta = self._d_repo.get_payload(codigo, "metadata") or {}
+        enun = self._d_repo.get_payload(codigo, "enunciation") or {}
+        return {
+            "titulo": str(input_data.get("titulo", "")),
+            "tipo_discurso": str(meta.get("tipo_discurso", "")),
+            "enunciador": str(enun.get("enunciador", "")),
+        }
+
+    def _make_agent(
+        self, contexto: dict[str, str], *, empaquetado: bool = False
+    ) -> CharacterizerAgent:
+        return CharacterizerAgent(
+            self._backend,
+            **contexto,
+            heuristicas=self._heuristicas,
+            retry_config=self._retry_config,
+            genre=self._genre,
+            empaquetado=empaquetado,
+        )
+
+    def _mark_failed(self, pendientes: list[_Pendientes], motivo: str) -> None:
+        """Marca con error todas las emociones de los discursos dados."""
+        for codigo, items in pendientes:
+            for frase_idx, emo_idx in items:
+                self._e_repo.set_caracterizacion_error(codigo, frase_idx, emo_idx, motivo)
+                self.metrics.record_item_failed()
+
+    def _persist(self, df_out: pd.DataFrame) -> int:
+        """Guarda la caracterización por (codigo, frase_idx, emocion_idx)."""
+        ok = 0
+        for _, row in df_out.iterrows():
+            payload = self._extract_payload(row)
+            codigo = str(row["codigo"])
+            frase_idx = int(row["frase_idx"])
+            emo_idx = int(row["emocion_idx"])
+            if payload is None:
+                self._e_repo.set_caracterizacion_error(
                     codigo,
                     frase_idx,
                     emo_idx,
-                    payload=payload,
-                    version=self._version,
+                    "Backend error (ver logs)",
                 )
-                total_ok += 1
-                self.metrics.record_item_ok()
-
-        logger.info(f"[Stage:{self.NAME}] Completado: {total_ok} ok.")
-        return total_ok
+                self.metrics.record_item_failed()
+                continue
+            self._e_repo.set_caracterizacion(
+                codigo,
+                frase_idx,
+                emo_idx,
+                payload=payload,
+                version=self._version,
+            )
+            ok += 1
+            self.metrics.record_item_ok()
+        return ok
 
     def _build_input_df(
         self,
@@ -2696,7 +3046,11 @@ class CharacterizerStage(Stage):
 
 
 class EmotionsPass2Stage(Stage):
-    """Pase 2 del análisis de emociones."""
+    """Pase 2 del análisis de emociones.
+
+    Admite el empaquetado entre discursos de `_FraseStage` vía
+    `pack_batch_size["emotions_pass2"]` del género.
+    """
 
     NAME = "emotions_pass2"
     STAGE_KEY = "emociones_pass2"
@@ -2705,6 +3059,10 @@ class EmotionsPass2Stage(Stage):
     #: `pipeline.parallel` y el tipo de backend; 1 = secuencial (in-process).
     parallel: int = 1
 
+    #: Discursos (o paquetes) y batches preparados por delante del que está
+    #: en el modelo. Lo fija el runner según `pipeline.prefetch`.
+    prefetch: int = DEFAULT_ANTICIPACION
+
     def __init__(
         self,
         backend: LLMBackend,
@@ -2752,6 +3110,7 @@ class EmotionsPass2Stage(Stage):
         self._media_ctx = media_context_provider
         # Persistencia bajo lock cuando se procesa en paralelo por discurso.
         self._persist_lock = threading.Lock()
+        self.pack_size = _pack_size(genre, self.NAME)
 
     def run_pending(self) -> int:
         """Procesa frases pendientes con rolling/full summary.
@@ -2775,79 +3134,148 @@ class EmotionsPass2Stage(Stage):
         logger.info(
             f"[Stage:{self.NAME}] Procesando {len(by_codigo)} discurso(s) "
             f"con {sum(len(v) for v in by_codigo.values())} frases pendientes"
+            + (f", empaquetadas de a {self.pack_size}" if self.pack_size else "")
             + (f" (parallel={self.parallel})." if self.parallel > 1 else ".")
         )
 
-        total_ok = 0
         self.progress.start(sum(len(v) for v in by_codigo.values()), "frases")
-        if self.parallel <= 1:
-            for codigo, pending_idxs in by_codigo.items():
-                total_ok += self._process_codigo(codigo, pending_idxs)
+        if self.pack_size:
+            agent = self._make_agent({}, empaquetado=True)
+            agent.BATCH_SIZE = self.pack_size  # type: ignore[misc]
+            agent.prefetch = self.prefetch
+            total_ok = _correr_pendientes(
+                _paquetes(by_codigo, self.pack_size),
+                self._preparar_paquete,
+                lambda paquete, df_in: self._process_paquete(agent, paquete, df_in),
+                self.parallel,
+                self.prefetch,
+            )
         else:
-            with ThreadPoolExecutor(max_workers=self.parallel) as pool:
-                futures = {
-                    pool.submit(self._process_codigo, codigo, idxs): codigo
-                    for codigo, idxs in by_codigo.items()
-                }
-                for future in as_completed(futures):
-                    total_ok += future.result()
+            total_ok = _correr_pendientes(
+                list(by_codigo.items()),
+                lambda p: self._preparar_codigo(*p),
+                lambda p, insumo: self._process_codigo(*p, insumo),
+                self.parallel,
+                self.prefetch,
+            )
         self.progress.finish()
 
         logger.info(f"[Stage:{self.NAME}] Completado: {total_ok} frases ok.")
         return total_ok
 
-    def _process_codigo(self, codigo: str, pending_idxs: list[int]) -> int:
-        """Corre el pase 2 sobre las frases pendientes de un discurso."""
+    def _preparar_codigo(self, codigo: str, pending_idxs: list[int]) -> _Insumo:
+        """Agente y frases pendientes validadas de un discurso; None si no hay."""
         input_data = self._d_repo.get_input(codigo) or {}
 
-        df_full = self._build_full_df_with_rolling(codigo)
-        if df_full.empty:
-            logger.info(f"[Stage:{self.NAME}] {codigo}: sin pase 1 procesado, salteando")
+        df_pending = self._pending_df(codigo, pending_idxs)
+        if df_pending.empty:
+            return None
+        self._validate(FraseConEmocionesContract, df_pending, "entrada")
+
+        agent = self._make_agent(self._agent_context(input_data, codigo))
+        agent.prefetch = self.prefetch
+        return agent, df_pending
+
+    def _process_codigo(self, codigo: str, pending_idxs: list[int], insumo: _Insumo) -> int:
+        """Corre el pase 2 sobre las frases pendientes de un discurso."""
+        if insumo is None:
             return 0
+        agent, df_pending = insumo
+        try:
+            df_out = agent.run(df_pending)
+        except Exception as e:
+            logger.error(f"[Stage:{self.NAME}] {codigo}: error inesperado: {e}")
+            self._mark_failed([(codigo, pending_idxs)], str(e))
+            return 0
+        return self._persist(df_out)
+
+    def _preparar_paquete(self, paquete: list[_Pendientes]) -> pd.DataFrame | None:
+        """Frases pendientes validadas de un paquete, con el contexto de cada discurso."""
+        frames: list[pd.DataFrame] = []
+        for codigo, pending_idxs in paquete:
+            df = self._pending_df(codigo, pending_idxs)
+            if df.empty:
+                continue
+            contexto = self._agent_context(self._d_repo.get_input(codigo) or {}, codigo)
+            frames.append(_con_contexto_discurso(df, contexto))
+        if not frames:
+            return None
+        df_in = pd.concat(frames, ignore_index=True)
+        self._validate(FraseConEmocionesContract, df_in, "entrada")
+        return df_in
 
-        df_pending = df_full[df_full["unit_idx"].isin(pending_idxs)].reset_index(drop=True)
-        if df_pending.empty:
+    def _process_paquete(
+        self, agent: EmotionsAgentPass2, paquete: list[_Pendientes], df_in: pd.DataFrame | None
+    ) -> int:
+        """Corre el pase 2 sobre varios discursos con el agente empaquetado."""
+        if df_in is None:
             return 0
-        self._validate(FraseConEmocionesContract, df_pending, "entrada")
+        try:
+            df_out = agent.run(df_in)
+        except Exception as e:
+            codigos = ", ".join(codigo for codigo, _ in paquete)
+            logger.error(f"[Stage:{self.NAME}] paquete [{codigos}]: error inesperado: {e}")
+            self._mark_failed(paquete, str(e))
+            return 0
+        return self._persist(df_out)
 
+    def _pending_df(self, codigo: str, pending_idxs: list[int]) -> pd.DataFrame:
+        """Frases pendientes del discurso con su rolling; vacío si no hay pase 1."""
+        df_full = self._build_full_df_with_rolling(codigo)
+        if df_full.empty:
+            logger.info(f"[Stage:{self.NAME}] {codigo}: sin pase 1 procesado, salteando")
+            return df_full
+        return df_full[df_full["unit_idx"].isin(pending_idxs)].reset_index(drop=True)
+
+    def _agent_context(self, input_data: dict[str, Any], codigo: str) -> dict[str, str]:
+        """Contexto del discurso: metadata, enunciación y resumen."""
         meta = self._d_repo.get_payload(codigo, "metadata") or {}
         enun = self._d_repo.get_payload(codigo, "enunciation") or {}
         summ = self._d_repo.get_payload(codigo, "summarizer") or {}
-        agent = EmotionsAgentPass2(
+        return {
+            "titulo": str(input_data.get("titulo", "")),
+            "tipo_discurso": str(meta.get("tipo_discurso", "")),
+            "enunciador": str(enun.get("enunciador", "")),
+            "enunciatarios": _format_enunciatarios(enun.get("enunciatarios")),
+            "auditorio": _format_enunciatarios(enun.get("auditorio")),
+            "resumen": _resumen_global(summ),
+        }
+
+    def _make_agent(
+        self, contexto: dict[str, str], *, empaquetado: bool = False
+    ) -> EmotionsAgentPass2:
+        return EmotionsAgentPass2(
             self._backend,
             heuristicas=self._heuristicas,
             configuraciones=self._configuraciones,
-            titulo=str(input_data.get("titulo", "")),
-            tipo_discurso=str(meta.get("tipo_discurso", "")),
-            enunciador=str(enun.get("enunciador", "")),
-            enunciatarios=_format_enunciatarios(enun.get("enunciatarios")),
-            auditorio=_format_enunciatarios(enun.get("auditorio")),
-            resumen=_resumen_global(summ),
+            **contexto,
             modos_existencia=self._modos_existencia,
             emotion_scope=self._emotion_scope,
             context_mode=self._context_mode,
             retry_config=self._retry_config,
             genre=self._genre,
+            empaquetado=empaquetado,
         )
 
-        try:
-            df_out = agent.run(df_pending)
-        except Exception as e:
-            logger.error(f"[Stage:{self.NAME}] {codigo}: error inesperado: {e}")
-            with self._persist_lock:
+    def _mark_failed(self, pendientes: list[_Pendientes], motivo: str) -> None:
+        """Marca con error todas las frases de los discursos dados."""
+        with self._persist_lock:
+            for codigo, pending_idxs in pendientes:
                 for idx in pending_idxs:
                     self._f_repo.set_error(
                         codigo,
                         idx,
-                        self.STAGE_KEY,
-                        str(e),  # type: ignore[arg-type]
+                        self.STAGE_KEY,  # type: ignore[arg-type]
+                        motivo,
                     )
                     self.metrics.record_item_failed()
-            return 0
 
+    def _persist(self, df_out: pd.DataFrame) -> int:
+        """Guarda el output del pase 2 por (codigo, unit_idx) de cada fila."""
         total_ok = 0
         with self._persist_lock:
             for _, row in df_out.iterrows():
+                codigo = str(row["codigo"])
                 idx = int(row["unit_idx"])
                 emociones_str = row.get("emociones")
                 if pd.isna(emociones_str):
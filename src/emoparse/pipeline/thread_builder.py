@@ -8,17 +8,31 @@
 #  cada post su conversación, su profundidad en el árbol y su condición de
 #  huérfano (reply cuyo padre no fue capturado, situación normal en corpus
 #  scrapeados), y agrega la tabla de hilos.
+#
+#  La resolución es vectorizada: los post_id se mapean a índices enteros,
+#  cada post apunta al índice de su padre y los saltos se duplican
+#  (pointer jumping) hasta llegar a la raíz capturada o al borde del corpus,
+#  en O(n·log(profundidad)) sin recorrer cadenas en Python. Solo las cadenas
+#  anómalas (ciclos o más de `_MAX_DEPTH` saltos) se remontan una por una.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
 import json
 
+import numpy as np
 import pandas as pd
 
 #: Tope de saltos al remontar padres: corta ante ciclos o cadenas anómalas.
 _MAX_DEPTH = 500
 
+#: Marcas de `padre` en el arreglo de índices: sin padre / padre fuera del corpus.
+_SIN_PADRE = -1
+_FUERA = -2
+
+#: Rondas de duplicación de saltos: 2**_RONDAS > _MAX_DEPTH + 1.
+_RONDAS = int(np.ceil(np.log2(_MAX_DEPTH + 2)))
+
 
 def build_threads(df_posts: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     """Enriquece los posts con estructura conversacional y agrega los hilos.
@@ -41,20 +55,22 @@ def build_threads(df_posts: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
       derivado (las plataformas lo calculan con el árbol completo).
     """
     df = df_posts.copy().reset_index(drop=True)
-    by_id: dict[str, dict] = {str(r["post_id"]): r for r in df.to_dict(orient="records")}
+    if df.empty:
+        df["conversacion_id"] = []
+        df["profundidad"] = pd.array([], dtype="Int64")
+        df["huerfano"] = []
+        return df, pd.DataFrame([])
 
-    conv_ids: list[str] = []
-    profundidades: list[int | None] = []
-    huerfanos: list[int] = []
+    post_ids = df["post_id"].astype(str).to_numpy(dtype=object)
+    padres = _clean_column(df, "en_respuesta_a")
+    provistos = _clean_column(df, "conversacion_id")
 
-    for row in df.to_dict(orient="records"):
-        conv, depth, orphan = _resolve(row, by_id)
-        conv_ids.append(conv)
-        profundidades.append(depth)
-        huerfanos.append(orphan)
+    conv_ids, profundidades, huerfanos = _resolve_all(post_ids, padres)
+    con_provisto = ~_nulos(provistos)
+    conv_ids[con_provisto] = provistos[con_provisto]
 
     df["conversacion_id"] = conv_ids
-    df["profundidad"] = pd.array(profundidades, dtype="Int64")
+    df["profundidad"] = profundidades
     df["huerfano"] = huerfanos
 
     df_hilos = _aggregate_hilos(df)
@@ -62,52 +78,131 @@ def build_threads(df_posts: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
 
 
 # ══════════════════════════════════════════════════════════════════════════════
-#  Resolución por post
+#  Resolución vectorizada
 # ══════════════════════════════════════════════════════════════════════════════
 
 
-def _resolve(
-    row: dict,
-    by_id: dict[str, dict],
-) -> tuple[str, int | None, int]:
-    """Resuelve (conversacion_id, profundidad, huerfano) para un post."""
-    post_id = str(row["post_id"])
-    parent = _clean(row.get("en_respuesta_a"))
-    provided_conv = _clean(row.get("conversacion_id"))
+def _resolve_all(
+    post_ids: np.ndarray, padres: np.ndarray
+) -> tuple[np.ndarray, pd.arrays.IntegerArray, np.ndarray]:
+    """(conversacion_id derivado, profundidad, huerfano) de cada fila.
+
+    Las cadenas se remontan sobre nodos únicos: si un post_id se repite,
+    manda su última aparición (como un dict armado fila a fila).
+    """
+    ids = pd.Index(post_ids)
+    if ids.is_unique:
+        unicos, fila_de_nodo = ids, np.arange(len(ids))
+        nodo_de_fila = fila_de_nodo
+    else:
+        ultima = ~ids.duplicated(keep="last")
+        unicos, fila_de_nodo = ids[ultima], np.flatnonzero(ultima)
+        nodo_de_fila = unicos.get_indexer(ids)
+
+    padre_de_nodo = padres[fila_de_nodo]
+    padre = _indices_de_padre(unicos, padre_de_nodo)
+    conv, profundidad, huerfano = _remontar_nodos(unicos, padre, padre_de_nodo)
+
+    # Sin padre propio, la fila es raíz aunque otra aparición de su id no lo sea.
+    raiz = _nulos(padres)
+    conv_filas = conv[nodo_de_fila]
+    conv_filas[raiz] = post_ids[raiz]
+    prof_filas = profundidad[nodo_de_fila]
+    prof_filas[raiz] = 0
+    huerfano_filas = huerfano[nodo_de_fila]
+    huerfano_filas[raiz] = 0
+    return (
+        conv_filas,
+        pd.arrays.IntegerArray(prof_filas, prof_filas < 0),
+        huerfano_filas,
+    )
+
+
+def _indices_de_padre(unicos: pd.Index, padre_de_nodo: np.ndarray) -> np.ndarray:
+    """Índice entero del padre de cada nodo, o `_SIN_PADRE` / `_FUERA`."""
+    padre = np.full(len(unicos), _SIN_PADRE, dtype=np.int64)
+    con_padre = ~_nulos(padre_de_nodo)
+    indices = unicos.get_indexer(padre_de_nodo[con_padre])
+    padre[con_padre] = np.where(indices < 0, _FUERA, indices)
+    return padre
+
+
+def _remontar_nodos(
+    unicos: pd.Index, padre: np.ndarray, padre_de_nodo: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(conversacion_id, profundidad (-1 = desconocida), huerfano) de cada nodo.
+
+    Pointer jumping: los nodos terminales (sin padre o con el padre fuera del
+    corpus) se apuntan a sí mismos y cada ronda duplica el salto, acumulando
+    la distancia recorrida. Tras `_RONDAS` rondas, todo nodo a ≤ `_MAX_DEPTH`
+    saltos de su terminal ya llegó a él.
+    """
+    n = len(unicos)
+    terminal = padre < 0
+    salto = np.where(terminal, np.arange(n), padre)
+    distancia = (~terminal).astype(np.int64)
+    for _ in range(_RONDAS):
+        if terminal[salto].all():
+            break
+        distancia += distancia[salto]
+        salto = salto[salto]
+
+    ids = unicos.to_numpy(dtype=object)
+    resuelto = terminal[salto] & (distancia <= _MAX_DEPTH)
+    fuera = resuelto & (padre[salto] == _FUERA)
+
+    conv = ids[salto]
+    conv[fuera] = padre_de_nodo[salto[fuera]]
+    profundidad = np.where(fuera, -1, distancia)
+    huerfano = fuera.astype(np.int64)
+
+    for nodo in np.flatnonzero(~resuelto):
+        conv[nodo], profundidad[nodo], huerfano[nodo] = _remontar(
+            int(nodo), padre, ids, padre_de_nodo
+        )
+    return conv, profundidad, huerfano
 
-    if not parent:
-        # Raíz (original, quote o repost): conversación propia salvo dato de fuente.
-        return provided_conv or post_id, 0, 0
 
-    # Reply: remontar la cadena de padres dentro del corpus.
+def _remontar(
+    nodo: int, padre: np.ndarray, ids: np.ndarray, padre_de_nodo: np.ndarray
+) -> tuple[str, int, int]:
+    """Remonta una cadena anómala salto a salto (ciclo o más de `_MAX_DEPTH`)."""
     depth = 0
-    current = post_id
-    seen: set[str] = {current}
+    current = nodo
+    seen: set[int] = {current}
     while True:
-        current_parent = _clean(by_id[current].get("en_respuesta_a")) if current in by_id else None
-        if not current_parent:
-            # `current` es la raíz capturada.
-            return provided_conv or current, depth, 0
+        p = int(padre[current])
+        if p == _SIN_PADRE:
+            return ids[current], depth, 0
         depth += 1
-        if current_parent not in by_id:
-            # La cadena sale del corpus: huérfano. La profundidad real es
-            # desconocida (falta el tramo superior del árbol).
-            return provided_conv or current_parent, None, 1
-        if current_parent in seen or depth > _MAX_DEPTH:
+        if p == _FUERA:
+            return padre_de_nodo[current], -1, 1
+        if p in seen or depth > _MAX_DEPTH:
             # Ciclo o cadena anómala: cortar sin romper la carga.
-            return provided_conv or current_parent, None, 1
-        seen.add(current_parent)
-        current = current_parent
+            return ids[p], -1, 1
+        seen.add(p)
+        current = p
+
 
+def _clean_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Referencias normalizadas de `column` (str, o None si falta/NaN/'')."""
+    out = np.full(len(df), None, dtype=object)
+    if column not in df.columns:
+        return out
+    values = df[column].to_numpy(dtype=object)
+    presentes = ~_nulos(values)
+    limpios = pd.Series(values[presentes], dtype=object).astype(str).str.strip()
+    out[presentes] = limpios.where(limpios != "", None).to_numpy(dtype=object)
+    return out
 
-def _clean(value: object) -> str | None:
-    """Normaliza referencias: None/NaN/'' → None."""
-    if value is None:
-        return None
-    if isinstance(value, float) and pd.isna(value):
-        return None
-    s = str(value).strip()
-    return s or None
+
+def _nulos(values: np.ndarray) -> np.ndarray:
+    """Máscara de None y NaN flotante (lo que `_clean` trata como vacío)."""
+    nulos = pd.isna(values)
+    if nulos.any():
+        candidatos = np.flatnonzero(nulos)
+        nulos[candidatos] = [v is None or isinstance(v, float) for v in values[candidatos].tolist()]
+    return nulos
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -117,22 +212,41 @@ def _clean(value: object) -> str | None:
 
 def _aggregate_hilos(df: pd.DataFrame) -> pd.DataFrame:
     """Agrega una fila por conversación."""
-    rows = []
-    for conv_id, grp in df.groupby("conversacion_id", sort=True):
-        fechas = sorted(f for f in grp["fecha"].tolist() if f)
-        profundidades = [int(p) for p in grp["profundidad"].dropna().tolist()]
-        participantes = sorted(set(grp["autor_handle"].astype(str).tolist()))
-        # La raíz es el post cuyo id coincide con la conversación; si no fue
-        # capturada, el id de conversación sigue apuntándola.
-        rows.append(
-            {
-                "conversacion_id": str(conv_id),
-                "post_raiz": str(conv_id),
-                "n_posts": int(len(grp)),
-                "profundidad_max": max(profundidades) if profundidades else 0,
-                "participantes": json.dumps(participantes, ensure_ascii=False),
-                "fecha_inicio": fechas[0] if fechas else None,
-                "fecha_fin": fechas[-1] if fechas else None,
-            }
-        )
-    return pd.DataFrame(rows)
+    conv = df["conversacion_id"]
+    n_posts = conv.value_counts(sort=False).sort_index()
+    profundidad_max = df["profundidad"].groupby(conv, sort=True).max().fillna(0).astype("int64")
+
+    # Mínimo y máximo por orden (conversación, fecha): evita el min/max de
+    # pandas sobre objetos, que cae a Python grupo por grupo.
+    fechas = pd.DataFrame({"conv": conv, "fecha": df["fecha"]})[df["fecha"].astype(bool)]
+    fechas = fechas.sort_values(["conv", "fecha"]).groupby("conv", sort=True)["fecha"]
+    fecha_inicio = _con_none(fechas.first().reindex(n_posts.index))
+    fecha_fin = _con_none(fechas.last().reindex(n_posts.index))
+
+    autores = pd.DataFrame({"conv": conv, "autor": df["autor_handle"].astype(str)})
+    autores = autores.drop_duplicates().sort_values(["conv", "autor"])
+    conv_orden = autores["conv"].to_numpy(dtype=object)
+    cortes = np.flatnonzero(conv_orden[1:] != conv_orden[:-1]) + 1
+    participantes = np.split(autores["autor"].to_numpy(dtype=object), cortes)
+
+    # La raíz es el post cuyo id coincide con la conversación; si no fue
+    # capturada, el id de conversación sigue apuntándola.
+    conv_ids = [str(c) for c in n_posts.index]
+    return pd.DataFrame(
+        {
+            "conversacion_id": conv_ids,
+            "post_raiz": conv_ids,
+            "n_posts": n_posts.to_numpy(dtype=np.int64),
+            "profundidad_max": profundidad_max.to_numpy(),
+            "participantes": [json.dumps(p.tolist(), ensure_ascii=False) for p in participantes],
+            "fecha_inicio": fecha_inicio,
+            "fecha_fin": fecha_fin,
+        }
+    )
+
+
+def _con_none(serie: pd.Series) -> np.ndarray:
+    """Valores de `serie` como objetos, con None donde falta el dato."""
+    valores = serie.to_numpy(dtype=object)
+    valores[pd.isna(valores)] = None
+    return valores
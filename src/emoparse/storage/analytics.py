@@ -51,3 +51,54 @@ def attach_run(db_path: Path | str, alias: str = "run") -> Any:
 def query_df(con: Any, sql: str) -> Any:
     """Ejecuta SQL sobre la conexión analítica y devuelve un DataFrame pandas."""
     return con.execute(sql).df()
+
+
+def attach_snapshots(snapshots: dict[str, Path | str]) -> Any:
+    """Abre DuckDB con las instantáneas Parquet de uno o más runs como vistas.
+
+    `snapshots` mapea un nombre de run a su directorio de instantánea (ver
+    `storage.snapshot`). Por cada tabla se crean dos tipos de vistas:
+
+    - `<nombre>.<tabla>`: la tabla de ese run (p. ej. ``run_a.emociones``);
+    - `<tabla>`: la unión de todos los runs con una columna `run`, para
+      comparar decenas de runs en una sola consulta (``GROUP BY run``).
+
+    La unión es por nombre de columna: un run sin una dimensión de
+    caracterización la aporta como NULL.
+
+    Raises:
+        AnalyticsUnavailableError: si duckdb no está instalado o falta alguna
+            tabla de la instantánea.
+    """
+    from emoparse.storage.snapshot import SNAPSHOT_TABLES
+
+    try:
+        import duckdb
+    except ImportError as e:
+        raise AnalyticsUnavailableError(
+            'DuckDB no está instalado. Instalá el extra: pip install -e ".[analytics]"'
+        ) from e
+    con = duckdb.connect(database=":memory:")
+    for table in SNAPSHOT_TABLES:
+        partes: list[str] = []
+        for name, directory in snapshots.items():
+            path = Path(directory).expanduser().resolve() / f"{table}.parquet"
+            if not path.is_file():
+                raise AnalyticsUnavailableError(f"Instantánea incompleta: falta {path}")
+            schema = _quote_ident(name)
+            source = f"read_parquet('{_quote_literal(path.as_posix())}')"
+            con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+            con.execute(f"CREATE OR REPLACE VIEW {schema}.{table} AS SELECT * FROM {source}")
+            partes.append(f"SELECT '{_quote_literal(name)}' AS run, * FROM {source}")
+        if partes:
+            union = " UNION ALL BY NAME ".join(partes)
+            con.execute(f"CREATE OR REPLACE VIEW main.{table} AS {union}")
+    return con
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    return value.replace("'", "''")
@@ -0,0 +1,91 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.storage.contexto_hilo
+#
+#  Repositorio de la tabla `contexto_hilo`: el bloque de contexto
+#  conversacional ya renderizado de cada post, por combinación de parámetros
+#  del provider (`clave`).
+#
+#  El contexto de un post depende de otros posts (padres, raíz, cita,
+#  intervenciones del hilo), así que la vigencia es del corpus entero: los
+#  triggers del esquema vacían la tabla ante cualquier escritura en `posts` o
+#  `hilos` que cambie lo que se renderiza, y la próxima stage que lo pida la
+#  vuelve a materializar (`post_context.materialize_hilo_contexts`).
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from typing import Any
+
+from emoparse.storage.db import Database
+
+
+class ContextoHiloRepository:
+    """Bloques de contexto de hilo materializados y el grafo de posts."""
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    # ── Bloques materializados ───────────────────────────────────────────────
+
+    def textos(self, clave: str) -> dict[str, str] | None:
+        """{codigo: bloque} de `clave`, o None si no está materializada.
+
+        Los posts sin contexto no tienen fila: su ausencia es el None del
+        provider.
+        """
+        if not self._db.table_exists("contexto_hilo"):
+            return None
+        vigente = self._db.execute(
+            "SELECT 1 FROM contexto_hilo_claves WHERE clave = ?", (clave,)
+        ).fetchone()
+        if vigente is None:
+            return None
+        rows = self._db.execute(
+            "SELECT codigo, texto FROM contexto_hilo WHERE clave = ?", (clave,)
+        ).fetchall()
+        return {str(r["codigo"]): str(r["texto"]) for r in rows}
+
+    def guardar(self, clave: str, textos: Mapping[str, str | None]) -> None:
+        """Reemplaza los bloques de `clave` y la marca vigente."""
+        if not self._db.table_exists("contexto_hilo"):
+            return
+        with self._db.transaction() as cur:
+            cur.execute("DELETE FROM contexto_hilo WHERE clave = ?", (clave,))
+            cur.executemany(
+                "INSERT INTO contexto_hilo (clave, codigo, texto) VALUES (?, ?, ?)",
+                [(clave, codigo, texto) for codigo, texto in textos.items() if texto],
+            )
+            cur.execute(
+                """
+                INSERT INTO contexto_hilo_claves (clave, n_posts, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(clave) DO UPDATE SET
+                    n_posts = excluded.n_posts,
+                    updated_at = excluded.updated_at
+                """,
+                (clave, len(textos), datetime.now(UTC)),
+            )
+
+    # ── Grafo de posts ───────────────────────────────────────────────────────
+
+    def posts(self) -> list[dict[str, Any]]:
+        """Los campos de `posts` que lee el contexto de hilo, en una consulta.
+
+        Ordenados por conversación y, dentro de cada una, como
+        `PostsRepository.list_by_conversacion` (fecha y luego id).
+        """
+        rows = self._db.execute(
+            """
+            SELECT post_id, autor_handle, texto, conversacion_id, en_respuesta_a, cita_a
+            FROM posts
+            ORDER BY conversacion_id, fecha, post_id
+            """
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def n_posts_por_hilo(self) -> dict[str, Any]:
+        """{conversacion_id: n_posts} de la tabla `hilos`."""
+        rows = self._db.execute("SELECT conversacion_id, n_posts FROM hilos").fetchall()
+        return {str(r["conversacion_id"]): r["n_posts"] for r in rows}
@@ -38,6 +38,41 @@ sqlite3.register_adapter(datetime, _adapt_datetime_iso)
 sqlite3.register_converter("TIMESTAMP", _convert_datetime_iso)
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+#  Firma en disco
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def _stat_sig(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _wal_header(path: Path) -> bytes:
+    """Checkpoint sequence y salts de la cabecera del WAL (cambian en cada reinicio)."""
+    try:
+        with path.open("rb") as fh:
+            return fh.read(32)[12:24]
+    except OSError:
+        return b""
+
+
+def db_signature(path: Path | str) -> tuple[Any, ...]:
+    """Firma barata del estado en disco de una base SQLite en modo WAL.
+
+    Un commit agrega frames al `-wal` (cambia tamaño y mtime); un checkpoint
+    toca la base y reinicia el WAL con salts nuevos. Dos firmas iguales
+    implican, en la práctica, el mismo contenido visible. La usan la caché del
+    dashboard y la instantánea analítica para saber si la base cambió.
+    """
+    p = Path(path)
+    wal = p.with_name(p.name + "-wal")
+    return (_stat_sig(p), _stat_sig(wal), _wal_header(wal))
+
+
 class Database:
     """Wrapper de sqlite3 con connection-per-thread."""
 
@@ -83,13 +83,14 @@ class DiscursosRepository:
             cur.execute(
                 f"""
                 UPDATE discursos SET
+                    payload_rev   = payload_rev + ({col_payload} IS NOT ?),
                     {col_payload} = ?,
                     {col_version} = ?,
                     {col_error}   = NULL,
                     updated_at    = ?
                 WHERE codigo = ?
                 """,
-                (payload_str, version, datetime.now(UTC), codigo),
+                (payload_str, payload_str, version, datetime.now(UTC), codigo),
             )
 
     def set_error(
@@ -108,6 +109,7 @@ class DiscursosRepository:
             cur.execute(
                 f"""
                 UPDATE discursos SET
+                    payload_rev   = payload_rev + ({col_payload} IS NOT NULL),
                     {col_payload} = NULL,
                     {col_version} = NULL,
                     {col_error}   = ?,
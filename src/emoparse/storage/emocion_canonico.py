@@ -0,0 +1,260 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.storage.emocion_canonico
+#
+#  Resolución materializada de los roles por emoción (tabla
+#  `emocion_canonico`): para cada emoción, los canónicos que resuelven su
+#  marca de experienciador y de fuente y los rechazados para cada una.
+#
+#  Se calcula una vez por cambio de sus insumos (emociones, menciones,
+#  funciones y vínculos marca↔referente): los triggers del esquema retiran la
+#  vigencia del código en `materializaciones` y `refresh` re-materializa solo
+#  los códigos sin vigencia. Las lecturas suman la tabla con un join
+#  (`columnas_resolucion`) y completan la prelación con `ResolucionRoles`,
+#  que cae al índice de marcas para los códigos todavía sin vigencia: el
+#  criterio sigue siendo uno solo, el de `storage.referencia`.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import json
+from collections.abc import Collection, Iterable
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any
+
+from emoparse.storage.db import Database
+from emoparse.storage.referencia import (
+    Executor,
+    MarcaIndex,
+    canonicos_de_marca,
+    marca_canonicos_index,
+    rechazados_de_marca,
+    resolver_ligados,
+)
+
+#: Stage con la que la tabla registra su vigencia en `materializaciones`.
+STAGE = "emocion_canonico"
+
+#: Rol → (función actancial, columna de la marca en `emociones`).
+ROLES: dict[str, tuple[str, str]] = {
+    "experienciador": ("experienciador", "experienciador_marca"),
+    "fuente": ("fuente", "fuente_marca"),
+}
+
+#: Listas que la tabla guarda por rol.
+_LISTAS = ("ligados", "rechazados")
+
+#: Códigos por transacción al re-materializar.
+_CODIGOS_POR_LOTE = 200
+
+
+def hay_resolucion_materializada(db: Executor) -> bool:
+    """True si la DB tiene la tabla (las bases previas a ella no la tienen)."""
+    return (
+        db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='emocion_canonico'"
+        ).fetchone()
+        is not None
+    )
+
+
+def columnas_resolucion(db: Executor, alias: str = "emociones") -> tuple[str, str]:
+    """(columnas, join) que suman la resolución a un SELECT sobre `emociones`.
+
+    `alias` es el nombre con que la consulta refiere a `emociones`. Las
+    columnas (`ec_<rol>_ligados`, `ec_<rol>_rechazados`, `ec_vigente`) son
+    las que lee `ResolucionRoles`; en una base sin la tabla salen en NULL y
+    toda la resolución cae al índice de marcas.
+    """
+    if not hay_resolucion_materializada(db):
+        nulas = ", ".join(f"NULL AS ec_{rol}_{c}" for rol in ROLES for c in _LISTAS)
+        return f"{nulas}, 0 AS ec_vigente", ""
+    columnas = ", ".join(f"ec.{rol}_{c} AS ec_{rol}_{c}" for rol in ROLES for c in _LISTAS)
+    join = (
+        "LEFT JOIN materializaciones ec_mz "
+        f"ON ec_mz.codigo = {alias}.codigo AND ec_mz.stage = '{STAGE}' "
+        "LEFT JOIN emocion_canonico ec "
+        f"ON ec.codigo = {alias}.codigo AND ec.frase_idx = {alias}.frase_idx "
+        f"AND ec.emocion_idx = {alias}.emocion_idx"
+    )
+    return f"{columnas}, ec_mz.codigo IS NOT NULL AS ec_vigente", join
+
+
+class ResolucionRoles:
+    """Resuelve los roles de filas leídas con `columnas_resolucion`.
+
+    Misma prelación que `referencia.resolver_canonicos`: atribución por
+    emoción > vínculos de la marca > canónicos de la inferencia menos los
+    rechazados. Las filas de códigos vigentes traen la marca ya resuelta;
+    para las demás se arma (una vez, y solo para esos códigos) el índice de
+    marcas. Las filas deben traer `codigo`, `frase_idx` y la marca del rol.
+    """
+
+    def __init__(self, db: Executor, codigos: Collection[str] | None = None) -> None:
+        self._db = db
+        self._codigos = codigos
+        self._indices: dict[str, MarcaIndex] = {}
+
+    def canonicos(
+        self,
+        row: Any,
+        rol: str,
+        *,
+        override: Any = None,
+        inferencia: str | None = None,
+    ) -> list[str]:
+        """Los canónicos del rol, en orden (ver `resolver_canonicos`)."""
+        ligados, rechazados = self.de_marca(row, rol)
+        return resolver_ligados(ligados, rechazados, override=override, inferencia=inferencia)
+
+    def canonico(
+        self,
+        row: Any,
+        rol: str,
+        *,
+        override: Any = None,
+        inferencia: str | None = None,
+    ) -> str:
+        """El primer canónico del rol, o "" (ver `resolver_canonico`)."""
+        resueltos = self.canonicos(row, rol, override=override, inferencia=inferencia)
+        return resueltos[0] if resueltos else ""
+
+    def de_marca(self, row: Any, rol: str) -> tuple[list[str], frozenset[str]]:
+        """(canónicos, rechazados) de la marca del rol en la fila."""
+        if row["ec_vigente"]:
+            return (
+                list(_lista(row[f"ec_{rol}_ligados"])),
+                frozenset(_lista(row[f"ec_{rol}_rechazados"])),
+            )
+        funcion, marca_field = ROLES[rol]
+        marca_map = self._indice(funcion).get((row["codigo"], int(row["frase_idx"])))
+        marca = row[marca_field]
+        return (
+            canonicos_de_marca(marca_map, marca),
+            frozenset(rechazados_de_marca(marca_map, marca)),
+        )
+
+    def _indice(self, funcion: str) -> MarcaIndex:
+        if funcion not in self._indices:
+            self._indices[funcion] = marca_canonicos_index(
+                self._db, funcion, codigos=self._sin_vigencia()
+            )
+        return self._indices[funcion]
+
+    def _sin_vigencia(self) -> Collection[str] | None:
+        """Códigos que hay que resolver por el índice; None = todos."""
+        if not hay_resolucion_materializada(self._db):
+            return self._codigos
+        sin = {
+            str(r["codigo"])
+            for r in self._db.execute(
+                "SELECT DISTINCT codigo FROM emociones EXCEPT "
+                "SELECT codigo FROM materializaciones WHERE stage = ?",
+                (STAGE,),
+            )
+        }
+        return sin if self._codigos is None else sin & set(self._codigos)
+
+
+@lru_cache(maxsize=65536)
+def _lista(valor: str | None) -> tuple[str, ...]:
+    """Lista JSON de la tabla → tupla; NULL es la lista vacía."""
+    return tuple(json.loads(valor)) if valor else ()
+
+
+def _json(valores: Iterable[str]) -> str | None:
+    lista = list(valores)
+    return json.dumps(lista, ensure_ascii=False) if lista else None
+
+
+class EmocionCanonicoRepository:
+    """Materialización de `emocion_canonico` por código."""
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    def pendientes(self, codigos: Iterable[str] | None = None) -> list[str]:
+        """Códigos con emociones y sin resolución vigente."""
+        if not self._db.table_exists("emocion_canonico"):
+            return []
+        rows = self._db.execute(
+            "SELECT DISTINCT codigo FROM emociones EXCEPT "
+            "SELECT codigo FROM materializaciones WHERE stage = ? ORDER BY codigo",
+            (STAGE,),
+        ).fetchall()
+        pendientes = [str(r["codigo"]) for r in rows]
+        if codigos is None:
+            return pendientes
+        pedidos = set(codigos)
+        return [c for c in pendientes if c in pedidos]
+
+    def refresh(self, codigos: Iterable[str] | None = None) -> int:
+        """Re-materializa los códigos sin vigencia (de `codigos`, o todos).
+
+        Cada lote se lee y se escribe en una misma transacción: una
+        escritura concurrente no puede quedar tapada por una vigencia
+        marcada sobre datos anteriores. Devuelve cuántos códigos resolvió.
+        """
+        pendientes = self.pendientes(codigos)
+        for i in range(0, len(pendientes), _CODIGOS_POR_LOTE):
+            lote = pendientes[i : i + _CODIGOS_POR_LOTE]
+            marks = ", ".join("?" * len(lote))
+            with self._db.transaction() as cur:
+                filas = self._resolver(lote)
+                cur.execute(f"DELETE FROM emocion_canonico WHERE codigo IN ({marks})", tuple(lote))
+                cur.executemany(
+                    """
+                    INSERT INTO emocion_canonico (
+                        codigo, frase_idx, emocion_idx,
+                        experienciador_ligados, experienciador_rechazados,
+                        fuente_ligados, fuente_rechazados
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    filas,
+                )
+                now = datetime.now(UTC)
+                cur.executemany(
+                    """
+                    INSERT INTO materializaciones (codigo, stage, huella, updated_at)
+                    VALUES (?, ?, '', ?)
+                    ON CONFLICT(codigo, stage) DO UPDATE SET
+                        huella = excluded.huella,
+                        updated_at = excluded.updated_at
+                    """,
+                    [(codigo, STAGE, now) for codigo in lote],
+                )
+        return len(pendientes)
+
+    def _resolver(self, codigos: list[str]) -> list[tuple[Any, ...]]:
+        """Filas de `emocion_canonico` de un lote de códigos.
+
+        Las emociones de una unidad repiten marcas: cada (unidad, marca) se
+        resuelve una sola vez.
+        """
+        indices = {
+            rol: marca_canonicos_index(self._db, funcion, codigos=codigos)
+            for rol, (funcion, _) in ROLES.items()
+        }
+        marks = ", ".join("?" * len(codigos))
+        rows = self._db.execute(
+            "SELECT codigo, frase_idx, emocion_idx, experienciador_marca, fuente_marca "
+            f"FROM emociones WHERE codigo IN ({marks})",
+            tuple(codigos),
+        ).fetchall()
+        memo: dict[tuple[str, str, int, str], tuple[str | None, str | None]] = {}
+        filas: list[tuple[Any, ...]] = []
+        for r in rows:
+            unidad = (str(r["codigo"]), int(r["frase_idx"]))
+            valores: list[str | None] = []
+            for rol, (_, marca_field) in ROLES.items():
+                clave = (rol, *unidad, str(r[marca_field] or ""))
+                if clave not in memo:
+                    marca_map = indices[rol].get(unidad)
+                    memo[clave] = (
+                        _json(canonicos_de_marca(marca_map, clave[3])),
+                        _json(sorted(rechazados_de_marca(marca_map, clave[3]))),
+                    )
+                valores.extend(memo[clave])
+            if any(v is not None for v in valores):
+                filas.append((*unidad, int(r["emocion_idx"]), *valores))
+        return filas
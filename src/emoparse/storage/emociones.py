@@ -12,6 +12,12 @@ from datetime import UTC, datetime
 from typing import Any
 
 from emoparse.storage.db import Database
+from emoparse.storage.emocion_canonico import (
+    ROLES,
+    EmocionCanonicoRepository,
+    ResolucionRoles,
+    columnas_resolucion,
+)
 from emoparse.storage.referencia import (
     marca_canonicos_index,
     resolver_canonico,
@@ -798,14 +804,10 @@ class EmocionesRepository:
         export: por eso refleja las ediciones de la tab Referentes y las
         stages downstream ven el referente que muestra la revisión.
         """
-        out: dict[tuple[int, int], str] = {}
-        for key, (marca_map, marca) in self._marcas_por_emocion(
-            codigo, funcion, marca_field
-        ).items():
-            canonical = resolver_canonico(marca_map, marca)
-            if canonical:
-                out[key] = canonical
-        return out
+        return {
+            key: canonicos[0]
+            for key, canonicos in self.resolve_canonicos_map(codigo, funcion, marca_field).items()
+        }
 
     def resolve_canonicos_map(
         self,
@@ -815,14 +817,35 @@ class EmocionesRepository:
     ) -> dict[tuple[int, int], list[str]]:
         """(frase_idx, emocion_idx) → los canónicos del rol.
 
-        Para la fuente, que puede combinar entidades en una sola emoción."""
-        out: dict[tuple[int, int], list[str]] = {}
-        for key, (marca_map, marca) in self._marcas_por_emocion(
-            codigo, funcion, marca_field
-        ).items():
-            canonicos = resolver_canonicos(marca_map, marca)
+        Para la fuente, que puede combinar entidades en una sola emoción.
+        Lee la resolución materializada (`emocion_canonico`), que re-materializa
+        antes si el código cambió desde la última vez.
+        """
+        if marca_field not in self._MARCA_FIELDS:
+            raise ValueError(f"marca_field inválido: {marca_field}")
+        if ROLES.get(funcion) != (funcion, marca_field):
+            out: dict[tuple[int, int], list[str]] = {}
+            for key, (marca_map, marca) in self._marcas_por_emocion(
+                codigo, funcion, marca_field
+            ).items():
+                canonicos = resolver_canonicos(marca_map, marca)
+                if canonicos:
+                    out[key] = canonicos
+            return out
+
+        EmocionCanonicoRepository(self._db).refresh([codigo])
+        columnas, join = columnas_resolucion(self._db)
+        resolucion = ResolucionRoles(self._db, {codigo})
+        out = {}
+        for r in self._db.execute(
+            f"SELECT emociones.codigo, emociones.frase_idx, emociones.emocion_idx, "
+            f"emociones.{marca_field}, {columnas} "
+            f"FROM emociones {join} WHERE emociones.codigo = ?",
+            (codigo,),
+        ).fetchall():
+            canonicos, _ = resolucion.de_marca(r, funcion)
             if canonicos:
-                out[key] = canonicos
+                out[(int(r["frase_idx"]), int(r["emocion_idx"]))] = canonicos
         return out
 
     def _marcas_por_emocion(
@@ -834,8 +857,6 @@ class EmocionesRepository:
         """(frase_idx, emocion_idx) → (marcas de la unidad, marca del rol).
 
         Devuelve {} si el run todavía no tiene base de menciones."""
-        if marca_field not in self._MARCA_FIELDS:
-            raise ValueError(f"marca_field inválido: {marca_field}")
         index = marca_canonicos_index(self._db, funcion, codigo)
         if not index:
             return {}
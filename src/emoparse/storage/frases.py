@@ -77,7 +77,12 @@ class FrasesRepository:
         payload: list[dict[str, Any]] | dict[str, Any],
         version: str | None = None,
     ) -> None:
-        """Marca una etapa como completada para una frase."""
+        """Marca una etapa como completada para una frase.
+
+        `payload_rev` sube solo si el payload cambia de contenido: reescribir
+        el mismo resultado (p. ej. un hit de caché) no ensucia las
+        materializaciones que lo consumen.
+        """
         self._validate_stage(stage)
         col_payload = f"{stage}_payload"
         col_version = f"{stage}_version"
@@ -88,6 +93,7 @@ class FrasesRepository:
             cur.execute(
                 f"""
                 UPDATE frases SET
+                    payload_rev   = payload_rev + ({col_payload} IS NOT ?),
                     {col_payload} = ?,
                     {col_version} = ?,
                     {col_error}   = NULL,
@@ -95,6 +101,7 @@ class FrasesRepository:
                 WHERE codigo = ? AND unit_idx = ?
                 """,
                 (
+                    payload_str,
                     payload_str,
                     version,
                     datetime.now(UTC),
@@ -119,6 +126,7 @@ class FrasesRepository:
             cur.execute(
                 f"""
                 UPDATE frases SET
+                    payload_rev   = payload_rev + ({col_payload} IS NOT NULL),
                     {col_payload} = NULL,
                     {col_version} = NULL,
                     {col_error}   = ?,
@@ -0,0 +1,135 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.storage.materializaciones
+#
+#  Repositorio de la tabla `materializaciones`: huella de los insumos que
+#  consumió cada stage derivada por código, para re-materializar solo los
+#  códigos que cambiaron.
+#
+#  La huella de insumos se arma con contadores, sin leer payloads: la
+#  revisión de los payloads del discurso y de sus frases (`payload_rev`, que
+#  los repositorios suben al escribir un payload distinto) y el estado de sus
+#  menciones (cantidad e id máximo: cualquier borrado o reinserción lo cambia).
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime
+from typing import Any
+
+from emoparse.storage.db import Database
+
+#: Máximo de parámetros por `IN (...)`; SQLite admite 999 en builds viejos.
+_LOTE_IN = 500
+
+_SQL_INSUMOS = """
+SELECT
+    d.codigo,
+    d.payload_rev,
+    COALESCE(f.n, 0)      AS n_frases,
+    COALESCE(f.rev, 0)    AS rev_frases,
+    COALESCE(f.idx, 0)    AS idx_frases,
+    COALESCE(m.n, 0)      AS n_menciones,
+    COALESCE(m.max_id, 0) AS max_mencion
+FROM discursos d
+LEFT JOIN (
+    SELECT codigo, COUNT(*) AS n, TOTAL(payload_rev) AS rev, TOTAL(unit_idx) AS idx
+    FROM frases {where}
+    GROUP BY codigo
+) f ON f.codigo = d.codigo
+LEFT JOIN (
+    SELECT codigo, COUNT(*) AS n, MAX(id) AS max_id
+    FROM menciones {where}
+    GROUP BY codigo
+) m ON m.codigo = d.codigo
+{where_d}
+"""
+
+
+class MaterializacionesRepository:
+    """Huellas de insumos por (código, stage) de las stages derivadas."""
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    # ── Huellas de insumos ───────────────────────────────────────────────────
+
+    def huellas_de_insumos(
+        self,
+        codigos: Iterable[str] | None = None,
+        *,
+        extra: str = "",
+    ) -> dict[str, str]:
+        """Huella actual de los insumos de cada código.
+
+        Args:
+            codigos: Códigos a consultar; None = todos.
+            extra: Componente común a todas las huellas (p. ej. digest del
+                conocimiento y versión de la derivación): si cambia, todos
+                los códigos quedan sucios.
+        """
+        if codigos is None:
+            rows = self._db.execute(_SQL_INSUMOS.format(where="", where_d="")).fetchall()
+            return {str(r["codigo"]): _huella(r, extra) for r in rows}
+        lista = list(dict.fromkeys(codigos))
+        out: dict[str, str] = {}
+        for i in range(0, len(lista), _LOTE_IN):
+            lote = lista[i : i + _LOTE_IN]
+            marks = ", ".join("?" * len(lote))
+            sql = _SQL_INSUMOS.format(
+                where=f"WHERE codigo IN ({marks})",
+                where_d=f"WHERE d.codigo IN ({marks})",
+            )
+            rows = self._db.execute(sql, (*lote, *lote, *lote)).fetchall()
+            out.update({str(r["codigo"]): _huella(r, extra) for r in rows})
+        return out
+
+    # ── Huellas materializadas ───────────────────────────────────────────────
+
+    def huellas(self, stage: str) -> dict[str, str]:
+        """Huella con la que se materializó cada código para `stage`."""
+        rows = self._db.execute(
+            "SELECT codigo, huella FROM materializaciones WHERE stage = ?",
+            (stage,),
+        ).fetchall()
+        return {str(r["codigo"]): str(r["huella"]) for r in rows}
+
+    def marcar(self, stage: str, huellas: Mapping[str, str]) -> None:
+        """Registra que los códigos de `huellas` quedaron materializados."""
+        if not huellas:
+            return
+        now = datetime.now(UTC)
+        with self._db.transaction() as cur:
+            cur.executemany(
+                """
+                INSERT INTO materializaciones (codigo, stage, huella, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(codigo, stage) DO UPDATE SET
+                    huella = excluded.huella,
+                    updated_at = excluded.updated_at
+                """,
+                [(codigo, stage, huella, now) for codigo, huella in huellas.items()],
+            )
+
+    def invalidar(self, stage: str, codigos: Iterable[str] | None = None) -> int:
+        """Fuerza la re-materialización de `stage` (todos los códigos si None)."""
+        with self._db.transaction() as cur:
+            if codigos is None:
+                cur.execute("DELETE FROM materializaciones WHERE stage = ?", (stage,))
+            else:
+                cur.executemany(
+                    "DELETE FROM materializaciones WHERE stage = ? AND codigo = ?",
+                    [(stage, c) for c in codigos],
+                )
+            return int(cur.rowcount)
+
+
+def _huella(row: Any, extra: str) -> str:
+    return "|".join(
+        (
+            f"d{row['payload_rev']}",
+            f"f{row['n_frases']}:{int(row['rev_frases'])}:{int(row['idx_frases'])}",
+            f"m{row['n_menciones']}:{row['max_mencion']}",
+            extra,
+        )
+    )
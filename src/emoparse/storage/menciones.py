@@ -213,6 +213,12 @@ def derivar_menciones(
     return list(acc.values())
 
 
+#: Orígenes de las propuestas que escribe la derivación desde payloads
+#: (explode): el canónico LLM, el clustering de correferencias, la deixis de
+#: 1ª persona y la KB de referentes.
+_ORIGENES_DERIVADOS = "('llm', 'coref', 'deixis', 'auto')"
+
+
 class MencionesRepository:
     """Repositorio de `menciones`, `mencion_funcion` y `mencion_canonico`."""
 
@@ -236,7 +242,10 @@ class MencionesRepository:
         Las marcas sembradas por la stage determinista (origin='technoparse',
         p. ej. @handles con vínculo aceptado) se preservan: si el LLM deriva
         la misma marca en la misma unidad, se reutiliza la fila existente y
-        solo se agregan sus funciones y su canónico propuesto.
+        solo se agregan sus funciones y su canónico propuesto. Lo que una
+        derivación anterior les colgó (funciones LLM y propuestas
+        automáticas sin revisar) se limpia antes, así la reconstrucción no
+        depende de que technoparse haya vuelto a sembrar.
         """
         derivadas = derivar_menciones(actores_by_unit, emociones_by_unit)
 
@@ -246,6 +255,17 @@ class MencionesRepository:
                 "DELETE FROM menciones WHERE codigo = ? AND origin != 'technoparse'",
                 (codigo,),
             )
+            cur.execute(
+                "DELETE FROM mencion_funcion WHERE origin = 'llm' AND mencion_id IN "
+                "(SELECT id FROM menciones WHERE codigo = ?)",
+                (codigo,),
+            )
+            cur.execute(
+                "DELETE FROM mencion_canonico WHERE status = 'proposed' "
+                f"AND origin IN {_ORIGENES_DERIVADOS} AND mencion_id IN "
+                "(SELECT id FROM menciones WHERE codigo = ?)",
+                (codigo,),
+            )
             preservadas = {
                 (row["unit_idx"], row["marca"]): row["id"]
                 for row in cur.execute(
@@ -298,23 +318,34 @@ class MencionesRepository:
         directamente como 'accepted' con modalidad 'designacion' (la
         revisión humana puede igualmente rechazarlo o repuntarlo).
 
-        Idempotente: borra las menciones technoparse del código y reinserta.
-        No pisa vínculos de una marca homónima creada por el LLM: si la
-        marca ya existe (UNIQUE codigo/unit/marca), se reutiliza su fila y
-        solo se agrega/promueve el vínculo canónico.
+        Idempotente: borra solo las menciones technoparse del código que ya no
+        están entre las seeds y reutiliza las demás, así que re-sembrar el
+        mismo texto no cambia ids ni pierde las funciones y vínculos que otras
+        stages colgaron de esas filas. No pisa vínculos de una marca homónima
+        creada por el LLM: si la marca ya existe (UNIQUE codigo/unit/marca),
+        se reutiliza su fila y solo se agrega/promueve el vínculo canónico.
         """
         naturaleza_by_handle = naturaleza_by_handle or {}
         counts = {"menciones": 0, "canonicos": 0}
+        validas: list[tuple[dict[str, Any], str, str]] = []
+        for s in seeds:
+            handle = _norm(s["handle"]).lstrip("@")
+            canonical = canonical_slug(handle) or handle.lower()
+            if canonical:
+                validas.append((s, handle, canonical))
+        vigentes = {(s["unit_idx"], s["marca"]) for s, _, _ in validas}
         with self._db.transaction() as cur:
-            cur.execute(
-                "DELETE FROM menciones WHERE codigo = ? AND origin = 'technoparse'",
-                (codigo,),
-            )
-            for s in seeds:
-                handle = _norm(s["handle"]).lstrip("@")
-                canonical = canonical_slug(handle) or handle.lower()
-                if not canonical:
-                    continue
+            obsoletas = [
+                (row["id"],)
+                for row in cur.execute(
+                    "SELECT id, unit_idx, marca FROM menciones "
+                    "WHERE codigo = ? AND origin = 'technoparse'",
+                    (codigo,),
+                ).fetchall()
+                if (row["unit_idx"], row["marca"]) not in vigentes
+            ]
+            cur.executemany("DELETE FROM menciones WHERE id = ?", obsoletas)
+            for s, handle, canonical in validas:
                 cur.execute(
                     "SELECT id FROM menciones WHERE codigo = ? AND unit_idx = ? AND marca = ?",
                     (codigo, s["unit_idx"], s["marca"]),
@@ -344,7 +375,9 @@ class MencionesRepository:
                     "    modalidad = COALESCE(mencion_canonico.modalidad, "
                     "                         'designacion'), "
                     "    modalidad_origin = COALESCE("
-                    "        mencion_canonico.modalidad_origin, 'nlp')",
+                    "        mencion_canonico.modalidad_origin, 'nlp'), "
+                    "    naturaleza = COALESCE(mencion_canonico.naturaleza, "
+                    "                          excluded.naturaleza)",
                     (
                         mencion_id,
                         canonical,
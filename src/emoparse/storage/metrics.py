@@ -27,6 +27,8 @@ class StageMetricsSnapshot:
     total_completion_tokens: int = 0
     cache_hits: int = 0
     cache_misses: int = 0
+    prefill_tokens_saved: int = 0
+    render_ms: float = 0.0
 
 
 @dataclass
@@ -39,6 +41,8 @@ class StageMetricsAccumulator:
     total_completion_tokens: int = 0
     cache_hits: int = 0
     cache_misses: int = 0
+    prefill_tokens_saved: int = 0
+    render_ms: float = 0.0
     _latencies: list[float] = field(default_factory=list)
 
     # ── API para _MeteredBackend ─────────────────────────────────────────────
@@ -49,8 +53,13 @@ class StageMetricsAccumulator:
         prompt_tokens: int,
         completion_tokens: int,
         cache_hit: bool,
+        prefill_tokens_saved: int = 0,
     ) -> None:
-        """Registra una llamada al backend."""
+        """Registra una llamada al backend.
+
+        `prefill_tokens_saved` son los tokens del prompt que el backend no
+        re-evaluó por restaurar un snapshot del system (llama_cpp).
+        """
         self._latencies.append(latency_ms)
         if cache_hit:
             self.cache_hits += 1
@@ -58,6 +67,7 @@ class StageMetricsAccumulator:
             self.cache_misses += 1
             self.total_prompt_tokens += prompt_tokens
             self.total_completion_tokens += completion_tokens
+            self.prefill_tokens_saved += prefill_tokens_saved
 
     # ── API para el Stage ────────────────────────────────────────────────────
 
@@ -67,6 +77,10 @@ class StageMetricsAccumulator:
     def record_item_failed(self) -> None:
         self.n_items_failed += 1
 
+    def record_render(self, ms: float) -> None:
+        """Suma tiempo de render de prompts (ver `prompts._loader.render_time_ms`)."""
+        self.render_ms += ms
+
     # ── Snapshot ─────────────────────────────────────────────────────────────
 
     def snapshot(self) -> StageMetricsSnapshot:
@@ -83,6 +97,8 @@ class StageMetricsAccumulator:
             total_completion_tokens=self.total_completion_tokens,
             cache_hits=self.cache_hits,
             cache_misses=self.cache_misses,
+            prefill_tokens_saved=self.prefill_tokens_saved,
+            render_ms=self.render_ms,
         )
 
 
@@ -131,9 +147,9 @@ class MetricsRepository:
                     n_items_ok, n_items_failed,
                     total_latency_ms, p50_latency_ms, p99_latency_ms,
                     total_prompt_tokens, total_completion_tokens,
-                    cache_hits, cache_misses,
-                    recorded_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    cache_hits, cache_misses, prefill_tokens_saved,
+                    render_ms, recorded_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     run_id,
@@ -148,6 +164,8 @@ class MetricsRepository:
                     snapshot.total_completion_tokens,
                     snapshot.cache_hits,
                     snapshot.cache_misses,
+                    snapshot.prefill_tokens_saved,
+                    snapshot.render_ms,
                     datetime.now(UTC),
                 ),
             )
@@ -155,6 +173,8 @@ class MetricsRepository:
     def list_for_run(self, run_id: str) -> list[dict[str, Any]]:
         """Todas las métricas de un run, ordenadas por recorded_at."""
         model_column = self._model_alias_select()
+        prefill_column = self._prefill_select()
+        render_column = self._render_select()
         rows = self._db.execute(
             f"""
             SELECT
@@ -162,8 +182,8 @@ class MetricsRepository:
                 n_items_ok, n_items_failed,
                 total_latency_ms, p50_latency_ms, p99_latency_ms,
                 total_prompt_tokens, total_completion_tokens,
-                cache_hits, cache_misses,
-                recorded_at
+                cache_hits, cache_misses, {prefill_column},
+                {render_column}, recorded_at
             FROM run_metrics
             WHERE run_id = ?
             ORDER BY recorded_at ASC
@@ -225,11 +245,24 @@ class MetricsRepository:
             return "model_alias"
         return "NULL AS model_alias"
 
+    def _prefill_select(self) -> str:
+        if self._has_column("prefill_tokens_saved"):
+            return "prefill_tokens_saved"
+        return "0 AS prefill_tokens_saved"
+
+    def _render_select(self) -> str:
+        if self._has_column("render_ms"):
+            return "render_ms"
+        return "0.0 AS render_ms"
+
     def _has_model_alias_column(self) -> bool:
+        return self._has_column("model_alias")
+
+    def _has_column(self, column: str) -> bool:
         if not self._db.table_exists("run_metrics"):
             return False
         columns = {
             str(row["name"])
             for row in self._db.execute("PRAGMA table_info(run_metrics)").fetchall()
         }
-        return "model_alias" in columns
+        return column in columns
@@ -7,6 +7,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterable
 from typing import Any
 
 from emoparse.storage.db import Database
@@ -27,12 +28,13 @@ class PostsRepository:
 
     # ── Escritura ────────────────────────────────────────────────────────────
 
-    def upsert_posts(self, rows: list[dict[str, Any]]) -> int:
+    def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> int:
         """Upsertea posts por `post_id`, preservando `created_at`.
 
         Cada row usa las claves canónicas del loader de posts (`post_id`,
         `plataforma`, `autor_handle`, `texto`, ...). `metricas` y `raw`
-        pueden venir como dict: se serializan a JSON.
+        pueden venir como dict: se serializan a JSON. `rows` puede ser un
+        generador: se consume dentro de una sola transacción.
         """
         n = 0
         with self._db.transaction() as cur:
@@ -1,11 +1,14 @@
 # ══════════════════════════════════════════════════════════════════════════════
 #  emoparse.storage.red
 #
-#  Repositorio de las tablas `aristas` y `red_metricas`.
+#  Repositorio de las tablas `aristas` y `red_metricas`, y del registro de
+#  construcción incremental (`red_construcciones`, `red_pendientes`).
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime
 from typing import Any
 
 import pandas as pd
@@ -21,23 +24,23 @@ class RedRepository:
 
     def replace_edges(self, grafo: str, df_edges: pd.DataFrame) -> int:
         """Reemplaza las aristas de un grafo (idempotente)."""
-        rows = df_edges.to_dict(orient="records")
+        rows = _edge_rows(grafo, df_edges)
         with self._db.transaction() as cur:
             cur.execute("DELETE FROM aristas WHERE grafo = ?", (grafo,))
-            for r in rows:
-                cur.execute(
-                    "INSERT INTO aristas "
-                    "(grafo, origen, destino, post_id, peso, fecha) "
-                    "VALUES (?, ?, ?, ?, ?, ?)",
-                    (
-                        grafo,
-                        str(r["origen"]),
-                        str(r["destino"]),
-                        _s(r.get("post_id")),
-                        float(r.get("peso", 1.0)),
-                        _s(r.get("fecha")),
-                    ),
-                )
+            cur.executemany(_INSERT_ARISTA, rows)
+        return len(rows)
+
+    def replace_edges_for_posts(
+        self, grafo: str, post_ids: Iterable[str], df_edges: pd.DataFrame
+    ) -> int:
+        """Reemplaza solo las aristas de `grafo` que materializan `post_ids`."""
+        rows = _edge_rows(grafo, df_edges)
+        with self._db.transaction() as cur:
+            cur.executemany(
+                "DELETE FROM aristas WHERE grafo = ? AND post_id = ?",
+                [(grafo, post_id) for post_id in post_ids],
+            )
+            cur.executemany(_INSERT_ARISTA, rows)
         return len(rows)
 
     def replace_metrics(
@@ -48,27 +51,29 @@ class RedRepository:
     ) -> int:
         """Reemplaza las métricas por nodo de un grafo (idempotente)."""
         communities = communities or {}
-        rows = df_metrics.to_dict(orient="records")
+        rows = [
+            (
+                grafo,
+                str(r["nodo"]),
+                _i(r.get("grado_in")),
+                _i(r.get("grado_out")),
+                _i(r.get("grado_total")),
+                _f(r.get("pagerank")),
+                _f(r.get("intermediacion")),
+                _f(r.get("intermediacion_error")),
+                communities.get(str(r["nodo"])),
+            )
+            for r in df_metrics.to_dict(orient="records")
+        ]
         with self._db.transaction() as cur:
             cur.execute("DELETE FROM red_metricas WHERE grafo = ?", (grafo,))
-            for r in rows:
-                nodo = str(r["nodo"])
-                cur.execute(
-                    "INSERT INTO red_metricas "
-                    "(grafo, nodo, grado_in, grado_out, grado_total, "
-                    " pagerank, intermediacion, comunidad) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (
-                        grafo,
-                        nodo,
-                        _i(r.get("grado_in")),
-                        _i(r.get("grado_out")),
-                        _i(r.get("grado_total")),
-                        _f(r.get("pagerank")),
-                        _f(r.get("intermediacion")),
-                        communities.get(nodo),
-                    ),
-                )
+            cur.executemany(
+                "INSERT INTO red_metricas "
+                "(grafo, nodo, grado_in, grado_out, grado_total, "
+                " pagerank, intermediacion, intermediacion_error, comunidad) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
         return len(rows)
 
     def load_edges(self, grafo: str) -> pd.DataFrame:
@@ -87,12 +92,83 @@ class RedRepository:
         ).fetchall()
         return pd.DataFrame([dict(r) for r in rows])
 
+    # ── Construcción incremental ─────────────────────────────────────────────
+
+    def preparar_construccion(
+        self, grafos: Iterable[str], incremental: bool
+    ) -> dict[str, set[str] | None]:
+        """Toma, en una transacción, lo que hay que reconstruir de cada grafo.
+
+        Por grafo: el conjunto de posts pendientes si se reconstruye
+        incrementalmente, o None si va entero (sin `incremental` o si nunca se
+        construyó). Los pendientes tomados se borran y los grafos enteros
+        quedan registrados, así que todo cambio posterior al llamado se anota
+        para la próxima construcción: hay que llamarlo antes de leer el
+        corpus, y `revertir_construccion` si la construcción falla.
+        """
+        out: dict[str, set[str] | None] = {}
+        with self._db.transaction() as cur:
+            construidos = {
+                str(r[0]) for r in cur.execute("SELECT grafo FROM red_construcciones").fetchall()
+            }
+            for grafo in grafos:
+                if incremental and grafo in construidos:
+                    rows = cur.execute(
+                        "SELECT post_id FROM red_pendientes WHERE grafo = ?", (grafo,)
+                    ).fetchall()
+                    out[grafo] = {str(r[0]) for r in rows}
+                else:
+                    cur.execute(
+                        "INSERT INTO red_construcciones (grafo, updated_at) VALUES (?, ?) "
+                        "ON CONFLICT(grafo) DO UPDATE SET updated_at = excluded.updated_at",
+                        (grafo, datetime.now(UTC)),
+                    )
+                    out[grafo] = None
+                cur.execute("DELETE FROM red_pendientes WHERE grafo = ?", (grafo,))
+        return out
+
+    def revertir_construccion(self, preparados: Mapping[str, set[str] | None]) -> None:
+        """Deshace `preparar_construccion` tras una construcción fallida.
+
+        Los pendientes tomados vuelven a la tabla y los grafos que iban
+        enteros dejan de figurar como construidos (la próxima vez van enteros).
+        """
+        with self._db.transaction() as cur:
+            for grafo, pendientes in preparados.items():
+                if pendientes is None:
+                    cur.execute("DELETE FROM red_construcciones WHERE grafo = ?", (grafo,))
+                    cur.execute("DELETE FROM red_pendientes WHERE grafo = ?", (grafo,))
+                else:
+                    cur.executemany(
+                        "INSERT OR IGNORE INTO red_pendientes (grafo, post_id) VALUES (?, ?)",
+                        [(grafo, post_id) for post_id in pendientes],
+                    )
+
     def grafos_disponibles(self) -> list[str]:
         """Grafos con aristas persistidas."""
         rows = self._db.execute("SELECT DISTINCT grafo FROM aristas ORDER BY grafo").fetchall()
         return [str(r["grafo"]) for r in rows]
 
 
+_INSERT_ARISTA = (
+    "INSERT INTO aristas (grafo, origen, destino, post_id, peso, fecha) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+def _edge_rows(grafo: str, df_edges: pd.DataFrame) -> list[tuple[Any, ...]]:
+    return [
+        (
+            grafo,
+            str(r["origen"]),
+            str(r["destino"]),
+            _s(r.get("post_id")),
+            float(r.get("peso", 1.0)),
+            _s(r.get("fecha")),
+        )
+        for r in df_edges.to_dict(orient="records")
+    ]
+
+
 def _s(value: Any) -> str | None:
     if value is None or (isinstance(value, float) and pd.isna(value)):
         return None
@@ -12,6 +12,8 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Collection
+from functools import lru_cache
 from typing import Any, Protocol
 
 from emoparse.core.text import canonical_slug, sanitize_referent_label
@@ -93,6 +95,10 @@ _SIN_PRELACION = (9, 9, 9)
 #: Tablas que componen la base de marcas discursivas.
 _TABLAS_MARCAS = ("menciones", "mencion_funcion", "mencion_canonico")
 
+#: Códigos por consulta al indexar un lote: holgado bajo el límite de
+#: parámetros de SQLite.
+_CODIGOS_POR_CONSULTA = 500
+
 
 class Executor(Protocol):
     """Acceso a la DB con `execute`: `storage.db.Database` o `sqlite3.Connection`."""
@@ -208,6 +214,8 @@ def marca_canonicos_index(
     db: Executor,
     funcion: str,
     codigo: str | None = None,
+    *,
+    codigos: Collection[str] | None = None,
 ) -> MarcaIndex:
     """Índice de los vínculos marca↔referente de una función actancial.
 
@@ -215,6 +223,9 @@ def marca_canonicos_index(
     su prelación (grupo, estado, procedencia), que es la que decide cuál de
     varios vínculos de una misma marca resuelve la emoción. Los rechazados
     entran con su propio grupo: no resuelven, pero constan como descartados.
+
+    `codigo` acota el índice a un discurso y `codigos` a un conjunto de ellos
+    (el export lo arma por lote, con lookups por el índice de `menciones`).
     """
     if not hay_base_de_marcas(db):
         return {}
@@ -225,27 +236,43 @@ def marca_canonicos_index(
         "JOIN mencion_funcion mf ON mf.mencion_id = m.id AND mf.funcion = ? "
         "JOIN mencion_canonico mc ON mc.mencion_id = m.id"
     )
-    params: list[Any] = [funcion]
-    if codigo:
-        sql += " WHERE m.codigo = ?"
-        params.append(codigo)
+    consultas: list[tuple[str, tuple[Any, ...]]]
+    if codigos is not None:
+        lista = sorted(set(codigos))
+        consultas = [
+            (
+                sql + f" WHERE m.codigo IN ({', '.join('?' * len(lote))})",
+                (funcion, *lote),
+            )
+            for lote in (
+                lista[i : i + _CODIGOS_POR_CONSULTA]
+                for i in range(0, len(lista), _CODIGOS_POR_CONSULTA)
+            )
+        ]
+    elif codigo:
+        consultas = [(sql + " WHERE m.codigo = ?", (funcion, codigo))]
+    else:
+        consultas = [(sql, (funcion,))]
 
     index: MarcaIndex = {}
-    for row in db.execute(sql, tuple(params)):
-        cid = row["cid"]
-        marca = str(row["marca"] or "").strip().lower()
-        if not cid or not marca:
-            continue
-        prelacion = (
-            _GRUPO_RECHAZADO
-            if row["status"] == "rejected"
-            else _ORIGIN_GRUPO.get(row["origin"], 0),
-            _STATUS_RANK.get(row["status"], _SIN_PRELACION[1]),
-            _ORIGIN_RANK.get(row["origin"], _SIN_PRELACION[2]),
-        )
-        entrada = index.setdefault((row["codigo"], int(row["unit_idx"])), {}).setdefault(marca, {})
-        if prelacion < entrada.get(cid, _SIN_PRELACION):
-            entrada[cid] = prelacion
+    for consulta, params in consultas:
+        for row in db.execute(consulta, params):
+            cid = row["cid"]
+            marca = str(row["marca"] or "").strip().lower()
+            if not cid or not marca:
+                continue
+            prelacion = (
+                _GRUPO_RECHAZADO
+                if row["status"] == "rejected"
+                else _ORIGIN_GRUPO.get(row["origin"], 0),
+                _STATUS_RANK.get(row["status"], _SIN_PRELACION[1]),
+                _ORIGIN_RANK.get(row["origin"], _SIN_PRELACION[2]),
+            )
+            entrada = index.setdefault((row["codigo"], int(row["unit_idx"])), {}).setdefault(
+                marca, {}
+            )
+            if prelacion < entrada.get(cid, _SIN_PRELACION):
+                entrada[cid] = prelacion
     return index
 
 
@@ -345,15 +372,22 @@ def canonicos_de_inferencia(inferencia: str | None) -> list[str]:
     entidades, devuelve una por entidad. Son los mismos slugs que propone la
     base de marcas, así que no introduce referentes nuevos.
     """
+    return list(_canonicos_de_inferencia(inferencia))
+
+
+@lru_cache(maxsize=65536)
+def _canonicos_de_inferencia(inferencia: str | None) -> tuple[str, ...]:
+    """Memo de `canonicos_de_inferencia`: un run repite pocas inferencias
+    distintas en miles de emociones, y el export las resuelve todas."""
     texto = sanitize_referent_label(inferencia)
     if es_referente_desconocido(texto):
-        return []
+        return ()
     out: list[str] = []
     for parte in split_coordinacion(texto):
         slug = canonical_slug(parte)
         if slug and not es_canonico_invalido(slug) and slug not in out:
             out.append(slug)
-    return out
+    return tuple(out)
 
 
 def resolver_canonicos(
@@ -382,13 +416,33 @@ def resolver_canonicos(
     if fijados:
         return fijados
     ligados = canonicos_de_marca(marca_map, marca)
-    if ligados:
+    if ligados or inferencia is None:
         return ligados
+    return resolver_ligados([], rechazados_de_marca(marca_map, marca), inferencia=inferencia)
+
+
+def resolver_ligados(
+    ligados: list[str],
+    rechazados: Collection[str],
+    *,
+    override: Any = None,
+    inferencia: str | None = None,
+) -> list[str]:
+    """`resolver_canonicos` a partir de la marca ya resuelta.
+
+    `ligados` y `rechazados` son `canonicos_de_marca` y `rechazados_de_marca`
+    de la emoción: lo que guarda la tabla `emocion_canonico`, de modo que las
+    vistas completan la prelación sin rearmar el índice de marcas.
+    """
+    fijados = canonicos_de_override(override)
+    if fijados:
+        return fijados
+    if ligados:
+        return list(ligados)
     if inferencia is None:
         return []
     # El piso no puede resucitar lo descartado: un referente rechazado para
     # esta marca queda fuera aunque el slug de la inferencia lo reproduzca.
-    rechazados = rechazados_de_marca(marca_map, marca)
     return [c for c in canonicos_de_inferencia(inferencia) if c not in rechazados]
 
 
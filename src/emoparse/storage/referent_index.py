@@ -0,0 +1,764 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.storage.referent_index
+#
+#  Índice persistente de referentes canónicos de un run, para sugerir
+#  fusiones y buscar "referentes parecidos a X" sin comparar todos contra
+#  todos.
+#
+#  Por referente guarda:
+#  - sus tokens significativos (bloques por token);
+#  - bandas LSH de una firma MinHash sobre n-gramas de caracteres de la
+#    parte distintiva del canónico (sin tokens frecuentes): capta variantes
+#    sin tokens en común, p. ej. "kirchnerismo" / "kirchnerista";
+#  - opcionalmente el vector semántico (spaCy md/lg) y bandas SimHash sobre
+#    él, para los candidatos por coseno.
+#
+#  Un token es frecuente si lo comparten más de `_BLOQUE_EXHAUSTIVO`
+#  canónicos ("gobierno", "ministro"): compartirlo no es señal de sinonimia.
+#  Por eso no entra en la firma y sus bloques no se comparan completos; los
+#  pares que solo comparten tokens frecuentes se proponen por contención
+#  (subconjuntos de ≥ 2 tokens) o si su parte distintiva se parece (LSH, y
+#  se puntúan sobre esa parte). El resto de los candidatos se puntúa con la
+#  misma fórmula léxica de siempre.
+#
+#  La SQLite del run sigue siendo la fuente de verdad: el índice es un
+#  derivado descartable junto al `.sqlite` (`<run>.referentes.idx`). `sync`
+#  lo actualiza de forma incremental: firma los canónicos nuevos (y los que
+#  contienen un token que pasó a ser frecuente, o dejó de serlo) y borra los
+#  que desaparecieron de `mencion_canonico`.
+#
+#  Solo los caminos de escritura tocan el archivo (`sync_referent_index`: el
+#  runner al materializar la resolución y `app.actions` tras cada edición).
+#  El dashboard lo lee con `ReferentIndex.in_memory_copy`, que no escribe.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import difflib
+import json
+import sqlite3
+import zlib
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+from emoparse.storage.db import Database
+
+#: Versión del formato; un cambio (o de los parámetros LSH) fuerza reconstrucción.
+INDEX_FORMAT = 1
+
+#: Largo de los n-gramas de caracteres de la firma MinHash.
+_NGRAM = 3
+#: Bandas × filas de la firma MinHash (128 permutaciones). Con 4 filas, un
+#: par con Jaccard de n-gramas 0.5 colisiona con probabilidad ~0.87 y uno de
+#: 0.6 con ~0.98; pares sin relación (Jaccard ~0.05) casi nunca.
+_BANDAS = 32
+_FILAS = 4
+#: Bandas × bits de SimHash sobre vectores centrados: coseno 0.9 colisiona
+#: con probabilidad ~0.98 y coseno 0.8 con ~0.79.
+_VBANDAS = 24
+_VBITS = 12
+_SEMILLA = 1729
+
+#: Bloques por token de hasta este tamaño se comparan completos; un token
+#: compartido por más canónicos es frecuente (ver cabecera).
+_BLOQUE_EXHAUSTIVO = 60
+#: Mínimo de tokens del subconjunto para proponer por contención entre
+#: tokens frecuentes ("gobierno" solo no se propone con cada "gobierno_*").
+_MIN_CONTENCION = 2
+#: Máximo de parámetros por `IN (...)`.
+_LOTE_IN = 500
+#: Canónicos firmados por lote (acota la matriz permutaciones × n-gramas).
+_LOTE_FIRMAS = 2000
+
+_STOP = frozenset({"de", "la", "el", "los", "las", "un", "una", "y", "o", "del", "al"})
+
+#: Vectorizador opcional: lista de cids → {cid: vector}, o None si no hay
+#: modelo disponible. Los cids sin vector se omiten del pase semántico.
+Vectorizer = Callable[[list[str]], Mapping[str, Any] | None]
+
+_DDL = (
+    "CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT NOT NULL)",
+    """
+    CREATE TABLE IF NOT EXISTS referentes (
+        cid    TEXT PRIMARY KEY,
+        n      INTEGER NOT NULL,
+        vector BLOB
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tokens (
+        token TEXT NOT NULL,
+        cid   TEXT NOT NULL,
+        PRIMARY KEY (token, cid)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_tokens_cid ON tokens(cid)",
+    """
+    CREATE TABLE IF NOT EXISTS bandas (
+        banda INTEGER NOT NULL,
+        clave INTEGER NOT NULL,
+        cid   TEXT NOT NULL,
+        PRIMARY KEY (banda, clave, cid)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_bandas_cid ON bandas(cid)",
+    """
+    CREATE TABLE IF NOT EXISTS vbandas (
+        banda INTEGER NOT NULL,
+        clave INTEGER NOT NULL,
+        cid   TEXT NOT NULL,
+        PRIMARY KEY (banda, clave, cid)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_vbandas_cid ON vbandas(cid)",
+)
+
+_TABLAS = ("referentes", "tokens", "bandas", "vbandas")
+
+
+def referent_index_path_for(db_path: Path | str) -> Path:
+    """Ruta por defecto del índice: `<run>.referentes.idx` junto al `.sqlite`."""
+    p = Path(db_path)
+    return p.with_name(f"{p.stem}.referentes.idx")
+
+
+def spacy_vectorizer(model: str | None) -> Vectorizer:
+    """Vectorizador de canónicos con vectores spaCy, para el índice de referentes.
+
+    Solo modelos CON vectores (es_core_news_md / lg; el sm no tiene). El
+    modelo se carga recién cuando hay canónicos sin vectorizar; si falta
+    spaCy o el modelo no trae vectores, devuelve None (silencioso).
+    """
+
+    def vectorize(cids: list[str]) -> dict[str, Any] | None:
+        try:
+            import spacy  # type: ignore
+        except Exception:
+            return None
+        candidates = [model] if model else []
+        candidates += ["es_core_news_md", "es_core_news_lg"]
+        nlp = None
+        for name in candidates:
+            if not name:
+                continue
+            try:
+                nlp = spacy.load(
+                    name,
+                    disable=[
+                        "parser",
+                        "ner",
+                        "tagger",
+                        "lemmatizer",
+                        "attribute_ruler",
+                        "morphologizer",
+                    ],
+                )
+                break
+            except Exception:
+                continue
+        if nlp is None or not getattr(nlp.vocab, "vectors_length", 0):
+            return None
+        out: dict[str, Any] = {}
+        for cid, doc in zip(cids, nlp.pipe(c.replace("_", " ") for c in cids)):
+            v = getattr(doc, "vector", None)
+            if v is not None:
+                out[cid] = v
+        return out
+
+    return vectorize
+
+
+def referent_counts(
+    conn: sqlite3.Connection | Database, codigo: str | None = None
+) -> dict[str, int]:
+    """`canonical_id → n de marcas` vigentes (sin rechazados), opcionalmente por discurso."""
+    sql = (
+        "SELECT mc.canonical_id AS cid, COUNT(*) AS n "
+        "FROM mencion_canonico mc JOIN menciones m ON m.id = mc.mencion_id "
+        "WHERE mc.status != 'rejected' AND mc.canonical_id IS NOT NULL "
+    )
+    params: tuple = ()
+    if codigo:
+        sql += "AND m.codigo = ? "
+        params = (codigo,)
+    sql += "GROUP BY mc.canonical_id"
+    return {str(r[0]): int(r[1]) for r in conn.execute(sql, params)}
+
+
+def sync_referent_index(
+    db: Database,
+    vectorizer: Vectorizer | None = None,
+    *,
+    vector_tag: str = "",
+) -> int:
+    """Alinea el índice en disco del run con los canónicos de su SQLite.
+
+    Camino de escritura del índice. Un fallo se loguea y no se propaga: el
+    índice es descartable y el lector lo completa en memoria.
+
+    Returns:
+        Canónicos agregados o quitados (0 si el run no tiene menciones).
+    """
+    if not db.table_exists("menciones") or not db.table_exists("mencion_canonico"):
+        return 0
+    path = referent_index_path_for(db.path)
+    try:
+        counts = referent_counts(db)
+        with ReferentIndex.open(path) as idx:
+            return idx.sync(counts, vectorizer, vector_tag=vector_tag)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"[referent_index] No se pudo actualizar {path.name}: {e}")
+        return 0
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Firmas
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def referent_tokens(cid: str) -> frozenset[str]:
+    """Tokens significativos de un canónico (los canónicos ya vienen sin artículos)."""
+    return frozenset(t for t in cid.split("_") if len(t) >= 3 and t not in _STOP)
+
+
+def _distintivo(cid: str, frecuentes: frozenset[str]) -> str:
+    """El canónico sin sus tokens frecuentes, como texto para la firma."""
+    return " ".join(t for t in cid.split("_") if t and t not in frecuentes)
+
+
+def _distinctive_score(a: str, b: str, frecuentes: frozenset[str], minimo: float) -> float:
+    """Puntaje léxico de las partes distintivas de `a` y `b`.
+
+    Es el de los candidatos que solo salen del LSH: no comparten ningún token
+    no frecuente, así que un prefijo común como "gobierno_" no debe sumar.
+    """
+    da, db = _distintivo(a, frecuentes), _distintivo(b, frecuentes)
+    if not da or not db:
+        return 0.0
+    return lexical_score(
+        da.replace(" ", "_"),
+        db.replace(" ", "_"),
+        referent_tokens(a) - frecuentes,
+        referent_tokens(b) - frecuentes,
+        minimo,
+    )
+
+
+def _permutaciones() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(_SEMILLA)
+    n = _BANDAS * _FILAS
+    a = rng.integers(0, 1 << 63, size=n, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=n, dtype=np.uint64)
+    return a, b
+
+
+_PERM_A, _PERM_B = _permutaciones()
+#: Multiplicadores impares para combinar las filas de una banda en una clave.
+_MEZCLA = np.array(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5],
+    dtype=np.uint64,
+)
+
+
+def _ngram_hashes(texto: str) -> list[int]:
+    texto = f" {texto} "
+    grams = {texto[i : i + _NGRAM] for i in range(max(1, len(texto) - _NGRAM + 1))}
+    return [zlib.crc32(g.encode("utf-8")) for g in grams]
+
+
+def _minhash(textos: list[str]) -> np.ndarray:
+    """Firmas MinHash (uint64[len(textos), _BANDAS * _FILAS]) de los n-gramas.
+
+    Cada permutación es un hash multiply-shift: (a·h + b) mod 2^64, de
+    donde se toman los 32 bits altos. Los n-gramas de todo el lote van en un
+    solo arreglo y el mínimo se toma por segmento (`minimum.reduceat`).
+    """
+    if not textos:
+        return np.zeros((0, _BANDAS * _FILAS), dtype=np.uint64)
+    por_texto = [_ngram_hashes(t) for t in textos]
+    largos = np.fromiter((len(h) for h in por_texto), dtype=np.int64, count=len(textos))
+    h = np.fromiter((x for hs in por_texto for x in hs), dtype=np.uint64, count=int(largos.sum()))
+    inicios = np.concatenate(([0], np.cumsum(largos)[:-1]))
+    mixed = (_PERM_A[:, None] * h[None, :] + _PERM_B[:, None]) >> np.uint64(32)
+    return np.minimum.reduceat(mixed, inicios, axis=1).T
+
+
+def _claves(firmas: np.ndarray) -> np.ndarray:
+    """Una clave int64 por (texto, banda), combinando las filas de la banda."""
+    m = firmas.reshape(len(firmas), _BANDAS, _FILAS)
+    return np.bitwise_xor.reduce(m * _MEZCLA, axis=2).view(np.int64)
+
+
+def _planos(dim: int) -> np.ndarray:
+    rng = np.random.default_rng(_SEMILLA + dim)
+    return rng.standard_normal((_VBANDAS * _VBITS, dim)).astype(np.float32)
+
+
+def _simhash(mat: np.ndarray, planos: np.ndarray) -> np.ndarray:
+    """Una clave por (vector, banda) con los signos de las proyecciones."""
+    bits = (mat @ planos.T > 0).reshape(len(mat), _VBANDAS, _VBITS)
+    return (bits * (1 << np.arange(_VBITS))).sum(axis=2)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Puntaje léxico
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def lexical_score(
+    a: str, b: str, ta: frozenset[str], tb: frozenset[str], minimo: float = 0.0
+) -> float:
+    """Jaccard de tokens, ratio de caracteres y contención de tokens (el máximo).
+
+    La contención (p. ej. "sociedad_humana" ⊆ "sociedad_humana_humanidad")
+    es señal fuerte de sinonimia y puntúa 0.9. El ratio de caracteres (lo
+    caro) se calcula solo si sus cotas superiores alcanzan lo ya obtenido y
+    `minimo`: el resultado es el mismo siempre que llegue a `minimo`.
+    """
+    inter = ta & tb
+    union_t = ta | tb
+    jacc = len(inter) / len(union_t) if union_t else 0.0
+    contained = bool(inter) and (ta <= tb or tb <= ta)
+    best = max(jacc, 0.9 if contained else 0.0)
+    piso = max(best, minimo)
+    sm = difflib.SequenceMatcher(None, a, b)
+    if sm.real_quick_ratio() >= piso and sm.quick_ratio() >= piso:
+        best = max(best, sm.ratio())
+    return best
+
+
+def _contencion(ta: frozenset[str], tb: frozenset[str]) -> bool:
+    """Uno contiene al otro y el contenido tiene ≥ `_MIN_CONTENCION` tokens."""
+    menor, mayor = (ta, tb) if len(ta) <= len(tb) else (tb, ta)
+    return len(menor) >= _MIN_CONTENCION and menor <= mayor
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Índice
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+class ReferentIndex:
+    """Índice persistente (tokens + LSH) de los referentes canónicos de un run.
+
+    Uso:
+        with ReferentIndex.open(referent_index_path_for(db_path)) as idx:
+            idx.sync(counts)
+            pares = idx.scored_pairs(threshold=0.62)
+            parecidos = idx.similar("gobierno_nacional")
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+        self._conn.row_factory = sqlite3.Row
+        for ddl in _DDL:
+            self._conn.execute(ddl)
+        self._check_format()
+
+    @classmethod
+    def open(cls, path: Path | str) -> ReferentIndex:
+        """Abre (o crea) el índice en `path`; en memoria si no se puede escribir."""
+        try:
+            conn = sqlite3.connect(str(path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            return cls(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"[referent_index] Índice en memoria ({path}: {e}).")
+            return cls(sqlite3.connect(":memory:"))
+
+    @classmethod
+    def in_memory_copy(cls, path: Path | str) -> ReferentIndex:
+        """Copia en memoria del índice en `path`, abierto en solo lectura.
+
+        Vacía si el archivo no existe o no se puede leer. Los `sync` sobre la
+        copia no tocan el archivo.
+        """
+        memoria = sqlite3.connect(":memory:")
+        p = Path(path)
+        if p.exists():
+            try:
+                origen = sqlite3.connect(f"{p.resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+                try:
+                    origen.backup(memoria)
+                finally:
+                    origen.close()
+            except sqlite3.Error as e:
+                logger.warning(f"[referent_index] No se pudo leer {p.name}: {e}")
+        return cls(memoria)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> ReferentIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM referentes").fetchone()[0])
+
+    def _meta(self, clave: str) -> str | None:
+        row = self._conn.execute("SELECT valor FROM meta WHERE clave = ?", (clave,)).fetchone()
+        return None if row is None else str(row["valor"])
+
+    def _set_meta(self, clave: str, valor: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (clave, valor) VALUES (?, ?)", (clave, valor)
+        )
+
+    def _check_format(self) -> None:
+        firma = (
+            f"{INDEX_FORMAT}:{_NGRAM}:{_BANDAS}x{_FILAS}:{_VBANDAS}x{_VBITS}:{_BLOQUE_EXHAUSTIVO}"
+        )
+        if self._meta("formato") == firma:
+            return
+        with self._conn:
+            for tabla in (*_TABLAS, "meta"):
+                self._conn.execute(f"DELETE FROM {tabla}")
+            self._set_meta("formato", firma)
+
+    def frequent_tokens(self) -> frozenset[str]:
+        """Tokens compartidos por más de `_BLOQUE_EXHAUSTIVO` canónicos."""
+        return frozenset(json.loads(self._meta("frecuentes") or "[]"))
+
+    # ── Actualización incremental ────────────────────────────────────────────
+
+    def sync(
+        self,
+        counts: Mapping[str, int],
+        vectorizer: Vectorizer | None = None,
+        *,
+        vector_tag: str = "",
+    ) -> int:
+        """Alinea el índice con los canónicos vigentes (`cid → n de marcas`).
+
+        Firma solo los canónicos nuevos (y los afectados por un cambio en
+        los tokens frecuentes), borra los que ya no están y actualiza los
+        conteos que cambiaron. Con `vectorizer`, además vectoriza los
+        canónicos que todavía no tienen vector; `vector_tag` identifica el
+        modelo: si cambia, los vectores previos se descartan.
+
+        Returns:
+            Cantidad de canónicos agregados o quitados.
+        """
+        previos = {
+            str(r["cid"]): int(r["n"]) for r in self._conn.execute("SELECT cid, n FROM referentes")
+        }
+        nuevos = [c for c in counts if c not in previos]
+        quitados = [c for c in previos if c not in counts]
+        cambiados = [
+            (int(counts[c]), c) for c in counts if c in previos and previos[c] != counts[c]
+        ]
+
+        with self._conn:
+            if quitados:
+                for tabla in _TABLAS:
+                    self._conn.executemany(
+                        f"DELETE FROM {tabla} WHERE cid = ?", [(c,) for c in quitados]
+                    )
+            if cambiados:
+                self._conn.executemany("UPDATE referentes SET n = ? WHERE cid = ?", cambiados)
+            if nuevos:
+                self._conn.executemany(
+                    "INSERT INTO referentes (cid, n) VALUES (?, ?)",
+                    [(c, int(counts[c])) for c in nuevos],
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tokens (token, cid) VALUES (?, ?)",
+                    [(t, c) for c in nuevos for t in referent_tokens(c)],
+                )
+            if nuevos or quitados:
+                self._resign(nuevos)
+
+        if vectorizer is not None:
+            self._sync_vectors(vectorizer, vector_tag)
+        if nuevos or quitados:
+            logger.debug(
+                f"[referent_index] sync: +{len(nuevos)} −{len(quitados)} (total {len(counts)})"
+            )
+        return len(nuevos) + len(quitados)
+
+    def _resign(self, nuevos: list[str]) -> None:
+        """Firma `nuevos` y re-firma los canónicos cuyo texto distintivo cambió."""
+        frecuentes = frozenset(
+            str(r["token"])
+            for r in self._conn.execute(
+                "SELECT token FROM tokens GROUP BY token HAVING COUNT(*) > ?",
+                (_BLOQUE_EXHAUSTIVO,),
+            )
+        )
+        firmar = set(nuevos)
+        cambiados = sorted(frecuentes ^ self.frequent_tokens())
+        for i in range(0, len(cambiados), _LOTE_IN):
+            lote = cambiados[i : i + _LOTE_IN]
+            marks = ", ".join("?" * len(lote))
+            firmar.update(
+                str(r["cid"])
+                for r in self._conn.execute(
+                    f"SELECT DISTINCT cid FROM tokens WHERE token IN ({marks})", lote
+                )
+            )
+        self._set_meta("frecuentes", json.dumps(sorted(frecuentes)))
+        if not firmar:
+            return
+
+        orden = sorted(firmar)
+        self._conn.executemany("DELETE FROM bandas WHERE cid = ?", [(c,) for c in orden])
+        # Un canónico hecho solo de tokens frecuentes no tiene parte
+        # distintiva: queda fuera del LSH (lo cubren tokens y contención).
+        textos = [(c, t) for c in orden if (t := _distintivo(c, frecuentes))]
+        for i in range(0, len(textos), _LOTE_FIRMAS):
+            lote = textos[i : i + _LOTE_FIRMAS]
+            claves = _claves(_minhash([t for _, t in lote]))
+            self._conn.executemany(
+                "INSERT INTO bandas (banda, clave, cid) VALUES (?, ?, ?)",
+                (
+                    (banda, int(clave), c)
+                    for (c, _), fila in zip(lote, claves, strict=True)
+                    for banda, clave in enumerate(fila)
+                ),
+            )
+
+    def _sync_vectors(self, vectorizer: Vectorizer, tag: str) -> None:
+        if self._meta("vector_tag") != tag:
+            with self._conn:
+                self._conn.execute("UPDATE referentes SET vector = NULL")
+                self._conn.execute("DELETE FROM vbandas")
+                self._set_meta("vector_tag", tag)
+        faltan = [
+            str(r["cid"])
+            for r in self._conn.execute("SELECT cid FROM referentes WHERE vector IS NULL")
+        ]
+        if not faltan:
+            return
+        vecs = vectorizer(faltan)
+        if vecs is None:
+            return
+        filas: list[tuple[bytes, str]] = []
+        for c in faltan:
+            # Un blob vacío marca "sin vector" (fuera de vocabulario): no se
+            # vuelve a pedir en cada sync.
+            v = vecs.get(c)
+            arr = np.asarray(v if v is not None else [], dtype=np.float32)
+            norm = float(np.linalg.norm(arr)) if arr.size else 0.0
+            filas.append(((arr / norm).tobytes() if norm > 0.0 else b"", c))
+        with self._conn:
+            self._conn.executemany("UPDATE referentes SET vector = ? WHERE cid = ?", filas)
+            # El SimHash se calcula sobre vectores centrados: la media cambia
+            # con cada lote nuevo, así que las bandas se rehacen completas.
+            self._conn.execute("DELETE FROM vbandas")
+            cids, mat = self._vectores()
+            if not cids:
+                return
+            claves = _simhash(mat - mat.mean(axis=0), _planos(mat.shape[1]))
+            self._conn.executemany(
+                "INSERT INTO vbandas (banda, clave, cid) VALUES (?, ?, ?)",
+                (
+                    (banda, int(clave), c)
+                    for c, fila in zip(cids, claves, strict=True)
+                    for banda, clave in enumerate(fila)
+                ),
+            )
+
+    # ── Lecturas ─────────────────────────────────────────────────────────────
+
+    def counts(self) -> dict[str, int]:
+        """`cid → n de marcas` de los canónicos indexados."""
+        return {
+            str(r["cid"]): int(r["n"]) for r in self._conn.execute("SELECT cid, n FROM referentes")
+        }
+
+    def _rows(self, sql: str, cids: Iterable[str] | None) -> list[sqlite3.Row]:
+        """Filas de `sql`, restringidas a `cids` (por lotes) si no es None."""
+        if cids is None:
+            return self._conn.execute(sql).fetchall()
+        lista = list(cids)
+        where = " AND " if " WHERE " in sql else " WHERE "
+        out: list[sqlite3.Row] = []
+        for i in range(0, len(lista), _LOTE_IN):
+            lote = lista[i : i + _LOTE_IN]
+            marks = ", ".join("?" * len(lote))
+            out.extend(self._conn.execute(f"{sql}{where}cid IN ({marks})", lote).fetchall())
+        return out
+
+    def _vectores(self, cids: Iterable[str] | None = None) -> tuple[list[str], np.ndarray]:
+        """(cids, matriz de vectores normalizados) de los referentes con vector."""
+        rows = self._rows("SELECT cid, vector FROM referentes WHERE length(vector) > 0", cids)
+        if not rows:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        out_cids = [str(r["cid"]) for r in rows]
+        mat = np.vstack([np.frombuffer(r["vector"], dtype=np.float32) for r in rows])
+        return out_cids, mat
+
+    def _buckets(self, tabla: str, cids: Iterable[str] | None) -> list[list[str]]:
+        """Listas de cids que comparten clave en alguna banda de `tabla`."""
+        if cids is None:
+            rows = self._conn.execute(
+                f"SELECT group_concat(cid, char(31)) AS cids FROM {tabla} "
+                "GROUP BY banda, clave HAVING COUNT(*) > 1"
+            ).fetchall()
+            return [str(r["cids"]).split("\x1f") for r in rows]
+        grupos: dict[tuple[int, int], list[str]] = defaultdict(list)
+        for r in self._rows(f"SELECT banda, clave, cid FROM {tabla}", cids):
+            grupos[(int(r["banda"]), int(r["clave"]))].append(str(r["cid"]))
+        return [g for g in grupos.values() if len(g) > 1]
+
+    # ── Candidatos ───────────────────────────────────────────────────────────
+
+    def _lexical_pairs(
+        self, scope: list[str] | None, threshold: float
+    ) -> dict[tuple[str, str], float]:
+        postings: dict[str, list[str]] = defaultdict(list)
+        for r in self._rows("SELECT token, cid FROM tokens", scope):
+            postings[str(r["token"])].append(str(r["cid"]))
+        tok_map = {c: referent_tokens(c) for c in (scope if scope is not None else self.counts())}
+
+        frecuentes = self.frequent_tokens()
+        scored: dict[tuple[str, str], float] = {}
+        vistos: set[tuple[str, str]] = set()
+
+        def evaluar(a: str, b: str, *, distintivo: bool = False) -> None:
+            key = (a, b) if a < b else (b, a)
+            if a == b or key in vistos:
+                return
+            vistos.add(key)
+            if distintivo:
+                score = _distinctive_score(a, b, frecuentes, threshold)
+            else:
+                score = lexical_score(a, b, tok_map[a], tok_map[b], threshold)
+            if score >= threshold:
+                scored[key] = score
+
+        # (1) Bloques por token chicos: todos los pares.
+        for members in postings.values():
+            if 2 <= len(members) <= _BLOQUE_EXHAUSTIVO:
+                for i in range(len(members)):
+                    for j in range(i + 1, len(members)):
+                        evaluar(members[i], members[j])
+
+        # (2) Contención entre tokens frecuentes: los superconjuntos de `c`
+        # están en la lista de su token más raro.
+        for c, ts in tok_map.items():
+            if len(ts) < _MIN_CONTENCION:
+                continue
+            raro = min(ts, key=lambda t: len(postings[t]))
+            if len(postings[raro]) <= _BLOQUE_EXHAUSTIVO:
+                continue  # ya cubierto por (1)
+            for other in postings[raro]:
+                if ts <= tok_map[other]:
+                    evaluar(c, other)
+
+        # (3) Colisiones LSH de la parte distintiva. Lo que llega acá sin
+        # haberse evaluado no comparte tokens no frecuentes: se puntúa por su
+        # parte distintiva.
+        for bucket in self._buckets("bandas", scope):
+            for i in range(len(bucket)):
+                for j in range(i + 1, len(bucket)):
+                    evaluar(bucket[i], bucket[j], distintivo=True)
+        return scored
+
+    def _semantic_pairs(
+        self, scope: list[str] | None, threshold: float
+    ) -> dict[tuple[str, str], float]:
+        vec_cids, mat = self._vectores(scope)
+        if len(vec_cids) < 2:
+            return {}
+        pos = {c: i for i, c in enumerate(vec_cids)}
+        out: dict[tuple[str, str], float] = {}
+        for bucket in self._buckets("vbandas", scope):
+            idx = np.array([pos[c] for c in bucket if c in pos])
+            if len(idx) < 2:
+                continue
+            cos = mat[idx] @ mat[idx].T
+            for i, j in zip(*np.nonzero(np.triu(cos >= threshold, k=1)), strict=True):
+                a, b = vec_cids[idx[i]], vec_cids[idx[j]]
+                out[(a, b) if a < b else (b, a)] = round(float(cos[i, j]), 3)
+        return out
+
+    # ── Consultas ────────────────────────────────────────────────────────────
+
+    def scored_pairs(
+        self,
+        threshold: float,
+        *,
+        embed_threshold: float | None = None,
+        cids: Iterable[str] | None = None,
+    ) -> dict[tuple[str, str], float]:
+        """Pares (a, b) con a < b y su score (léxico o coseno, el mayor).
+
+        Args:
+            threshold: Score léxico mínimo.
+            embed_threshold: Coseno mínimo del pase semántico; None lo omite.
+            cids: Restringe a estos canónicos (p. ej. los de un discurso); los
+                bloques por token se arman solo con ellos.
+        """
+        scope = None if cids is None else list(dict.fromkeys(cids))
+        scored = self._lexical_pairs(scope, threshold)
+        if embed_threshold is not None:
+            for key, cos in self._semantic_pairs(scope, embed_threshold).items():
+                scored[key] = max(scored.get(key, 0.0), cos)
+        return scored
+
+    def similar(
+        self,
+        cid: str,
+        *,
+        threshold: float = 0.62,
+        embed_threshold: float | None = None,
+        limit: int = 20,
+    ) -> list[tuple[str, float]]:
+        """Referentes parecidos a `cid`, del más al menos parecido.
+
+        Usa los mismos candidatos que `scored_pairs`: comparten un token no
+        frecuente, se contienen, o colisionan en el LSH.
+        """
+        ta = referent_tokens(cid)
+        frecuentes = self.frequent_tokens()
+        por_tokens: set[str] = set()
+        if ta:
+            marks = ", ".join("?" * len(ta))
+            compartidos: dict[str, set[str]] = defaultdict(set)
+            for r in self._conn.execute(
+                f"SELECT token, cid FROM tokens WHERE token IN ({marks})", sorted(ta)
+            ):
+                compartidos[str(r["cid"])].add(str(r["token"]))
+            por_tokens = {
+                c
+                for c, toks in compartidos.items()
+                if toks - frecuentes or _contencion(ta, referent_tokens(c))
+            }
+        por_lsh: set[str] = set()
+        tablas = ("bandas", "vbandas") if embed_threshold is not None else ("bandas",)
+        for tabla in tablas:
+            por_lsh.update(
+                str(r["cid"])
+                for r in self._conn.execute(
+                    f"SELECT DISTINCT o.cid FROM {tabla} b JOIN {tabla} o "
+                    "ON o.banda = b.banda AND o.clave = b.clave WHERE b.cid = ?",
+                    (cid,),
+                )
+            )
+        candidatos = (por_tokens | por_lsh) - {cid}
+
+        out: dict[str, float] = {}
+        for c in candidatos:
+            if c in por_tokens:
+                s = lexical_score(cid, c, ta, referent_tokens(c), threshold)
+            else:
+                s = _distinctive_score(cid, c, frecuentes, threshold)
+            if s >= threshold:
+                out[c] = s
+        if embed_threshold is not None:
+            vec_cids, mat = self._vectores([cid, *candidatos])
+            if cid in vec_cids:
+                q = mat[vec_cids.index(cid)]
+                for c, cos in zip(vec_cids, mat @ q, strict=True):
+                    if c != cid and cos >= embed_threshold:
+                        out[c] = max(out.get(c, 0.0), round(float(cos), 3))
+        return sorted(out.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
@@ -242,6 +242,31 @@ class RunsRepository:
             column="model_alias",
             type_def="TEXT",
         )
+        self._add_column_if_missing(
+            table="run_metrics",
+            column="prefill_tokens_saved",
+            type_def="INTEGER NOT NULL DEFAULT 0",
+        )
+        self._add_column_if_missing(
+            table="run_metrics",
+            column="render_ms",
+            type_def="REAL NOT NULL DEFAULT 0.0",
+        )
+        self._add_column_if_missing(
+            table="discursos",
+            column="payload_rev",
+            type_def="INTEGER NOT NULL DEFAULT 0",
+        )
+        self._add_column_if_missing(
+            table="frases",
+            column="payload_rev",
+            type_def="INTEGER NOT NULL DEFAULT 0",
+        )
+        self._add_column_if_missing(
+            table="red_metricas",
+            column="intermediacion_error",
+            type_def="REAL",
+        )
 
     def _add_column_if_missing(
         self,
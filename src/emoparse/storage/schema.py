@@ -78,6 +78,10 @@ CREATE TABLE IF NOT EXISTS discursos (
     enunciation_version     TEXT,
     enunciation_error       TEXT,
 
+    -- Revisión de los payloads: sube cada vez que un payload cambia de
+    -- contenido. Alimenta la huella de insumos de las materializaciones.
+    payload_rev             INTEGER NOT NULL DEFAULT 0,
+
     -- Timestamps.
     created_at              TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at              TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
@@ -114,6 +118,9 @@ CREATE TABLE IF NOT EXISTS frases (
     emociones_pass2_version TEXT,
     emociones_pass2_error   TEXT,
 
+    -- Revisión de los payloads de la frase (ver `discursos.payload_rev`).
+    payload_rev             INTEGER NOT NULL DEFAULT 0,
+
     created_at              TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at              TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
 
@@ -270,6 +277,10 @@ CREATE TABLE IF NOT EXISTS run_metrics (
     total_completion_tokens INTEGER NOT NULL DEFAULT 0,
     cache_hits              INTEGER NOT NULL DEFAULT 0,
     cache_misses            INTEGER NOT NULL DEFAULT 0,
+    -- Tokens de prompt no re-evaluados gracias a snapshots del system (llama_cpp).
+    prefill_tokens_saved    INTEGER NOT NULL DEFAULT 0,
+    -- Tiempo de render de prompts Jinja durante la stage.
+    render_ms               REAL NOT NULL DEFAULT 0.0,
     recorded_at             TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (run_id, stage_name, recorded_at)
 )
@@ -451,6 +462,135 @@ CREATE INDEX IF NOT EXISTS idx_mencion_canonico_mencion
 """.strip()
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+#  Tabla `materializaciones`: huella de insumos por stage derivada y código.
+#
+#  Las stages deterministas que derivan tablas desde payloads (explode de
+#  emociones y menciones) guardan la huella de los insumos que consumieron;
+#  un código se re-materializa solo si su huella actual difiere.
+# ══════════════════════════════════════════════════════════════════════════════
+
+CREATE_MATERIALIZACIONES = """
+CREATE TABLE IF NOT EXISTS materializaciones (
+    codigo              TEXT NOT NULL,
+    stage               TEXT NOT NULL,
+    huella              TEXT NOT NULL,
+    updated_at          TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (codigo, stage),
+    FOREIGN KEY (codigo) REFERENCES discursos(codigo) ON DELETE CASCADE
+)
+""".strip()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Tabla `emocion_canonico`: resolución materializada de los roles por emoción.
+#
+#  Una fila por emoción con los canónicos que resuelven sus marcas de
+#  experienciador y fuente (y los rechazados para cada una), según
+#  `storage.referencia`. Es la parte cara de la resolución: las vistas la
+#  leen con un join y completan la prelación (atribución por emoción >
+#  vínculo > inferencia) sin rearmar el índice de marcas.
+#
+#  La vigencia por código vive en `materializaciones` (stage
+#  'emocion_canonico'). Los triggers de abajo la borran ante cualquier
+#  escritura que cambie la resolución, venga de una stage o de la app: un
+#  código sin vigencia se resuelve en Python hasta re-materializarse.
+#  Las emociones sin canónicos ni rechazados no tienen fila.
+# ══════════════════════════════════════════════════════════════════════════════
+
+CREATE_EMOCION_CANONICO = """
+CREATE TABLE IF NOT EXISTS emocion_canonico (
+    codigo                      TEXT NOT NULL,
+    frase_idx                   INTEGER NOT NULL,
+    emocion_idx                 INTEGER NOT NULL,
+    -- Listas JSON de canonical_id, en el orden de `canonicos_de_marca`.
+    -- NULL = lista vacía.
+    experienciador_ligados      TEXT,
+    experienciador_rechazados   TEXT,
+    fuente_ligados              TEXT,
+    fuente_rechazados           TEXT,
+    PRIMARY KEY (codigo, frase_idx, emocion_idx),
+    FOREIGN KEY (codigo) REFERENCES discursos(codigo) ON DELETE CASCADE
+)
+""".strip()
+
+
+#: Escrituras que invalidan la resolución materializada: (tabla, columna con
+#: la que se ubica el código, columnas relevantes para un UPDATE, código
+#: afectado en función de esa columna).
+_INSUMOS_EMOCION_CANONICO: tuple[tuple[str, str, str, str], ...] = (
+    (
+        "emociones",
+        "codigo",
+        "codigo, frase_idx, emocion_idx, experienciador_marca, fuente_marca",
+        "codigo IN ({filas})",
+    ),
+    ("menciones", "codigo", "codigo, unit_idx, marca", "codigo IN ({filas})"),
+    (
+        "mencion_funcion",
+        "mencion_id",
+        "mencion_id, funcion",
+        "codigo IN (SELECT codigo FROM menciones WHERE id IN ({filas}))",
+    ),
+    (
+        "mencion_canonico",
+        "mencion_id",
+        "mencion_id, canonical_id, status, origin",
+        "codigo IN (SELECT codigo FROM menciones WHERE id IN ({filas}))",
+    ),
+)
+
+
+def _triggers_vigencia(stage: str, insumos: tuple[tuple[str, str, str, str], ...]) -> list[str]:
+    """Triggers que borran la vigencia de `stage` ante escrituras en `insumos`."""
+    out: list[str] = []
+    for tabla, campo, columnas, donde in insumos:
+        eventos = (
+            ("insert", "INSERT", f"NEW.{campo}"),
+            ("delete", "DELETE", f"OLD.{campo}"),
+            ("update", f"UPDATE OF {columnas}", f"OLD.{campo}, NEW.{campo}"),
+        )
+        for sufijo, evento, filas in eventos:
+            out.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{stage}_{tabla}_{sufijo}\n"
+                f"AFTER {evento} ON {tabla}\n"
+                "BEGIN\n"
+                "    DELETE FROM materializaciones\n"
+                f"    WHERE stage = '{stage}' AND {donde.format(filas=filas)};\n"
+                "END"
+            )
+    return out
+
+
+#: Triggers de vigencia de `emocion_canonico`.
+CREATE_EMOCION_CANONICO_TRIGGERS: list[str] = _triggers_vigencia(
+    "emocion_canonico", _INSUMOS_EMOCION_CANONICO
+)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Vigencia de la validación por discurso (stage 'validacion').
+#
+#  `ValidationRunner.run(incremental=True)` revalida solo los discursos sin
+#  vigencia: estos triggers la borran cuando cambia algo que leen los
+#  validators (la emoción, su caracterización o la enunciación del discurso).
+# ══════════════════════════════════════════════════════════════════════════════
+
+_INSUMOS_VALIDACION: tuple[tuple[str, str, str, str], ...] = (
+    (
+        "emociones",
+        "codigo",
+        "codigo, frase_idx, emocion_idx, experienciador, experienciador_marca, "
+        "tipo_emocion, tipo_emocion_canonico, modo_existencia, caracterizacion_payload",
+        "codigo IN ({filas})",
+    ),
+    ("discursos", "codigo", "codigo, enunciation_payload", "codigo IN ({filas})"),
+)
+
+#: Triggers de vigencia de la validación.
+CREATE_VALIDACION_TRIGGERS: list[str] = _triggers_vigencia("validacion", _INSUMOS_VALIDACION)
+
+
 CREATE_CANONICO_SEMAS = """
 CREATE TABLE IF NOT EXISTS canonico_semas (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -597,6 +737,61 @@ CREATE INDEX IF NOT EXISTS idx_media_post
 """.strip()
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+#  Tabla `contexto_hilo`: contexto conversacional materializado por post.
+#
+#  El bloque que `post_context.make_hilo_context_provider` inyecta, ya
+#  renderizado para cada post y combinación de parámetros (`clave`), para
+#  que las stages que lo usan no recorran la cadena de respuestas post por
+#  post. `contexto_hilo_claves` marca las claves materializadas (los posts
+#  sin contexto no tienen fila). Depende del corpus entero: los triggers
+#  vacían ambas tablas ante escrituras en `posts` o `hilos`.
+# ══════════════════════════════════════════════════════════════════════════════
+
+CREATE_CONTEXTO_HILO = """
+CREATE TABLE IF NOT EXISTS contexto_hilo (
+    clave               TEXT NOT NULL,
+    codigo              TEXT NOT NULL,     -- post_id
+    texto               TEXT NOT NULL,     -- bloque sin recortar al presupuesto
+    PRIMARY KEY (clave, codigo)
+)
+""".strip()
+
+CREATE_CONTEXTO_HILO_CLAVES = """
+CREATE TABLE IF NOT EXISTS contexto_hilo_claves (
+    clave               TEXT PRIMARY KEY,
+    n_posts             INTEGER NOT NULL,
+    updated_at          TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+""".strip()
+
+
+def _triggers_contexto_hilo() -> list[str]:
+    out: list[str] = []
+    for tabla, columnas in (
+        ("posts", "post_id, autor_handle, texto, fecha, conversacion_id, en_respuesta_a, cita_a"),
+        ("hilos", "conversacion_id, n_posts"),
+    ):
+        for sufijo, evento in (
+            ("insert", "INSERT"),
+            ("delete", "DELETE"),
+            ("update", f"UPDATE OF {columnas}"),
+        ):
+            out.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_contexto_hilo_{tabla}_{sufijo}\n"
+                f"AFTER {evento} ON {tabla}\n"
+                "BEGIN\n"
+                "    DELETE FROM contexto_hilo_claves;\n"
+                "    DELETE FROM contexto_hilo;\n"
+                "END"
+            )
+    return out
+
+
+#: Triggers de vigencia de `contexto_hilo`.
+CREATE_CONTEXTO_HILO_TRIGGERS: list[str] = _triggers_contexto_hilo()
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  Tabla `tecno_entidades`: tecnolingüísticos por unidad.
 #
@@ -697,6 +892,12 @@ CREATE INDEX IF NOT EXISTS idx_aristas_grafo
 """.strip()
 
 
+CREATE_ARISTAS_POST_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_aristas_post
+    ON aristas(grafo, post_id)
+""".strip()
+
+
 CREATE_RED_METRICAS = """
 CREATE TABLE IF NOT EXISTS red_metricas (
     grafo               TEXT NOT NULL,
@@ -706,6 +907,7 @@ CREATE TABLE IF NOT EXISTS red_metricas (
     grado_total         INTEGER,
     pagerank            REAL,
     intermediacion      REAL,
+    intermediacion_error REAL,          -- cota de error si se estimó por muestreo
     comunidad           INTEGER,
     updated_at          TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (grafo, nodo)
@@ -713,6 +915,85 @@ CREATE TABLE IF NOT EXISTS red_metricas (
 """.strip()
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+#  Construcción incremental de la red.
+#
+#  `red_construcciones` registra los grafos construidos desde el corpus y
+#  `red_pendientes`, por cada uno, los posts cuyas aristas pueden haber
+#  cambiado desde esa construcción. Los triggers anotan el post ante cambios
+#  en lo que leen los constructores (autor, fecha y referencias del post;
+#  menciones y hashtags de `tecno_entidades`), y `emoparse network
+#  --incremental` reconstruye solo las aristas de esos posts y de los que
+#  los referencian.
+# ══════════════════════════════════════════════════════════════════════════════
+
+CREATE_RED_CONSTRUCCIONES = """
+CREATE TABLE IF NOT EXISTS red_construcciones (
+    grafo               TEXT PRIMARY KEY,
+    updated_at          TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+""".strip()
+
+CREATE_RED_PENDIENTES = """
+CREATE TABLE IF NOT EXISTS red_pendientes (
+    grafo               TEXT NOT NULL,
+    post_id             TEXT NOT NULL,
+    PRIMARY KEY (grafo, post_id)
+)
+""".strip()
+
+
+def _triggers_red() -> list[str]:
+    insumos = (
+        (
+            "posts",
+            "post_id",
+            ("post_id", "autor_handle", "fecha", "en_respuesta_a", "reposteo_a", "cita_a"),
+            None,
+        ),
+        (
+            "tecno_entidades",
+            "codigo",
+            ("codigo", "unit_idx", "tipo", "valor_norm"),
+            "{fila}.tipo IN ('mencion', 'hashtag')",
+        ),
+    )
+    out: list[str] = []
+    for tabla, campo, columnas, filtro in insumos:
+        # Los upserts reescriben la fila entera: solo cuenta si algo cambió.
+        cambio = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in columnas)
+        eventos = [
+            ("insert", "INSERT", ("NEW",), []),
+            ("delete", "DELETE", ("OLD",), []),
+            ("update", f"UPDATE OF {', '.join(columnas)}", ("OLD", "NEW"), [f"({cambio})"]),
+        ]
+        for sufijo, evento, filas, condiciones in eventos:
+            if filtro is not None:
+                condiciones = [
+                    "(" + " OR ".join(filtro.format(fila=f) for f in filas) + ")",
+                    *condiciones,
+                ]
+            cuando = f"WHEN {' AND '.join(condiciones)}\n" if condiciones else ""
+            inserts = "".join(
+                "    INSERT OR IGNORE INTO red_pendientes (grafo, post_id)\n"
+                f"    SELECT grafo, {fila}.{campo} FROM red_construcciones;\n"
+                for fila in filas
+            )
+            out.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_red_{tabla}_{sufijo}\n"
+                f"AFTER {evento} ON {tabla}\n"
+                f"{cuando}"
+                "BEGIN\n"
+                f"{inserts}"
+                "END"
+            )
+    return out
+
+
+#: Triggers que anotan los posts pendientes de reconstruir en la red.
+CREATE_RED_TRIGGERS: list[str] = _triggers_red()
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  Lista canónica de DDLs en orden de creación
 # ══════════════════════════════════════════════════════════════════════════════
@@ -743,6 +1024,8 @@ ALL_TABLES_DDL: list[str] = [
     CREATE_MENCION_CANONICO,
     CREATE_MENCION_CANONICO_INDEX,
     CREATE_MENCION_CANONICO_MENCION_INDEX,
+    CREATE_MATERIALIZACIONES,
+    CREATE_EMOCION_CANONICO,
     CREATE_CANONICO_SEMAS,
     CREATE_CANONICO_SEMAS_CANONICAL_INDEX,
     CREATE_CANONICO_SEMAS_SEMA_INDEX,
@@ -753,11 +1036,20 @@ ALL_TABLES_DDL: list[str] = [
     CREATE_HILOS,
     CREATE_MEDIA,
     CREATE_MEDIA_POST_INDEX,
+    CREATE_CONTEXTO_HILO,
+    CREATE_CONTEXTO_HILO_CLAVES,
     CREATE_TECNO_ENTIDADES,
     CREATE_TECNO_ENTIDADES_INDEX,
     CREATE_TECNO_ENTIDADES_TIPO_INDEX,
     CREATE_HASHTAGS,
     CREATE_ARISTAS,
     CREATE_ARISTAS_GRAFO_INDEX,
+    CREATE_ARISTAS_POST_INDEX,
     CREATE_RED_METRICAS,
+    CREATE_RED_CONSTRUCCIONES,
+    CREATE_RED_PENDIENTES,
+    *CREATE_EMOCION_CANONICO_TRIGGERS,
+    *CREATE_VALIDACION_TRIGGERS,
+    *CREATE_CONTEXTO_HILO_TRIGGERS,
+    *CREATE_RED_TRIGGERS,
 ]
@@ -28,12 +28,7 @@ from typing import Any
 import pandas as pd
 from loguru import logger
 
-from emoparse.storage.referencia import (
-    hay_base_de_marcas,
-    marca_canonicos_index,
-    resolver_canonico,
-    resolver_canonicos,
-)
+from emoparse.storage.emocion_canonico import ResolucionRoles, columnas_resolucion
 
 
 @contextmanager
@@ -162,39 +157,25 @@ def _resolve_marca_canonicos(
             is None
         ):
             return out
-        per = _frase_mention_canonicos(conn, funcion, codigo)
+        resolucion = ResolucionRoles(conn, {codigo})
+        columnas, join = columnas_resolucion(conn)
         cols = {r["name"] for r in conn.execute("PRAGMA table_info(emociones)")}
+        fijado = f"emociones.{canonico_field}" if canonico_field in cols else "NULL"
         for r in conn.execute(
-            "SELECT frase_idx, emocion_idx, "
-            f"{marca_field} AS marca, {inferencia_field} AS inferencia, "
-            f"{_canon_col(cols, canonico_field)} AS fijado "
-            "FROM emociones WHERE codigo = ?",
+            "SELECT emociones.codigo, emociones.frase_idx, emociones.emocion_idx, "
+            f"emociones.{marca_field}, emociones.{inferencia_field} AS inferencia, "
+            f"{fijado} AS fijado, {columnas} "
+            f"FROM emociones {join} WHERE emociones.codigo = ?",
             (codigo,),
         ):
-            canonicos = resolver_canonicos(
-                per.get((codigo, int(r["frase_idx"]))),
-                r["marca"],
-                override=r["fijado"],
-                inferencia=r["inferencia"],
+            canonicos = resolucion.canonicos(
+                r, funcion, override=r["fijado"], inferencia=r["inferencia"]
             )
             if canonicos:
                 out[(int(r["frase_idx"]), int(r["emocion_idx"]))] = canonicos
     return out
 
 
-def _frase_mention_canonicos(
-    conn: sqlite3.Connection, funcion: str, codigo: str | None = None
-) -> dict[tuple[str, int], dict[str, dict[str, tuple[int, int]]]]:
-    """(codigo, unit_idx) → {marca_norm: {canonical_id: prelación}} de una función.
-
-    Delega en `storage.referencia`, que es el criterio compartido con las
-    stages y el export: Revisión, Simulacros y Búsqueda resuelven igual.
-    """
-    if not hay_base_de_marcas(conn):
-        return {}
-    return marca_canonicos_index(conn, funcion, codigo)
-
-
 def _canonico_semas_map(
     conn: sqlite3.Connection,
 ) -> dict[str, set[str]]:
@@ -342,44 +323,46 @@ def get_emociones_enriched(
             is None
         ):
             return base
-        exp_units = _frase_mention_canonicos(conn, "experienciador")
-        fte_units = _frase_mention_canonicos(conn, "fuente")
+        resolucion = ResolucionRoles(conn, codigos or None)
+        columnas, join = columnas_resolucion(conn)
         semas = _canonico_semas_map(conn)
         enun_map = _discurso_enunciador_map(conn)
         len_map = _discurso_len_map(conn)
         emo_cols = {r["name"] for r in conn.execute("PRAGMA table_info(emociones)")}
         sel_exp_c = (
-            "experienciador_canonico"
+            "emociones.experienciador_canonico"
             if "experienciador_canonico" in emo_cols
             else "NULL AS experienciador_canonico"
         )
         sel_fte_c = (
-            "fuente_canonico" if "fuente_canonico" in emo_cols else "NULL AS fuente_canonico"
+            "emociones.fuente_canonico"
+            if "fuente_canonico" in emo_cols
+            else "NULL AS fuente_canonico"
         )
         sql = (
-            "SELECT codigo, frase_idx, emocion_idx, "
-            "experienciador, experienciador_marca, "
-            "fuente_inferencia, fuente_marca, "
-            f"{sel_exp_c}, {sel_fte_c}, actantes_payload FROM emociones"
+            "SELECT emociones.codigo, emociones.frase_idx, emociones.emocion_idx, "
+            "emociones.experienciador, emociones.experienciador_marca, "
+            "emociones.fuente_inferencia, emociones.fuente_marca, "
+            f"{sel_exp_c}, {sel_fte_c}, emociones.actantes_payload, {columnas} "
+            f"FROM emociones {join}"
         )
         params: tuple = ()
         if codigos:
             qm = ",".join("?" * len(codigos))
-            sql += f" WHERE codigo IN ({qm})"
+            sql += f" WHERE emociones.codigo IN ({qm})"
             params = tuple(codigos)
         for r in conn.execute(sql, params):
             key = (r["codigo"], int(r["frase_idx"]), int(r["emocion_idx"]))
-            fkey = (r["codigo"], int(r["frase_idx"]))
 
-            exp_c = resolver_canonico(
-                exp_units.get(fkey),
-                r["experienciador_marca"],
+            exp_c = resolucion.canonico(
+                r,
+                "experienciador",
                 override=r["experienciador_canonico"],
                 inferencia=r["experienciador"],
             )
-            fte_cids = resolver_canonicos(
-                fte_units.get(fkey),
-                r["fuente_marca"],
+            fte_cids = resolucion.canonicos(
+                r,
+                "fuente",
                 override=r["fuente_canonico"],
                 inferencia=r["fuente_inferencia"],
             )
@@ -0,0 +1,503 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  emoparse.storage.snapshot
+#
+#  Instantánea columnar (Parquet) de un run para las vistas agregadas.
+#
+#  Las tabs agregadas (curva, correlación, comparación, red) reconstruyen en
+#  cada vista DataFrames desde filas SQLite y payloads JSON anidados. La
+#  instantánea materializa esas tablas ya aplanadas y tipadas:
+#
+#  - emociones : `get_emociones_enriched` (caracterización en columnas,
+#                canónicos y semas resueltos, actantes aplanados);
+#  - menciones : una fila por vínculo marca→referente, con sus funciones;
+#  - posts     : posts con las métricas numéricas en columnas;
+#  - aristas   : aristas de todos los grafos de `emoparse network`.
+#
+#  La SQLite sigue siendo la única fuente de verdad: la instantánea es un
+#  derivado descartable, junto al `.sqlite` (`<run>.snapshot/`). El refresco
+#  es incremental por código: una huella por código (emociones, marcas y sus
+#  vínculos, discurso, frases y post) decide qué filas se recalculan; el resto
+#  se copia de la instantánea anterior sin volver a parsear JSON. Los cambios
+#  globales (semas de referentes, columnas nuevas) fuerzan reconstrucción.
+#
+#  Requiere pyarrow (extra `data`). La lectura vía DuckDB vive en
+#  `storage.analytics.attach_snapshots`.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from loguru import logger
+
+from emoparse.storage.analytics import AnalyticsUnavailableError
+from emoparse.storage.db import db_signature
+from emoparse.storage.simulacros import get_emociones_enriched
+
+#: Tablas que materializa la instantánea, en orden de escritura.
+SNAPSHOT_TABLES: tuple[str, ...] = ("emociones", "menciones", "posts", "aristas")
+
+#: Versión del formato; un cambio fuerza reconstrucción completa.
+SNAPSHOT_FORMAT = 1
+
+_MANIFEST = "_manifest.json"
+_HUELLAS = "_huellas.parquet"
+
+#: Columnas de listas en `emociones` (se conservan como list<string>).
+_LIST_COLUMNS = (
+    "experienciador_canonicos",
+    "experienciador_semas",
+    "fuente_canonicos",
+    "fuente_semas",
+)
+
+#: Más códigos cambiados que esta fracción del total → reconstrucción completa.
+_FULL_REBUILD_RATIO = 0.5
+#: Códigos por lote al recalcular un refresco parcial (límite de parámetros SQL).
+_CODIGOS_POR_LOTE = 2000
+
+
+@dataclass
+class SnapshotReport:
+    """Resultado de `build_snapshot`."""
+
+    snapshot_dir: Path
+    full: bool
+    n_codigos: int
+    n_changed: int
+    n_removed: int
+    rows: dict[str, int] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+
+
+def snapshot_dir_for(db_path: Path | str) -> Path:
+    """Directorio por defecto de la instantánea: `<run>.snapshot/` junto al `.sqlite`."""
+    p = Path(db_path)
+    return p.with_name(f"{p.stem}.snapshot")
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise AnalyticsUnavailableError(
+            'pyarrow no está instalado. Instalá el extra: pip install -e ".[data]"'
+        ) from e
+    return pq
+
+
+@contextmanager
+def _ro_connect(db_path: Path) -> Iterator[sqlite3.Connection]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _table_cols(conn: sqlite3.Connection, table: str) -> list[str]:
+    return [r["name"] for r in conn.execute(f"PRAGMA table_info({table})")]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Huellas por código
+# ══════════════════════════════════════════════════════════════════════════════
+
+#: (tabla, columna de código, orden) que alimentan la huella de cada código.
+_FUENTES_HUELLA: tuple[tuple[str, str, str], ...] = (
+    ("discursos", "codigo", "codigo"),
+    ("frases", "codigo", "codigo, unit_idx"),
+    ("emociones", "codigo", "codigo, frase_idx, emocion_idx"),
+    ("posts", "post_id", "post_id"),
+)
+
+
+def _feed(hashers: dict[str, Any], rows: Iterable[sqlite3.Row], key: str) -> None:
+    for r in rows:
+        codigo = str(r[key])
+        h = hashers.get(codigo)
+        if h is None:
+            h = hashers[codigo] = hashlib.blake2b(digest_size=16)
+        h.update(repr(tuple(r)).encode("utf-8", "surrogatepass"))
+
+
+def _huellas(conn: sqlite3.Connection) -> tuple[dict[str, str], str]:
+    """(codigo → huella, huella global) del contenido que alimenta la instantánea.
+
+    Se hashean las filas crudas (sin parsear JSON), que es mucho más barato que
+    reconstruir las tablas aplanadas. La huella global cubre lo que afecta a
+    todos los códigos a la vez: semas por referente y columnas de las tablas.
+    """
+    existentes = {
+        r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    hashers: dict[str, Any] = {}
+    global_h = hashlib.blake2b(digest_size=16)
+    global_h.update(f"formato={SNAPSHOT_FORMAT}".encode())
+    for table, col, order in _FUENTES_HUELLA:
+        if table not in existentes:
+            continue
+        global_h.update(repr((table, _table_cols(conn, table))).encode())
+        rows = conn.execute(f"SELECT * FROM {table} ORDER BY {order}")
+        _feed(hashers, rows, col)
+    if {"menciones", "mencion_canonico"} <= existentes:
+        _feed(
+            hashers,
+            conn.execute(
+                "SELECT m.codigo, m.unit_idx, m.marca, m.origin, mc.* "
+                "FROM menciones m LEFT JOIN mencion_canonico mc ON mc.mencion_id = m.id "
+                "ORDER BY m.codigo, m.id, mc.id"
+            ),
+            "codigo",
+        )
+        if "mencion_funcion" in existentes:
+            _feed(
+                hashers,
+                conn.execute(
+                    "SELECT m.codigo, f.mencion_id, f.funcion FROM mencion_funcion f "
+                    "JOIN menciones m ON m.id = f.mencion_id ORDER BY m.codigo, f.id"
+                ),
+                "codigo",
+            )
+    if "canonico_semas" in existentes:
+        for r in conn.execute(
+            "SELECT canonical_id, sema, status FROM canonico_semas ORDER BY canonical_id, sema"
+        ):
+            global_h.update(repr(tuple(r)).encode())
+    return {c: h.hexdigest() for c, h in hashers.items()}, global_h.hexdigest()
+
+
+def _aristas_firma(conn: sqlite3.Connection) -> str | None:
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name='aristas'").fetchone() is None:
+        return None
+    r = conn.execute("SELECT COUNT(*), MAX(id), TOTAL(peso) FROM aristas").fetchone()
+    return repr(tuple(r))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Tablas aplanadas
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def _normalizar_tipos(df: pd.DataFrame) -> pd.DataFrame:
+    """Deja cada columna con un tipo Parquet estable.
+
+    Las listas se conservan como listas de strings; las columnas de objetos
+    con tipos mezclados (un payload con `intensidad` numérica en una fila y
+    textual en otra) se llevan a string, para que dos refrescos no produzcan
+    schemas incompatibles.
+    """
+    for col in df.columns:
+        s = df[col]
+        if s.dtype != object:
+            continue
+        vals = s.dropna()
+        if col in _LIST_COLUMNS or (len(vals) and vals.map(lambda v: isinstance(v, list)).all()):
+            df[col] = [
+                [str(x) for x in v] if isinstance(v, (list, tuple)) else [] for v in s.tolist()
+            ]
+            continue
+        tipos = {type(v) for v in vals.tolist()}
+        if tipos and tipos <= {bool}:
+            continue
+        if tipos and tipos <= {int, float}:
+            df[col] = pd.to_numeric(s)
+            continue
+        df[col] = [None if v is None or v is pd.NA else str(v) for v in s.tolist()]
+    return df
+
+
+def _emociones_df(db_path: Path, codigos: list[str] | None) -> pd.DataFrame:
+    if codigos is None:
+        return get_emociones_enriched(db_path)
+    parts = [
+        get_emociones_enriched(db_path, codigos[i : i + _CODIGOS_POR_LOTE])
+        for i in range(0, len(codigos), _CODIGOS_POR_LOTE)
+    ]
+    parts = [p for p in parts if not p.empty]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+
+def _in_lotes(
+    conn: sqlite3.Connection, sql: str, column: str, codigos: list[str] | None, order: str
+) -> list[sqlite3.Row]:
+    if codigos is None:
+        return conn.execute(f"{sql} ORDER BY {order}").fetchall()
+    rows: list[sqlite3.Row] = []
+    for i in range(0, len(codigos), _CODIGOS_POR_LOTE):
+        lote = codigos[i : i + _CODIGOS_POR_LOTE]
+        qm = ",".join("?" * len(lote))
+        rows.extend(conn.execute(f"{sql} WHERE {column} IN ({qm}) ORDER BY {order}", lote))
+    return rows
+
+
+def _menciones_df(conn: sqlite3.Connection, codigos: list[str] | None) -> pd.DataFrame:
+    existentes = {
+        r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    if not {"menciones", "mencion_canonico"} <= existentes:
+        return pd.DataFrame()
+    mc_cols = set(_table_cols(conn, "mencion_canonico"))
+
+    def col(name: str) -> str:
+        return f"mc.{name}" if name in mc_cols else "NULL"
+
+    funciones = (
+        "(SELECT group_concat(f.funcion, '; ') FROM "
+        "(SELECT funcion FROM mencion_funcion WHERE mencion_id = m.id ORDER BY funcion) f)"
+        if "mencion_funcion" in existentes
+        else "NULL"
+    )
+    sql = (
+        "SELECT m.id AS mencion_id, m.codigo, m.unit_idx, m.marca, m.llm_inferencia, "
+        f"m.origin, {funciones} AS funciones, "
+        "mc.canonical_id, mc.status, mc.origin AS vinculo_origin, "
+        f"{col('deixis_tipo')} AS deixis_tipo, {col('modalidad')} AS modalidad, "
+        f"{col('naturaleza')} AS naturaleza "
+        "FROM menciones m LEFT JOIN mencion_canonico mc ON mc.mencion_id = m.id"
+    )
+    rows = _in_lotes(conn, sql, "m.codigo", codigos, "m.codigo, m.unit_idx, m.id, mc.id")
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame.from_records([dict(r) for r in rows])
+    df["funciones"] = [[p for p in (v or "").split("; ") if p] for v in df["funciones"].tolist()]
+    return df
+
+
+def _posts_df(conn: sqlite3.Connection, codigos: list[str] | None) -> pd.DataFrame:
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name='posts'").fetchone() is None:
+        return pd.DataFrame()
+    sql = (
+        "SELECT post_id, plataforma, autor_handle, texto, fecha, lang, tipo, "
+        "conversacion_id, en_respuesta_a, cita_a, reposteo_a, es_repost_puro, "
+        "huerfano, profundidad, url, metricas FROM posts"
+    )
+    rows = _in_lotes(conn, sql, "post_id", codigos, "post_id")
+    records: list[dict[str, Any]] = []
+    for r in rows:
+        rec = dict(r)
+        metricas = rec.pop("metricas")
+        try:
+            parsed = json.loads(metricas) if metricas else {}
+        except (json.JSONDecodeError, TypeError):
+            parsed = {}
+        if isinstance(parsed, dict):
+            for k, v in parsed.items():
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    rec[f"metricas__{k}"] = v
+        records.append(rec)
+    return pd.DataFrame.from_records(records)
+
+
+def _aristas_df(conn: sqlite3.Connection) -> pd.DataFrame:
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name='aristas'").fetchone() is None:
+        return pd.DataFrame()
+    rows = conn.execute(
+        "SELECT grafo, origen, destino, post_id, peso, fecha FROM aristas ORDER BY id"
+    ).fetchall()
+    return pd.DataFrame.from_records([dict(r) for r in rows])
+
+
+_ORDEN: dict[str, list[str]] = {
+    "emociones": ["codigo", "frase_idx", "emocion_idx"],
+    "menciones": ["codigo", "unit_idx", "mencion_id"],
+    "posts": ["post_id"],
+}
+_CLAVE_CODIGO = {"emociones": "codigo", "menciones": "codigo", "posts": "post_id"}
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Escritura
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+#: Columnas con las que se escribe una tabla vacía, para que siga siendo legible.
+_COLUMNAS_MINIMAS: dict[str, list[str]] = {
+    "emociones": ["codigo", "frase_idx", "emocion_idx"],
+    "menciones": ["mencion_id", "codigo", "unit_idx"],
+    "posts": ["post_id"],
+    "aristas": ["grafo", "origen", "destino", "post_id", "peso", "fecha"],
+}
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """Escribe atómicamente (archivo temporal + rename)."""
+    pq = _require_pyarrow()
+    import pyarrow as pa
+
+    if df.columns.empty:
+        df = pd.DataFrame(columns=_COLUMNAS_MINIMAS.get(path.stem, ["codigo"]), dtype="string")
+    tmp = path.with_name(path.name + ".tmp")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+
+
+def _read_parquet(path: Path) -> pd.DataFrame:
+    pq = _require_pyarrow()
+    return pq.read_table(path).to_pandas()
+
+
+def _merge(
+    previa: pd.DataFrame, nueva: pd.DataFrame, table: str, reemplazados: set[str]
+) -> pd.DataFrame:
+    """Conserva las filas previas de códigos sin cambios y agrega las recalculadas."""
+    clave = _CLAVE_CODIGO[table]
+    if not previa.empty and reemplazados:
+        previa = previa[~previa[clave].isin(reemplazados)]
+    partes = [p for p in (previa, nueva) if not p.empty]
+    if not partes:
+        return pd.DataFrame()
+    out = pd.concat(partes, ignore_index=True) if len(partes) > 1 else partes[0]
+    return out.sort_values(_ORDEN[table], kind="stable").reset_index(drop=True)
+
+
+def read_manifest(snapshot_dir: Path | str) -> dict[str, Any] | None:
+    """Manifiesto de una instantánea, o None si no existe o está dañado."""
+    path = Path(snapshot_dir) / _MANIFEST
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def build_snapshot(
+    db_path: Path | str,
+    snapshot_dir: Path | str | None = None,
+    *,
+    full: bool = False,
+) -> SnapshotReport:
+    """Crea o refresca la instantánea Parquet de un run.
+
+    Sin `full`, recalcula solo los códigos cuya huella cambió desde la
+    instantánea anterior (y elimina los que ya no existen). Las aristas se
+    reescriben solo si cambió su firma (cantidad, último id, peso total).
+
+    Raises:
+        AnalyticsUnavailableError: si falta pyarrow.
+        FileNotFoundError: si la base no existe.
+    """
+    t0 = time.perf_counter()
+    _require_pyarrow()
+    db_path = Path(db_path).expanduser().resolve()
+    if not db_path.is_file():
+        raise FileNotFoundError(f"DB no encontrada: {db_path}")
+    out_dir = Path(snapshot_dir) if snapshot_dir else snapshot_dir_for(db_path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = read_manifest(out_dir) or {}
+    # La firma se toma antes de leer: si un writer commitea durante el
+    # refresco, la instantánea queda marcada como desactualizada.
+    firma_db = db_signature(db_path)
+    with _ro_connect(db_path) as conn:
+        huellas, huella_global = _huellas(conn)
+        firma_aristas = _aristas_firma(conn)
+
+    previas: dict[str, str] = {}
+    huellas_path = out_dir / _HUELLAS
+    completa = (
+        full
+        or manifest.get("formato") != SNAPSHOT_FORMAT
+        or manifest.get("huella_global") != huella_global
+        or not huellas_path.is_file()
+        or any(not (out_dir / f"{t}.parquet").is_file() for t in SNAPSHOT_TABLES)
+    )
+    if not completa:
+        prev_df = _read_parquet(huellas_path)
+        previas = dict(zip(prev_df["codigo"], prev_df["huella"]))
+
+    cambiados = sorted(c for c, h in huellas.items() if previas.get(c) != h)
+    eliminados = set(previas) - set(huellas)
+    if not completa and len(cambiados) > _FULL_REBUILD_RATIO * max(len(huellas), 1):
+        completa = True
+
+    rows: dict[str, int] = {}
+    codigos = None if completa else cambiados
+    reemplazados = set(cambiados) | eliminados
+    if completa or reemplazados:
+        nuevas = {"emociones": _emociones_df(db_path, codigos)}
+        with _ro_connect(db_path) as conn:
+            nuevas["menciones"] = _menciones_df(conn, codigos)
+            nuevas["posts"] = _posts_df(conn, codigos)
+        for table, df in nuevas.items():
+            path = out_dir / f"{table}.parquet"
+            if not completa:
+                df = _merge(load_snapshot_table(out_dir, table), df, table, reemplazados)
+            df = _normalizar_tipos(df)
+            _write_parquet(df, path)
+            rows[table] = len(df)
+    aristas_path = out_dir / "aristas.parquet"
+    if completa or manifest.get("aristas") != firma_aristas or not aristas_path.is_file():
+        with _ro_connect(db_path) as conn:
+            aristas = _aristas_df(conn)
+        _write_parquet(aristas, aristas_path)
+        rows["aristas"] = len(aristas)
+
+    _write_parquet(
+        pd.DataFrame({"codigo": list(huellas), "huella": list(huellas.values())}), huellas_path
+    )
+    nuevo_manifest = {
+        "formato": SNAPSHOT_FORMAT,
+        "db": str(db_path),
+        "db_signature": repr(firma_db),
+        "huella_global": huella_global,
+        "aristas": firma_aristas,
+        "built_at": datetime.now(UTC).isoformat(),
+        "rows": {**(manifest.get("rows") or {}), **rows},
+    }
+    tmp = out_dir / (_MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(nuevo_manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, out_dir / _MANIFEST)
+
+    report = SnapshotReport(
+        snapshot_dir=out_dir,
+        full=completa,
+        n_codigos=len(huellas),
+        n_changed=len(cambiados),
+        n_removed=len(eliminados),
+        rows=nuevo_manifest["rows"],
+        elapsed_s=time.perf_counter() - t0,
+    )
+    logger.info(
+        f"[snapshot] {db_path.name}: {'completa' if completa else 'incremental'}, "
+        f"{report.n_changed}/{report.n_codigos} códigos recalculados, "
+        f"{report.n_removed} eliminados ({report.elapsed_s:.1f}s)."
+    )
+    return report
+
+
+def snapshot_is_fresh(db_path: Path | str, snapshot_dir: Path | str | None = None) -> bool:
+    """True si la instantánea existe y la base no cambió en disco desde que se construyó."""
+    db_path = Path(db_path).expanduser().resolve()
+    out_dir = Path(snapshot_dir) if snapshot_dir else snapshot_dir_for(db_path)
+    manifest = read_manifest(out_dir)
+    if manifest is None or manifest.get("formato") != SNAPSHOT_FORMAT:
+        return False
+    if any(not (out_dir / f"{t}.parquet").is_file() for t in SNAPSHOT_TABLES):
+        return False
+    return manifest.get("db_signature") == repr(db_signature(db_path))
+
+
+def load_snapshot_table(snapshot_dir: Path | str, table: str) -> pd.DataFrame:
+    """Lee una tabla de la instantánea como DataFrame (listas como `list`)."""
+    if table not in SNAPSHOT_TABLES:
+        raise ValueError(f"Tabla de instantánea desconocida: {table!r}")
+    df = _read_parquet(Path(snapshot_dir) / f"{table}.parquet")
+    for col in df.columns:
+        if col in _LIST_COLUMNS or col == "funciones":
+            df[col] = [list(v) if v is not None else [] for v in df[col].tolist()]
+    return df
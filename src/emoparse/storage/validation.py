@@ -7,6 +7,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterable
 from datetime import UTC, datetime
 from typing import Any
 
@@ -50,20 +51,7 @@ class ValidationRepository:
 
     def save_issues(self, issues: list[ValidationIssue]) -> None:
         """Inserta un lote de issues."""
-        now = datetime.now(UTC)
-        rows = [
-            (
-                issue.validator_id,
-                issue.severidad,
-                issue.mensaje,
-                issue.codigo,
-                issue.frase_idx,
-                issue.emocion_idx,
-                json.dumps(issue.contexto, ensure_ascii=False, default=str),
-                now,
-            )
-            for issue in issues
-        ]
+        rows = _issue_rows(issues)
         with self._db.transaction() as cur:
             cur.executemany(
                 """
@@ -75,6 +63,23 @@ class ValidationRepository:
                 rows,
             )
 
+    def replace_issues(self, codigos: Iterable[str], issues: list[ValidationIssue]) -> None:
+        """Reemplaza las issues de `codigos` por `issues`, en una sola transacción."""
+        with self._db.transaction() as cur:
+            cur.executemany(
+                "DELETE FROM validation_issues WHERE codigo = ?",
+                [(codigo,) for codigo in codigos],
+            )
+            cur.executemany(
+                """
+                INSERT INTO validation_issues (
+                    validator_id, severidad, mensaje, codigo,
+                    frase_idx, emocion_idx, contexto, run_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                _issue_rows(issues),
+            )
+
     def delete_issues_for_codigo(self, codigo: str) -> None:
         """Borra todas las issues de un discurso."""
         with self._db.transaction() as cur:
@@ -159,3 +164,21 @@ class ValidationRepository:
         """Total de issues en la tabla."""
         row = self._db.execute("SELECT COUNT(*) as cnt FROM validation_issues").fetchone()
         return row["cnt"] if row else 0
+
+
+def _issue_rows(issues: list[ValidationIssue]) -> list[tuple[Any, ...]]:
+    """Filas de `validation_issues`, todas con el mismo `run_at`."""
+    now = datetime.now(UTC)
+    return [
+        (
+            issue.validator_id,
+            issue.severidad,
+            issue.mensaje,
+            issue.codigo,
+            issue.frase_idx,
+            issue.emocion_idx,
+            json.dumps(issue.contexto, ensure_ascii=False, default=str),
+            now,
+        )
+        for issue in issues
+    ]
@@ -0,0 +1,91 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  tests/andamio/test_app_data_cache
+#
+#  Caché de lectura del dashboard: aciertos, invalidación y cota de memoria.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from emoparse.app import _cache
+from emoparse.app import data as data_layer
+from emoparse.storage import Database, DiscursosRepository
+from emoparse.storage.models import RunContext
+from emoparse.storage.runs import RunsRepository
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpia():
+    _cache.invalidate()
+    yield
+    _cache.invalidate()
+    _cache.close_pools()
+
+
+def _build_db(tmp_path: Path) -> tuple[Path, Database]:
+    path = tmp_path / "run_cache.sqlite"
+    db = Database(path)
+    RunsRepository(db).bootstrap(RunContext(run_id="run_cache", started_at=datetime.now(UTC)))
+    DiscursosRepository(db).upsert_input("d1", {"titulo": "Uno", "contenido": "Texto."})
+    return path, db
+
+
+def test_repeated_loader_call_is_a_hit_and_returns_a_copy(tmp_path) -> None:
+    path, _db = _build_db(tmp_path)
+
+    first = data_layer.get_discursos(path)
+    first["codigo"] = "mutado"
+    hits_before = _cache.cache_stats()["hits"]
+    second = data_layer.get_discursos(path)
+
+    assert _cache.cache_stats()["hits"] == hits_before + 1
+    assert second["codigo"].tolist() == ["d1"]
+
+
+def test_external_write_changes_signature(tmp_path) -> None:
+    path, db = _build_db(tmp_path)
+    assert data_layer.get_discursos(path)["codigo"].tolist() == ["d1"]
+
+    DiscursosRepository(db).upsert_input("d2", {"titulo": "Dos", "contenido": "Otro."})
+
+    assert data_layer.get_discursos(path)["codigo"].tolist() == ["d1", "d2"]
+
+
+def test_invalidate_drops_only_that_db(tmp_path) -> None:
+    path_a, _ = _build_db(tmp_path / "a")
+    path_b, _ = _build_db(tmp_path / "b")
+    data_layer.get_run_stats(path_a)
+    data_layer.get_run_stats(path_b)
+    assert _cache.cache_stats()["entries"] == 2
+
+    _cache.invalidate(path_a)
+
+    assert _cache.cache_stats()["entries"] == 1
+
+
+def test_budget_bounds_cached_bytes(tmp_path, monkeypatch) -> None:
+    path, _db = _build_db(tmp_path)
+    data_layer.get_run_stats(path)
+    monkeypatch.setenv("EMOPARSE_APP_CACHE_MB", "0")
+
+    data_layer.get_discursos(path)
+
+    stats = _cache.cache_stats()
+    assert stats["entries"] == 0
+    assert stats["bytes"] == 0
+
+
+def test_pooled_connection_is_reused_and_read_only(tmp_path) -> None:
+    path, _db = _build_db(tmp_path)
+
+    with _cache.pooled_connect(path) as first:
+        pass
+    with _cache.pooled_connect(path) as second:
+        with pytest.raises(Exception, match="readonly"):
+            second.execute("DELETE FROM discursos")
+
+    assert first is second
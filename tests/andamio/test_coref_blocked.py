@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from emoparse.pipeline.coref import _cluster_mentions_pairwise, cluster_mentions_within_discurso
+
+#: Vocabulario chico a propósito: fuerza colisiones de tokens, subconjuntos,
+#: strings idénticos con distinta capitalización/tildes y stopwords sueltas.
+_VOCAB = [
+    "presidente",
+    "Presidente",
+    "nación",
+    "nacion",
+    "argentina",
+    "gobierno",
+    "ministro",
+    "economía",
+    "víctimas",
+    "atentado",
+    "amia",
+    "de",
+    "la",
+    "del",
+    "el",
+    "x",
+]
+
+
+def _actores(rng: random.Random) -> list[tuple[int, list[dict]]]:
+    out: list[tuple[int, list[dict]]] = []
+    for unit_idx in range(rng.randint(0, 8)):
+        actores: list = []
+        for _ in range(rng.randint(0, 6)):
+            if rng.random() < 0.05:
+                actores.append("no es un dict")
+                continue
+            palabras = rng.choices(_VOCAB, k=rng.randint(0, 5))
+            actores.append({"actor": " ".join(palabras)})
+        out.append((unit_idx, actores))
+    return out
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_bloqueado_equivale_a_pares(seed: int) -> None:
+    actores = _actores(random.Random(seed))
+
+    # Mismos clusters y en el mismo orden (primera aparición).
+    assert cluster_mentions_within_discurso(actores) == _cluster_mentions_pairwise(actores)
+
+
+def test_casos_conocidos() -> None:
+    actores = [
+        (
+            0,
+            [
+                {"actor": "presidente de la nación"},
+                {"actor": "Presidente de la Nación Argentina"},
+                {"actor": "víctimas del Holocausto"},
+            ],
+        ),
+        (1, [{"actor": "víctimas del atentado"}, {"actor": "PRESIDENTE DE LA NACION"}]),
+    ]
+
+    assert cluster_mentions_within_discurso(actores) == [
+        {(0, 0), (0, 1), (1, 1)},
+        {(0, 2)},
+        {(1, 0)},
+    ]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from emoparse.core.backend.base import LLMResponse
+from emoparse.genres.tuit import get_genre
+from emoparse.pipeline.stages import ActorsStage, EmotionsStage, _paquetes
+from emoparse.storage.db import Database
+from emoparse.storage.discursos import DiscursosRepository
+from emoparse.storage.frases import FrasesRepository
+from tests.factories import FakeBackend
+
+_UNIDAD_RE = re.compile(r"UNIDAD \[(\d+)\] \(codigo=([^)]+)\)")
+
+
+class _EchoBackend(FakeBackend):
+    """Responde cada unidad con un ítem que nombra su código, en orden inverso."""
+
+    def __init__(self, item: Any) -> None:
+        super().__init__()
+        self._item = item
+
+    def generate(self, system: str, user: str, **kwargs: Any) -> LLMResponse:
+        unidades = _UNIDAD_RE.findall(user)
+        self._responses.append([self._item(int(i), codigo) for i, codigo in reversed(unidades)])
+        return super().generate(system, user, **kwargs)
+
+
+def _actor_item(unit_idx: int, codigo: str) -> dict[str, Any]:
+    actor = {
+        "marca": codigo,
+        "actor": codigo,
+        "tipo": "humano_individual",
+        "modo": "explicito",
+        "justificacion": "x",
+    }
+    return {"unit_idx": unit_idx, "actores": [actor]}
+
+
+def _emotion_item(unit_idx: int, codigo: str) -> dict[str, Any]:
+    emocion = {
+        "exp": "el autor del post",
+        "expm": "no identificado",
+        "emo": "alegria",
+        "fue": "no identificado",
+        "fuem": "no identificado",
+        "modo": "realizada",
+        "conf": 1,
+    }
+    return {"unit_idx": unit_idx, "emociones": [emocion]}
+
+
+def _posts(db: Database, n: int) -> tuple[DiscursosRepository, FrasesRepository]:
+    d_repo = DiscursosRepository(db)
+    f_repo = FrasesRepository(db)
+    for k in range(n):
+        codigo = f"post{k}"
+        d_repo.upsert_input(codigo, {"titulo": "", "contenido": f"texto {k}"})
+        d_repo.set_payload(codigo, "enunciation", {"enunciador": f"@cuenta{k}"})
+        f_repo.upsert_frase(codigo, 0, f"texto del post {k}")
+    return d_repo, f_repo
+
+
+def test_paquetes_no_parten_discursos() -> None:
+    by_codigo = {"a": [0], "b": [0, 1, 2, 3, 4], "c": [0], "d": [0]}
+
+    assert _paquetes(by_codigo, 3) == [
+        [("a", [0]), ("b", [0, 1, 2, 3, 4])],
+        [("c", [0]), ("d", [0])],
+    ]
+
+
+def test_actors_empaqueta_posts_y_rutea_por_codigo(bootstrapped_db: Database) -> None:
+    d_repo, f_repo = _posts(bootstrapped_db, 8)
+    backend = _EchoBackend(_actor_item)
+    stage = ActorsStage(backend, d_repo, f_repo, genre=get_genre())
+
+    assert stage.pack_size == 6
+    assert stage.run_pending() == 8
+
+    assert len(backend.calls) == 2
+    assert "CONTEXTO POR UNIDAD" in backend.calls[0].system
+    assert "@cuenta" not in backend.calls[0].system
+    assert "Enunciador: @cuenta0" in backend.calls[0].user
+    for k in range(8):
+        actores = f_repo.get_payload(f"post{k}", 0, "actores")
+        assert [a["actor"] for a in actores] == [f"post{k}"]
+
+
+def test_emotions_empaquetado_usa_el_enunciador_de_cada_post(
+    bootstrapped_db: Database,
+) -> None:
+    d_repo, f_repo = _posts(bootstrapped_db, 3)
+    for k in range(3):
+        f_repo.set_payload(f"post{k}", 0, "actores", [])
+    backend = _EchoBackend(_emotion_item)
+    stage = EmotionsStage(backend, d_repo, f_repo, heuristicas="", genre=get_genre())
+
+    assert stage.run_pending() == 3
+
+    assert len(backend.calls) == 1
+    for k in range(3):
+        emociones = f_repo.get_payload(f"post{k}", 0, "emociones")
+        assert [e["experienciador"] for e in emociones] == [f"@cuenta{k}"]
+
+
+def test_sin_pack_batch_size_sigue_un_agente_por_discurso(bootstrapped_db: Database) -> None:
+    d_repo, f_repo = _posts(bootstrapped_db, 3)
+    backend = _EchoBackend(_actor_item)
+    stage = ActorsStage(backend, d_repo, f_repo)
+
+    assert stage.pack_size == 0
+    assert stage.run_pending() == 3
+    assert len(backend.calls) == 3
+    assert "Enunciador: @cuenta" in backend.calls[0].system
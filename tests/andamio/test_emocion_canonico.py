@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+from emoparse.storage.db import Database
+from emoparse.storage.discursos import DiscursosRepository
+from emoparse.storage.emocion_canonico import (
+    STAGE,
+    EmocionCanonicoRepository,
+    ResolucionRoles,
+    columnas_resolucion,
+)
+from emoparse.storage.emociones import EmocionesRepository
+from emoparse.storage.frases import FrasesRepository
+from emoparse.storage.models import RunContext
+from emoparse.storage.referencia import marca_canonicos_index, resolver_canonicos
+from emoparse.storage.runs import RunsRepository
+
+_CODIGOS = ("A", "B", "C")
+_MARCAS = ("milei", "javier milei", "el gobierno", "los radicales", "macristas", "nosotros")
+_MARCAS_EMOCION = (*_MARCAS, "los radicales y macristas", "milei y el gobierno", "ellos", "")
+_CIDS = ("javier_milei", "gobierno", "radicales", "macristas", "pueblo")
+_STATUS = ("accepted", "proposed", "rejected", "raro")
+_ORIGINS = ("human", "technoparse", "llm", "coref", "auto", "deixis_llm", "deixis", "raro")
+_INFERENCIAS = (None, "", "no identificado", "Javier Milei", "los radicales y el gobierno")
+
+
+def _poblar(db: Database, rng: random.Random) -> None:
+    d_repo, f_repo = DiscursosRepository(db), FrasesRepository(db)
+    for codigo in _CODIGOS:
+        d_repo.upsert_input(codigo, {"titulo": codigo, "contenido": "x"})
+        for unit in range(2):
+            f_repo.upsert_frase(codigo, unit, "frase")
+    with db.transaction() as cur:
+        for codigo in _CODIGOS:
+            for unit in range(2):
+                for marca in rng.sample(_MARCAS, rng.randint(0, 4)):
+                    cur.execute(
+                        "INSERT INTO menciones (codigo, unit_idx, marca) VALUES (?, ?, ?)",
+                        (codigo, unit, marca.title() if rng.random() < 0.3 else marca),
+                    )
+                    mid = cur.lastrowid
+                    for funcion in rng.sample(("experienciador", "fuente", "actor"), 2):
+                        cur.execute(
+                            "INSERT INTO mencion_funcion (mencion_id, funcion) VALUES (?, ?)",
+                            (mid, funcion),
+                        )
+                    for cid in rng.sample(_CIDS, rng.randint(1, 3)):
+                        cur.execute(
+                            "INSERT INTO mencion_canonico (mencion_id, canonical_id, status, "
+                            "origin) VALUES (?, ?, ?, ?)",
+                            (mid, cid, rng.choice(_STATUS), rng.choice(_ORIGINS)),
+                        )
+                for emocion_idx in range(3):
+                    cur.execute(
+                        "INSERT INTO emociones (codigo, frase_idx, emocion_idx, experienciador, "
+                        "experienciador_marca, tipo_emocion, fuente_marca, fuente_inferencia, "
+                        "modo_existencia, experienciador_canonico, fuente_canonico) "
+                        "VALUES (?, ?, ?, ?, ?, 'miedo', ?, ?, 'realizada', ?, ?)",
+                        (
+                            codigo,
+                            unit,
+                            emocion_idx,
+                            rng.choice(_INFERENCIAS) or "",
+                            rng.choice(_MARCAS_EMOCION),
+                            rng.choice(_MARCAS_EMOCION),
+                            rng.choice(_INFERENCIAS) or "",
+                            rng.choice((None, None, None, "pueblo")),
+                            rng.choice((None, None, None, "gobierno; pueblo")),
+                        ),
+                    )
+
+
+def _esperado(db: Database) -> dict[tuple[str, int, int, str], list[str]]:
+    """La resolución de referencia: índice de marcas + `resolver_canonicos`."""
+    indices = {f: marca_canonicos_index(db, f) for f in ("experienciador", "fuente")}
+    out: dict[tuple[str, int, int, str], list[str]] = {}
+    for r in db.execute("SELECT * FROM emociones").fetchall():
+        unidad = (r["codigo"], int(r["frase_idx"]))
+        for rol, marca, override, inferencia in (
+            ("experienciador", "experienciador_marca", "experienciador_canonico", "experienciador"),
+            ("fuente", "fuente_marca", "fuente_canonico", "fuente_inferencia"),
+        ):
+            out[(*unidad, int(r["emocion_idx"]), rol)] = resolver_canonicos(
+                indices[rol].get(unidad),
+                r[marca],
+                override=r[override],
+                inferencia=r[inferencia],
+            )
+    return out
+
+
+def _leido(db: Database) -> dict[tuple[str, int, int, str], list[str]]:
+    """La misma resolución leída con el join sobre `emocion_canonico`."""
+    columnas, join = columnas_resolucion(db)
+    resolucion = ResolucionRoles(db)
+    out: dict[tuple[str, int, int, str], list[str]] = {}
+    for r in db.execute(f"SELECT emociones.*, {columnas} FROM emociones {join}").fetchall():
+        clave = (r["codigo"], int(r["frase_idx"]), int(r["emocion_idx"]))
+        out[(*clave, "experienciador")] = resolucion.canonicos(
+            r,
+            "experienciador",
+            override=r["experienciador_canonico"],
+            inferencia=r["experienciador"],
+        )
+        out[(*clave, "fuente")] = resolucion.canonicos(
+            r, "fuente", override=r["fuente_canonico"], inferencia=r["fuente_inferencia"]
+        )
+    return out
+
+
+def _vigentes(db: Database) -> set[str]:
+    rows = db.execute("SELECT codigo FROM materializaciones WHERE stage = ?", (STAGE,))
+    return {r["codigo"] for r in rows}
+
+
+def test_tabla_reproduce_el_resolutor_en_configuraciones_al_azar(tmp_path: Path) -> None:
+    for seed in range(25):
+        db = Database(tmp_path / f"azar_{seed}.sqlite")
+        RunsRepository(db).bootstrap(RunContext(run_id="azar"))
+        _poblar(db, random.Random(seed))
+        esperado = _esperado(db)
+
+        # Sin vigencia, la lectura cae al índice de marcas.
+        assert _leido(db) == esperado
+        assert EmocionCanonicoRepository(db).refresh() == len(_CODIGOS)
+        assert _vigentes(db) == set(_CODIGOS)
+        assert _leido(db) == esperado
+        db.close_thread_connection()
+
+
+def test_escrituras_retiran_la_vigencia_solo_del_codigo_tocado(
+    bootstrapped_db: Database,
+) -> None:
+    db = bootstrapped_db
+    _poblar(db, random.Random(7))
+    repo = EmocionCanonicoRepository(db)
+    repo.refresh()
+
+    db.execute(
+        "UPDATE mencion_canonico SET status = 'rejected' WHERE mencion_id IN "
+        "(SELECT id FROM menciones WHERE codigo = 'B')"
+    )
+    assert _vigentes(db) == {"A", "C"}
+    # Columnas que no intervienen en la resolución no invalidan.
+    db.execute("UPDATE mencion_canonico SET semas_version = 'v2'")
+    db.execute("UPDATE emociones SET caracterizacion_version = 'v2'")
+    assert _vigentes(db) == {"A", "C"}
+
+    EmocionesRepository(db).delete_emocion("C", 0, 0)
+    assert repo.pendientes() == ["B", "C"]
+    assert repo.refresh(["B"]) == 1
+    assert _vigentes(db) == {"A", "B"}
+    assert _leido(db) == _esperado(db)
+
+
+def test_resolve_canonico_map_materializa_el_codigo(bootstrapped_db: Database) -> None:
+    db = bootstrapped_db
+    _poblar(db, random.Random(3))
+    e_repo = EmocionesRepository(db)
+
+    mapa = e_repo.resolve_canonicos_map("A", "fuente", "fuente_marca")
+
+    assert _vigentes(db) == {"A"}
+    indice = marca_canonicos_index(db, "fuente", "A")
+    rows = db.execute("SELECT * FROM emociones WHERE codigo = 'A'").fetchall()
+    assert mapa == {
+        (int(r["frase_idx"]), int(r["emocion_idx"])): canonicos
+        for r in rows
+        if (canonicos := resolver_canonicos(indice.get(("A", r["frase_idx"])), r["fuente_marca"]))
+    }
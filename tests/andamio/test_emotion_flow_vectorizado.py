@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from typing import Any
+
+import pandas as pd
+
+from emoparse.network import (
+    contagion_lift,
+    flujo_entre_comunidades,
+    foria_transition_by_scope,
+    foria_transition_matrix,
+    pares_respuesta,
+)
+from emoparse.network.emotion_coupling import FORIAS, SIN_EMOCION
+
+_TIPOS = ("miedo", "ira", "alegría", "asco", "esperanza")
+_FORIAS_MAPA = (*FORIAS, SIN_EMOCION, "rara")
+
+
+def _corpus(rng: random.Random, n: int = 120) -> tuple[pd.DataFrame, dict[str, Any]]:
+    ids = [f"p{i}" for i in range(n)]
+    df_posts = pd.DataFrame(
+        {
+            "post_id": ids,
+            "autor_handle": [rng.choice(("Ana", "beto", "CARO", "dani", None)) for _ in ids],
+            "en_respuesta_a": [rng.choice((*ids, "perdido", None, float("nan"))) for _ in ids],
+        }
+    )
+    tipos = {p: set(rng.sample(_TIPOS, rng.randint(1, 3))) for p in ids if rng.random() < 0.7}
+    foria_map = {p: rng.choice(_FORIAS_MAPA) for p in ids if rng.random() < 0.8}
+    comunidades = {h: rng.randint(0, 2) for h in ("ana", "Beto", "caro") if rng.random() < 0.9}
+    return df_posts, {"tipos": tipos, "foria_map": foria_map, "comunidades": comunidades}
+
+
+def _pares(df_posts: pd.DataFrame) -> list[tuple[str, str]]:
+    ids = {str(p) for p in df_posts["post_id"]}
+    return [
+        (str(padre), str(hijo))
+        for padre, hijo in zip(df_posts["en_respuesta_a"], df_posts["post_id"], strict=True)
+        if not pd.isna(padre) and str(padre) in ids
+    ]
+
+
+def _lift_por_pares(df_posts: pd.DataFrame, tipos: dict[str, set[str]]) -> pd.DataFrame:
+    pares, filas = _pares(df_posts), []
+    for tipo in sorted({t for tt in tipos.values() for t in tt}):
+        con_padre = [(p, h) for p, h in pares if tipo in tipos.get(p, ())]
+        if len(con_padre) < 5:
+            continue
+        replicas = sum(1 for _, h in con_padre if tipo in tipos.get(h, ()))
+        base = sum(1 for _, h in pares if tipo in tipos.get(h, ()))
+        p_cond, p_base = replicas / len(con_padre), base / len(pares)
+        filas.append(
+            {
+                "tipo_emocion": tipo,
+                "pares": len(pares),
+                "pares_con_padre": len(con_padre),
+                "replicas": replicas,
+                "p_condicional": round(p_cond, 4),
+                "p_base": round(p_base, 4),
+                "lift": round(p_cond / p_base, 3) if p_base else None,
+            }
+        )
+    return (
+        pd.DataFrame(filas)
+        .sort_values("lift", ascending=False, na_position="last")
+        .reset_index(drop=True)
+    )
+
+
+def _por_alcance(
+    df_posts: pd.DataFrame, foria_map: dict[str, str], comunidades: dict[str, int]
+) -> tuple[dict[str, Counter], dict[tuple[int, int], Counter]]:
+    comunidades = {k.lower(): v for k, v in comunidades.items()}
+    autor = {str(p): str(a).lower() for p, a in zip(df_posts["post_id"], df_posts["autor_handle"])}
+    matrices: dict[str, Counter] = {"intra": Counter(), "inter": Counter()}
+    flujo: dict[tuple[int, int], Counter] = {}
+    for padre, hijo in _pares(df_posts):
+        c_padre, c_hijo = comunidades.get(autor[padre]), comunidades.get(autor[hijo])
+        if c_padre is None or c_hijo is None:
+            continue
+        f_padre = foria_map.get(padre, SIN_EMOCION)
+        f_hijo = foria_map.get(hijo, SIN_EMOCION)
+        if f_hijo != SIN_EMOCION:
+            flujo.setdefault((c_padre, c_hijo), Counter())[f_hijo] += 1
+        if f_padre in FORIAS and f_hijo in FORIAS:
+            matrices["intra" if c_padre == c_hijo else "inter"][(f_padre, f_hijo)] += 1
+    return matrices, flujo
+
+
+def test_medidas_vectorizadas_reproducen_el_recorrido_por_pares() -> None:
+    for seed in range(10):
+        df_posts, insumos = _corpus(random.Random(seed))
+        tipos, foria_map, comunidades = (
+            insumos["tipos"],
+            insumos["foria_map"],
+            insumos["comunidades"],
+        )
+        pares = pares_respuesta(df_posts)
+        matrices, flujo = _por_alcance(df_posts, foria_map, comunidades)
+
+        for compartidos in (None, pares):
+            pd.testing.assert_frame_equal(
+                contagion_lift(df_posts, tipos, pares=compartidos),
+                _lift_por_pares(df_posts, tipos),
+            )
+            por_alcance = foria_transition_by_scope(
+                df_posts, foria_map, comunidades, pares=compartidos
+            )
+            for alcance, matriz in por_alcance.items():
+                assert {
+                    (f, g): int(matriz.loc[f, g])
+                    for f in FORIAS
+                    for g in FORIAS
+                    if matriz.loc[f, g]
+                } == dict(matrices[alcance])
+            df_flujo = flujo_entre_comunidades(df_posts, foria_map, comunidades, pares=compartidos)
+            assert {
+                (r["comunidad_origen"], r["comunidad_destino"]): (
+                    r["respuestas"],
+                    [r[f] for f in FORIAS],
+                )
+                for r in df_flujo.to_dict(orient="records")
+            } == {
+                clave: (sum(c.values()), [c.get(f, 0) for f in FORIAS])
+                for clave, c in flujo.items()
+            }
+            global_ = foria_transition_matrix(
+                df_posts, foria_map, include_sin_emocion=True, pares=compartidos
+            )
+            total = sum(
+                1
+                for p, h in _pares(df_posts)
+                if foria_map.get(p, SIN_EMOCION) in (*FORIAS, SIN_EMOCION)
+                and foria_map.get(h, SIN_EMOCION) in (*FORIAS, SIN_EMOCION)
+            )
+            assert int(global_.values.sum()) == total
+
+
+def test_sin_pares_devuelve_tablas_vacias() -> None:
+    df_posts = pd.DataFrame({"post_id": ["a", "b"], "autor_handle": ["x", "y"]})
+
+    assert contagion_lift(df_posts, {"a": {"miedo"}}).empty
+    assert flujo_entre_comunidades(df_posts, {"a": "euforico"}, {"x": 0}).empty
+    assert int(foria_transition_matrix(pd.DataFrame(), {}).values.sum()) == 0
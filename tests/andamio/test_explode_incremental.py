@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Any
+
+from emoparse.pipeline.retry_policies import RetryPolicy, RetryPolicyApplier, RetryPolicyFile
+from emoparse.pipeline.stages import ExplodeEmotionsStage
+from emoparse.storage.db import Database
+from emoparse.storage.discursos import DiscursosRepository
+from emoparse.storage.emociones import EmocionesRepository
+from emoparse.storage.frases import FrasesRepository
+from emoparse.storage.materializaciones import MaterializacionesRepository
+from emoparse.storage.menciones import MencionesRepository
+
+
+def _emocion(tipo: str) -> dict[str, Any]:
+    return {
+        "experienciador": "el enunciador",
+        "experienciador_marca": "yo",
+        "tipo_emocion": tipo,
+        "modo_existencia": "realizada",
+        "fuente_marca": "la medida",
+        "fuente_inferencia": "la medida",
+    }
+
+
+def _stage(db: Database) -> tuple[ExplodeEmotionsStage, FrasesRepository]:
+    d_repo = DiscursosRepository(db)
+    f_repo = FrasesRepository(db)
+    for codigo in ("A", "B", "C"):
+        d_repo.upsert_input(codigo, {"titulo": codigo, "contenido": "x"})
+        d_repo.set_payload(codigo, "enunciation", {"enunciador": "La oradora"})
+        f_repo.upsert_frase(codigo, 0, "Me alegra la medida.")
+        f_repo.set_payload(codigo, 0, "actores", [])
+        f_repo.set_payload(codigo, 0, "emociones", [_emocion("alegría")])
+    stage = ExplodeEmotionsStage(
+        d_repo,
+        f_repo,
+        EmocionesRepository(db),
+        MencionesRepository(db),
+        materializaciones_repo=MaterializacionesRepository(db),
+    )
+    return stage, f_repo
+
+
+def test_resume_sin_cambios_no_rematerializa(bootstrapped_db: Database) -> None:
+    stage, f_repo = _stage(bootstrapped_db)
+
+    assert stage.run_pending() == 3
+    assert stage.run_pending() == 0
+
+    # Reescribir el mismo payload (p. ej. un hit de caché) no ensucia.
+    f_repo.set_payload("A", 0, "emociones", [_emocion("alegría")])
+    assert stage.run_pending() == 0
+
+
+def test_solo_rematerializa_el_discurso_que_cambio(bootstrapped_db: Database) -> None:
+    stage, f_repo = _stage(bootstrapped_db)
+    stage.run_pending()
+
+    f_repo.set_payload("B", 0, "emociones", [_emocion("miedo")])
+
+    assert stage.run_pending() == 1
+    tipos = bootstrapped_db.execute(
+        "SELECT codigo, tipo_emocion FROM emociones ORDER BY codigo"
+    ).fetchall()
+    assert [tuple(r) for r in tipos] == [("A", "alegría"), ("B", "miedo"), ("C", "alegría")]
+
+
+def test_retry_policy_y_technoparse_cuentan_como_cambio(bootstrapped_db: Database) -> None:
+    stage, _ = _stage(bootstrapped_db)
+    m_repo = MencionesRepository(bootstrapped_db)
+    seed = [{"unit_idx": 0, "marca": "@pepe", "handle": "@pepe"}]
+    m_repo.seed_technoparse("C", seed)
+    stage.run_pending()
+
+    # Re-sembrar lo mismo reutiliza las filas: C sigue limpio.
+    m_repo.seed_technoparse("C", seed)
+    assert stage.run_pending() == 0
+
+    m_repo.seed_technoparse("C", [{"unit_idx": 0, "marca": "@ana", "handle": "@ana"}])
+    assert stage.run_pending() == 1
+
+    # Vaciar payloads desde una retry policy también cuenta como cambio.
+    mat_repo = MaterializacionesRepository(bootstrapped_db)
+    previas = mat_repo.huellas(stage.NAME)
+    RetryPolicyApplier(bootstrapped_db).apply(
+        RetryPolicyFile(policies=[RetryPolicy(stage="emotions", target="completed")])
+    )
+    actuales = mat_repo.huellas_de_insumos(extra=stage._huella_extra())
+    assert all(actuales[c] != previas[c] for c in ("A", "B", "C"))
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import itertools
+import random
+
+from emoparse.pipeline.post_context import (
+    clave_contexto_hilo,
+    make_hilo_context_provider,
+    materialize_hilo_contexts,
+)
+from emoparse.storage.contexto_hilo import ContextoHiloRepository
+from emoparse.storage.db import Database
+from emoparse.storage.hilos import HilosRepository
+from emoparse.storage.posts import PostsRepository
+
+_HANDLES = ("ana", "beto", "caro", "dani")
+
+
+def _poblar(db: Database, rng: random.Random, n: int = 40) -> None:
+    ids = [f"p{i}" for i in range(n)]
+    referencias = (*ids, "perdido", None, None)
+    posts = []
+    for post_id in ids:
+        menciones = " ".join(f"@{h}" for h in rng.sample(_HANDLES, rng.randint(0, 2)))
+        posts.append(
+            {
+                "post_id": post_id,
+                "plataforma": "bluesky",
+                "autor_handle": rng.choice(_HANDLES),
+                "texto": rng.choice(("", f"hola {menciones} " + "x" * rng.randint(0, 300))),
+                "fecha": rng.choice((None, "2024-01-01", "2024-01-02")),
+                "conversacion_id": rng.choice(("p0", "p1", "otra", None)),
+                "en_respuesta_a": rng.choice(referencias),
+                "cita_a": rng.choice((None, None, "perdido", *ids[:5])),
+            }
+        )
+    PostsRepository(db).upsert_posts(posts)
+    HilosRepository(db).upsert_hilos(
+        [
+            {"conversacion_id": conv, "post_raiz": conv, "n_posts": rng.randint(1, 4)}
+            for conv in ("p0", "otra")
+        ]
+    )
+
+
+def test_materializado_reproduce_el_provider_por_consultas(bootstrapped_db: Database) -> None:
+    db = bootstrapped_db
+    posts_repo, hilos_repo = PostsRepository(db), HilosRepository(db)
+    for seed in range(6):
+        db.execute("DELETE FROM posts")
+        db.execute("DELETE FROM hilos")
+        _poblar(db, random.Random(seed))
+        codigos = [r[0] for r in db.execute("SELECT post_id FROM posts")] + ["ausente"]
+        for parents, root, participants, con_hilos in itertools.product(
+            (0, 2, 5), (False, True), (False, True), (False, True)
+        ):
+            parametros = {
+                "max_parents": parents,
+                "include_root": root,
+                "include_participants": participants,
+                "max_chars": 100_000,
+            }
+            h_repo = hilos_repo if con_hilos else None
+            por_consultas = make_hilo_context_provider(posts_repo, h_repo, **parametros)
+            materializado = make_hilo_context_provider(
+                posts_repo, h_repo, contextos_repo=ContextoHiloRepository(db), **parametros
+            )
+
+            assert [materializado(c) for c in codigos] == [por_consultas(c) for c in codigos]
+
+
+def test_escrituras_en_posts_o_hilos_vacian_lo_materializado(bootstrapped_db: Database) -> None:
+    db = bootstrapped_db
+    _poblar(db, random.Random(1))
+    repo = ContextoHiloRepository(db)
+    clave = clave_contexto_hilo(
+        True,
+        max_parents=2,
+        include_root=False,
+        include_participants=True,
+        max_participant_posts=2,
+        participant_post_chars=200,
+    )
+    materialize_hilo_contexts(repo, max_parents=2)
+    assert repo.textos(clave)
+
+    # La clasificación de reframing no cambia el contexto: no invalida.
+    PostsRepository(db).set_reframing("p3", {"operacion": "x"}, "v1")
+    assert repo.textos(clave)
+
+    HilosRepository(db).upsert_hilos([{"conversacion_id": "p0", "post_raiz": "p0", "n_posts": 9}])
+    assert repo.textos(clave) is None
+
+    materialize_hilo_contexts(repo, max_parents=2)
+    db.execute("UPDATE posts SET texto = 'editado' WHERE post_id = 'p2'")
+    assert repo.textos(clave) is None
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from emoparse.core.backend.llamacpp import LlamaCppBackend, _prefix_key, _PrefixStateCache
+from emoparse.pipeline.runner import _MeteredBackend
+from emoparse.storage.metrics import StageMetricsAccumulator
+
+
+def _chat(messages: list[dict[str, str]]) -> str:
+    return "".join(f"<{m['role']}>{m['content']}" for m in messages)
+
+
+class _FakeLlama:
+    """Imita la reutilización de prefijo de llama.cpp con un token por carácter."""
+
+    def __init__(self) -> None:
+        self.input_ids: list[int] = []
+        self.evaluados = 0
+        self.loads = 0
+        #: KV de partida y tokens evaluados por cada `create_chat_completion`.
+        self.llamadas: list[tuple[tuple[int, ...], int]] = []
+
+    def reset(self) -> None:
+        self.input_ids = []
+
+    def tokenize(self, text: bytes, add_bos: bool = True, special: bool = False) -> list[int]:
+        return [ord(c) for c in text.decode("utf-8")]
+
+    def eval(self, tokens: list[int]) -> None:
+        self.evaluados += len(tokens)
+        self.input_ids = [*self.input_ids, *tokens]
+
+    def save_state(self) -> Any:
+        return SimpleNamespace(input_ids=list(self.input_ids), n_tokens=len(self.input_ids))
+
+    def load_state(self, state: Any) -> None:
+        self.loads += 1
+        self.input_ids = list(state.input_ids[: state.n_tokens])
+
+    def create_chat_completion(self, **kwargs: Any) -> dict[str, Any]:
+        prompt = [ord(c) for c in _chat(kwargs["messages"])]
+        inicio = tuple(self.input_ids)
+        comunes = 0
+        for a, b in zip(self.input_ids, prompt, strict=False):
+            if a != b:
+                break
+            comunes += 1
+        comunes = min(comunes, len(prompt) - 1)
+        self.evaluados += len(prompt) - comunes
+        self.llamadas.append((inicio, len(prompt) - comunes))
+        self.input_ids = [*prompt, ord("!")]
+        return {
+            "choices": [{"message": {"content": "ok"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt), "completion_tokens": 1},
+        }
+
+
+def _backend(slots: int) -> tuple[LlamaCppBackend, _FakeLlama]:
+    llm = _FakeLlama()
+    backend = LlamaCppBackend.__new__(LlamaCppBackend)
+    backend.alias = "fake"
+    backend._cfg = {}
+    backend._default_max_tokens = 16
+    backend._default_temperature = 0.0
+    backend._default_seed = 42
+    backend._top_p, backend._top_k, backend._min_p, backend._repeat_penalty = 1.0, 40, 0.0, 1.0
+    backend._no_think = False
+    backend._grammar_cache = {}
+    backend._prefix_cache = _PrefixStateCache(slots)
+    backend._llm = llm  # type: ignore[assignment]
+    backend.__dict__["_chat_formatter"] = lambda messages: SimpleNamespace(
+        prompt=_chat(messages), added_special=True
+    )
+    return backend, llm
+
+
+def test_snapshot_del_system_evita_el_prefill_y_se_reporta() -> None:
+    backend, llm = _backend(slots=2)
+    system = "S" * 200
+
+    primera = backend.generate(system, "user uno")
+    backend.generate("otro system", "x")
+    segunda = backend.generate(system, "user dos")
+
+    assert primera.extra["prefill_tokens_saved"] == 0
+    assert segunda.extra["prefill_tokens_saved"] >= len(system)
+    # Toda llamada arranca de un snapshot, también la que lo construye.
+    assert llm.loads == 3
+    assert llm.evaluados < 3 * len(system)
+
+
+def test_lru_desaloja_el_system_menos_usado() -> None:
+    backend, llm = _backend(slots=1)
+
+    backend.generate("A" * 50, "u")
+    backend.generate("B" * 50, "u")
+    respuesta = backend.generate("A" * 50, "u")
+
+    assert respuesta.extra["prefill_tokens_saved"] == 0
+    assert len(backend._prefix_cache) == 1
+
+
+def test_estado_de_partida_no_depende_del_orden_ni_de_hits() -> None:
+    system = "S" * 50
+
+    # "uno" antes que "dos"; solo "dos" ("uno" lo resolvió el caché LLM);
+    # "dos" primero, otro system en el medio y "uno" después.
+    en_orden, llm_orden = _backend(slots=2)
+    en_orden.generate(system, "uno")
+    en_orden.generate(system, "dos")
+    con_hit, llm_hit = _backend(slots=2)
+    con_hit.generate(system, "dos")
+    invertido, llm_inv = _backend(slots=2)
+    invertido.generate(system, "dos")
+    invertido.generate("otro", "x")
+    invertido.generate(system, "uno")
+
+    prefijo = tuple(ord(c) for c in f"<system>{system}<user>")
+    assert llm_orden.llamadas[1] == llm_hit.llamadas[0] == llm_inv.llamadas[0]
+    assert llm_orden.llamadas[0] == llm_inv.llamadas[2]
+    assert {inicio for inicio, _ in llm_orden.llamadas} == {prefijo}
+    # El snapshot es solo el prefijo del system: sin user ni respuesta.
+    estado = invertido._prefix_cache._states[_prefix_key(system)]
+    assert tuple(estado.input_ids) == prefijo
+
+
+def test_sin_slots_no_se_guardan_snapshots() -> None:
+    backend, llm = _backend(slots=0)
+
+    backend.generate("A" * 50, "u")
+    respuesta = backend.generate("A" * 50, "v")
+
+    assert "prefill_tokens_saved" not in respuesta.extra
+    assert len(backend._prefix_cache) == 0
+
+
+def test_metered_backend_acumula_prefill_evitado() -> None:
+    backend, _ = _backend(slots=2)
+    acc = StageMetricsAccumulator()
+    metered = _MeteredBackend(backend, acc)
+
+    metered.generate("S" * 100, "u1")
+    metered.generate("S" * 100, "u2")
+
+    assert acc.snapshot().prefill_tokens_saved >= 100
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import random
+from collections import deque
+
+import numpy as np
+
+from emoparse.network import centrality
+
+
+def _grafo(rng: random.Random, n: int, m: int, dirigido: bool) -> tuple[np.ndarray, ...]:
+    """Aristas simples al azar (con algún bucle), como las da networkx."""
+    vistas: set[tuple[int, int]] = set()
+    for _ in range(m):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if not dirigido and (v, u) in vistas:
+            continue
+        vistas.add((u, v))
+    src, dst = (np.array(c, dtype=np.int64) for c in zip(*sorted(vistas), strict=True))
+    peso = np.array([rng.choice((0.5, 1.0, 3.0)) for _ in vistas])
+    return src, dst, peso
+
+
+def _intermediacion_por_pares(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Referencia: caminos mínimos par a par, sumando σ_st(v)/σ_st."""
+    ady: list[set[int]] = [set() for _ in range(n)]
+    for u, v in zip(src.tolist(), dst.tolist(), strict=True):
+        if u != v:
+            ady[u].add(v)
+    dist, sigma = [], []
+    for s in range(n):
+        d, c = [-1] * n, [0] * n
+        d[s], c[s] = 0, 1
+        cola = deque([s])
+        while cola:
+            u = cola.popleft()
+            for v in ady[u]:
+                if d[v] == -1:
+                    d[v] = d[u] + 1
+                    cola.append(v)
+                if d[v] == d[u] + 1:
+                    c[v] += c[u]
+        dist.append(d)
+        sigma.append(c)
+    bc = np.zeros(n)
+    for s in range(n):
+        for t in range(n):
+            if s == t or dist[s][t] <= 0:
+                continue
+            for v in range(n):
+                if v in (s, t) or dist[s][v] <= 0 or dist[v][t] <= 0:
+                    continue
+                if dist[s][v] + dist[v][t] == dist[s][t]:
+                    bc[v] += sigma[s][v] * sigma[v][t] / sigma[s][t]
+    return bc / ((n - 1) * (n - 2))
+
+
+def _pagerank_denso(n: int, src: np.ndarray, dst: np.ndarray, peso: np.ndarray) -> np.ndarray:
+    """Referencia: el punto fijo de PageRank resuelto como sistema lineal."""
+    A = np.zeros((n, n))
+    np.add.at(A, (src, dst), peso)
+    salida = A.sum(axis=1)
+    P = np.divide(A, salida[:, None], out=np.full((n, n), 1.0 / n), where=salida[:, None] > 0)
+    alpha = centrality.PAGERANK_ALPHA
+    return np.linalg.solve(np.eye(n) - alpha * P.T, np.full(n, (1 - alpha) / n))
+
+
+def test_metricas_exactas_coinciden_con_las_referencias() -> None:
+    rng = random.Random(7)
+    for _ in range(12):
+        n, dirigido = rng.randint(3, 25), rng.random() < 0.5
+        src, dst, peso = _grafo(rng, n, rng.randint(1, 60), dirigido)
+        a_src, a_dst, a_peso = centrality.arcos(src, dst, peso, dirigido)
+
+        bc = centrality.intermediacion(n, a_src, a_dst)
+        pr = centrality.pagerank(n, a_src, a_dst, a_peso)
+
+        np.testing.assert_allclose(bc, _intermediacion_por_pares(n, a_src, a_dst), atol=1e-12)
+        np.testing.assert_allclose(pr, _pagerank_denso(n, a_src, a_dst, a_peso), atol=1e-4)
+        _, _, total = centrality.grados(n, src, dst)
+        assert total.sum() == 2 * len(src)
+
+
+def test_intermediacion_muestreada_respeta_la_cota_y_la_seed() -> None:
+    n = 300
+    src, dst, _ = _grafo(random.Random(3), n, 1200, dirigido=False)
+    a_src, a_dst, _ = centrality.arcos(src, dst, np.ones(len(src)), dirigido=False)
+    exacta = centrality.intermediacion(n, a_src, a_dst)
+
+    k = 60
+    estimada = centrality.intermediacion(n, a_src, a_dst, k=k, seed=5)
+
+    assert np.abs(estimada - exacta).max() <= centrality.cota_de_error(n, k, delta=0.05)
+    np.testing.assert_array_equal(estimada, centrality.intermediacion(n, a_src, a_dst, k=k, seed=5))
+    assert centrality.muestras_para_error(n, 0.02, 0.05) > n  # con tanta precisión, exacta
+    assert centrality.cota_de_error(n, n, delta=0.05) == 0.0
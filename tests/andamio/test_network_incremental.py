@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from typing import Any
+
+import pandas as pd
+
+from emoparse.network import GRAFOS, build_edges, build_edges_for_posts, posts_afectados
+from emoparse.storage.db import Database
+from emoparse.storage.posts import PostsRepository
+from emoparse.storage.red import RedRepository
+from emoparse.storage.tecno import TecnoRepository
+
+_HANDLES = ("ana", "beto", "caro", "dani")
+
+
+def _post(rng: random.Random, post_id: str, ids: list[str]) -> dict[str, Any]:
+    referencias = (*ids, "perdido", None, None)
+    return {
+        "post_id": post_id,
+        "plataforma": "bluesky",
+        "autor_handle": rng.choice(_HANDLES),
+        "texto": "hola",
+        "fecha": rng.choice((None, "2024-01-01", "2024-01-02")),
+        "en_respuesta_a": rng.choice(referencias),
+        "reposteo_a": rng.choice((None, None, *ids[:4])),
+        "cita_a": rng.choice(referencias),
+    }
+
+
+def _tecno(db: Database, rng: random.Random, codigo: str) -> None:
+    db.execute("INSERT OR IGNORE INTO discursos (codigo, input) VALUES (?, ?)", (codigo, "{}"))
+    entidades = [
+        {
+            "unit_idx": rng.randint(0, 1),
+            "tipo": tipo,
+            "valor": valor,
+            "valor_norm": valor,
+            "inicio": i,
+            "fin": i + 1,
+        }
+        for i in range(rng.randint(0, 4))
+        for tipo, valor in [
+            rng.choice(
+                [("mencion", h) for h in _HANDLES] + [("hashtag", t) for t in ("a", "b", "c")]
+            )
+        ]
+    ]
+    TecnoRepository(db).replace_for_codigo(codigo, entidades)
+
+
+def _read(db: Database, sql: str) -> pd.DataFrame:
+    return pd.DataFrame([dict(r) for r in db.execute(sql).fetchall()])
+
+
+def _multiconjunto(df: pd.DataFrame) -> Counter:
+    if df.empty:
+        return Counter()
+    return Counter(
+        (r["origen"], r["destino"], r["post_id"], r["fecha"]) for r in df.to_dict(orient="records")
+    )
+
+
+def test_reconstruccion_incremental_reproduce_la_completa(bootstrapped_db: Database) -> None:
+    db = bootstrapped_db
+    posts_repo, red_repo = PostsRepository(db), RedRepository(db)
+    rng = random.Random(11)
+    ids = [f"p{i}" for i in range(30)]
+    posts_repo.upsert_posts([_post(rng, p, ids) for p in ids])
+    for p in ids[:20]:
+        _tecno(db, rng, p)
+
+    for grafo, cambiados in red_repo.preparar_construccion(GRAFOS, incremental=True).items():
+        assert cambiados is None  # nunca construidos: van enteros
+        red_repo.replace_edges(
+            grafo,
+            build_edges(
+                _read(db, "SELECT * FROM posts"),
+                _read(db, "SELECT * FROM tecno_entidades"),
+                (grafo,),
+            ),
+        )
+
+    for ronda in range(4):
+        # Posts nuevos (algunos ya referidos), cambios de autor, borrados y
+        # menciones/hashtags reescritos.
+        nuevos = [f"n{ronda}_{i}" for i in range(3)] + ["perdido"] * (ronda == 0)
+        ids.extend(nuevos)
+        posts_repo.upsert_posts([_post(rng, p, ids) for p in nuevos])
+        db.execute(
+            "UPDATE posts SET autor_handle = ? WHERE post_id = ?",
+            (rng.choice(_HANDLES), rng.choice(ids)),
+        )
+        db.execute("DELETE FROM posts WHERE post_id = ?", (ids.pop(rng.randrange(len(ids))),))
+        _tecno(db, rng, rng.choice(ids))
+        db.execute("DELETE FROM discursos WHERE codigo = ?", (f"p{rng.randrange(20)}",))
+
+        preparados = red_repo.preparar_construccion(GRAFOS, incremental=True)
+        df_posts = _read(db, "SELECT * FROM posts")
+        df_tecno = _read(db, "SELECT * FROM tecno_entidades")
+        for grafo, cambiados in preparados.items():
+            assert cambiados is not None
+            afectados = posts_afectados(df_posts, grafo, cambiados)
+            red_repo.replace_edges_for_posts(
+                grafo, afectados, build_edges_for_posts(df_posts, df_tecno, grafo, afectados)
+            )
+            assert _multiconjunto(red_repo.load_edges(grafo)) == _multiconjunto(
+                build_edges(df_posts, df_tecno, (grafo,))
+            )
+
+
+def test_pendientes_solo_ante_cambios_que_mueven_aristas(bootstrapped_db: Database) -> None:
+    db = bootstrapped_db
+    posts_repo, red_repo = PostsRepository(db), RedRepository(db)
+    posts = [_post(random.Random(2), p, ["a", "b"]) for p in ("a", "b")]
+    posts_repo.upsert_posts(posts)
+    red_repo.preparar_construccion(("reply",), incremental=True)
+
+    posts_repo.upsert_posts(posts)  # mismo contenido
+    db.execute("UPDATE posts SET texto = 'editado' WHERE post_id = 'a'")
+    assert red_repo.preparar_construccion(("reply",), incremental=True) == {"reply": set()}
+
+    db.execute("UPDATE posts SET autor_handle = 'otra' WHERE post_id = 'b'")
+    preparados = red_repo.preparar_construccion(("reply",), incremental=True)
+    assert preparados == {"reply": {"b"}}
+
+    # Una construcción fallida devuelve los pendientes tomados.
+    red_repo.revertir_construccion(preparados)
+    assert red_repo.preparar_construccion(("reply",), incremental=True) == {"reply": {"b"}}
@@ -0,0 +1,163 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  tests/andamio/test_prefetch_batches
+#
+#  Preparación anticipada: el insumo del item N+1 se arma en un hilo auxiliar
+#  mientras el N está en el modelo, sin cambiar resultados ni orden.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pandas as pd
+import pytest
+from pydantic import BaseModel, RootModel
+
+from emoparse.agents.base import BaseBatchAgent
+from emoparse.core.backend.base import LLMResponse
+from emoparse.core.prefetch import anticipar
+from emoparse.pipeline.stages import ActorsStage
+from emoparse.storage.db import Database
+from emoparse.storage.discursos import DiscursosRepository
+from emoparse.storage.frases import FrasesRepository
+from tests.factories import FakeBackend
+
+
+class _Lento(FakeBackend):
+    """Tarda en cada llamada y anota cuándo entró y salió del modelo."""
+
+    def __init__(self, demora: float = 0.05) -> None:
+        super().__init__()
+        self._demora = demora
+        self.llamadas: list[tuple[float, float]] = []
+        self.preparados: list[tuple[Any, int | None]] = []
+
+    def generate(self, system: str, user: str, **kwargs: Any) -> LLMResponse:
+        inicio = time.monotonic()
+        time.sleep(self._demora)
+        if kwargs.get("schema") is _Lote:
+            self._responses.append([{"unit_idx": i, "eco": ""} for i in range(kwargs["max_items"])])
+        respuesta = super().generate(system, user, **kwargs)
+        self.llamadas.append((inicio, time.monotonic()))
+        return respuesta
+
+    def prepare(self, schema: type[BaseModel], max_items: int | None = None) -> None:
+        self.preparados.append((schema, max_items))
+
+
+class _Item(BaseModel):
+    unit_idx: int
+    eco: str
+
+
+class _Lote(RootModel[list[_Item]]):
+    pass
+
+
+class _EcoAgent(BaseBatchAgent[_Lote]):
+    NAME = "eco"
+    SCHEMA = _Lote
+    OUTPUT_COLUMNS = ("eco",)
+    BATCH_SIZE = 2
+
+    def __init__(self, backend: FakeBackend) -> None:
+        super().__init__(backend)
+        self.armados: list[tuple[float, str]] = []
+
+    def _build_system(self) -> str:
+        return "sistema"
+
+    def _build_user(self, batch: pd.DataFrame) -> str:
+        self.armados.append((time.monotonic(), threading.current_thread().name))
+        return "\n".join(f"[{i}] {t}" for i, t in enumerate(batch["texto"]))
+
+    def _map_item_to_columns(self, item: BaseModel, row: pd.Series) -> dict[str, Any]:
+        return {"eco": f"{row['texto']}:{item.unit_idx}"}  # type: ignore[attr-defined]
+
+
+def test_anticipar_acotado_en_orden_y_con_errores_diferidos() -> None:
+    en_vuelo: list[int] = []
+    maximo = 0
+    lock = threading.Lock()
+
+    def preparar(n: int) -> int:
+        if n == 3:
+            raise ValueError("tres")
+        with lock:
+            en_vuelo.append(n)
+        return n * 10
+
+    vistos: list[int] = []
+    for n, futuro in anticipar(list(range(6)), preparar, anticipacion=2):
+        time.sleep(0.01)
+        with lock:
+            # Preparados y no consumidos: nunca más que la anticipación + el actual.
+            maximo = max(maximo, len([m for m in en_vuelo if m > n]))
+        if n == 3:
+            with pytest.raises(ValueError, match="tres"):
+                futuro.result()
+            continue
+        vistos.append(futuro.result())
+
+    assert vistos == [0, 10, 20, 40, 50]
+    assert maximo <= 2
+    # Sin anticipación todo corre en el hilo que llama.
+    hilos = {f.result() for _, f in anticipar([0], lambda _: threading.current_thread().name)}
+    assert hilos == {threading.current_thread().name}
+
+
+def test_agente_arma_el_batch_siguiente_mientras_decodifica() -> None:
+    df = pd.DataFrame({"texto": [f"t{i}" for i in range(7)]})
+
+    en_serie = _EcoAgent(_Lento())
+    en_serie.prefetch = 0
+    esperado = en_serie.run(df)
+
+    backend = _Lento()
+    agente = _EcoAgent(backend)
+    salida = agente.run(df)
+
+    pd.testing.assert_frame_equal(salida, esperado)
+    assert list(salida["eco"]) == [f"t{i}:{i % 2}" for i in range(7)]
+    assert [n for _, n in backend.preparados] == [2, 2, 2, 1]
+    # El prompt del batch N+1 se armó en el hilo auxiliar antes de que el
+    # modelo terminara el N.
+    assert all(nombre.startswith("prefetch") for _, nombre in agente.armados)
+    for (armado, _), (_, fin_anterior) in zip(agente.armados[1:], backend.llamadas, strict=False):
+        assert armado < fin_anterior
+
+
+def _posts(db: Database, n: int) -> tuple[DiscursosRepository, FrasesRepository]:
+    d_repo = DiscursosRepository(db)
+    f_repo = FrasesRepository(db)
+    for k in range(n):
+        codigo = f"post{k}"
+        d_repo.upsert_input(codigo, {"titulo": "", "contenido": f"texto {k}"})
+        d_repo.set_payload(codigo, "enunciation", {"enunciador": f"@cuenta{k}"})
+        f_repo.upsert_frase(codigo, 0, f"texto del post {k}")
+    return d_repo, f_repo
+
+
+def test_stage_prepara_el_discurso_siguiente_durante_la_inferencia(
+    bootstrapped_db: Database,
+) -> None:
+    d_repo, f_repo = _posts(bootstrapped_db, 4)
+    backend = _Lento()
+    stage = ActorsStage(backend, d_repo, f_repo)
+    preparados: list[tuple[float, str]] = []
+    original = stage._build_input_df
+
+    def _build_input_df(codigo: str, unit_idxs: list[int]) -> pd.DataFrame:
+        preparados.append((time.monotonic(), codigo))
+        return original(codigo, unit_idxs)
+
+    stage._build_input_df = _build_input_df  # type: ignore[method-assign]
+
+    assert stage.run_pending() == 4
+
+    assert [codigo for _, codigo in preparados] == [f"post{k}" for k in range(4)]
+    for (preparado, _), (_, fin_anterior) in zip(preparados[1:], backend.llamadas, strict=False):
+        assert preparado < fin_anterior
+    assert f_repo.list_pending("actores") == []
@@ -0,0 +1,82 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  tests/andamio/test_prompt_render_cache
+#
+#  Render de prompts: el bytecode compilado queda en disco para los procesos
+#  siguientes y el tiempo de render llega a las métricas de la stage.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from jinja2 import FileSystemBytecodeCache
+from jinja2.bccache import Bucket
+
+from emoparse.core.prompts import _loader, emotions
+from emoparse.storage.db import Database
+from emoparse.storage.metrics import MetricsRepository, StageMetricsAccumulator
+
+
+def _sistema() -> str:
+    return emotions.render_system(
+        configuraciones="C1\nC2",
+        titulo="T",
+        tipo_discurso="tuit",
+        enunciador="@a",
+        heuristicas="H1",
+        modos_existencia="M1",
+        template="emotions_system_tuit",
+    )
+
+
+class _Cache(FileSystemBytecodeCache):
+    """Anota los templates que se cargaron desde el bytecode en disco."""
+
+    def __init__(self, directory: Path) -> None:
+        super().__init__(directory=str(directory), pattern="emoparse-%s.cache")
+        self.cargados: list[str] = []
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            self.cargados.append(bucket.key)
+
+
+def test_bytecode_compilado_queda_en_disco(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    caches: list[_Cache] = []
+
+    def _nuevo_cache() -> _Cache:
+        caches.append(_Cache(tmp_path))
+        return caches[-1]
+
+    monkeypatch.setattr(_loader, "_bytecode_cache", _nuevo_cache)
+    _loader._env.cache_clear()
+    try:
+        assert list(tmp_path.iterdir()) == []
+        _sistema()
+        assert len(list(tmp_path.glob("emoparse-*.cache"))) == 1
+        assert caches[0].cargados == []
+
+        # Un Environment nuevo (otro proceso) carga desde el bucket sin recompilar.
+        _loader._env.cache_clear()
+        _sistema()
+        assert len(caches) == 2
+        assert len(caches[1].cargados) == 1
+    finally:
+        _loader._env.cache_clear()
+
+
+def test_tiempo_de_render_llega_a_run_metrics(bootstrapped_db: Database) -> None:
+    antes = _loader.render_time_ms()
+    _sistema()
+    transcurrido = _loader.render_time_ms() - antes
+    assert transcurrido > 0
+
+    acc = StageMetricsAccumulator()
+    acc.record_render(transcurrido)
+    repo = MetricsRepository(bootstrapped_db)
+    repo.insert("run-1", "emotions", acc.snapshot())
+
+    [fila] = repo.list_for_run("run-1")
+    assert fila["render_ms"] == pytest.approx(transcurrido)
@@ -0,0 +1,150 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  tests/andamio/test_referent_index
+#
+#  Índice persistente de referentes: candidatos sin topes silenciosos,
+#  sync incremental, pase semántico por LSH y lectura sin escritura desde el
+#  dashboard.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+from loguru import logger
+
+from emoparse.app import _cache
+from emoparse.app import actions as actions_layer
+from emoparse.app import data as data_layer
+from emoparse.storage import Database, DiscursosRepository
+from emoparse.storage import referent_index as ri
+from emoparse.storage.models import RunContext
+from emoparse.storage.runs import RunsRepository
+
+_RELLENO = [f"gobierno_{chr(97 + i // 26)}{chr(97 + i % 26)}zz" for i in range(80)]
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpia():
+    _cache.invalidate()
+    yield
+    _cache.invalidate()
+    _cache.close_pools()
+
+
+def test_bloque_grande_no_se_saltea(tmp_path: Path) -> None:
+    counts = {c: 1 for c in [*_RELLENO, "gobierno_nacional", "gobierno_nacionall"]}
+    counts["gobierno_nacional_argentino"] = 1
+
+    with ri.ReferentIndex.open(tmp_path / "r.referentes.idx") as idx:
+        idx.sync(counts)
+        pares = idx.scored_pairs(0.9)
+
+    # "gobierno" tiene 83 canónicos: el blocking clásico lo salteaba entero.
+    assert ("gobierno_nacional", "gobierno_nacionall") in pares
+    assert ("gobierno_nacional", "gobierno_nacional_argentino") in pares
+    # Compartir solo un token frecuente no alcanza ("gobierno_aazz" / "gobierno_abzz").
+    assert not [p for p in pares if p[0] in _RELLENO and p[1] in _RELLENO]
+
+
+def test_sync_incremental_solo_firma_lo_nuevo(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "r.referentes.idx"
+    with ri.ReferentIndex.open(path) as idx:
+        idx.sync({"javier_milei": 3, "milei": 1, "cristina_kirchner": 2})
+
+    firmados: list[str] = []
+    original = ri._minhash
+    monkeypatch.setattr(ri, "_minhash", lambda cids: firmados.extend(cids) or original(cids))
+
+    with ri.ReferentIndex.open(path) as idx:
+        assert idx.sync({"javier_milei": 4, "cristina_kirchner": 2, "cristina_fernandez": 1}) == 2
+        assert firmados == ["cristina fernandez"]
+        assert idx.counts() == {"javier_milei": 4, "cristina_kirchner": 2, "cristina_fernandez": 1}
+        assert [c for c, _ in idx.similar("cristina_kirchner")] == ["cristina_fernandez"]
+
+
+def test_pase_semantico_por_lsh_y_vectores_persistidos(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    base = {c: rng.standard_normal(32) for c in ("pueblo", "patria", "casta", "gente")}
+    base["ciudadania"] = base["pueblo"] + 0.05 * rng.standard_normal(32)
+    pedidos: list[list[str]] = []
+
+    def vectorizar(cids: list[str]) -> dict[str, np.ndarray]:
+        pedidos.append(cids)
+        return {c: base[c] for c in cids if c in base}
+
+    path = tmp_path / "r.referentes.idx"
+    counts = {c: 1 for c in base}
+    with ri.ReferentIndex.open(path) as idx:
+        idx.sync(counts, vectorizar)
+        pares = idx.scored_pairs(0.95, embed_threshold=0.9)
+    with ri.ReferentIndex.open(path) as idx:
+        idx.sync({**counts, "oov": 1}, vectorizar)
+        idx.sync({**counts, "oov": 1}, vectorizar)
+
+    assert set(pares) == {("ciudadania", "pueblo")}
+    # Cada canónico se vectoriza una sola vez, incluso el que no tiene vector.
+    assert pedidos[1:] == [["oov"]]
+
+
+def _run_con_referentes(tmp_path: Path) -> Path:
+    path = tmp_path / "run_ref.sqlite"
+    db = Database(path)
+    RunsRepository(db).bootstrap(RunContext(run_id="run_ref", started_at=datetime.now(UTC)))
+    DiscursosRepository(db).upsert_input("d1", {"titulo": "Uno", "contenido": "Texto."})
+    with db.transaction() as cur:
+        for i, cid in enumerate(["presidente_milei", "presidente_milei", "presidenta_milei"]):
+            cur.execute(
+                "INSERT INTO menciones (codigo, unit_idx, marca) VALUES ('d1', ?, 'x')", (i,)
+            )
+            cur.execute(
+                "INSERT INTO mencion_canonico (mencion_id, canonical_id, status) "
+                "VALUES (?, ?, 'accepted')",
+                (cur.lastrowid, cid),
+            )
+    return path
+
+
+def test_suggest_referent_merges_usa_el_indice_del_run(tmp_path: Path) -> None:
+    path = _run_con_referentes(tmp_path)
+    assert actions_layer.refresh_referent_index(path) == 2
+    idx_path = ri.referent_index_path_for(path)
+    antes = idx_path.read_bytes()
+
+    grupos = data_layer.suggest_referent_merges(path, use_embeddings=False)
+
+    # La lectura no escribe el índice.
+    assert idx_path.read_bytes() == antes
+    assert grupos == [
+        {
+            "members": ["presidente_milei", "presidenta_milei"],
+            "sugerido": "presidente_milei",
+            "n_marcas": {"presidente_milei": 2, "presidenta_milei": 1},
+            "score": grupos[0]["score"],
+        }
+    ]
+    assert data_layer.similar_referents(path, "presidenta_milei")[0][0] == "presidente_milei"
+
+
+def test_lectura_sin_indice_no_lo_crea_y_avisa(tmp_path: Path) -> None:
+    path = _run_con_referentes(tmp_path)
+    avisos: list[str] = []
+    logger.add(lambda m: avisos.append(str(m)), level="WARNING")
+
+    parecidos = data_layer.similar_referents(path, "presidenta_milei")
+
+    assert parecidos[0][0] == "presidente_milei"
+    assert not ri.referent_index_path_for(path).exists()
+    assert any("Índice de referentes desactualizado" in a for a in avisos)
+
+
+def test_edicion_desde_la_app_mantiene_el_indice(tmp_path: Path) -> None:
+    path = _run_con_referentes(tmp_path)
+    actions_layer.rename_canonical(
+        path, "presidenta_milei", "javier_milei", kb_path=tmp_path / "kb.json"
+    )
+
+    with ri.ReferentIndex.in_memory_copy(ri.referent_index_path_for(path)) as idx:
+        assert idx.counts() == {"presidente_milei": 2, "javier_milei": 1}
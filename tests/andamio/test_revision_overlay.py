@@ -0,0 +1,110 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  tests/andamio/test_revision_overlay
+#
+#  Overlay de revisión: journal append-only, compactación sobre la base JSON,
+#  importación de overlays previos y export.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from emoparse.app import revision_overlay
+from emoparse.app.revision_overlay import (
+    OverlayCorruptError,
+    RevisionOverlay,
+    journal_path_for,
+)
+
+
+@pytest.fixture(autouse=True)
+def _estado_limpio():
+    revision_overlay._ESTADOS.clear()
+    yield
+    revision_overlay._ESTADOS.clear()
+
+
+def test_each_edit_appends_one_journal_line(tmp_path: Path) -> None:
+    path = tmp_path / "revision_overlay.json"
+    ov = RevisionOverlay(path)
+
+    ov.set_emocion_override_path("d1", 0, 1, ["caracterizacion", "foria"], "euforica")
+    ov.delete_emocion("d1", 0, 2)
+
+    lines = journal_path_for(path).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert not path.exists()
+
+
+def test_journal_is_replayed_by_a_fresh_process(tmp_path: Path) -> None:
+    path = tmp_path / "revision_overlay.json"
+    ov = RevisionOverlay(path)
+    ov.set_discurso_override("d1", "titulo", "Otro")
+    ov.add_emocion("d1", 3, {"tipo_emocion": "miedo"})
+
+    revision_overlay._ESTADOS.clear()
+    again = RevisionOverlay(path)
+
+    assert again.get_discurso("d1")["overrides"] == {"titulo": "Otro"}
+    assert again.list_new_emociones("d1", 3) == [{"tipo_emocion": "miedo"}]
+
+
+def test_compaction_folds_journal_into_base(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(revision_overlay, "COMPACT_EVERY", 3)
+    path = tmp_path / "revision_overlay.json"
+    ov = RevisionOverlay(path)
+    for i in range(4):
+        ov.confirm_emocion_field("d1", 0, i, "tipo_emocion")
+
+    base = json.loads(path.read_text(encoding="utf-8"))
+    assert sorted(base["emociones"]["d1"]["0"]) == ["0", "1", "2"]
+    assert len(journal_path_for(path).read_text(encoding="utf-8").splitlines()) == 1
+
+    revision_overlay._ESTADOS.clear()
+    assert RevisionOverlay(path).get_emocion("d1", 0, 3)["confirmado"] == {"tipo_emocion": True}
+
+
+def test_torn_last_line_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "revision_overlay.json"
+    RevisionOverlay(path).delete_emocion("d1", 0, 0)
+    with journal_path_for(path).open("a", encoding="utf-8") as fh:
+        fh.write('{"s": "emociones", "k": ["d1"')
+
+    revision_overlay._ESTADOS.clear()
+    ov = RevisionOverlay(path)
+
+    assert ov.is_emocion_deleted("d1", 0, 0)
+
+
+def test_corrupt_middle_line_is_reported(tmp_path: Path) -> None:
+    path = tmp_path / "revision_overlay.json"
+    journal_path_for(path).write_text("no es json\n{}\n", encoding="utf-8")
+
+    with pytest.raises(OverlayCorruptError):
+        RevisionOverlay(path)
+
+
+def test_import_legacy_json_and_export_roundtrip(tmp_path: Path) -> None:
+    legacy = tmp_path / "viejo.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "schema_version": 1,
+                "emociones": {"d1": {"0": {"0": {"deleted": True, "overrides": {}}}}},
+                "actores_kb_propuestos": {"nuevo": {"display_name": "Nuevo", "tipo": "x"}},
+            }
+        ),
+        encoding="utf-8",
+    )
+    ov = RevisionOverlay(tmp_path / "run" / "revision_overlay.json")
+    ov.remove_actor("d1", 0, "pueblo")
+
+    assert ov.import_json(legacy) == 2
+    exported = json.loads(ov.export_json(tmp_path / "export.json").read_text(encoding="utf-8"))
+
+    assert exported["emociones"]["d1"]["0"]["0"]["deleted"] is True
+    assert exported["frases"]["d1"]["0"]["actores_removidos"] == ["pueblo"]
+    assert set(exported["actores_kb_propuestos"]) == {"nuevo"}
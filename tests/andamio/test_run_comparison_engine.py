@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import random
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from emoparse.evaluation.agreement import krippendorff_alpha, nominal_alpha_from_annotations
+from emoparse.evaluation.run_comparison import (
+    RunComparison,
+    _canonical_norm,
+    _surface_norm,
+    classify_reference,
+    compare_runs,
+    is_role_label,
+)
+
+_REFERENTES = (None, "", "  ", "Javier Milei", "javier milei", "Milei", "el enunciador")
+_REFERENTES += ("la oposición", "medida", "la medida", "N/A", "none")
+_CANONICOS = (None, "", "javier_milei", "medida", "el enunciador", "oposicion")
+_TIPOS = (None, "", "Ira", "ira ", "miedo", "NA", "alegría")
+_PAYLOADS = (None, "", "{", "[1]", '{"x": 1}', '{"foria": "eufórica"}', '{"foria": "Disfórica"}')
+
+
+def _run_db(path: Path, rng: random.Random) -> Path:
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        """
+        CREATE TABLE frases (codigo TEXT, unit_idx INTEGER, frase TEXT,
+                             PRIMARY KEY (codigo, unit_idx));
+        CREATE TABLE emociones (
+            codigo TEXT, frase_idx INTEGER, emocion_idx INTEGER,
+            experienciador TEXT, experienciador_canonico TEXT,
+            tipo_emocion TEXT, tipo_emocion_canonico TEXT,
+            fuente_inferencia TEXT, fuente_marca TEXT, fuente_canonico TEXT,
+            modo_existencia TEXT, caracterizacion_payload TEXT,
+            PRIMARY KEY (codigo, frase_idx, emocion_idx)
+        );
+        """
+    )
+    for doc in range(rng.randint(2, 5)):
+        for unit in range(rng.randint(1, 3)):
+            connection.execute(
+                "INSERT INTO frases VALUES (?, ?, ?)", (f"d{doc}", unit, rng.choice("xy"))
+            )
+            for slot in rng.sample(range(4), rng.randint(0, 3)):
+                connection.execute(
+                    "INSERT OR IGNORE INTO emociones VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        f"d{doc}",
+                        unit if rng.random() < 0.9 else 7,
+                        slot,
+                        rng.choice(_REFERENTES),
+                        rng.choice(_CANONICOS),
+                        rng.choice(_TIPOS),
+                        rng.choice(_TIPOS),
+                        rng.choice(_REFERENTES),
+                        rng.choice(_REFERENTES),
+                        rng.choice(_CANONICOS),
+                        rng.choice((None, "realizada", "Realizada", "virtual")),
+                        rng.choice(_PAYLOADS),
+                    ),
+                )
+    connection.commit()
+    connection.close()
+    return path
+
+
+def _texto(value: Any) -> str | None:
+    return str(value or "").strip() or None
+
+
+def _referencia(row: dict[str, Any] | None, field: str) -> tuple[str | None, str | None]:
+    if row is None:
+        return None, None
+    if field == "experienciador":
+        return _texto(row["experienciador"]), _texto(row["experienciador_canonico"])
+    return (
+        _texto(row["fuente_inferencia"] or row["fuente_marca"]),
+        _texto(row["fuente_canonico"]),
+    )
+
+
+def _valor(row: dict[str, Any] | None, dimension: str) -> str | None:
+    """Valor de la dimensión tal como lo lee el acuerdo (None = faltante)."""
+    if row is None:
+        return None
+    if dimension in ("experienciador", "fuente"):
+        raw, canonical = _referencia(row, dimension)
+        return _canonical_norm(canonical or raw) or None
+    if dimension == "tipo":
+        return _surface_norm(row["tipo_emocion_canonico"] or row["tipo_emocion"]) or None
+    if dimension == "modo_existencia":
+        return _surface_norm(row["modo_existencia"]) or None
+    try:
+        payload = json.loads(row["caracterizacion_payload"] or "")
+    except json.JSONDecodeError:
+        payload = {}
+    return _surface_norm(payload.get("foria") if isinstance(payload, dict) else None) or None
+
+
+def _comparacion_fila_a_fila(paths: list[Path]) -> RunComparison:
+    """La comparación de referencia: matrices densas y pares recorridos uno a uno."""
+    units: list[set[tuple[str, int]]] = []
+    emotions: list[dict[tuple[str, int], dict[int, dict[str, Any]]]] = []
+    for path in paths:
+        connection = sqlite3.connect(path)
+        connection.row_factory = sqlite3.Row
+        units.append({(r[0], r[1]) for r in connection.execute("SELECT * FROM frases")})
+        por_unidad: dict[tuple[str, int], dict[int, dict[str, Any]]] = {}
+        for row in connection.execute("SELECT * FROM emociones"):
+            por_unidad.setdefault((row["codigo"], row["frase_idx"]), {})[row["emocion_idx"]] = dict(
+                row
+            )
+        emotions.append(por_unidad)
+        connection.close()
+    names = [path.stem for path in paths]
+    common = sorted(set.intersection(*units))
+    max_slot = max((s for run in emotions for unit in run.values() for s in unit), default=0)
+    positions = [(unit, slot) for unit in common for slot in range(max_slot + 1)]
+
+    agreement = [
+        {
+            "dimension": "hay_emocion",
+            "alpha": krippendorff_alpha(
+                [["si" if run.get(unit) else "no" for unit in common] for run in emotions]
+            ),
+            "items": len(common),
+        }
+    ]
+    for dimension in ("tipo", "experienciador", "fuente", "modo_existencia", "foria"):
+        matrix = [
+            [_valor(run.get(u, {}).get(s), dimension) for u, s in positions] for run in emotions
+        ]
+        agreement.append(
+            {
+                "dimension": dimension,
+                "alpha": krippendorff_alpha(matrix),
+                "items": len(positions),
+            }
+        )
+
+    counts: dict[tuple[str, str, str, str], int] = {}
+    for (a, left), (b, right) in itertools.combinations(zip(names, emotions, strict=True), 2):
+        for unit, slot in positions:
+            left_row, right_row = left.get(unit, {}).get(slot), right.get(unit, {}).get(slot)
+            if left_row is None and right_row is None:
+                continue
+            for field in ("experienciador", "fuente"):
+                (left_raw, left_canon), (right_raw, right_canon) = (
+                    _referencia(left_row, field),
+                    _referencia(right_row, field),
+                )
+                grade = classify_reference(
+                    left_raw, right_raw, left_canonical=left_canon, right_canonical=right_canon
+                )
+                counts[(a, b, field, grade)] = counts.get((a, b, field, grade), 0) + 1
+
+    violations = []
+    for name, run in zip(names, emotions, strict=True):
+        for field in ("experienciador", "fuente"):
+            flagged = [
+                value
+                for slots in run.values()
+                for row in slots.values()
+                if (
+                    value := next(
+                        (v for v in _referencia(row, field)[::-1] if is_role_label(v)), None
+                    )
+                )
+            ]
+            violations.append(
+                {
+                    "run": name,
+                    "dimension": field,
+                    "violaciones": len(flagged),
+                    "ejemplos": ", ".join(sorted(set(flagged))[:5]),
+                }
+            )
+    return RunComparison(
+        run_names=tuple(names),
+        common_units=len(common),
+        same_corpus=False,
+        corpus_signatures={},
+        agreement=tuple(agreement),
+        reference_matches=tuple(
+            {"run_a": a, "run_b": b, "dimension": f, "grado": g, "n": n}
+            for (a, b, f, g), n in sorted(counts.items())
+        ),
+        contract_violations=tuple(violations),
+    )
+
+
+def _assert_misma_comparacion(obtenida: RunComparison, esperada: RunComparison) -> None:
+    assert obtenida.common_units == esperada.common_units
+    for got, expected in zip(obtenida.agreement, esperada.agreement, strict=True):
+        assert (got["dimension"], got["items"]) == (expected["dimension"], expected["items"])
+        if expected["alpha"] is None:
+            assert got["alpha"] is None
+        else:
+            assert math.isclose(got["alpha"], expected["alpha"], abs_tol=1e-12)
+    assert obtenida.reference_matches == esperada.reference_matches
+    assert obtenida.contract_violations == esperada.contract_violations
+
+
+def test_motor_reproduce_la_comparacion_fila_a_fila(tmp_path: Path) -> None:
+    for seed in range(40):
+        rng = random.Random(seed)
+        paths = [_run_db(tmp_path / f"s{seed}_{i}.sqlite", rng) for i in range(rng.randint(2, 4))]
+
+        _assert_misma_comparacion(compare_runs(paths, workers=1), _comparacion_fila_a_fila(paths))
+
+
+def test_lectores_en_paralelo_dan_la_misma_comparacion(tmp_path: Path) -> None:
+    rng = random.Random(99)
+    paths = [_run_db(tmp_path / f"run_{i}.sqlite", rng) for i in range(3)]
+
+    assert compare_runs(paths, workers=2) == compare_runs(paths, workers=1)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_alpha_nominal_por_anotaciones_coincide_con_la_matriz(seed: int) -> None:
+    rng = random.Random(seed)
+    categorias = [None, "", "NA", "a", "A ", "b", "c", *(str(i) for i in range(rng.randint(0, 30)))]
+    matriz = [[rng.choice(categorias) for _ in range(12)] for _ in range(rng.randint(2, 5))]
+    indice = {valor: i for i, valor in enumerate(categorias)}
+    unidades = np.array([u * 7 - 3 for fila in matriz for u in range(len(fila))])
+    codigos = np.array([indice[valor] for fila in matriz for valor in fila])
+
+    esperado = krippendorff_alpha(matriz)
+    obtenido = nominal_alpha_from_annotations(unidades, codigos, categorias)
+
+    if esperado is None:
+        assert obtenido is None
+    else:
+        assert obtenido == pytest.approx(esperado, abs=1e-12)
@@ -0,0 +1,190 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  tests/andamio/test_scrape_fetch_engine
+#
+#  Motor de descarga concurrente contra un servidor HTTP local: cortesía por
+#  dominio, solicitudes condicionales con caché y reanudación por URL.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import argparse
+import csv
+import threading
+import time
+from collections.abc import Iterator
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from emoparse.acquisition import DiscursoRecord, FetchEngine, HttpCache, SourceAdapter
+from emoparse.acquisition.base import HtmlParser
+from emoparse.cli.commands import scrape_cmd
+
+
+def _parser(url: str, html: str) -> DiscursoRecord | None:
+    if "vacia" in html:
+        return None
+    return DiscursoRecord(
+        codigo=url.rsplit("/", 1)[-1], url=url, titulo=html, fecha="", contenido=html, fuente="t"
+    )
+
+
+class _Servidor:
+    """Sirve `/nota/<id>` con ETag; `/nota/vacia` sin contenido y `/rota` con 404."""
+
+    def __init__(self) -> None:
+        self.solicitudes: list[tuple[str, float, str | None]] = []
+        self.en_vuelo = 0
+        self.max_en_vuelo = 0
+        lock = threading.Lock()
+        servidor = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                with lock:
+                    servidor.solicitudes.append(
+                        (self.path, time.monotonic(), self.headers.get("If-None-Match"))
+                    )
+                    servidor.en_vuelo += 1
+                    servidor.max_en_vuelo = max(servidor.max_en_vuelo, servidor.en_vuelo)
+                try:
+                    time.sleep(0.03)
+                    if not self.path.startswith("/nota/"):
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    etag = f'"{self.path}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    cuerpo = self.path.rsplit("/", 1)[-1].encode()
+                    self.send_response(200)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(cuerpo)))
+                    self.end_headers()
+                    self.wfile.write(cuerpo)
+                finally:
+                    with lock:
+                        servidor.en_vuelo -= 1
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._http = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.base = f"http://127.0.0.1:{self._http.server_address[1]}"
+        self._hilo = threading.Thread(target=self._http.serve_forever, daemon=True)
+        self._hilo.start()
+
+    def close(self) -> None:
+        self._http.shutdown()
+        self._http.server_close()
+
+
+@pytest.fixture
+def servidor() -> Iterator[_Servidor]:
+    s = _Servidor()
+    yield s
+    s.close()
+
+
+def test_descarga_concurrente_cortes_y_condicional(servidor: _Servidor, tmp_path: Path) -> None:
+    urls = [f"{servidor.base}/nota/n{i}" for i in range(12)]
+    urls += [f"{servidor.base}/nota/vacia", f"{servidor.base}/rota"]
+    engine = FetchEngine(
+        _parser,
+        workers=6,
+        per_domain=2,
+        interval=0.02,
+        cache=HttpCache(tmp_path / "cache"),
+        parse_workers=0,
+        max_retries=0,
+    )
+
+    primera = {r.url: r for r in engine.run(urls)}
+
+    assert set(primera) == set(urls)
+    assert primera[f"{servidor.base}/nota/vacia"].record is None
+    assert "404" in (primera[f"{servidor.base}/rota"].error or "")
+    assert {r.record.titulo for r in primera.values() if r.record} == {f"n{i}" for i in range(12)}
+    assert servidor.max_en_vuelo <= 2
+    inicios = sorted(t for _, t, _ in servidor.solicitudes)
+    # 14 inicios espaciados ≥ 0.02 s (con margen para el jitter del servidor).
+    assert inicios[-1] - inicios[0] >= 13 * 0.02 - 0.03
+
+    # Segunda pasada: todo se revalida con If-None-Match y vuelve de la caché.
+    servidor.solicitudes.clear()
+    segunda = {r.url: r for r in engine.run(urls[:12])}
+
+    assert all(r.from_cache for r in segunda.values())
+    assert {u: r.record for u, r in segunda.items()} == {u: primera[u].record for u in urls[:12]}
+    assert all(etag for _, _, etag in servidor.solicitudes)
+
+
+def test_parseo_en_otros_procesos(servidor: _Servidor) -> None:
+    urls = [f"{servidor.base}/nota/p{i}" for i in range(4)]
+    engine = FetchEngine(_parser, workers=2, interval=0.0, parse_workers=2)
+
+    titulos = {r.record.titulo for r in engine.run(urls) if r.record is not None}
+
+    assert titulos == {f"p{i}" for i in range(4)}
+
+
+class _Fuente(SourceAdapter):
+    source_id = "fixture"
+
+    def __init__(self, urls: list[str]) -> None:
+        self._urls = urls
+
+    def list_discursos(
+        self,
+        *,
+        max_items: int | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> Iterator[str]:
+        yield from self._urls[:max_items]
+
+    def fetch_discurso(self, url: str) -> DiscursoRecord | None:
+        raise AssertionError("con html_parser no se descarga en serie")
+
+    def html_parser(self) -> HtmlParser:
+        return _parser
+
+
+def test_scrape_reanuda_por_url(
+    servidor: _Servidor, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    urls = [f"{servidor.base}/nota/r{i}" for i in range(6)]
+    monkeypatch.setattr(scrape_cmd, "get_source", lambda *_a, **_k: _Fuente(urls))
+    salida = tmp_path / "corpus.csv"
+    args = argparse.Namespace(
+        source="fixture",
+        output=salida,
+        max=2,
+        from_date=None,
+        to_date=None,
+        max_after_filter=False,
+        mode="http",
+        timeout=5.0,
+        workers=3,
+        per_domain=3,
+        interval=0.0,
+        cache_dir=None,
+        parse_workers=0,
+    )
+
+    assert scrape_cmd.run(args) == 0
+    args.max = None
+    servidor.solicitudes.clear()
+    assert scrape_cmd.run(args) == 0
+
+    with salida.open(encoding="utf-8-sig", newline="") as f:
+        filas = list(csv.DictReader(f))
+    assert sorted(fila["url"] for fila in filas) == sorted(urls)
+    # La segunda corrida solo pidió lo que faltaba en el CSV.
+    assert len(servidor.solicitudes) == len(urls) - 2
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from emoparse.inputs.posts_loader import PostsBundle, load_posts
+from emoparse.pipeline import runner
+from emoparse.pipeline.runner import PipelineRunner
+from emoparse.pipeline.thread_builder import _MAX_DEPTH, build_threads
+from emoparse.storage.db import Database
+from emoparse.storage.hilos import HilosRepository
+from emoparse.storage.posts import PostsRepository
+
+
+def _clean(value: object) -> str | None:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    return str(value).strip() or None
+
+
+def _resolver_fila(row: dict, by_id: dict[str, dict]) -> tuple[str, int | None, int]:
+    """Remontado fila a fila: la implementación de referencia."""
+    post_id = str(row["post_id"])
+    provided = _clean(row.get("conversacion_id"))
+    if not _clean(row.get("en_respuesta_a")):
+        return provided or post_id, 0, 0
+    depth, current, seen = 0, post_id, {post_id}
+    while True:
+        parent = _clean(by_id[current].get("en_respuesta_a"))
+        if not parent:
+            return provided or current, depth, 0
+        depth += 1
+        if parent not in by_id or parent in seen or depth > _MAX_DEPTH:
+            return provided or parent, None, 1
+        seen.add(parent)
+        current = parent
+
+
+def _hilos_de_referencia(df: pd.DataFrame) -> list[dict]:
+    rows = []
+    for conv_id, grp in df.groupby("conversacion_id", sort=True):
+        fechas = sorted(f for f in grp["fecha"].tolist() if f)
+        profundidades = [int(p) for p in grp["profundidad"].dropna().tolist()]
+        rows.append(
+            {
+                "conversacion_id": str(conv_id),
+                "post_raiz": str(conv_id),
+                "n_posts": len(grp),
+                "profundidad_max": max(profundidades) if profundidades else 0,
+                "participantes": json.dumps(
+                    sorted(set(grp["autor_handle"].astype(str))), ensure_ascii=False
+                ),
+                "fecha_inicio": fechas[0] if fechas else None,
+                "fecha_fin": fechas[-1] if fechas else None,
+            }
+        )
+    return rows
+
+
+def _corpus(rng: random.Random, n: int) -> pd.DataFrame:
+    ids = [f"p{i}" for i in range(n)]
+    # Algunos ids repetidos: manda la última aparición, como en el dict original.
+    ids += rng.sample(ids, 3)
+    refs = (*ids, " p1 ", "perdido", None, float("nan"), "", "  ")
+    return pd.DataFrame(
+        {
+            "post_id": ids,
+            "autor_handle": [rng.choice(("ana", "beto", "caro", None)) for _ in ids],
+            "fecha": [rng.choice(("2024-01-0" + str(rng.randint(1, 9)), None, "")) for _ in ids],
+            "en_respuesta_a": [rng.choice(refs) for _ in ids],
+            "conversacion_id": [rng.choice((None, None, None, "c1", " c2 ")) for _ in ids],
+        }
+    )
+
+
+def _cadena(largo: int, *, ciclo: bool = False) -> pd.DataFrame:
+    ids = [f"k{i}" for i in range(largo)]
+    padres: list[str | None] = [None, *ids[:-1]]
+    if ciclo:
+        padres[0] = ids[-1]
+    return pd.DataFrame(
+        {"post_id": ids, "autor_handle": "ana", "fecha": None, "en_respuesta_a": padres}
+    )
+
+
+def test_build_threads_reproduce_el_remontado_fila_a_fila() -> None:
+    corpora = [_corpus(random.Random(seed), 60) for seed in range(15)]
+    corpora += [
+        _cadena(_MAX_DEPTH + 3),
+        _cadena(_MAX_DEPTH + 1),
+        _cadena(40, ciclo=True),
+        _cadena(_MAX_DEPTH + 40, ciclo=True),
+    ]
+    for df_in in corpora:
+        df_posts, df_hilos = build_threads(df_in)
+
+        registros = df_in.reset_index(drop=True).to_dict(orient="records")
+        by_id = {str(r["post_id"]): r for r in registros}
+        esperado = [_resolver_fila(r, by_id) for r in registros]
+        obtenido = list(
+            zip(
+                df_posts["conversacion_id"],
+                [None if pd.isna(p) else int(p) for p in df_posts["profundidad"]],
+                df_posts["huerfano"],
+                strict=True,
+            )
+        )
+        assert obtenido == esperado
+        assert str(df_posts["profundidad"].dtype) == "Int64"
+        assert df_hilos.to_dict(orient="records") == _hilos_de_referencia(df_posts)
+
+
+def test_load_posts_comparte_strings_repetidos(tmp_path: Path) -> None:
+    path = tmp_path / "posts.jsonl"
+    lineas = [
+        {"id": "a", "texto": "hola", "autor_handle": "@ana", "plataforma": "bluesky"},
+        {"id": "b", "texto": "chau", "autor_handle": "ana", "en_respuesta_a": "a"},
+        {"id": "c", "texto": "", "autor_handle": "beto", "reposteo_a": "a", "lang": "es"},
+    ]
+    path.write_text("\n".join(json.dumps(x) for x in lineas) + "\n\n", encoding="utf-8")
+
+    bundle = load_posts(path)
+    df = bundle.posts
+
+    assert df["tipo"].tolist() == ["original", "reply", "repost"]
+    assert df["es_repost_puro"].tolist() == [0, 0, 1]
+    assert df["lang"].tolist() == [None, None, "es"]
+    assert df["metricas"].tolist() == [{}, {}, {}]
+    assert df.loc[0, "autor_handle"] is df.loc[1, "autor_handle"]
+    assert df.loc[1, "en_respuesta_a"] is df.loc[0, "post_id"]
+    assert bundle.autores[["plataforma", "handle", "n_posts"]].values.tolist() == [
+        ["bluesky", "ana", 1],
+        ["desconocida", "ana", 1],
+        ["desconocida", "beto", 1],
+    ]
+
+
+def test_ingest_posts_vuelca_por_lotes(
+    bootstrapped_db: Database, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "posts.jsonl"
+    lineas = [
+        {"id": f"p{i}", "texto": "hola", "autor_handle": "ana", "en_respuesta_a": f"p{i - 1}"}
+        for i in range(5)
+    ]
+    lineas[0]["en_respuesta_a"] = None
+    lineas[1]["media"] = [{"tipo": "imagen", "url": "https://x/1.png"}]
+    path.write_text("\n".join(json.dumps(x) for x in lineas), encoding="utf-8")
+    bundle = load_posts(path)
+    df_posts, df_hilos = build_threads(bundle.posts)
+    monkeypatch.setattr(runner, "_LOTE_POSTS", 2)
+    fake = SimpleNamespace(
+        _p_repo=PostsRepository(bootstrapped_db), _h_repo=HilosRepository(bootstrapped_db)
+    )
+
+    PipelineRunner.ingest_posts(
+        fake,  # type: ignore[arg-type]
+        PostsBundle(posts=df_posts, autores=bundle.autores, hilos=df_hilos),
+    )
+
+    filas = bootstrapped_db.execute(
+        "SELECT post_id, profundidad, huerfano FROM posts ORDER BY post_id"
+    ).fetchall()
+    assert [tuple(f) for f in filas] == [(f"p{i}", i, 0) for i in range(5)]
+    assert bootstrapped_db.execute("SELECT COUNT(*) FROM media").fetchone()[0] == 1
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+from emoparse.domain.validators.base import ValidationIssue
+from emoparse.domain.validators.rules import DISCURSO_VALIDATORS, ROW_VALIDATORS
+from emoparse.domain.validators.runner import ValidationRunner
+from emoparse.storage.db import Database
+from emoparse.storage.discursos import DiscursosRepository
+from emoparse.storage.frases import FrasesRepository
+from emoparse.storage.models import RunContext
+from emoparse.storage.runs import RunsRepository
+from emoparse.storage.validation import ValidationRepository
+
+_CODIGOS = ("A", "B", "C", "D")
+_ACTORES = ("el enunciador", "Javier Milei", "los votantes", "")
+_PAYLOADS = (
+    None,
+    "{",
+    "[]",
+    "{}",
+    '{"foria": null, "intensidad": "alta"}',
+    '{"foria": "aforico", "intensidad": "alta", "fuente_inferencia": "no identificado"}',
+    '{"foria": "ambiforico", "intensidad": "baja", "dominancia": "dominada"}',
+    '{"foria": "euforico", "intensidad": "media", "fuente_marca": "x"}',
+)
+
+
+def _poblar(db: Database, rng: random.Random) -> None:
+    d_repo, f_repo = DiscursosRepository(db), FrasesRepository(db)
+    for codigo in _CODIGOS:
+        d_repo.upsert_input(codigo, {"titulo": codigo, "contenido": "x"})
+        if rng.random() < 0.8:
+            _enunciar(d_repo, codigo, rng.choice(_ACTORES))
+        for unit in range(3):
+            f_repo.upsert_frase(codigo, unit, "frase")
+            for emocion_idx in range(rng.randint(0, 3)):
+                db.execute(
+                    "INSERT INTO emociones (codigo, frase_idx, emocion_idx, experienciador, "
+                    "experienciador_marca, tipo_emocion, fuente_marca, fuente_inferencia, "
+                    "modo_existencia, caracterizacion_payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?, '', '', ?, ?)",
+                    (
+                        codigo,
+                        unit,
+                        emocion_idx,
+                        rng.choice(_ACTORES),
+                        rng.choice(_ACTORES),
+                        rng.choice(("miedo", "ira")),
+                        rng.choice(("realizada", "virtual", "potencial")),
+                        rng.choice(_PAYLOADS),
+                    ),
+                )
+
+
+def _enunciar(d_repo: DiscursosRepository, codigo: str, enunciador: str) -> None:
+    d_repo.set_payload(
+        codigo,
+        "enunciation",
+        {"enunciador": enunciador, "enunciatarios": [{"enunciatario": "los votantes"}]},
+    )
+
+
+def _issues_discurso_a_discurso(db: Database) -> list[ValidationIssue]:
+    """La validación de referencia: consultas y JSON de cada discurso por separado."""
+    issues: list[ValidationIssue] = []
+    codigos = db.execute(
+        "SELECT DISTINCT codigo FROM emociones "
+        "WHERE caracterizacion_payload IS NOT NULL ORDER BY codigo"
+    ).fetchall()
+    for (codigo,) in codigos:
+        raw = db.execute(
+            "SELECT enunciation_payload FROM discursos WHERE codigo = ?", (codigo,)
+        ).fetchone()[0]
+        enun = json.loads(raw) if raw else {}
+        enunciador = enun.get("enunciador", "no identificado") or "no identificado"
+        enunciatarios = enun.get("enunciatarios", []) or []
+        emociones: list[dict[str, Any]] = []
+        for row in db.execute(
+            "SELECT * FROM emociones WHERE codigo = ? AND caracterizacion_payload IS NOT NULL "
+            "ORDER BY frase_idx, emocion_idx",
+            (codigo,),
+        ):
+            try:
+                caract = json.loads(row["caracterizacion_payload"])
+            except json.JSONDecodeError:
+                continue
+            caract = caract if isinstance(caract, dict) else {}
+            emociones.append(
+                {
+                    "frase_idx": row["frase_idx"],
+                    "emocion_idx": row["emocion_idx"],
+                    "experienciador": row["experienciador"] or "",
+                    "experienciador_marca": row["experienciador_marca"] or "",
+                    "tipo_emocion": row["tipo_emocion"] or "",
+                    "tipo_emocion_canonico": row["tipo_emocion_canonico"] or "",
+                    "modo_existencia": row["modo_existencia"] or "",
+                    **{
+                        c: caract.get(c, "")
+                        for c in ("foria", "dominancia", "intensidad", "fuente_marca")
+                    },
+                    "fuente_inferencia": caract.get("fuente_inferencia", ""),
+                }
+            )
+        contexto = {"enunciador": enunciador, "enunciatarios": enunciatarios}
+        for emo in emociones:
+            campos = {k: v for k, v in emo.items() if k != "tipo_emocion_canonico"}
+            campos["tipo_emocion"] = emo["tipo_emocion_canonico"] or emo["tipo_emocion"]
+            for validator in ROW_VALIDATORS:
+                try:
+                    issues.extend(validator.validate(codigo=codigo, **campos, **contexto))
+                except AttributeError:
+                    pass  # valores null: el runner lo loguea y sigue
+        for disc_validator in DISCURSO_VALIDATORS:
+            issues.extend(disc_validator.validate(codigo=codigo, emociones=emociones, **contexto))
+    return issues
+
+
+def _guardadas(db: Database) -> list[tuple[Any, ...]]:
+    return [
+        (i["codigo"], i["validator_id"], i["frase_idx"], i["emocion_idx"], i["mensaje"])
+        for i in ValidationRepository(db).list_issues()
+    ]
+
+
+def test_carga_en_lote_reproduce_la_validacion_por_discurso(tmp_path: Path) -> None:
+    for seed in range(15):
+        db = Database(tmp_path / f"azar_{seed}.sqlite")
+        RunsRepository(db).bootstrap(RunContext(run_id="azar"))
+        _poblar(db, random.Random(seed))
+
+        assert ValidationRunner(db, workers=1).run() == _issues_discurso_a_discurso(db)
+        db.close_thread_connection()
+
+
+def test_workers_dan_las_mismas_issues(bootstrapped_db: Database) -> None:
+    db = bootstrapped_db
+    _poblar(db, random.Random(3))
+
+    en_serie = ValidationRunner(db, workers=1).run()
+    guardadas = _guardadas(db)
+
+    assert ValidationRunner(db, workers=2).run() == en_serie
+    assert _guardadas(db) == guardadas
+
+
+def test_incremental_revalida_solo_los_discursos_tocados(bootstrapped_db: Database) -> None:
+    db = bootstrapped_db
+    _poblar(db, random.Random(11))
+    runner = ValidationRunner(db, workers=1)
+    runner.run()
+    completas = _guardadas(db)
+
+    assert runner.run(incremental=True) == []
+    assert _guardadas(db) == completas
+
+    db.execute(
+        "UPDATE emociones SET caracterizacion_payload = ? WHERE codigo = 'B'",
+        ('{"foria": "aforico", "intensidad": "alta"}',),
+    )
+    _enunciar(DiscursosRepository(db), "C", "los votantes")
+    # Escrituras que los validators no leen no invalidan.
+    db.execute("UPDATE emociones SET caracterizacion_version = 'v2'")
+
+    revalidadas = runner.run(incremental=True)
+
+    assert {i.codigo for i in revalidadas} <= {"B", "C"}
+    assert any(i.codigo == "B" for i in revalidadas)
+    incrementales = _guardadas(db)
+    assert [g for g in incrementales if g[0] in ("A", "D")] == [
+        c for c in completas if c[0] in ("A", "D")
+    ]
+    ValidationRunner(db, workers=1).run()
+    assert _guardadas(db) == incrementales
+    assert runner.run(incremental=True) == []
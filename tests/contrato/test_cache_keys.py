@@ -5,12 +5,27 @@
 #  - Determinismo: mismo input = mismo digest.
 #  - Sensibilidad: cambios mínimos = digest distinto.
 #  - Estabilidad: None y "" se tratan igual (consistencia cross-run).
+#  - Dependencias: el digest sigue al contenido, no a las versions del run.
+#  - Invalidación selectiva: editar las heurísticas de un agente cambia solo
+#    las claves de ese agente.
 # ══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
 
-from emoparse.core.cache.keys import make_cache_key
+import shutil
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, create_model
+
+from emoparse.agents.actors import ActorsAgent
+from emoparse.agents.base import BaseBatchAgent
+from emoparse.agents.characterizer import CharacterizerAgent
+from emoparse.agents.emotions import EmotionsAgent
+from emoparse.core.cache.keys import compute_schema_digest, make_cache_key
+from emoparse.knowledge.loader import KnowledgeLoader
 from emoparse.storage.models import Versions
+from tests.factories import FakeBackend
 
 
 def _key(**overrides: object) -> str:
@@ -66,20 +81,87 @@ class TestSensitivity:
     def test_seed_affects(self) -> None:
         assert _key(seed=1) != _key(seed=2)
 
-    def test_each_version_affects_independently(self) -> None:
-        """Cambiar una version invalida sin afectar las otras combinaciones."""
+    def test_schema_digest_affects(self) -> None:
+        assert _key(schema_digest="a") != _key(schema_digest="b")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Dependencias: el digest sigue al contenido de la llamada
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+class TestContentDependencies:
+    def test_versions_do_not_affect_digest(self) -> None:
+        """Bumpear una version no invalida entradas cuyo contenido no cambió."""
         base = Versions(knowledge="kv", prompt="pv", ontology="ov", schema="sv")
-        d_base = _key(versions=base)
+        bumped = Versions(knowledge="kv2", prompt="pv2", ontology="ov2", schema="sv2")
+        assert _key(versions=base) == _key(versions=bumped)
+
+    def test_schema_digest_follows_json_schema(self) -> None:
+        """Mismo qualname con otros `Literal` (p. ej. ontología) → otro digest."""
+
+        def _schema(*valores: str) -> type[BaseModel]:
+            return create_model("Item", emo=(Literal[valores], ...))  # type: ignore[valid-type]
+
+        a = compute_schema_digest(_schema("alegria", "miedo"))
+        b = compute_schema_digest(_schema("alegria", "miedo"))
+        c = compute_schema_digest(_schema("alegria", "miedo", "ira"))
+
+        assert a == b
+        assert a != c
+        assert compute_schema_digest(None) is None
+
+
+def _agent_keys(knowledge_dir: Path) -> dict[str, str]:
+    """Clave de una misma llamada por agente, con el knowledge de `knowledge_dir`."""
+    knowledge = KnowledgeLoader(knowledge_dir)
+    backend = FakeBackend()
+    agents: dict[str, BaseBatchAgent] = {
+        "actors": ActorsAgent(
+            backend, heuristicas=knowledge.load_heuristics("heuristicas/actors.md")
+        ),
+        "emotions": EmotionsAgent(
+            backend,
+            heuristicas=knowledge.load_heuristics("heuristicas/emotions.md"),
+            configuraciones=knowledge.load_emotion_configurations("configuraciones_emocion.json"),
+            modos_existencia=knowledge.load_ontology("emociones.json"),
+        ),
+        "characterizer": CharacterizerAgent(
+            backend, heuristicas=knowledge.load_heuristics("heuristicas/characterizer.md")
+        ),
+    }
+    return {
+        name: make_cache_key(
+            model_alias="test-model",
+            system=agent._build_system(),
+            user="[0] El pueblo está harto.",
+            schema_qualname=f"{agent.SCHEMA.__module__}.{agent.SCHEMA.__qualname__}",
+            seed=42,
+            versions=Versions(),
+            schema_digest=compute_schema_digest(agent.SCHEMA),
+        ).digest
+        for name, agent in agents.items()
+    }
 
-        # Cada cambio individual genera un digest distinto.
-        d_kv = _key(versions=Versions(knowledge="kv2", prompt="pv", ontology="ov", schema="sv"))
-        d_pv = _key(versions=Versions(knowledge="kv", prompt="pv2", ontology="ov", schema="sv"))
-        d_ov = _key(versions=Versions(knowledge="kv", prompt="pv", ontology="ov2", schema="sv"))
-        d_sv = _key(versions=Versions(knowledge="kv", prompt="pv", ontology="ov", schema="sv2"))
 
-        # Todos distintos del base.
-        assert {d_base, d_kv, d_pv, d_ov, d_sv} == {d_base, d_kv, d_pv, d_ov, d_sv}
-        assert len({d_base, d_kv, d_pv, d_ov, d_sv}) == 5  # los 5 son distintos
+class TestSelectiveInvalidation:
+    def test_editing_actors_heuristics_only_invalidates_actors(
+        self, tmp_path: Path, project_root: Path
+    ) -> None:
+        knowledge_dir = tmp_path / "knowledge"
+        shutil.copytree(project_root / "knowledge", knowledge_dir)
+        before = _agent_keys(knowledge_dir)
+
+        actors_md = knowledge_dir / "heuristicas" / "actors.md"
+        actors_md.write_text(
+            actors_md.read_text(encoding="utf-8") + "\n- Regla nueva de prueba.\n",
+            encoding="utf-8",
+        )
+        after = _agent_keys(knowledge_dir)
+
+        assert after["actors"] != before["actors"]
+        assert after["emotions"] == before["emotions"]
+        assert after["characterizer"] == before["characterizer"]
 
 
 # ══════════════════════════════════════════════════════════════════════════════
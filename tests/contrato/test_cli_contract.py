@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import subprocess
 import sys
 from pathlib import Path
 
@@ -26,12 +27,41 @@ def _subcommands(parser: argparse.ArgumentParser) -> dict[str, argparse.Argument
 def test_parser_registers_every_command_module_once() -> None:
     parser = cli_main.build_parser()
     registered = tuple(_subcommands(parser))
-    expected = tuple(module.__name__.rsplit(".", 1)[-1].removesuffix("_cmd") for module in COMMANDS)
+    expected = tuple(command.name for command in COMMANDS)
 
     assert registered == expected
     assert len(registered) == len(set(registered))
 
 
+def test_lazy_help_matches_each_module_registration() -> None:
+    action = next(
+        item
+        for item in cli_main.build_parser()._actions
+        if isinstance(item, argparse._SubParsersAction)
+    )
+    registered = {choice.dest: choice.help for choice in action._choices_actions}
+
+    assert registered == {command.name: command.help for command in COMMANDS}
+
+
+def test_dispatch_imports_only_the_invoked_command() -> None:
+    codigo = (
+        "import sys\n"
+        "from emoparse.cli import main\n"
+        "try:\n"
+        "    main(['status', '--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "cargados = [m for m in sys.modules if m.endswith('_cmd') or m in ('pandas', 'pandera')]\n"
+        "print(','.join(sorted(cargados)))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", codigo], capture_output=True, text=True, check=True
+    )
+
+    assert proc.stdout.strip().splitlines()[-1] == "emoparse.cli.commands.status_cmd"
+
+
 def test_each_subcommand_has_callable_handler() -> None:
     for parser in _subcommands(cli_main.build_parser()).values():
         assert callable(parser.get_default("handler"))
@@ -69,7 +99,7 @@ def test_main_maps_keyboard_interrupt_to_sigint_code(
         command="fake",
         handler=lambda _: (_ for _ in ()).throw(KeyboardInterrupt()),
     )
-    monkeypatch.setattr(cli_main, "build_parser", lambda: _ParserStub(args))
+    monkeypatch.setattr(cli_main, "build_parser", lambda *_: _ParserStub(args))
     monkeypatch.setattr(cli_main.logging_setup, "configure", lambda **_: None)
 
     assert cli_main.main([]) == 130
@@ -86,7 +116,7 @@ def test_main_maps_unexpected_error_to_code_2(
         command="fake",
         handler=lambda _: (_ for _ in ()).throw(RuntimeError("boom")),
     )
-    monkeypatch.setattr(cli_main, "build_parser", lambda: _ParserStub(args))
+    monkeypatch.setattr(cli_main, "build_parser", lambda *_: _ParserStub(args))
     monkeypatch.setattr(cli_main.logging_setup, "configure", lambda **_: None)
 
     assert cli_main.main([]) == 2
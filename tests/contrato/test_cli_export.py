@@ -122,6 +122,31 @@ class TestExportCLI:
         assert "emociones.csv" in out
         assert "1 filas" in out  # cada tabla tiene 1 fila
 
+    def test_export_jsonl_reports_throughput_and_memory(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        db_path = _make_populated_db(tmp_path)
+        out_dir = tmp_path / "out"
+        rc = main(
+            [
+                "--no-log-file",
+                "export",
+                "--db",
+                str(db_path),
+                "--output-dir",
+                str(out_dir),
+                "--format",
+                "jsonl",
+                "--chunk-size",
+                "1",
+            ]
+        )
+        out = capsys.readouterr().out
+        assert rc == 0
+        assert (out_dir / "emociones.jsonl.gz").is_file()
+        assert "filas/s" in out
+        assert "pico de memoria" in out
+
     def test_export_missing_db_arg_exits_nonzero(self) -> None:
         with pytest.raises(SystemExit) as exc:
             main(["--no-log-file", "export", "--output-dir", "/tmp/x"])
@@ -0,0 +1,111 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  tests/contrato/test_evaluation_agreement
+#
+#  Alpha de Krippendorff: valores publicados del ejemplo clásico, casos sin
+#  datos suficientes e intervalo bootstrap.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+import pytest
+
+from emoparse.evaluation.agreement import (
+    agreement_by_dimension,
+    alpha_with_ci,
+    krippendorff_alpha,
+)
+
+_ = None
+
+#: Krippendorff (2011), "Computing Krippendorff's Alpha-Reliability": 4 × 12.
+CLASICO = [
+    [1, 2, 3, 3, 2, 1, 4, 1, 2, _, _, _],
+    [1, 2, 3, 3, 2, 2, 4, 1, 2, 5, _, 3],
+    [_, 3, 3, 3, 2, 3, 4, 2, 2, 5, 1, _],
+    [1, 2, 3, 3, 2, 4, 4, 1, 2, 5, 1, _],
+]
+
+
+@pytest.mark.parametrize(
+    ("metric", "expected"),
+    [("nominal", 0.743), ("interval", 0.849), ("ordinal", 0.815)],
+)
+def test_classic_example_matches_published_values(metric, expected) -> None:
+    assert krippendorff_alpha(CLASICO, metric) == pytest.approx(expected, abs=1e-3)
+
+
+def test_missing_markers_and_case_are_normalized() -> None:
+    data = [["Miedo", "ira", "NA", "alegria"], ["miedo ", "ira", "ira", ""]]
+
+    assert krippendorff_alpha(data) == pytest.approx(1.0)
+
+
+def _pairwise_nominal(data: list[list[Any]]) -> float:
+    """Alpha nominal por pares, como la implementación anterior a la vectorizada."""
+    unidades = []
+    for u in range(max(len(f) for f in data)):
+        valores = [str(f[u]).strip().lower() for f in data if u < len(f) and f[u] is not None]
+        if len(valores) >= 2:
+            unidades.append(valores)
+    coincidencias: Counter[tuple[str, str]] = Counter()
+    for valores in unidades:
+        for i, c in enumerate(valores):
+            for j, k in enumerate(valores):
+                if i != j:
+                    coincidencias[(c, k)] += 1 / (len(valores) - 1)  # type: ignore[assignment]
+    n_c: Counter[str] = Counter()
+    for (c, _k), v in coincidencias.items():
+        n_c[c] += v
+    n = sum(n_c.values())
+    do = sum(v for (c, k), v in coincidencias.items() if c != k) / n
+    de = sum(n_c[c] * n_c[k] for c in n_c for k in n_c if c != k) / (n * (n - 1))
+    return 1 - do / de
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [[1, 1.0, 2, 2], [1.0, 1, 2, 1]],
+        [[True, 1, 0, False, 2.0], [1, True, False, 0.0, 2], [1.0, 1, 0, 0, _]],
+        [[" 1", 1, "1.0", True], [1.0, "1 ", 1, "TRUE"]],
+    ],
+)
+def test_nominal_mixed_numeric_and_bool_labels_match_pairwise(data) -> None:
+    """`1`, `1.0` y `True` son categorías nominales distintas ('1', '1.0', 'true')."""
+    assert krippendorff_alpha(data) == pytest.approx(_pairwise_nominal(data))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [["a", "b"], [_, "b"]],  # una sola unidad apareable
+        [["a", "a", "a"], ["a", "a", "a"]],  # una sola categoría
+        [],
+    ],
+)
+def test_insufficient_data_returns_none(data) -> None:
+    assert krippendorff_alpha(data) is None
+
+
+def test_bootstrap_interval_is_reproducible_and_brackets_alpha() -> None:
+    first = alpha_with_ci(CLASICO, "nominal", n_bootstrap=500, seed=7)
+    again = alpha_with_ci(CLASICO, "nominal", n_bootstrap=500, seed=7)
+
+    assert first == again
+    assert first.n_units == 11
+    assert first.ci_low is not None and first.ci_high is not None
+    assert first.ci_low <= first.alpha <= first.ci_high
+
+
+def test_agreement_by_dimension_keeps_metric_per_dimension() -> None:
+    results = agreement_by_dimension(
+        {"tipo": (CLASICO, "nominal"), "intensidad": (CLASICO, "ordinal")}
+    )
+
+    assert list(results) == ["tipo", "intensidad"]
+    assert results["intensidad"].metric == "ordinal"
+    assert results["intensidad"].alpha == pytest.approx(0.815, abs=1e-3)
+    assert results["tipo"].ci_low is None
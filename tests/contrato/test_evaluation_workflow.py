@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import re
 import sqlite3
 from pathlib import Path
 
@@ -330,6 +331,30 @@ def test_agreement_treats_passes_as_distinct_coders(tmp_path: Path) -> None:
     assert "| fuente | nominal |" in report
 
 
+def test_agreement_bootstrap_adds_confidence_interval(tmp_path: Path) -> None:
+    rows = []
+    for pass_number in (1, 2):
+        for index in range(1, 5):
+            row = _completed_sample_row()
+            row["id_muestra"] = f"u{index:04d}"
+            row["pasada"] = str(pass_number)
+            row["hay_emocion"] = "si" if index % 2 or pass_number == 1 else "no"
+            if row["hay_emocion"] == "no":
+                for column in ANNOTATION_COLUMNS:
+                    if column.startswith("emocion_"):
+                        row[column] = ""
+            rows.append(row)
+    csv_path = tmp_path / "agreement.csv"
+    pd.DataFrame(rows).to_csv(csv_path, index=False)
+    output = tmp_path / "agreement.md"
+    args = argparse.Namespace(agreement=csv_path, out=output, bootstrap=200, seed=1)
+
+    assert eval_cmd._agreement(args) == 0
+    report = output.read_text(encoding="utf-8")
+    assert "IC 95% (200 réplicas)" in report
+    assert re.search(r"\| hay_emocion \| nominal \| -?\d\.\d{3} \| \[", report)
+
+
 def test_freeze_uses_per_row_metadata_without_cli_overrides(tmp_path: Path) -> None:
     row = _completed_sample_row()
     row["anotador"] = "alex"
@@ -401,3 +426,57 @@ def test_agreement_rejects_missing_decision_column(tmp_path: Path) -> None:
 
     assert eval_cmd._agreement(args) == 1
     assert not output.exists()
+
+
+def test_eval_golden_lote_compara_runs_contra_la_linea_base(tmp_path: Path) -> None:
+    base_db, worse_db = tmp_path / "base.sqlite", tmp_path / "nuevo.sqlite"
+    _create_run_db(base_db, "tuit", "t")
+    _create_run_db(worse_db, "tuit", "t")
+    conn = sqlite3.connect(worse_db)
+    conn.execute("DELETE FROM emociones WHERE codigo = 't-0'")
+    conn.commit()
+    conn.close()
+    golden_path = tmp_path / "golden.jsonl"
+    emotion = {"tipo_emocion": "ira", "experienciador": "autor", "foria": "disforico"}
+    golden_path.write_text(
+        "".join(
+            json.dumps(
+                {
+                    "codigo": f"t-{document}",
+                    "unit_idx": unit_idx,
+                    "genero": "tuit",
+                    "emociones": [emotion] if (document + unit_idx) % 2 == 0 else [],
+                }
+            )
+            + "\n"
+            for document in range(4)
+            for unit_idx in range(2)
+        ),
+        encoding="utf-8",
+    )
+    output = tmp_path / "lote.md"
+    args = build_parser().parse_args(
+        [
+            "eval",
+            "--golden",
+            str(golden_path),
+            "--lote",
+            "--workers",
+            "2",
+            "--db",
+            str(base_db),
+            "--db",
+            str(worse_db),
+            "--db",
+            str(tmp_path / "ausente.sqlite"),
+            "--out",
+            str(output),
+        ]
+    )
+
+    assert args.handler(args) == 1
+    report = output.read_text(encoding="utf-8")
+    assert "Línea base: `base.sqlite`" in report
+    assert re.search(r"\| `base.sqlite` \| 8 \| 4 / 0 / 0 .* \| \+0\.000 \|", report)
+    assert re.search(r"\| `nuevo.sqlite` \| 8 \| 3 / 0 / 1 .* \| -0\.143 \|", report)
+    assert "`ausente.sqlite`: no se pudo leer" in report
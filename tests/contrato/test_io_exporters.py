@@ -11,6 +11,7 @@
 from __future__ import annotations
 
 import csv
+import gzip
 import json
 from pathlib import Path
 
@@ -18,9 +19,11 @@ import pytest
 
 from emoparse.io.exporters import (
     export_discursos_csv,
+    export_emociones,
     export_emociones_csv,
     export_frases_csv,
     export_full_run,
+    export_run,
 )
 from emoparse.storage.db import Database
 from emoparse.storage.schema import ALL_TABLES_DDL
@@ -603,3 +606,132 @@ class TestExportFullRun:
             "frases": 0,
             "emociones": 0,
         }
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Export por lotes y formatos
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def _vincular(db: Database, codigo: str, unit_idx: int, marca: str, canonico: str) -> None:
+    with db.transaction() as cur:
+        cur.execute(
+            "INSERT INTO menciones (codigo, unit_idx, marca) VALUES (?, ?, ?)",
+            (codigo, unit_idx, marca),
+        )
+        mencion_id = cur.lastrowid
+        cur.execute(
+            "INSERT INTO mencion_funcion (mencion_id, funcion) VALUES (?, 'experienciador')",
+            (mencion_id,),
+        )
+        cur.execute(
+            "INSERT INTO mencion_canonico (mencion_id, canonical_id, status) "
+            "VALUES (?, ?, 'accepted')",
+            (mencion_id, canonico),
+        )
+
+
+@pytest.fixture
+def multi_chunk_db(tmp_path: Path) -> Database:
+    """Tres discursos cuyas claves de caracterización aparecen de a poco."""
+    db = _init_db(tmp_path / "chunks.sqlite")
+    payloads = [
+        {"foria": "euforico"},
+        None,
+        {"intensidad": "alta", "foria": "disforico"},
+        {"dominancia": "pasional"},
+    ]
+    for i, codigo in enumerate(("D1", "D2", "D3")):
+        _insert_discurso(db, codigo)
+        _insert_frase(db, codigo, 0, f"frase {codigo}")
+        for j, payload in enumerate(payloads[i : i + 2]):
+            _insert_emocion(
+                db,
+                codigo,
+                0,
+                j,
+                experienciador_marca=f"marca {codigo}",
+                caracterizacion_payload=payload,
+            )
+        _vincular(db, codigo, 0, f"marca {codigo}", f"referente_{codigo.lower()}")
+    return db
+
+
+class TestExportStreaming:
+    def test_chunk_size_does_not_change_output(
+        self, multi_chunk_db: Database, tmp_path: Path
+    ) -> None:
+        export_emociones(multi_chunk_db, tmp_path / "uno.csv", chunk_size=1)
+        export_emociones(multi_chunk_db, tmp_path / "todo.csv")
+
+        assert (tmp_path / "uno.csv").read_bytes() == (tmp_path / "todo.csv").read_bytes()
+
+    def test_payload_columns_follow_first_appearance(
+        self, multi_chunk_db: Database, tmp_path: Path
+    ) -> None:
+        out = tmp_path / "e.csv"
+        export_emociones(multi_chunk_db, out, chunk_size=2)
+
+        header = out.read_text(encoding="utf-8").splitlines()[0].split(",")
+        caract = [c for c in header if c.startswith("caracterizacion__")]
+        assert caract == [
+            "caracterizacion__foria",
+            "caracterizacion__intensidad",
+            "caracterizacion__dominancia",
+        ]
+
+    def test_canonicals_resolved_per_chunk(self, multi_chunk_db: Database, tmp_path: Path) -> None:
+        out = tmp_path / "e.csv"
+        export_emociones(multi_chunk_db, out, chunk_size=1)
+
+        with out.open(encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+        assert {r["codigo"]: r["experienciador_referente"] for r in rows} == {
+            "D1": "referente_d1",
+            "D2": "referente_d2",
+            "D3": "referente_d3",
+        }
+
+    def test_jsonl_has_stable_keys_and_integer_indexes(
+        self, multi_chunk_db: Database, tmp_path: Path
+    ) -> None:
+        out = tmp_path / "emociones.jsonl.gz"
+        n = export_emociones(multi_chunk_db, out, chunk_size=2)
+
+        with gzip.open(out, "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+
+        assert n == len(rows) == 6
+        assert len({tuple(r) for r in rows}) == 1
+        assert rows[0]["emocion_idx"] == 0
+        assert rows[1]["caracterizacion__foria"] == ""
+
+    def test_parquet_matches_csv(self, multi_chunk_db: Database, tmp_path: Path) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+        export_emociones(multi_chunk_db, tmp_path / "e.parquet", chunk_size=4)
+        export_emociones(multi_chunk_db, tmp_path / "e.csv")
+
+        table = pq.read_table(tmp_path / "e.parquet")
+        with (tmp_path / "e.csv").open(encoding="utf-8") as f:
+            csv_rows = list(csv.DictReader(f))
+
+        assert table.column_names == list(csv_rows[0])
+        assert table.column("frase_idx").type == "int64"
+        assert table.column("tipo_emocion").to_pylist() == [r["tipo_emocion"] for r in csv_rows]
+
+    def test_parallel_and_serial_runs_write_the_same_files(
+        self, multi_chunk_db: Database, tmp_path: Path
+    ) -> None:
+        serial = export_run(multi_chunk_db, tmp_path / "serie", fmt="jsonl", workers=1)
+        parallel = export_run(multi_chunk_db, tmp_path / "paralelo", fmt="jsonl", workers=4)
+
+        assert serial.counts == parallel.counts
+        for name, table in serial.tables.items():
+            with gzip.open(table.path, "rt", encoding="utf-8") as a:
+                with gzip.open(parallel.tables[name].path, "rt", encoding="utf-8") as b:
+                    assert a.read() == b.read()
+
+    def test_unknown_format_is_rejected(self, empty_db: Database, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Formato de export desconocido"):
+            export_run(empty_db, tmp_path / "out", fmt="xlsx")
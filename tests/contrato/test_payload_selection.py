@@ -185,3 +185,30 @@ def test_stage_executes_only_codes_in_dynamic_scope(database: Database) -> None:
         "SELECT DISTINCT codigo FROM tecno_entidades ORDER BY codigo"
     ).fetchall()
     assert [str(row["codigo"]) for row in rows] == ["A", "C"]
+
+
+def test_selector_paths_are_indexed_and_resolved_once_per_run(database: Database) -> None:
+    discursos, _ = _bootstrap(database)
+    for code, tipo in (("A", "politico"), ("B", "entrevista"), ("C", "politico")):
+        discursos.set_payload(code, "metadata", {"tipo_discurso": tipo})
+    selection = _selection({"field": "metadata.tipo_discurso", "op": "eq", "value": "politico"})
+    engine = PayloadSelectionEngine(database, selection, ("metadata", "enunciation", "actors"))
+    engine.prepare()
+
+    assert engine.scope_for("enunciation") == frozenset({"A", "C"})
+    plan = " ".join(
+        str(row["detail"])
+        for row in database.execute(
+            "EXPLAIN QUERY PLAN SELECT codigo FROM discursos "
+            "WHERE json_extract(metadata_payload, '$.tipo_discurso') = ?",
+            ("politico",),
+        ).fetchall()
+    )
+    assert "USING INDEX idx_json_discursos_metadata_payload_tipo_discurso" in plan
+
+    # Dentro de la corrida el productor ya no cambia: lo resuelto se reutiliza.
+    discursos.set_payload("B", "metadata", {"tipo_discurso": "politico"})
+    assert engine.scope_for("actors") == frozenset({"A", "C"})
+
+    engine.prepare()
+    assert engine.scope_for("actors") == frozenset({"A", "B", "C"})
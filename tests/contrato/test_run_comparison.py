@@ -132,6 +132,8 @@ def test_additive_migration_adds_model_alias_and_eval_reports(tmp_path: Path) ->
 
     columns = {row["name"] for row in db.execute("PRAGMA table_info(run_metrics)")}
     assert "model_alias" in columns
+    assert "prefill_tokens_saved" in columns
+    assert "render_ms" in columns
     assert db.table_exists("eval_reports")
     db.close_thread_connection()
 
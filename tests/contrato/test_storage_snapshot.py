@@ -0,0 +1,124 @@
+# ══════════════════════════════════════════════════════════════════════════════
+#  tests/contrato/test_storage_snapshot
+#
+#  Instantánea Parquet por run: equivalencia con la lectura en vivo, refresco
+#  incremental por código y lectura entre runs con DuckDB.
+# ══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from emoparse.storage.db import Database
+from emoparse.storage.schema import ALL_TABLES_DDL
+from emoparse.storage.simulacros import get_emociones_enriched
+from emoparse.storage.snapshot import (
+    build_snapshot,
+    load_snapshot_table,
+    snapshot_dir_for,
+    snapshot_is_fresh,
+)
+
+
+def _db_con_emociones(path: Path, codigos: list[str]) -> Database:
+    db = Database(path)
+    for ddl in ALL_TABLES_DDL:
+        db.execute_script(ddl)
+    with db.transaction() as cur:
+        for codigo in codigos:
+            cur.execute(
+                "INSERT INTO discursos (codigo, input, enunciation_payload) VALUES (?, ?, ?)",
+                (
+                    codigo,
+                    json.dumps({"titulo": f"T_{codigo}", "fecha": "2024-01-01"}),
+                    json.dumps({"enunciador": "Presidente"}),
+                ),
+            )
+            cur.execute(
+                "INSERT INTO frases (codigo, unit_idx, frase) VALUES (?, 0, ?)",
+                (codigo, f"Frase de {codigo}."),
+            )
+            cur.execute(
+                "INSERT INTO emociones (codigo, frase_idx, emocion_idx, experienciador, "
+                "experienciador_marca, tipo_emocion, fuente_marca, fuente_inferencia, "
+                "modo_existencia, caracterizacion_payload) "
+                "VALUES (?, 0, 0, 'pueblo', 'el pueblo', 'miedo', 'ellos', 'ellos', "
+                "'realizada', ?)",
+                (codigo, json.dumps({"foria": "disforica", "intensidad": "alta"})),
+            )
+    return db
+
+
+def test_snapshot_reproduces_live_enriched_emotions(tmp_path: Path) -> None:
+    path = tmp_path / "run.sqlite"
+    _db_con_emociones(path, ["d1", "d2"])
+
+    report = build_snapshot(path)
+    snap = load_snapshot_table(report.snapshot_dir, "emociones")
+    live = get_emociones_enriched(path)
+
+    assert report.full
+    assert list(snap.columns) == list(live.columns)
+    assert snap[["codigo", "foria", "intensidad"]].values.tolist() == (
+        live[["codigo", "foria", "intensidad"]].values.tolist()
+    )
+    assert snap["experienciador_canonicos"].tolist() == live["experienciador_canonicos"].tolist()
+    assert snapshot_is_fresh(path)
+
+
+def test_refresh_recomputes_only_changed_codigos(tmp_path: Path) -> None:
+    path = tmp_path / "run.sqlite"
+    db = _db_con_emociones(path, ["d1", "d2", "d3"])
+    build_snapshot(path)
+
+    db.execute(
+        "UPDATE emociones SET caracterizacion_payload = ? WHERE codigo = 'd2'",
+        (json.dumps({"foria": "euforica", "intensidad": "baja"}),),
+    )
+    assert not snapshot_is_fresh(path)
+    report = build_snapshot(path)
+
+    snap = load_snapshot_table(snapshot_dir_for(path), "emociones")
+    assert not report.full
+    assert report.n_changed == 1
+    assert dict(zip(snap["codigo"], snap["foria"])) == {
+        "d1": "disforica",
+        "d2": "euforica",
+        "d3": "disforica",
+    }
+
+
+def test_refresh_drops_removed_codigos(tmp_path: Path) -> None:
+    path = tmp_path / "run.sqlite"
+    db = _db_con_emociones(path, ["d1", "d2", "d3"])
+    build_snapshot(path)
+
+    db.execute("PRAGMA foreign_keys=ON")
+    db.execute("DELETE FROM discursos WHERE codigo = 'd3'")
+    report = build_snapshot(path)
+
+    snap = load_snapshot_table(snapshot_dir_for(path), "emociones")
+    assert report.n_removed == 1
+    assert snap["codigo"].tolist() == ["d1", "d2"]
+
+
+def test_attach_snapshots_unions_runs_by_name(tmp_path: Path) -> None:
+    pytest.importorskip("duckdb")
+    from emoparse.storage.analytics import attach_snapshots
+
+    a = tmp_path / "a.sqlite"
+    b = tmp_path / "b.sqlite"
+    _db_con_emociones(a, ["d1"])
+    _db_con_emociones(b, ["d1", "d2"])
+    dirs = {"a": build_snapshot(a).snapshot_dir, "b": build_snapshot(b).snapshot_dir}
+
+    con = attach_snapshots(dirs)
+    rows = con.execute("SELECT run, COUNT(*) FROM emociones GROUP BY run ORDER BY run").fetchall()
+
+    assert rows == [("a", 1), ("b", 2)]
+    assert con.execute("SELECT COUNT(*) FROM b.aristas").fetchone() == (0,)